@@ -120,7 +120,7 @@ from aviary.mission.flops_based.phases.detailed_landing_phases import LandingTra
 from aviary.mission.flops_based.phases.detailed_takeoff_phases import TakeoffTrajectory as DetailedTakeoffTrajectoryBuilder
 
 # SimuPy
-from aviary.mission.gasp_based.ode.time_integration_base_classes import SimuPyProblem
+from aviary.mission.gasp_based.ode.time_integration_base_classes import SimuPyProblem, BatchSimulation
 from aviary.mission.gasp_based.phases.time_integration_phases import SGMGroundroll, SGMRotation, SGMAscent, SGMAscentCombined, SGMAccel, SGMClimb, SGMCruise, SGMDescent
 from aviary.mission.gasp_based.phases.time_integration_traj import TimeIntegrationTrajBase, FlexibleTraj
 
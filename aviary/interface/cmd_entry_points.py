@@ -9,6 +9,7 @@ from aviary.utils.engine_deck_conversion import _exec_EDC, _setup_EDC_parser, ED
 from aviary.visualization.dashboard import _dashboard_setup_parser, _dashboard_cmd
 from aviary.interface.graphical_input import _exec_flight_profile, _setup_flight_profile_parser
 from aviary.interface.download_models import _exec_hangar, _setup_hangar_parser
+from aviary.interface.payload_range import _exec_payload_range, _setup_payload_range_parser
 
 
 def _load_and_exec(script_name, user_args):
@@ -52,6 +53,8 @@ _command_map = {
     'hangar': (_setup_hangar_parser, _exec_hangar,
                "Allows users that pip installed Aviary to download models from the Aviary hangar"),
     'convert_engine': (_setup_EDC_parser, _exec_EDC, EDC_description),
+    'payload_range': (_setup_payload_range_parser, _exec_payload_range,
+                      "Computes the payload-range diagram of a vehicle"),
 }
 
 
@@ -0,0 +1,327 @@
+"""
+Payload-range sweeps of a designed vehicle.
+
+The vehicle is built once, as an AviaryProblem whose only mission is an off-design
+"point" mission with its own payload and takeoff gross mass. Every point of the
+diagram is a maximum-range optimization of that mission, so the same pre-set-up
+problem is reused for the whole sweep and each point is started from the solution of
+its neighbour.
+"""
+import importlib.util
+import multiprocessing
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+
+import numpy as np
+import openmdao.api as om
+
+from aviary.interface.methods_for_level2 import AviaryProblem
+from aviary.utils.named_values import NamedValues
+from aviary.variable_info.enums import EquationsOfMotion, LegacyCode, Verbosity
+from aviary.variable_info.variables import Aircraft, Mission
+
+# The sweep problem of this process. Workers forked from the process that built it
+# inherit it already set up; other workers build it once, in `_init_worker`.
+_sweep_problem = None
+
+_POINT = 'off_design.point'
+
+_RESULT_UNITS = {
+    'payload': 'lbm',
+    'gross_mass': 'lbm',
+    'fuel': 'lbm',
+    'range': 'nmi',
+    'converged': 'unitless',
+}
+
+
+def compute_payload_range(
+    aircraft_data, phase_info=None, num_points=5, num_workers=None, optimizer='SLSQP',
+    max_iter=50, verbosity=Verbosity.QUIET,
+):
+    """
+    Compute the payload-range diagram of a vehicle.
+
+    The diagram is made of the zero-range point at maximum payload, the maximum
+    range at maximum payload and maximum takeoff gross mass, the maximum range with
+    full fuel tanks at maximum takeoff gross mass, and the ferry range with full fuel
+    tanks and no payload. The two sloped segments between these corners are sampled
+    with `num_points` points each. The design payload and gross mass of the input
+    deck are taken as the maximum payload and maximum takeoff gross mass.
+
+    Each point is flown as a maximum-range mission, so the phases of `phase_info`
+    must allow durations long enough for the ferry mission. The points are split
+    into contiguous chunks that are flown concurrently by a pool of `num_workers`
+    processes. Each worker sweeps its chunk in order, starting every optimization
+    from the solution of the last point that converged.
+
+    Parameters
+    ----------
+    aircraft_data : str, Path or AviaryValues
+        The aircraft inputs, as accepted by AviaryProblem.load_inputs.
+    phase_info : dict, optional
+        The phase_info of the mission. Defaults to the phase_info loaded by
+        AviaryProblem.load_inputs. The 'optimize_mass' pre-mission option and the
+        'target_range' post-mission option are ignored.
+    num_points : int
+        Number of points on each of the two sloped segments of the diagram, including
+        the corners.
+    num_workers : int, optional
+        Number of processes used to fly the points. Defaults to one per CPU. With a
+        single worker the points are flown in this process.
+    optimizer : str
+        Name of the optimizer used for every point.
+    max_iter : int
+        Maximum number of optimizer iterations for every point.
+    verbosity : Verbosity
+        Verbosity of the problem and of the driver.
+
+    Returns
+    -------
+    NamedValues
+        The 'payload', 'gross_mass', 'fuel', 'range' and 'converged' arrays of the
+        points, ordered from maximum payload to ferry range.
+    """
+    global _sweep_problem
+
+    if num_points < 2:
+        raise ValueError('num_points must be at least 2 to include both corners of '
+                         'each segment of the payload-range diagram')
+
+    build_args = (aircraft_data, phase_info, optimizer, max_iter, verbosity)
+    prob = _sweep_problem = _build_sweep_problem(*build_args)
+
+    payload_name = _get_payload_name(prob)
+    operating_mass = prob.get_val(Aircraft.Design.OPERATING_MASS, 'lbm')[0]
+    max_payload = prob.get_val(payload_name, 'lbm')[0]
+    fuel_capacity = prob.get_val(Aircraft.Fuel.TOTAL_CAPACITY, 'lbm')[0]
+    max_gross_mass = prob.get_val(Mission.Design.GROSS_MASS, 'lbm')[0]
+
+    # payload at which the tanks are full at maximum takeoff gross mass
+    full_tanks_payload = np.clip(
+        max_gross_mass - operating_mass - fuel_capacity, 0., max_payload)
+
+    payloads = np.linspace(max_payload, full_tanks_payload, num_points)
+    if full_tanks_payload > 0.:
+        payloads = np.concatenate(
+            (payloads, np.linspace(full_tanks_payload, 0., num_points)[1:]))
+
+    gross_masses = np.minimum(
+        max_gross_mass, operating_mass + payloads + fuel_capacity)
+    points = list(zip(payloads, gross_masses))
+
+    if num_workers is None:
+        num_workers = os.cpu_count()
+
+    # Fly the maximum payload point here first, so the workers inherit its solution
+    # and the total coloring of the problem.
+    flown = _fly_points(points[:1])
+    points = points[1:]
+
+    chunks = [chunk for chunk in np.array_split(np.arange(len(points)), num_workers)
+              if chunk.size]
+
+    if len(chunks) == 1:
+        flown += _fly_points(points)
+
+    elif chunks:
+        # Forked workers inherit the sweep problem; otherwise each builds its own.
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            context = None
+
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context,
+                                 initializer=_init_worker,
+                                 initargs=(build_args,)) as pool:
+            futures = [pool.submit(_fly_points, [points[idx] for idx in chunk])
+                       for chunk in chunks]
+
+            flown += [point for future in futures for point in future.result()]
+
+    # the zero-range point
+    results = {name: [val] for name, val in zip(
+        _RESULT_UNITS, (max_payload, max_gross_mass, 0., 0., True))}
+
+    for point in flown:
+        for name, val in zip(_RESULT_UNITS, point):
+            results[name].append(val)
+
+    payload_range = NamedValues()
+    for name, units in _RESULT_UNITS.items():
+        payload_range.set_val(name, np.array(results[name]), units)
+
+    return payload_range
+
+
+def _build_sweep_problem(aircraft_data, phase_info, optimizer, max_iter, verbosity):
+    """
+    Build and set up the problem that flies a single point of the diagram.
+    """
+    prob = AviaryProblem(reports=False)
+    prob.load_inputs(aircraft_data, deepcopy(phase_info), verbosity=verbosity)
+
+    if prob.mission_method is not EquationsOfMotion.HEIGHT_ENERGY:
+        raise ValueError('Payload-range sweeps are only supported for '
+                         f'{EquationsOfMotion.HEIGHT_ENERGY.value} missions')
+
+    # the vehicle is fixed, only the point mission is optimized
+    prob.pre_mission_info = {**prob.pre_mission_info, 'optimize_mass': False}
+    post_mission_info = {key: val for key, val in prob.post_mission_info.items()
+                         if key != 'target_range'}
+
+    prob.check_and_preprocess_inputs()
+    prob.add_pre_mission_systems()
+
+    payload_name = _get_payload_name(prob)
+    prob.add_off_design_missions({
+        'point': {
+            'phase_info': {
+                'pre_mission': prob.pre_mission_info,
+                **prob.phase_info,
+                'post_mission': post_mission_info,
+            },
+            'aviary_inputs': {
+                payload_name: prob.aviary_inputs.get_item(payload_name, (0., 'lbm')),
+                Mission.Design.GROSS_MASS:
+                    prob.aviary_inputs.get_item(Mission.Design.GROSS_MASS),
+            },
+        },
+    })
+
+    prob.add_driver(optimizer, max_iter=max_iter, verbosity=verbosity)
+    prob.add_design_variables()
+
+    final_phase = list(prob.phase_info)[-1]
+    prob.model.add_objective(
+        f'{_POINT}.traj.{final_phase}.timeseries.distance', index=-1, units='nmi',
+        ref=-1.e3)
+
+    prob.setup()
+    prob.set_initial_guesses()
+    prob.set_solver_print(level=0)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', om.OpenMDAOWarning)
+        prob.run_model()
+
+    return prob
+
+
+def _get_payload_name(prob):
+    if prob.mass_method is LegacyCode.GASP:
+        return Aircraft.CrewPayload.PASSENGER_PAYLOAD_MASS
+
+    return Aircraft.CrewPayload.TOTAL_PAYLOAD_MASS
+
+
+def _init_worker(build_args):
+    """
+    Build the sweep problem of a worker process, unless it was inherited.
+    """
+    global _sweep_problem
+
+    if _sweep_problem is None:
+        _sweep_problem = _build_sweep_problem(*build_args)
+
+
+def _fly_points(points):
+    """
+    Fly the given (payload, gross mass) points in order with the sweep problem of this
+    process, each one starting from the solution of the last point that converged.
+    """
+    prob = _sweep_problem
+    payload_name = _get_payload_name(prob)
+    final_phase = list(prob.phase_info)[-1]
+
+    design_vars = list(prob.model.get_design_vars())
+    start = {name: prob.get_val(name) for name in design_vars}
+
+    flown = []
+    for payload, gross_mass in points:
+        # a point that failed to converge is a poor start for the next one
+        for name, val in start.items():
+            prob.set_val(name, val)
+
+        prob.set_val(f'{_POINT}.{payload_name}', payload, 'lbm')
+        prob.set_val(f'{_POINT}.{Mission.Design.GROSS_MASS}', gross_mass, 'lbm')
+
+        # Shift the mass history of the previous solution to the new takeoff mass,
+        # which also sets the initial mass of phases that fix it.
+        mass_names = [f'{_POINT}.traj.{phase_name}.states:mass'
+                      for phase_name in prob.phase_info]
+        delta = gross_mass - prob.get_val(mass_names[0], 'lbm')[0]
+        for name in mass_names:
+            prob.set_val(name, prob.get_val(name, 'lbm') + delta, 'lbm')
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', om.OpenMDAOWarning)
+            prob.run_driver()
+
+        converged = not prob.driver.fail
+        if converged:
+            start = {name: prob.get_val(name) for name in design_vars}
+
+        flown.append((
+            payload,
+            gross_mass,
+            prob.get_val(f'{_POINT}.{Mission.Summary.TOTAL_FUEL_MASS}', 'lbm')[0],
+            prob.get_val(
+                f'{_POINT}.traj.{final_phase}.timeseries.distance', 'nmi')[-1, 0],
+            converged,
+        ))
+
+    return flown
+
+
+def _setup_payload_range_parser(parser):
+    parser.add_argument(
+        'input_deck', metavar='indeck', type=str, nargs=1,
+        help='Name of vehicle input deck file')
+    parser.add_argument(
+        '-o', '--output', default='payload_range.csv',
+        help='Name of the csv file the payload-range points are written to')
+    parser.add_argument(
+        '--phase_info', type=str, default=None,
+        help='Path to a python file that defines phase_info')
+    parser.add_argument(
+        '--num_points', type=int, default=5,
+        help='Number of points on each sloped segment of the diagram')
+    parser.add_argument(
+        '--num_workers', type=int, default=None,
+        help='Number of processes used to fly the points, defaults to one per CPU')
+    parser.add_argument(
+        '--optimizer', type=str, default='SLSQP', help='Name of optimizer',
+        choices=('SNOPT', 'IPOPT', 'SLSQP'))
+    parser.add_argument(
+        '--max_iter', type=int, default=50,
+        help='Maximum number of iterations for each point')
+
+
+def _exec_payload_range(args, user_args):
+    phase_info = None
+    if args.phase_info is not None:
+        spec = importlib.util.spec_from_file_location('phase_info', args.phase_info)
+        phase_info_module = importlib.util.module_from_spec(spec)
+        sys.modules['phase_info'] = phase_info_module
+        spec.loader.exec_module(phase_info_module)
+        phase_info = phase_info_module.phase_info
+
+    payload_range = compute_payload_range(
+        args.input_deck[0], phase_info, num_points=args.num_points,
+        num_workers=args.num_workers, optimizer=args.optimizer,
+        max_iter=args.max_iter)
+
+    header = [f'{name} ({units})' for name, units in _RESULT_UNITS.items()]
+    columns = [payload_range.get_val(name, units)
+               for name, units in _RESULT_UNITS.items()]
+
+    np.savetxt(args.output, np.column_stack(columns), delimiter=',', fmt='%.8g',
+               header=','.join(header), comments='')
+
+    print(''.join(f'{name:>22}' for name in header))
+    for row in zip(*columns):
+        print(''.join(f'{val:22.2f}' for val in row[:-1]) + f'{bool(row[-1])!s:>22}')
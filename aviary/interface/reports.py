@@ -128,43 +128,52 @@ def mission_report(prob, **kwargs):
     reports_folder = Path(prob.get_reports_dir())
     report_file = reports_folder / 'mission_summary.md'
 
-    # read per-phase data from trajectory
-    data = {}
-    for idx, phase in enumerate(prob.phase_info):
-        # TODO for traj in trajectories, currently assuming single one named "traj"
-        # TODO delta mass and fuel consumption need to be tracked separately
-        fuel_burn = _get_phase_diff('traj', phase, 'mass', 'lbm', [-1, 0])
-        time = _get_phase_diff('traj', phase, 't', 'min')
-        range = _get_phase_diff('traj', phase, 'distance', 'nmi')
-
-        # get initial values, first in traj
-        if idx == 0:
-            initial_mass = _get_phase_value('traj', phase, 'mass', 'lbm', 0)[0]
-            initial_time = _get_phase_value('traj', phase, 't', 'min', 0)
-            initial_range = _get_phase_value('traj', phase, 'distance', 'nmi', 0)[0]
-
-        outputs = NamedValues()
-        # Fuel burn is negative of delta mass
-        outputs.set_val('Fuel Burn', fuel_burn, 'lbm')
-        outputs.set_val('Elapsed Time', time, 'min')
-        outputs.set_val('Ground Distance', range, 'nmi')
-        data[phase] = outputs
-
-        # get final values, last in traj
-        final_mass = _get_phase_value('traj', phase, 'mass', 'lbm', -1)[0]
-        final_time = _get_phase_value('traj', phase, 't', 'min', -1)
-        final_range = _get_phase_value('traj', phase, 'distance', 'nmi', -1)[0]
-
-    totals = NamedValues()
-    totals.set_val('Total Fuel Burn', initial_mass - final_mass, 'lbm')
-    totals.set_val('Total Time', final_time - initial_time, 'min')
-    totals.set_val('Total Ground Distance', final_range - initial_range, 'nmi')
+    def _get_mission_data(traj, phase_info):
+        # read per-phase data from trajectory
+        data = {}
+        for idx, phase in enumerate(phase_info):
+            # TODO delta mass and fuel consumption need to be tracked separately
+            fuel_burn = _get_phase_diff(traj, phase, 'mass', 'lbm', [-1, 0])
+            time = _get_phase_diff(traj, phase, 't', 'min')
+            range = _get_phase_diff(traj, phase, 'distance', 'nmi')
+
+            # get initial values, first in traj
+            if idx == 0:
+                initial_mass = _get_phase_value(traj, phase, 'mass', 'lbm', 0)[0]
+                initial_time = _get_phase_value(traj, phase, 't', 'min', 0)
+                initial_range = _get_phase_value(traj, phase, 'distance', 'nmi', 0)[0]
+
+            outputs = NamedValues()
+            # Fuel burn is negative of delta mass
+            outputs.set_val('Fuel Burn', fuel_burn, 'lbm')
+            outputs.set_val('Elapsed Time', time, 'min')
+            outputs.set_val('Ground Distance', range, 'nmi')
+            data[phase] = outputs
+
+            # get final values, last in traj
+            final_mass = _get_phase_value(traj, phase, 'mass', 'lbm', -1)[0]
+            final_time = _get_phase_value(traj, phase, 't', 'min', -1)
+            final_range = _get_phase_value(traj, phase, 'distance', 'nmi', -1)[0]
+
+        totals = NamedValues()
+        totals.set_val('Total Fuel Burn', initial_mass - final_mass, 'lbm')
+        totals.set_val('Total Time', final_time - initial_time, 'min')
+        totals.set_val('Total Ground Distance', final_range - initial_range, 'nmi')
+
+        return totals, data
+
+    # TODO for traj in trajectories, currently assuming single one named "traj"
+    totals, data = _get_mission_data('traj', prob.phase_info)
+
+    off_design = {
+        name: _get_mission_data(f'off_design.{name}.traj', mission.phase_info)
+        for name, mission in prob.off_design_missions.items()
+    }
 
     if MPI and MPI.COMM_WORLD.rank != 0:
         return
 
-    with open(report_file, mode='w') as f:
-        f.write('# MISSION SUMMARY')
+    def _write_totals(f, totals):
         write_markdown_variable_table(f, totals,
                                       ['Total Fuel Burn',
                                        'Total Time',
@@ -173,6 +182,10 @@ def mission_report(prob, **kwargs):
                                        'Total Time': {'units': 'min'},
                                        'Total Ground Distance': {'units': 'nmi'}})
 
+    with open(report_file, mode='w') as f:
+        f.write('# MISSION SUMMARY')
+        _write_totals(f, totals)
+
         f.write('\n# MISSION SEGMENTS')
         for phase in data:
             f.write(f'\n## {phase}')
@@ -181,6 +194,12 @@ def mission_report(prob, **kwargs):
                                            'Elapsed Time': {'units': 'min'},
                                            'Ground Distance': {'units': 'nmi'}})
 
+        if off_design:
+            f.write('\n# OFF-DESIGN MISSIONS')
+            for name, (totals, _) in off_design.items():
+                f.write(f'\n## {name}')
+                _write_totals(f, totals)
+
 
 def timeseries_csv(prob, **kwargs):
     """
@@ -34,6 +34,11 @@ class CommandEntryPointsTestCases(unittest.TestCase):
             ' --optimizer IPOPT --max_iter 1 --shooting'
         self.run_and_test_cmd(cmd)
 
+    def bench_test_payload_range_cmd(self):
+        cmd = 'aviary payload_range models/test_aircraft/aircraft_for_bench_FwFm.csv' \
+            ' --num_points 2 --num_workers 1 --max_iter 1'
+        self.run_and_test_cmd(cmd)
+
     def test_diff_configuration_conversion(self):
         filepath = pkg_resources.resource_filename('aviary',
                                                    'models/test_aircraft/converter_configuration_test_data_GwGm.dat')
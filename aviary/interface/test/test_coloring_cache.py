@@ -0,0 +1,95 @@
+from copy import deepcopy
+import unittest
+
+from openmdao.core.problem import _clear_problem_names
+from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.coloring import Coloring
+from openmdao.utils.reports_system import clear_reports
+from openmdao.utils.testing_utils import use_tempdirs
+
+from aviary.interface.methods_for_level2 import AviaryProblem
+from aviary.interface.default_phase_info.height_energy import phase_info
+from aviary.variable_info.variables import Mission
+
+
+@use_tempdirs
+class ColoringCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        # need to reset these to simulate separate runs
+        _clear_problem_names()
+        clear_reports()
+
+    def build_problem(self, phase_info):
+        prob = AviaryProblem(reports=False)
+
+        csv_path = "models/test_aircraft/aircraft_for_bench_FwFm.csv"
+
+        prob.load_inputs(csv_path, phase_info)
+        prob.check_and_preprocess_inputs()
+
+        prob.add_pre_mission_systems()
+        prob.add_phases()
+        prob.add_post_mission_systems()
+
+        prob.link_phases()
+
+        prob.add_driver('SLSQP', max_iter=1, coloring_cache='cache')
+        prob.add_design_variables()
+        prob.add_objective()
+
+        prob.setup()
+        prob.set_initial_guesses()
+
+        return prob
+
+    def test_coloring_cache(self):
+        prob = self.build_problem(deepcopy(phase_info))
+        cache_file = prob._coloring_cache_file
+
+        self.assertFalse(cache_file.exists())
+        prob.run_driver()
+        self.assertTrue(cache_file.exists())
+
+        fuel = prob.get_val(Mission.Summary.FUEL_BURNED, 'lbm')
+
+        # the same problem reuses the stored coloring
+        prob = self.build_problem(deepcopy(phase_info))
+
+        self.assertEqual(prob._coloring_cache_file, cache_file)
+
+        prob.run_driver()
+        self.assertIsInstance(prob.driver._coloring_info.static, Coloring)
+        assert_near_equal(prob.get_val(Mission.Summary.FUEL_BURNED, 'lbm'), fuel, 1e-8)
+
+        # a different grid needs a new coloring
+        local_phase_info = deepcopy(phase_info)
+        local_phase_info['cruise']['user_options']['num_segments'] = 3
+
+        prob = self.build_problem(local_phase_info)
+
+        self.assertNotEqual(prob._coloring_cache_file, cache_file)
+        self.assertTrue(prob.driver._coloring_info.dynamic)
+
+        # explicit invalidation
+        prob = self.build_problem(deepcopy(phase_info))
+        prob.clear_coloring_cache()
+
+        self.assertFalse(cache_file.exists())
+
+        prob.run_driver()
+        self.assertTrue(prob.driver._coloring_info.dynamic)
+        self.assertTrue(cache_file.exists())
+
+    def test_cache_is_opt_in(self):
+        prob = AviaryProblem(reports=False)
+        prob.load_inputs("models/test_aircraft/aircraft_for_bench_FwFm.csv",
+                         deepcopy(phase_info))
+        prob.check_and_preprocess_inputs()
+        prob.add_driver('SLSQP')
+
+        self.assertIsNone(prob._coloring_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
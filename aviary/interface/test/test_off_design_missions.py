@@ -0,0 +1,117 @@
+from copy import deepcopy
+import unittest
+
+from openmdao.core.problem import _clear_problem_names
+from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.reports_system import clear_reports
+from openmdao.utils.testing_utils import use_tempdirs
+
+from aviary.interface.methods_for_level2 import AviaryProblem
+from aviary.interface.default_phase_info.height_energy import phase_info
+from aviary.variable_info.variables import Aircraft, Mission
+
+
+@use_tempdirs
+class OffDesignMissionsTest(unittest.TestCase):
+
+    def setUp(self):
+        # need to reset these to simulate separate runs
+        _clear_problem_names()
+        clear_reports()
+
+    def build_problem(self, missions):
+        prob = AviaryProblem()
+
+        csv_path = "models/test_aircraft/aircraft_for_bench_FwFm.csv"
+
+        prob.load_inputs(csv_path, deepcopy(phase_info))
+        prob.check_and_preprocess_inputs()
+
+        prob.add_pre_mission_systems()
+        prob.add_phases()
+        prob.add_post_mission_systems()
+
+        prob.link_phases()
+
+        prob.add_off_design_missions(missions)
+
+        prob.add_driver('SLSQP', max_iter=100)
+        prob.add_design_variables()
+        prob.add_objective()
+
+        prob.setup()
+        prob.set_initial_guesses()
+
+        return prob
+
+    def test_shared_pre_mission(self):
+        prob = self.build_problem({
+            'light': {'aviary_inputs': {Mission.Design.GROSS_MASS: (150000., 'lbm')}},
+            'heavy': {},
+        })
+
+        prob.run_model()
+
+        # the vehicle is only designed once
+        light_systems = [system.name for system in
+                         prob.model.off_design.light.system_iter(recurse=False)]
+        self.assertNotIn('pre_mission', light_systems)
+
+        shared_inputs = {
+            meta['prom_name'] for meta in prob.model.off_design.list_vars(
+                out_stream=None, val=False, prom_name=True,
+                return_format='dict').values()}
+        self.assertIn(Aircraft.Wing.AREA, shared_inputs)
+
+        results = prob.get_off_design_results()
+
+        self.assertEqual(list(results), ['light', 'heavy'])
+        assert_near_equal(
+            results['light'].get_val(Mission.Design.GROSS_MASS, 'lbm'), 150000.)
+        assert_near_equal(
+            results['heavy'].get_val(Mission.Design.GROSS_MASS, 'lbm'),
+            prob.get_val(Mission.Design.GROSS_MASS, 'lbm'))
+        assert_near_equal(
+            prob.get_val('off_design.light.traj.climb.timeseries.mass', 'lbm')[0],
+            150000., 1e-8)
+
+        # the design variables and constraints of each mission are part of the problem
+        desvars = prob.model.get_design_vars()
+        self.assertIn('off_design.light.' + Mission.Design.GROSS_MASS, desvars)
+        self.assertIn('off_design.heavy.' + Mission.Design.GROSS_MASS, desvars)
+        self.assertIn('off_design.light.' + Mission.Constraints.RANGE_RESIDUAL,
+                      prob.model.get_constraints())
+
+    def test_off_design_mission(self):
+        short = deepcopy(phase_info)
+        short['post_mission']['target_range'] = (2000., 'nmi')
+        short['cruise']['user_options']['duration_bounds'] = ((1500., 14000.), 's')
+
+        prob = self.build_problem({
+            'short': {
+                'phase_info': short,
+                'aviary_inputs': {
+                    Aircraft.CrewPayload.TOTAL_PAYLOAD_MASS: (25000., 'lbm')},
+            },
+        })
+
+        prob.run_aviary_problem(make_plots=False)
+
+        results = prob.get_off_design_results()['short']
+
+        assert_near_equal(
+            results.get_val(Mission.Constraints.RANGE_RESIDUAL, 'nmi'), 0., 1e-6)
+
+        # the off-design gross mass closes with the design operating mass
+        operating_mass = prob.get_val(Aircraft.Design.OPERATING_MASS, 'lbm')
+        total_fuel = results.get_val(Mission.Summary.TOTAL_FUEL_MASS, 'lbm')
+        assert_near_equal(
+            results.get_val(Mission.Design.GROSS_MASS, 'lbm'),
+            operating_mass + total_fuel + 25000., 1e-6)
+
+        self.assertLess(results.get_val(Mission.Design.GROSS_MASS, 'lbm'),
+                        prob.get_val(Mission.Design.GROSS_MASS, 'lbm'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+from copy import deepcopy
+import unittest
+
+import numpy as np
+from openmdao.core.problem import _clear_problem_names
+from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.reports_system import clear_reports
+from openmdao.utils.testing_utils import use_tempdirs
+
+from aviary.interface.default_phase_info.height_energy import phase_info
+from aviary.interface.payload_range import compute_payload_range
+
+
+@use_tempdirs
+class PayloadRangeTest(unittest.TestCase):
+
+    def setUp(self):
+        # need to reset these to simulate separate runs
+        _clear_problem_names()
+        clear_reports()
+
+    def test_payload_range(self):
+        local_phase_info = deepcopy(phase_info)
+        # leave room for the ferry mission
+        local_phase_info['cruise']['user_options']['duration_bounds'] = \
+            ((30., 900.), 'min')
+
+        payload_range = compute_payload_range(
+            'models/test_aircraft/aircraft_for_bench_FwFm.csv', local_phase_info,
+            num_points=2, num_workers=2)
+
+        payload = payload_range.get_val('payload', 'lbm')
+        gross_mass = payload_range.get_val('gross_mass', 'lbm')
+        fuel = payload_range.get_val('fuel', 'lbm')
+        flown_range = payload_range.get_val('range', 'nmi')
+
+        self.assertTrue(np.all(payload_range.get_val('converged')))
+
+        # zero range, maximum payload, full tanks and ferry corners
+        assert_near_equal(payload, [38025., 38025., 32131.87557092, 0.], 1e-6)
+        assert_near_equal(gross_mass, [175400., 175400., 175400., 143268.12442908], 1e-6)
+        assert_near_equal(fuel, [0., 39800.87557092, 45694., 45694.], 1e-6)
+        assert_near_equal(flown_range, [0., 3200.753, 3804.374, 4374.227], 1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
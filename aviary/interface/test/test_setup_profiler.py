@@ -0,0 +1,98 @@
+from copy import deepcopy
+import json
+import os
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+from openmdao.core.problem import _clear_problem_names
+from openmdao.utils.reports_system import clear_reports
+from openmdao.utils.testing_utils import use_tempdirs
+
+from aviary.interface.methods_for_level2 import AviaryProblem
+from aviary.interface.default_phase_info.height_energy import phase_info
+from aviary.interface.utils.setup_profiler import PROFILE_SETUP_ENV_VAR
+
+
+@use_tempdirs
+class SetupProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        # need to reset these to simulate separate runs
+        _clear_problem_names()
+        clear_reports()
+
+    def test_setup_profiler(self):
+        prob = AviaryProblem(reports=False, profile_setup=True)
+
+        csv_path = "models/test_aircraft/aircraft_for_bench_FwFm.csv"
+
+        prob.load_inputs(csv_path, deepcopy(phase_info))
+        prob.check_and_preprocess_inputs()
+
+        prob.add_pre_mission_systems()
+        prob.add_phases()
+        prob.add_post_mission_systems()
+
+        prob.link_phases()
+
+        prob.add_driver('SLSQP', max_iter=0, coloring_cache=False)
+        prob.add_design_variables()
+        prob.add_objective()
+
+        prob.setup()
+        prob.set_initial_guesses()
+        prob.final_setup()
+        prob.final_setup()
+
+        # memory is only traced while a stage is recorded
+        self.assertFalse(tracemalloc.is_tracing())
+
+        report_dir = prob.get_reports_dir()
+        self.assertTrue((report_dir / 'setup_profile.html').exists())
+
+        with open(report_dir / 'setup_profile.json') as file:
+            report = json.load(file)
+
+        stages = [entry['name'] for entry in report['stages'] if entry['depth'] == 0]
+        for stage in ('load_inputs', 'check_and_preprocess_inputs',
+                      'add_pre_mission_systems', 'add_phases', 'link_phases',
+                      'add_design_variables', 'setup', 'set_initial_guesses',
+                      'final_setup'):
+            self.assertIn(stage, stages)
+
+        # final_setup is called again by every run, but only the first call is a stage
+        self.assertEqual(stages.count('final_setup'), 1)
+
+        for entry in report['stages']:
+            self.assertGreaterEqual(entry['wall_time'], 0.)
+            self.assertGreaterEqual(entry['peak_memory'], 0.)
+
+        # the subsystems of each phase are built while the model is set up
+        build_mission = [entry for entry in report['stages']
+                         if entry['name'] == 'build_mission']
+        phases = {entry['phase'] for entry in build_mission}
+        self.assertEqual(phases, {'climb', 'cruise', 'descent'})
+
+        for entry in build_mission:
+            self.assertEqual(entry['depth'], 1)
+            self.assertIn(entry['subsystem'], report['subsystems'])
+
+        # builders are restored after setup
+        for builder in prob.core_subsystems.values():
+            self.assertNotIn('build_mission', vars(builder))
+
+    def test_env_var(self):
+        with patch.dict(os.environ, {PROFILE_SETUP_ENV_VAR: '1'}):
+            self.assertIsNotNone(AviaryProblem(reports=False)._setup_profiler)
+
+        with patch.dict(os.environ, {PROFILE_SETUP_ENV_VAR: '0'}):
+            self.assertIsNone(AviaryProblem(reports=False)._setup_profiler)
+
+        with patch.dict(os.environ, {PROFILE_SETUP_ENV_VAR: '1'}):
+            self.assertIsNone(
+                AviaryProblem(reports=False, profile_setup=False)._setup_profiler)
+
+
+if __name__ == '__main__':
+    unittest.main()
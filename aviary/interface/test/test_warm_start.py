@@ -0,0 +1,146 @@
+from copy import deepcopy
+import unittest
+
+import dymos as dm
+import numpy as np
+import openmdao.api as om
+from openmdao.core.problem import _clear_problem_names
+from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.reports_system import clear_reports
+from openmdao.utils.testing_utils import use_tempdirs
+
+from aviary.interface.methods_for_level2 import AviaryProblem
+from aviary.interface.default_phase_info.height_energy import phase_info
+from aviary.interface.utils.warm_start import load_solution, set_warm_start
+from aviary.variable_info.variables import Mission
+
+
+class VectorODE(om.ExplicitComponent):
+    """
+    Rate of a vector state, given by a parameter.
+    """
+
+    def initialize(self):
+        self.options.declare('num_nodes', types=int)
+
+    def setup(self):
+        nn = self.options['num_nodes']
+        self.add_input('vel', shape=(nn, 2), units='m/s')
+        self.add_output('pos_dot', shape=(nn, 2), units='m/s')
+
+        self.declare_partials('pos_dot', 'vel', rows=np.arange(2 * nn),
+                              cols=np.arange(2 * nn), val=1.)
+
+    def compute(self, inputs, outputs):
+        outputs['pos_dot'] = inputs['vel']
+
+
+@use_tempdirs
+class WarmStartTest(unittest.TestCase):
+
+    def setUp(self):
+        # need to reset these to simulate separate runs
+        _clear_problem_names()
+        clear_reports()
+
+    def build_problem(self, phase_info):
+        prob = AviaryProblem(reports=False)
+
+        csv_path = "models/test_aircraft/aircraft_for_bench_FwFm.csv"
+
+        prob.load_inputs(csv_path, phase_info)
+        prob.check_and_preprocess_inputs()
+
+        prob.add_pre_mission_systems()
+        prob.add_phases()
+        prob.add_post_mission_systems()
+
+        prob.link_phases()
+
+        prob.add_driver('SLSQP', max_iter=50, coloring_cache=False)
+        prob.add_design_variables()
+        prob.add_objective()
+
+        prob.setup()
+        prob.set_initial_guesses()
+
+        return prob
+
+    def test_warm_start(self):
+        prob = self.build_problem(deepcopy(phase_info))
+        prob.run_aviary_problem(make_plots=False)
+        prob.save_solution('solution.json')
+
+        # the compact solution file holds the same trajectory as the database
+        solution = load_solution('aviary_history.db')
+        compact_solution = load_solution('solution.json')
+
+        for name in ('traj.cruise.timeseries.time', 'traj.cruise.timeseries.mass',
+                     'traj.descent.timeseries.altitude'):
+            val, units = solution[name]
+            compact_val, compact_units = compact_solution[name]
+            self.assertEqual(units, compact_units)
+            assert_near_equal(compact_val, val, 1e-12)
+
+        # design variables are given in the units they are declared with
+        self.assertEqual(compact_solution[Mission.Design.GROSS_MASS][1], 'lbm')
+        assert_near_equal(compact_solution[Mission.Design.GROSS_MASS][0],
+                          solution[Mission.Design.GROSS_MASS][0], 1e-12)
+
+        # a finer grid and a longer mission
+        local_phase_info = deepcopy(phase_info)
+        local_phase_info['cruise']['user_options']['num_segments'] = 3
+        local_phase_info['post_mission']['target_range'] = (2000., 'nmi')
+
+        prob = self.build_problem(local_phase_info)
+        prob.warm_start('aviary_history.db')
+
+        prob.run_model()
+
+        for name in ('traj.cruise.timeseries.time', 'traj.cruise.timeseries.mass'):
+            val, units = solution[name]
+            assert_near_equal(prob.get_val(name, units)[[0, -1]], val[[0, -1]], 1e-12)
+
+        assert_near_equal(prob.get_val(Mission.Design.GROSS_MASS, 'lbm'),
+                          solution[Mission.Design.GROSS_MASS][0], 1e-12)
+
+        prob.run_aviary_problem(make_plots=False, record_filename='warm_started.db')
+
+        self.assertFalse(prob.driver.fail)
+        self.assertLess(prob.driver.iter_count, 8)
+        assert_near_equal(prob.get_val(Mission.Summary.FUEL_BURNED, 'lbm'),
+                          25501.257, 1e-4)
+
+    def test_vector_state(self):
+        phase = dm.Phase(ode_class=VectorODE,
+                         transcription=dm.Radau(num_segments=2, order=3))
+        phase.set_time_options(fix_initial=True, fix_duration=True, units='s')
+        phase.add_state('pos', shape=(2,), rate_source='pos_dot', units='m',
+                        fix_initial=True)
+        phase.add_parameter('vel', shape=(2,), units='m/s', opt=False)
+
+        traj = dm.Trajectory()
+        traj.add_phase('phase0', phase)
+
+        prob = om.Problem()
+        prob.model.add_subsystem('traj', traj)
+        prob.setup()
+
+        prob.set_val('traj.phase0.t_duration', 1., units='s')
+        prob.set_val('traj.phase0.states:pos', [1., 10.], units='m')
+
+        time = np.linspace(0., 1., 5)
+        set_warm_start(prob, {
+            'traj.phase0.timeseries.time': (time, 's'),
+            'traj.phase0.timeseries.pos': (np.column_stack((5. + time, 7. + 2. * time)),
+                                           'm'),
+        })
+
+        # each component of the history is shifted to its own fixed initial value
+        pos = prob.get_val('traj.phase0.states:pos', units='m')
+        assert_near_equal(pos[0], [1., 10.], 1e-12)
+        assert_near_equal(pos[:, 1] - 10., 2. * (pos[:, 0] - 1.), 1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,310 @@
+"""
+Opt-in profiling of the construction of Aviary problems.
+
+When profiling is enabled, either with the `profile_setup` argument of AviaryProblem or
+by setting the AVIARY_PROFILE_SETUP environment variable, the wall time and the peak
+traced memory of each stage of building the problem are recorded, together with every
+`build_mission` call made by the subsystem builders while the phases are set up. The
+records are written to setup_profile.json and setup_profile.html in the reports folder
+of the problem.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial, wraps
+import html
+import json
+import os
+from pathlib import Path
+import time
+import tracemalloc
+
+PROFILE_SETUP_ENV_VAR = 'AVIARY_PROFILE_SETUP'
+
+
+def profile_setup_requested(profile_setup=None):
+    """
+    Return whether setup profiling is enabled.
+
+    Parameters
+    ----------
+    profile_setup : bool or None
+        Explicit request. If None, profiling is enabled when the AVIARY_PROFILE_SETUP
+        environment variable is set to anything other than '', '0', 'false' or 'no'.
+
+    Returns
+    -------
+    bool
+        True if the construction of the problem should be profiled.
+    """
+    if profile_setup is None:
+        return os.environ.get(PROFILE_SETUP_ENV_VAR, '').lower() not in (
+            '', '0', 'false', 'no')
+
+    return profile_setup
+
+
+def profile_stage(method=None, first_call_only=False):
+    """
+    Record a method of AviaryProblem as a stage of the setup profile of the problem.
+
+    With `first_call_only`, only the first call of the method is recorded, for methods
+    such as final_setup that are called again every time the problem runs.
+    """
+    if method is None:
+        return partial(profile_stage, first_call_only=first_call_only)
+
+    @wraps(method)
+    def wrapper(prob, *args, **kwargs):
+        profiler = prob._setup_profiler
+        if profiler is None or first_call_only and any(
+                entry['name'] == method.__name__ and entry.get('problem') == prob._name
+                for entry in profiler.records):
+            return method(prob, *args, **kwargs)
+
+        with profiler.record(method.__name__, problem=prob._name):
+            return method(prob, *args, **kwargs)
+
+    return wrapper
+
+
+class SetupProfiler:
+    """
+    Records the wall time and peak memory of the stages of building a problem.
+
+    Memory is measured with tracemalloc, so it only accounts for memory allocated by
+    Python, including numpy arrays. Unless it is already running, tracemalloc is started
+    when a top-level record opens and stopped when it closes. Tracing memory makes the
+    profiled stages noticeably slower than they would otherwise be.
+
+    Parameters
+    ----------
+    report_dir : str or Path
+        Folder in which the reports are written.
+    write_reports : bool
+        If False, the records are kept but no report is written, as on all but one
+        rank of a parallel run.
+    """
+
+    def __init__(self, report_dir, write_reports=True):
+        self.report_dir = Path(report_dir)
+        self._write_reports = write_reports
+        self.records = []
+
+        # peak memory reached so far by each open record
+        self._peaks = []
+
+        # whether tracemalloc was started by the open top-level record
+        self._started_tracing = False
+
+        # (record, system) of each build_mission call, until the system is set up
+        self._built_systems = []
+
+    @contextmanager
+    def record(self, name, **info):
+        """
+        Record the wall time and peak memory of the enclosed code.
+
+        Records can be nested. The reports are written every time a top-level record
+        is closed.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage.
+        **info : dict
+            Additional information stored with the record.
+        """
+        if not self._peaks and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        current, peak = tracemalloc.get_traced_memory()
+        if self._peaks:
+            # tracemalloc has a single peak, so keep the one of the enclosing record
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        tracemalloc.reset_peak()
+
+        entry = {'name': name, **info, 'depth': len(self._peaks)}
+        self.records.append(entry)
+        self._peaks.append(current)
+        start_time = time.perf_counter()
+
+        try:
+            yield entry
+
+        finally:
+            entry['wall_time'] = time.perf_counter() - start_time
+
+            end, peak = tracemalloc.get_traced_memory()
+            peak = max(self._peaks.pop(), peak)
+            entry['peak_memory'] = peak / 2**20
+            entry['memory_increase'] = (end - current) / 2**20
+
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            else:
+                if self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+
+                self.write_reports()
+
+    def profile_builders(self, builders):
+        """
+        Wrap the `build_mission` method of the given subsystem builders, so that every
+        call is recorded.
+
+        Parameters
+        ----------
+        builders : list of SubsystemBuilderBase
+            The builders to profile.
+
+        Returns
+        -------
+        list of SubsystemBuilderBase
+            The builders that were wrapped, to be passed to `restore_builders`.
+        """
+        wrapped = []
+        for builder in builders:
+            if 'build_mission' in vars(builder):
+                # already wrapped, or replaced by the user
+                continue
+
+            builder.build_mission = self._wrap_build_mission(builder)
+            wrapped.append(builder)
+
+        return wrapped
+
+    def restore_builders(self, builders):
+        """
+        Remove the wrappers added by `profile_builders`, and add the path and phase of
+        each system built through them to its record. This should be called once the
+        model is set up, when the built systems know their place in the model.
+
+        Parameters
+        ----------
+        builders : list of SubsystemBuilderBase
+            The builders returned by `profile_builders`.
+        """
+        for builder in builders:
+            del builder.build_mission
+
+        for entry, system in self._built_systems:
+            # builders may build nothing for the mission
+            path = getattr(system, 'pathname', None) or None
+
+            phase = None
+            if path and '.phases.' in path:
+                phase = path.split('.phases.')[1].split('.')[0]
+
+            entry.update(phase=phase, system=path)
+
+        self._built_systems = []
+
+    def _wrap_build_mission(self, builder):
+        build_mission = builder.build_mission
+
+        @wraps(build_mission)
+        def wrapper(*args, **kwargs):
+            with self.record('build_mission', subsystem=builder.name) as entry:
+                system = build_mission(*args, **kwargs)
+
+            self._built_systems.append((entry, system))
+            return system
+
+        return wrapper
+
+    def get_subsystem_totals(self):
+        """
+        Sum the `build_mission` calls of each subsystem, over all phases.
+
+        Returns
+        -------
+        dict
+            Maps each subsystem name to a dict with its number of 'calls', its total
+            'wall_time' and the largest 'peak_memory' of its calls.
+        """
+        totals = defaultdict(lambda: {'calls': 0, 'wall_time': 0., 'peak_memory': 0.})
+        for entry in self.records:
+            if entry['name'] == 'build_mission' and 'wall_time' in entry:
+                total = totals[entry['subsystem']]
+                total['calls'] += 1
+                total['wall_time'] += entry['wall_time']
+                total['peak_memory'] = max(total['peak_memory'], entry['peak_memory'])
+
+        return dict(totals)
+
+    def write_reports(self):
+        """
+        Write the records to setup_profile.json and setup_profile.html.
+        """
+        if not self._write_reports:
+            return
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+
+        report = {
+            'stages': [entry for entry in self.records if 'wall_time' in entry],
+            'subsystems': self.get_subsystem_totals(),
+        }
+
+        with open(self.report_dir / 'setup_profile.json', 'w') as file:
+            json.dump(report, file, indent=1)
+
+        with open(self.report_dir / 'setup_profile.html', 'w') as file:
+            file.write(self._get_html(report))
+
+    @staticmethod
+    def _get_html(report):
+        def table(header, rows):
+            lines = ['<table>', '<tr>' + ''.join(f'<th>{html.escape(name)}</th>'
+                                                 for name in header) + '</tr>']
+            for row in rows:
+                lines.append('<tr>' + ''.join(f'<td>{html.escape(str(val))}</td>'
+                                              for val in row) + '</tr>')
+            lines.append('</table>')
+            return '\n'.join(lines)
+
+        stage_rows = []
+        for entry in report['stages']:
+            # non-breaking spaces, so the nesting shows in the table
+            name = '\u00a0' * 4 * entry['depth'] + entry['name']
+            if entry['name'] == 'build_mission':
+                detail = f"{entry['subsystem']} ({entry['system']})"
+            else:
+                detail = entry.get('problem', '')
+
+            stage_rows.append((name, detail, f"{entry['wall_time']:.3f}",
+                               f"{entry['peak_memory']:.1f}",
+                               f"{entry['memory_increase']:.1f}"))
+
+        subsystem_rows = [
+            (name, total['calls'], f"{total['wall_time']:.3f}",
+             f"{total['peak_memory']:.1f}")
+            for name, total in sorted(report['subsystems'].items(),
+                                      key=lambda item: -item[1]['wall_time'])]
+
+        return '\n'.join([
+            '<!DOCTYPE html>',
+            '<html>',
+            '<head>',
+            '<meta charset="utf-8">',
+            '<title>Aviary Setup Profile</title>',
+            '<style>',
+            'body { font-family: sans-serif; }',
+            'table { border-collapse: collapse; }',
+            'th, td { border: 1px solid #ccc; padding: 2px 8px; text-align: left; }',
+            'td:nth-child(n+3) { text-align: right; }',
+            '</style>',
+            '</head>',
+            '<body>',
+            '<h1>Setup Stages</h1>',
+            table(('Stage', 'Problem / Subsystem', 'Wall Time (s)', 'Peak Memory (MiB)',
+                   'Memory Increase (MiB)'), stage_rows),
+            '<h1>Subsystem build_mission Calls</h1>',
+            table(('Subsystem', 'Calls', 'Wall Time (s)', 'Peak Memory (MiB)'),
+                  subsystem_rows),
+            '</body>',
+            '</html>',
+            '',
+        ])
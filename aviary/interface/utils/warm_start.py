@@ -0,0 +1,211 @@
+"""
+Warm starts of Aviary problems from a previous solution.
+
+A previous solution is read from a recorder database, such as the aviary_history.db
+written by `AviaryProblem.run_aviary_problem`, or from a compact solution file written
+by `save_solution`. The timeseries of each phase are interpolated onto the grid of the
+matching phase of the new problem in normalized time, so the number of segments and
+the transcription order of the phases can change between the two problems.
+"""
+import json
+
+import dymos as dm
+import numpy as np
+import openmdao.api as om
+
+
+def save_solution(prob, filename):
+    """
+    Write the solution of a problem to a compact json file.
+
+    Only the values needed to warm start another problem are written: the time, state
+    and control timeseries of every phase and the values of the design variables.
+
+    Parameters
+    ----------
+    prob : om.Problem
+        The problem that has been run.
+    filename : str or Path
+        Name of the json file.
+    """
+    model = prob.model
+    output_units = _get_output_units(model)
+    names = {}
+
+    for name, meta in model.get_design_vars().items():
+        units = meta['units']
+        if units is None:
+            units = output_units[meta['source']]
+
+        names[name] = units
+
+    for traj_path, traj in _get_trajectories(prob):
+        for phase_name, phase in traj._phases.items():
+            prefix = f'{traj_path}.{phase_name}.timeseries'
+            for name in (phase.time_options['name'], *phase.state_options,
+                         *phase.control_options, *phase.polynomial_control_options):
+                prom_name = f'{prefix}.{name}'
+                if prom_name in output_units:
+                    names[prom_name] = output_units[prom_name]
+
+    solution = {}
+    for name, units in names.items():
+        solution[name] = {
+            'val': np.asarray(prob.get_val(name, units=units, get_remote=True)).tolist(),
+            'units': units,
+        }
+
+    if prob.comm.rank == 0:
+        with open(filename, 'w') as file:
+            json.dump(solution, file, indent=1)
+
+
+def load_solution(filename):
+    """
+    Read a previous solution.
+
+    Parameters
+    ----------
+    filename : str or Path
+        Name of a compact solution file written by `save_solution` (.json), or of a
+        recorder database. The last problem case of the database is used, or the last
+        driver case if no problem case was recorded.
+
+    Returns
+    -------
+    dict
+        Maps the promoted name of each recorded variable to a (val, units) tuple. The
+        units of design variables read from a database are None, meaning the units the
+        design variable was declared with.
+    """
+    filename = str(filename)
+
+    if filename.endswith('.json'):
+        with open(filename) as file:
+            data = json.load(file)
+
+        return {name: (np.array(item['val']), item['units'])
+                for name, item in data.items()}
+
+    reader = om.CaseReader(filename)
+    if 'problem' in reader.list_sources(out_stream=None):
+        source = 'problem'
+    else:
+        source = 'driver'
+
+    case = reader.get_case(reader.list_cases(source, out_stream=None)[-1])
+
+    solution = {meta['prom_name']: (meta['val'], meta['units']) for _, meta in
+                case.list_outputs(prom_name=True, units=True, out_stream=None)}
+
+    # design variables on inputs are only recorded as driver values
+    for name, val in case.get_design_vars(scaled=False).items():
+        solution.setdefault(name, (val, None))
+
+    return solution
+
+
+def set_warm_start(prob, solution):
+    """
+    Set a previous solution as the starting point of a problem.
+
+    The design variables of the problem that are in the previous solution and have the
+    same size are set to their previous values. The states and controls of each phase
+    are interpolated from the timeseries of the phase with the same name, so phases
+    that were added since the previous solution keep their current values and phases
+    that were removed are ignored. Inputs that are not design variables are never
+    changed, so the problem can differ from the previous one in its design inputs.
+    States with a fixed initial value keep it, and their previous history is shifted
+    to start from it.
+
+    This should be called after the initial guesses of the problem have been set.
+
+    Parameters
+    ----------
+    prob : om.Problem
+        The problem to warm start, after setup.
+    solution : dict
+        Maps promoted names to (val, units) tuples, as returned by `load_solution`.
+    """
+    model = prob.model
+    output_units = None
+
+    for name, meta in model.get_design_vars().items():
+        if name in solution:
+            val, units = solution[name]
+            if units is None:
+                units = meta['units']
+            if units is None:
+                if output_units is None:
+                    output_units = _get_output_units(model)
+                units = output_units[meta['source']]
+
+            if np.size(val) == meta['size']:
+                prob.set_val(name, val, units=units)
+
+    for traj_path, traj in _get_trajectories(prob):
+        for phase_name, phase in traj._phases.items():
+            if isinstance(phase, dm.AnalyticPhase):
+                continue
+
+            prefix = f'{traj_path}.{phase_name}'
+            time_name = phase.time_options['name']
+
+            if f'{prefix}.timeseries.{time_name}' not in solution:
+                # phases that are new in this problem keep their initial guesses
+                continue
+
+            time, time_units = solution[f'{prefix}.timeseries.{time_name}']
+            time = np.ravel(time)
+
+            if not phase.time_options['fix_initial']:
+                prob.set_val(f'{prefix}.t_initial', time[0], units=time_units)
+            if not phase.time_options['fix_duration']:
+                prob.set_val(f'{prefix}.t_duration', time[-1] - time[0],
+                             units=time_units)
+
+            # segment boundaries are repeated in the timeseries
+            time, idxs = np.unique(time, return_index=True)
+            if time.size < 2:
+                continue
+
+            for var_type, options in (
+                ('states', phase.state_options),
+                ('controls', phase.control_options),
+                ('polynomial_controls', phase.polynomial_control_options),
+            ):
+                for name in options:
+                    if f'{prefix}.timeseries.{name}' not in solution:
+                        continue
+
+                    val, units = solution[f'{prefix}.timeseries.{name}']
+                    val = phase.interp(name, ys=np.asarray(val)[idxs], xs=time,
+                                       kind='slinear')
+
+                    path = f'{prefix}.{var_type}:{name}'
+                    if var_type == 'states' and options[name]['fix_initial']:
+                        # shift each component of the state to its fixed initial value
+                        initial = np.reshape(prob.get_val(path, units=units),
+                                             (-1,) + val.shape[1:])
+                        val += initial[0] - val[0]
+
+                    prob.set_val(path, val, units=units)
+
+
+def _get_output_units(model):
+    # units of every output of the model, by absolute and by promoted name
+    output_units = {}
+    for abs_name, meta in model.get_io_metadata(
+            iotypes='output', metadata_keys=['units'], get_remote=True,
+            return_rel_names=False).items():
+        output_units[abs_name] = meta['units']
+        output_units.setdefault(meta['prom_name'], meta['units'])
+
+    return output_units
+
+
+def _get_trajectories(prob):
+    # Aviary does not promote trajectories, so their paths are also promoted names.
+    return [(traj.pathname, traj)
+            for traj in prob.model.system_iter(recurse=True, typ=dm.Trajectory)]
+
@@ -61,11 +61,12 @@ class BaseODE(om.Group):
         if alpha_mode is AlphaModes.ROTATION:
             alpha_comp = om.ExecComp(
                 'alpha=rotation_rate*(t_curr-start_rotation)+alpha_init',
-                alpha=dict(val=0., units='deg'),
+                alpha=dict(val=np.zeros(nn), units='deg'),
                 rotation_rate=dict(val=10.0/3.0, units='deg/s'),
-                t_curr=dict(val=0., units='s'),
+                t_curr=dict(val=np.zeros(nn), units='s'),
                 start_rotation=dict(val=0., units='s'),
                 alpha_init=dict(val=0., units='deg'),
+                has_diag_partials=True,
             )
             alpha_comp_inputs = ["rotation_rate", "t_curr", "start_rotation",
                                  ("alpha_init", Aircraft.Wing.INCIDENCE)]
@@ -86,10 +87,11 @@ class BaseODE(om.Group):
         elif alpha_mode is AlphaModes.FUSELAGE_PITCH:
             alpha_comp = om.ExecComp(
                 'alpha=max_fus_angle-gamma+i_wing',
-                alpha=dict(val=0., units='deg'),
+                alpha=dict(val=np.zeros(nn), units='deg'),
                 max_fus_angle=dict(val=0., units='deg'),
-                gamma=dict(val=0., units='deg'),
+                gamma=dict(val=np.zeros(nn), units='deg'),
                 i_wing=dict(val=0., units='deg'),
+                has_diag_partials=True,
             )
             alpha_comp_inputs = [("max_fus_angle", Aircraft.Design.MAX_FUSELAGE_PITCH_ANGLE),
                                  ("gamma", Dynamic.Mission.FLIGHT_PATH_ANGLE),
@@ -125,12 +125,13 @@ class FlightPathODE(BaseODE):
                     'calc_lift',
                     om.ExecComp(
                         'required_lift = weight*cos(alpha + gamma) - thrust*sin(i_wing)',
-                        required_lift={'val': 0, 'units': 'lbf'},
-                        weight={'val': 0, 'units': 'lbf'},
-                        thrust={'val': 0, 'units': 'lbf'},
-                        alpha={'val': 0, 'units': 'rad'},
-                        gamma={'val': 0, 'units': 'rad'},
+                        required_lift={'val': np.zeros(nn), 'units': 'lbf'},
+                        weight={'val': np.zeros(nn), 'units': 'lbf'},
+                        thrust={'val': np.zeros(nn), 'units': 'lbf'},
+                        alpha={'val': np.zeros(nn), 'units': 'rad'},
+                        gamma={'val': np.zeros(nn), 'units': 'rad'},
                         i_wing={'val': 0, 'units': 'rad'},
+                        has_diag_partials=True,
                     ),
                     promotes_inputs=[
                         'weight',
@@ -168,12 +169,13 @@ class FlightPathODE(BaseODE):
                     # TODO fix engines not providing thrust in the right direction
                     # + weight*sin(alpha + gamma)
                     'required_thrust = ( drag  ) / cos(i_wing)',
-                    required_thrust={'val': 0, 'units': 'lbf'},
-                    drag={'val': 0, 'units': 'lbf'},
+                    required_thrust={'val': np.zeros(nn), 'units': 'lbf'},
+                    drag={'val': np.zeros(nn), 'units': 'lbf'},
                     # weight={'val': 0, 'units': 'lbf'},
                     # alpha={'val': 0, 'units': 'rad'},
                     # gamma={'val': 0, 'units': 'rad'},
                     i_wing={'val': 0, 'units': 'rad'},
+                    has_diag_partials=True,
                 ),
                 promotes_inputs=[
                     ('drag', Dynamic.Mission.DRAG),
@@ -185,7 +187,7 @@ class FlightPathODE(BaseODE):
                 promotes_outputs=['required_thrust']
             )
 
-            self.AddThrottleControl(prop_group=prop_group,
+            self.AddThrottleControl(prop_group=prop_group, num_nodes=nn,
                                     atol=1e-8, print_level=print_level)
 
         self.add_subsystem(
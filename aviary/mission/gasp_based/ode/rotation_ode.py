@@ -46,11 +46,12 @@ class RotationODE(BaseODE):
         if analysis_scheme is AnalysisScheme.SHOOTING:
             alpha_comp = om.ExecComp(
                 'alpha=rotation_rate*(t_curr-start_rotation)+alpha_init',
-                alpha=dict(val=0., units='deg'),
+                alpha=dict(val=np.zeros(nn), units='deg'),
                 rotation_rate=dict(val=10.0/3.0, units='deg/s'),
-                t_curr=dict(val=0., units='s'),
+                t_curr=dict(val=np.zeros(nn), units='s'),
                 start_rotation=dict(val=0., units='s'),
                 alpha_init=dict(val=0., units='deg'),
+                has_diag_partials=True,
             )
             alpha_comp_inputs = ["rotation_rate", "t_curr", "start_rotation",
                                  ("alpha_init", Aircraft.Wing.INCIDENCE)]
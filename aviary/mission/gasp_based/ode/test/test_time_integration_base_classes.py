@@ -0,0 +1,274 @@
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from aviary.mission.gasp_based.ode.time_integration_base_classes import (
+    BatchSimulation, SGMTrajBase, SimuPyProblem)
+
+
+class DecayODE(om.ExplicitComponent):
+    def initialize(self):
+        self.options.declare('num_nodes', default=1, types=int)
+
+    def setup(self):
+        nn = self.options['num_nodes']
+        self.add_input('t_curr', val=np.zeros(nn), units='s')
+        self.add_input('x', val=np.ones(nn), units='m')
+        self.add_input('k', val=np.ones(nn), units='1/s')
+        self.add_output('x_rate', val=np.zeros(nn), units='m/s')
+        self.add_output('y', val=np.zeros(nn), units='m')
+        self.num_computes = 0
+
+    def compute(self, inputs, outputs):
+        self.num_computes += 1
+        outputs['x_rate'] = -inputs['k'] * inputs['x']
+        outputs['y'] = inputs['x'] + inputs['t_curr']
+
+
+class SimuPyProblemCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ode = DecayODE()
+        self.problem = SimuPyProblem(
+            self.ode,
+            states=['x'],
+            parameters=['k'],
+            outputs=['y'],
+        )
+        self.problem.add_trigger('x', 0.5)
+        self.problem.prepare_to_integrate(0.0, np.array([1.0]))
+
+    def test_cache_hits(self):
+        problem = self.problem
+        computes = self.ode.num_computes
+
+        rate = problem.state_equation_function(1.0, np.array([2.0]))
+        assert_near_equal(rate, [-2.0])
+        self.assertEqual(self.ode.num_computes, computes + 1)
+
+        # the model is already evaluated at this point
+        assert_near_equal(problem.output_equation_function(1.0, np.array([2.0])), [3.0])
+        assert_near_equal(problem.event_equation_function(1.0, np.array([2.0])), [1.5])
+        self.assertEqual(self.ode.num_computes, computes + 1)
+
+        problem.state_equation_function(2.0, np.array([3.0]))
+        self.assertEqual(self.ode.num_computes, computes + 2)
+
+        # returning to an earlier point does not run the model
+        hits = problem.cache_hits
+        rate = problem.state_equation_function(1.0, np.array([2.0]))
+        assert_near_equal(rate, [-2.0])
+        self.assertEqual(self.ode.num_computes, computes + 2)
+        self.assertEqual(problem.cache_hits, hits + 1)
+
+        # but the model is run when its values are requested
+        assert_near_equal(problem.get_val('y'), [3.0])
+        self.assertEqual(self.ode.num_computes, computes + 3)
+
+    def test_parameter_change(self):
+        problem = self.problem
+
+        assert_near_equal(problem.state_equation_function(1.0, np.array([2.0])), [-2.0])
+        problem.set_val('k', 3.0)
+        misses = problem.cache_misses
+        assert_near_equal(problem.state_equation_function(1.0, np.array([2.0])), [-6.0])
+        self.assertEqual(problem.cache_misses, misses + 1)
+
+        # setting the original value again recovers the cached result
+        problem.set_val('k', 1.0)
+        assert_near_equal(problem.state_equation_function(1.0, np.array([2.0])), [-2.0])
+        self.assertEqual(problem.cache_misses, misses + 1)
+
+    def test_cache_size(self):
+        problem = self.problem
+        problem.cache_size = 2
+        problem.clear_cache()
+
+        for t in range(4):
+            problem.state_equation_function(float(t), np.array([1.0]))
+        self.assertEqual(len(problem._cache), 2)
+
+        misses = problem.cache_misses
+        problem.state_equation_function(0.0, np.array([1.0]))
+        self.assertEqual(problem.cache_misses, misses + 1)
+
+
+class SimuPyProblemVectorTestCase(unittest.TestCase):
+    def test_unit_conversion(self):
+        problem = SimuPyProblem(
+            DecayODE(),
+            states={'x': {'units': 'ft', 'rate': 'x_rate', 'rate_units': 'ft/s'}},
+            parameters={'k': '1/min'},
+            outputs={'y': 'ft'},
+        )
+
+        problem.state = np.array([3.0])
+        assert_near_equal(problem.get_val('x', units='m'), [0.9144], 1e-12)
+        assert_near_equal(problem.state, [3.0], 1e-12)
+        assert_near_equal(problem.parameter, [60.0], 1e-12)
+
+        problem.time = 2.0
+        problem.compute()
+        assert_near_equal(problem.state_rate, [-3.0], 1e-12)
+        assert_near_equal(problem.output, [3.0 + 2.0 / 0.3048], 1e-12)
+
+
+
+class BatchSimulationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.problem = SimuPyProblem(
+            DecayODE(num_nodes=3),
+            states=['x'],
+            parameters=['k'],
+            outputs=['y'],
+        )
+        self.problem.add_trigger('x', 0.5)
+
+    def test_events(self):
+        problem = self.problem
+        k = np.array([1.0, 2.0, 0.5])
+        x0 = np.array([1.0, 2.0, 4.0])
+        problem.set_val('k', k)
+
+        batch = BatchSimulation(problem, rtol=1e-9, atol=1e-12)
+        results = batch.simulate(0.0, x0[:, np.newaxis])
+
+        # each trajectory ends when its own state reaches the trigger
+        for res, k_i, x0_i in zip(results, k, x0):
+            t_event = np.log(2.0 * x0_i) / k_i
+            assert_near_equal(res.t[0], 0.0)
+            assert_near_equal(res.t[-1], t_event, 1e-8)
+            assert_near_equal(res.x[:, 0], x0_i * np.exp(-k_i * res.t), 1e-7)
+            assert_near_equal(res.y[-1], [0.5 + t_event], 1e-8)
+            assert_near_equal(res.e[-1], [0.0], 1e-8)
+
+        # the trajectories take their own steps, but each stage runs the model once
+        # for all of them, so the number of runs is set by the longest trajectory
+        num_steps = [res.t.size - 1 for res in results]
+        self.assertEqual(len(set(num_steps)), 3)
+        self.assertLess(batch.num_evaluations, 7 * max(num_steps))
+
+    def test_final_time(self):
+        problem = self.problem
+        problem.set_val('k', 1.0)
+
+        results = BatchSimulation(problem).simulate(0.0, np.array([2.0]), tf=0.5)
+
+        for res in results:
+            assert_near_equal(res.t[-1], 0.5)
+            assert_near_equal(res.x[-1], [2.0 * np.exp(-0.5)], 1e-6)
+
+    def test_matches_simupy(self):
+        problem = SimuPyProblem(
+            DecayODE(),
+            states=['x'],
+            parameters=['k'],
+            outputs=['y'],
+        )
+        problem.add_trigger('x', 0.5)
+        problem.set_val('k', 2.0)
+        problem.initial_condition = np.array([3.0])
+        res = problem.simulate((0.0, 10.0))
+
+        batch_res, = BatchSimulation(problem).simulate(0.0, np.array([3.0]))
+
+        assert_near_equal(batch_res.t[-1], res.t[-1], 1e-4)
+        assert_near_equal(batch_res.x[-1], res.x[-1], 1e-4)
+
+    def test_custom_events(self):
+        class CustomEvents(SimuPyProblem):
+            def event_equation_function(self, t, x):
+                return x
+
+        problem = CustomEvents(DecayODE(num_nodes=2), states=['x'])
+
+        with self.assertRaises(ValueError):
+            BatchSimulation(problem)
+
+
+
+class DecayWithSwitch(SimuPyProblem):
+    # the decay rate is halved when y = x + t first falls to 1.8, and the phase ends
+    # when x reaches 0.5
+    def __init__(self, **kwargs):
+        super().__init__(DecayODE(), states=['x'], parameters=['k'], outputs=['y'],
+                         **kwargs)
+        self.add_trigger('x', 0.5)
+        self.add_trigger('y', 'switch', units='m')
+        self.switch = 1.8
+
+    def update_equation_function(self, t, x, event_channels=None):
+        if 0 in event_channels:
+            self.output_nan = True
+        else:
+            self.set_val('k', 0.5 * self.get_val('k'))
+            self.switch = -np.inf
+        return x
+
+
+class RKIntegratorTestCase(unittest.TestCase):
+    def test_events(self):
+        for integrator_options in ({}, {'step': 0.02}):
+            problem = SimuPyProblem(
+                DecayODE(),
+                states=['x'],
+                parameters=['k'],
+                outputs=['y'],
+                integrator='rk',
+                integrator_options=integrator_options,
+            )
+            problem.add_trigger('x', 0.5)
+            problem.set_val('k', 2.0)
+            problem.initial_condition = np.array([3.0])
+            res = problem.simulate((0.0, 10.0))
+
+            t_event = np.log(6.0) / 2.0
+            assert_near_equal(res.t[-1], t_event, 1e-6)
+            assert_near_equal(res.x[-1], [0.5], 1e-6)
+            assert_near_equal(res.y[-1], [0.5 + t_event], 1e-6)
+            if 'step' in integrator_options:
+                steps = np.diff(res.t[:-1])
+                assert_near_equal(steps, np.full_like(steps, 0.02), 1e-10)
+
+    def test_update(self):
+        results = {}
+        for integrator in ('simupy', 'rk'):
+            problem = DecayWithSwitch(integrator=integrator)
+            problem.set_val('k', 1.0)
+            problem.initial_condition = np.array([2.0])
+            results[integrator] = res = problem.simulate((0.0, 10.0))
+
+        # the switch is at t1 = 0.2639..., after which x = 2 exp(-t1 - (t - t1) / 2)
+        t1 = 0.263901271594
+        t_event = 2.0 * np.log(4.0) - t1
+        assert_near_equal(results['rk'].t[-1], t_event, 1e-6)
+        assert_near_equal(results['rk'].x[-1], [0.5], 1e-6)
+        assert_near_equal(results['rk'].t[-1], results['simupy'].t[-1], 1e-4)
+
+    def test_unknown_integrator(self):
+        with self.assertRaises(ValueError):
+            SimuPyProblem(DecayODE(), states=['x'], integrator='euler')
+
+
+class AdjointExecutorTestCase(unittest.TestCase):
+    def test_executor_reuse(self):
+        traj = SGMTrajBase(adjoint_executor='thread')
+
+        executor = traj._get_adjoint_executor(2)
+        self.assertIs(traj._get_adjoint_executor(2), executor)
+
+        # a different number of workers needs a new pool
+        other_executor = traj._get_adjoint_executor(3)
+        self.assertIsNot(other_executor, executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(abs, -1)
+
+        traj.cleanup()
+        self.assertIsNone(traj._adjoint_executor)
+        with self.assertRaises(RuntimeError):
+            other_executor.submit(abs, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+from openmdao.utils.assert_utils import assert_near_equal
+
+from aviary.mission.gasp_based.ode.test.test_time_integration_base_classes import \
+    DecayODE
+from aviary.mission.gasp_based.ode.time_integration_base_classes import (
+    SGMTrajBase, SimuPyProblem)
+from aviary.mission.gasp_based.ode.time_integration_trajectory import DenseTrajectory
+
+
+class DenseTrajectoryTestCase(unittest.TestCase):
+    def setUp(self):
+        problem = SimuPyProblem(
+            DecayODE(),
+            states=['x'],
+            parameters=['k'],
+            outputs=['y'],
+        )
+        problem.phase_name = 'decay'
+        problem.add_trigger('x', 0.2)
+        problem.initial_condition = np.array([1.0])
+        with warnings.catch_warnings():
+            # simulations end with a NaN output after the event
+            warnings.simplefilter('ignore', category=UserWarning)
+            self.res = problem.simulate((0.0, 10.0))
+        self.traj = DenseTrajectory.from_simulation([self.res], [problem])
+
+    def test_evaluate(self):
+        traj = self.traj
+        t = np.linspace(traj.t_initial, traj.t_final, 50)
+
+        assert_near_equal(traj.t_final, -np.log(0.2), 1e-4)
+        assert_near_equal(traj.state(self.res.t), self.res.x, 1e-12)
+        assert_near_equal(traj.state(t)[:, 0], np.exp(-t), 1e-4)
+        assert_near_equal(traj.state_rate(t)[:, 0], -np.exp(-t), 1e-3)
+        assert_near_equal(traj.get_val('x', t, units='cm'), 100.0 * np.exp(-t), 1e-4)
+        # the outputs are interpolated linearly, the last one is NaN after the event
+        assert_near_equal(traj.get_val('y', self.res.t[:-1]), self.res.y[:-1, 0], 1e-12)
+
+    def test_save_load(self):
+        t = np.linspace(self.traj.t_initial, self.traj.t_final, 20)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'traj.npz')
+            self.traj.save(filename)
+            traj = DenseTrajectory.load(filename)
+
+        self.assertEqual(traj.phase_names, ['decay'])
+        self.assertEqual(traj.state_units, ['m'])
+        assert_near_equal(traj.state(t), self.traj.state(t), 1e-15)
+        assert_near_equal(traj.output(t), self.traj.output(t), 1e-15)
+
+    def test_control_rates(self):
+        # SimuPy feeds the output y = x + t back as the control k
+        problem = SimuPyProblem(
+            DecayODE(),
+            states=['x'],
+            controls=['k'],
+            outputs=['y'],
+        )
+        problem.phase_name = 'decay'
+        problem.add_trigger('x', 0.01)
+        problem.initial_condition = np.array([1.0])
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=UserWarning)
+            res = problem.simulate((0.0, 1.0))
+        traj = DenseTrajectory.from_simulation([res], [problem])
+
+        x = res.x[:, 0]
+        assert_near_equal(traj.state_rate(res.t)[:, 0], -(x + res.t) * x, 1e-12)
+
+
+class RKDenseTrajectoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.problem = problem = SimuPyProblem(
+            DecayODE(),
+            states=['x'],
+            parameters=['k'],
+            outputs=['y'],
+            integrator='rk',
+        )
+        problem.phase_name = 'decay'
+        problem.add_trigger('x', 0.2)
+        problem.initial_condition = np.array([1.0])
+        self.res = problem.simulate((0.0, 10.0))
+        self.traj = DenseTrajectory.from_simulation([self.res], [problem])
+
+    def test_step_polynomials(self):
+        # the states are the continuous extension of the steps of the integrator
+        traj = self.traj
+        t = np.linspace(traj.t_initial, traj.t_final, 200)
+
+        self.assertEqual(traj.state_coeffs.shape, (self.res.t.size - 1, 5, 1))
+        assert_near_equal(traj.state(self.res.t), self.res.x, 1e-12)
+        assert_near_equal(traj.state(t)[:, 0], np.exp(-t), 1e-5)
+        assert_near_equal(traj.state_rate(t)[:, 0], -np.exp(-t), 1e-4)
+
+    def test_reference_trajectory(self):
+        first_step = self.res.t[1] - self.res.t[0]
+        self.assertEqual(self.traj.initial_step(0), first_step)
+        self.assertIsNone(self.traj.initial_step(1))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'traj.npz')
+            self.traj.save(filename)
+            sgm_traj = SGMTrajBase()
+            sgm_traj.set_reference_trajectory(filename)
+
+        reference = sgm_traj._reference_trajectory
+        self.assertEqual(reference.initial_step(0), first_step)
+
+        # a larger first step, taken from the reference, is kept by the integrator
+        res = self.problem.simulate((0.0, 10.0), first_step=2.0 * first_step)
+        self.assertEqual(res.t[1] - res.t[0], 2.0 * first_step)
+
+
+if __name__ == '__main__':
+    unittest.main()
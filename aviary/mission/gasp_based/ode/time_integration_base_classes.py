@@ -1,11 +1,17 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import numpy as np
 import openmdao.api as om
 from openmdao.utils import units
 from scipy import interpolate
-from simupy.block_diagram import DEFAULT_INTEGRATOR_OPTIONS, SimulationMixin
+from simupy.block_diagram import (
+    DEFAULT_INTEGRATOR_OPTIONS, SimulationMixin, SimulationResult)
 from simupy.systems import DynamicalSystem
 
 from aviary.mission.gasp_based.ode.params import ParamPort
+from aviary.mission.gasp_based.ode.time_integration_trajectory import DenseTrajectory
 from aviary.variable_info.enums import Verbosity
 from aviary.variable_info.variable_meta_data import _MetaData
 
@@ -46,6 +52,168 @@ class event_trigger():
         self.channel_name = channel_name
 
 
+class _VectorMap():
+    """
+    Location of a set of named variables in the output vector of the model of a
+    problem, along with the conversions between the units stored there and the
+    requested units. Values of all variables are read with a single gather and
+    written with a single scatter. Variables that can not be mapped directly (e.g.
+    inputs using src_indices) go through get_val and set_val instead, as do all
+    variables of problems running on more than one process.
+
+    The locations are checked against get_val once, when the map is built, and the
+    map falls back to get_val and set_val for every variable if they do not agree.
+
+    variables: a dictionary of the form {name:units}
+    """
+
+    def __init__(self, prob, variables):
+        self.prob = prob
+        model = prob.model
+        input_meta = model.get_io_metadata(iotypes='input', return_rel_names=False)
+        output_meta = model.get_io_metadata(
+            iotypes='output', metadata_keys=['units', 'distributed'],
+            return_rel_names=False)
+        src_indexed = {meta['prom_name'] for meta in input_meta.values()
+                       if meta['has_src_indices']}
+
+        # the output vector only holds the local part of the model under MPI
+        if prob.comm.size > 1:
+            slices = {}
+        else:
+            slices = model._outputs.get_slice_dict()
+
+        self.size = len(variables)
+        self.fallback = []
+        mapped = []
+        sources = []
+        first = []
+        lengths = []
+        elements = []
+        owners = []
+        get_conv = []
+        set_conv = []
+        for idx, (name, var_units) in enumerate(variables.items()):
+            src = model.get_source(name)
+            if (
+                src not in slices
+                or output_meta[src]['distributed']
+                or name in src_indexed
+            ):
+                self.fallback.append((idx, name, var_units))
+                continue
+            src_slice = slices[src]
+            src_units = output_meta[src]['units']
+            if var_units is None or src_units is None:
+                get_conv.append((1.0, 0.0))
+                set_conv.append((1.0, 0.0))
+            else:
+                get_conv.append(units.unit_conversion(src_units, var_units))
+                set_conv.append(units.unit_conversion(var_units, src_units))
+            mapped.append(idx)
+            sources.append(src)
+            first.append(src_slice.start)
+            lengths.append(src_slice.stop - src_slice.start)
+            elements.extend(range(src_slice.start, src_slice.stop))
+            owners.extend([len(mapped) - 1] * (src_slice.stop - src_slice.start))
+
+        self.mapped = np.array(mapped, dtype=int)
+        self.first = np.array(first, dtype=int)
+        self.lengths = np.array(lengths, dtype=int)
+        self.elements = np.array(elements, dtype=int)
+        self.owners = np.array(owners, dtype=int)
+        self.get_scale, self.get_offset = np.array(get_conv).reshape(-1, 2).T
+        self.set_scale, self.set_offset = np.array(set_conv).reshape(-1, 2).T
+
+        if not self._check_layout(sources):
+            self.fallback = [(idx, name, var_units) for idx, (name, var_units)
+                             in enumerate(variables.items())]
+            self.mapped = self.first = self.lengths = np.zeros(0, dtype=int)
+            self.elements = self.owners = np.zeros(0, dtype=int)
+            self.get_scale = self.get_offset = np.zeros(0)
+            self.set_scale = self.set_offset = np.zeros(0)
+
+    def _check_layout(self, sources):
+        """
+        Write distinct values to the mapped elements of the output vector and check
+        that get_val reads each of them back from the expected source.
+        """
+        if not sources:
+            return True
+
+        data = self.prob.model._outputs.asarray()
+        saved = data[self.elements].copy()
+        probe = np.arange(1., self.elements.size + 1.)
+        data[self.elements] = probe
+
+        try:
+            start = 0
+            for src, length in zip(sources, self.lengths):
+                val = np.ravel(self.prob.get_val(src))
+                if val.size != length or \
+                        not np.array_equal(val, probe[start:start + length]):
+                    return False
+                start += length
+        finally:
+            data[self.elements] = saved
+
+        return True
+
+    def get(self):
+        """
+        Return the first element of each variable, in the requested units.
+        """
+        values = np.empty(self.size)
+        data = self.prob.model._outputs.asarray()
+        values[self.mapped] = (data[self.first] + self.get_offset) * self.get_scale
+        for idx, name, var_units in self.fallback:
+            values[idx] = self.prob.get_val(name, units=var_units)[0]
+        return values
+
+    def set(self, values):
+        """
+        Set all elements of each variable to the given values, in the requested units.
+        """
+        values = np.asarray(values)
+        data = self.prob.model._outputs.asarray()
+        src_values = (values[self.mapped] + self.set_offset) * self.set_scale
+        data[self.elements] = src_values[self.owners]
+        for idx, name, var_units in self.fallback:
+            self.prob.set_val(name, values[idx], units=var_units)
+
+    def _node_indices(self, num_nodes):
+        # variables that are not sized by the number of nodes repeat their last element
+        nodes = np.minimum(np.arange(num_nodes), self.lengths[:, np.newaxis] - 1)
+        return self.first[:, np.newaxis] + nodes
+
+    def get_nodes(self, num_nodes):
+        """
+        Return the values of each variable at every node, in the requested units, as an
+        array of shape (number of variables, num_nodes).
+        """
+        values = np.empty((self.size, num_nodes))
+        data = self.prob.model._outputs.asarray()
+        values[self.mapped] = (
+            (data[self._node_indices(num_nodes)] + self.get_offset[:, np.newaxis])
+            * self.get_scale[:, np.newaxis])
+        for idx, name, var_units in self.fallback:
+            values[idx] = self.prob.get_val(name, units=var_units)
+        return values
+
+    def set_nodes(self, values):
+        """
+        Set the values of each variable at every node, in the requested units, from an
+        array of shape (number of variables, number of nodes).
+        """
+        values = np.asarray(values)
+        data = self.prob.model._outputs.asarray()
+        data[self._node_indices(values.shape[1])] = (
+            (values[self.mapped] + self.set_offset[:, np.newaxis])
+            * self.set_scale[:, np.newaxis])
+        for idx, name, var_units in self.fallback:
+            self.prob.set_val(name, values[idx], units=var_units)
+
+
 class SimuPyProblem(SimulationMixin):
     # Subproblem used as a basis for forward in time integration phases.
     def __init__(
@@ -69,7 +237,9 @@ class SimuPyProblem(SimulationMixin):
         verbosity=Verbosity.QUIET,
         max_allowable_time=1_000_000,
         adjoint_int_opts=DEFAULT_INTEGRATOR_OPTIONS.copy(),
-
+        cache_size=1000,
+        integrator='simupy',
+        integrator_options=None,
     ):
         """
         states: a dictionary of the form {state_name:{'units':unit, 'rate':state_rate_name, 'rate_units':state_rate_units}}
@@ -82,13 +252,28 @@ class SimuPyProblem(SimulationMixin):
         include_state_outputs : automatically add the state to the input
         works well for auto-parsed naming, does not check for duplication before adding
         states, parameters, outputs, and controls can also be input as a list of keys for the dictionary
+        cache_size: maximum number of model evaluations, keyed on the exact time, state,
+        control and parameter values, that are kept to avoid re-running the model at
+        points that were already evaluated. Set to 0 to disable the cache.
+        integrator: engine used by simulate, either 'simupy' for the SimuPy integrators
+        or 'rk' for the built-in Dormand-Prince 5(4) integrator, with adaptive steps or,
+        if integrator_options has a 'step', fixed steps
+        integrator_options: options of the 'rk' integrator (rtol, atol, step, max_step,
+        first_step, max_steps, event_tol), see BatchSimulation
         """
+        if integrator not in ('simupy', 'rk'):
+            raise ValueError(f"Unknown integrator '{integrator}', expected 'simupy' "
+                             "or 'rk'")
 
         default_om_list_args = dict(prom_name=True, val=False,
                                     out_stream=None, units=True)
 
         self.verbosity = verbosity
         self.max_allowable_time = max_allowable_time
+        if integrator_options is None:
+            integrator_options = {}
+        self.integrator = integrator
+        self.integrator_options = integrator_options
         self.adjoint_int_opts = adjoint_int_opts
         self.adjoint_int_opts['nsteps'] = 5000
         self.adjoint_int_opts['name'] = "dop853"
@@ -227,6 +412,33 @@ class SimuPyProblem(SimulationMixin):
         self.dim_output = len(outputs)
         self.dim_input = len(controls)
         self.dim_parameters = len(parameters)
+
+        # locations of the variables in the model vectors, for bulk reads and writes
+        self._time_map = None if time_independent else _VectorMap(prob, {t_name: None})
+        self._state_map = _VectorMap(
+            prob, {name: data['units'] for name, data in states.items()})
+        self._state_rate_map = _VectorMap(
+            prob, {data['rate']: data['rate_units'] for data in states.values()})
+        self._control_map = _VectorMap(prob, controls)
+        self._parameter_map = _VectorMap(prob, parameters)
+        self._output_map = _VectorMap(prob, outputs)
+        self._event_map = None
+
+        # LRU cache of model evaluations, see _evaluate
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        # key of the point the model was last run at, and the point the model
+        # should be at if that evaluation was skipped because of a cache hit
+        self._evaluated_key = None
+        self._pending_point = None
+        self._control_value = self.control
+        self._parameter_values = {
+            parameter_name: self.prob.get_val(parameter_name).tobytes()
+            for parameter_name in parameters
+        }
+        self._parameter_key = None
         # TODO: add defensive checks to make sure dimensions match in both setup and
         # calls
 
@@ -241,34 +453,33 @@ class SimuPyProblem(SimulationMixin):
 
     @property
     def time(self):
-        return self.prob.get_val(self.t_name)[0]
+        self._sync()
+        if self._time_map is None:
+            return self.prob.get_val(self.t_name)[0]
+        return self._time_map.get()[0]
 
     @time.setter
     def time(self, value):
         if self.time_independent or self.time == value:
             return
-        self.prob.set_val(self.t_name, value)
+        self._evaluated_key = None
+        self._time_map.set([value])
 
     @property
     def state(self):
-        return np.array(
-            [
-                self.prob.get_val(state_name, units=state_data['units'])[0]
-                for state_name, state_data in self.states.items()
-            ]
-        )
+        self._sync()
+        return self._state_map.get()
 
     @state.setter
     def state(self, value):
         if np.all(self.state == value):
             return
-        for state_name, elem_val in zip(
-            self.states.keys(), value
-        ):
-            self.prob.set_val(state_name, elem_val,
-                              units=self.states[state_name]['units'])
+        self._evaluated_key = None
+        self._state_map.set(value)
 
     def compute_along_traj(self, ts, xs):
+        self._sync()
+        self._evaluated_key = None
         self.prob.set_val(self.t_name, ts)
         for state_name, elem_val in zip(self.states.keys(), xs.T):
             self.prob.set_val(state_name, elem_val,
@@ -278,12 +489,8 @@ class SimuPyProblem(SimulationMixin):
 
     @property
     def control(self):
-        return np.array(
-            [
-                self.prob.get_val(control_name, units=unit)[0]
-                for control_name, unit in self.controls.items()
-            ]
-        )
+        self._sync()
+        return self._control_map.get()
 
     @control.setter
     def control(self, value):
@@ -291,82 +498,160 @@ class SimuPyProblem(SimulationMixin):
             value = np.array([])
         if (self.control.size == value.size) and np.all(self.control == value):
             return
-        for control_name, elem_val in zip(
-            self.controls, value
-        ):
-            self.prob.set_val(control_name, elem_val, units=self.controls[control_name])
+        self._evaluated_key = None
+        self._control_map.set(value)
+        self._control_value = self.control
 
     @property
     def parameter(self):
-        return np.array(
-            [
-                self.prob.get_val(parameter_name, units=unit)[0]
-                for parameter_name, unit in self.parameters.items()
-            ]
-        )
+        return self._parameter_map.get()
 
     @parameter.setter
     def parameter(self, value):
         if np.all(self.parameter == value):
             return
-        for parameter_name, elem_val in zip(
-            self.paramaters, value
+        for (parameter_name, unit), elem_val in zip(
+            self.parameters.items(), value
         ):
-            self.prob.set_val(parameter_name, elem_val)
+            self.set_val(parameter_name, elem_val, units=unit)
 
     @property
     def state_rate(self):
-        return np.array(
-            [
-                self.prob.get_val(state_data['rate'], units=state_data['rate_units'])[0]
-                for _, state_data in self.states.items()
-            ]
-        )
+        self._sync()
+        return self._state_rate_map.get()
 
     @property
     def output(self):
-        return np.array(
-            [
-                self.prob.get_val(output_name, units=unit)[0]
-                for output_name, unit in self.outputs.items()
-            ]
-        )
+        self._sync()
+        return self._output_map.get()
 
     @property
     def events(self):
-        return np.array(
-            [
-                self.prob.get_val(event_name, units=unit)[0]
-                for event_name, unit in zip(self.event_names, self.event_units)
-            ]
-        )
+        self._sync()
+        # event names are set by the subclasses after setup
+        if self._event_map is None:
+            self._event_map = _VectorMap(
+                self.prob, dict(zip(self.event_names, self.event_units)))
+        return self._event_map.get()
 
     @property
     def compute(self):
-        # TODO: create cache -- t, x (optionally u) as hash
-        # I guess just set_val for every input and output?
-        # for compute_totals, force run_model. anywhere else that needs forced
-        # run_model?
         return self.prob.run_model
 
     @property
     def compute_totals(self):
+        # derivatives need the model to be evaluated at the current point
+        self._sync()
         return self.prob.compute_totals
 
-    def state_equation_function(self, t, x, u=None):
+    def clear_cache(self):
+        """
+        Discard all cached model evaluations.
+        """
+        self._cache.clear()
+
+    def _cache_key(self, t, x, u):
+        if self._parameter_key is None:
+            self._parameter_key = b''.join(self._parameter_values.values())
+        return (
+            None if self.time_independent else float(t),
+            np.asarray(x, dtype=float).tobytes(),
+            u.tobytes(),
+            self._parameter_key,
+        )
+
+    def _run_at(self, key, t, x, u):
+        # run the model at (t, x, u) unless that is where it was last run
+        self._pending_point = None
+        if key == self._evaluated_key:
+            return
         self.time = t
         self.state = x
         self.control = u
         self.compute()
-        return self.state_rate
+        self.cache_misses += 1
+        self._evaluated_key = key
+
+    def _sync(self):
+        # bring the model to the last requested point if running it there was
+        # skipped because of a cache hit
+        if self._pending_point is not None:
+            self._run_at(*self._pending_point)
+
+    def _evaluate(self, quantity, t, x, u, get_value):
+        """
+        Return quantity at time t, state x and control u. The model is only run
+        if quantity was not already computed at that point, or cached from an
+        earlier evaluation with the same parameter values.
+        """
+        if u is None or np.size(u) == 0 or self.dim_input == 0:
+            u = self._control_value
+        else:
+            u = np.array(u, dtype=float)
+        key = self._cache_key(t, x, u)
+
+        entry = self._cache.get(key)
+        if entry is not None and quantity in entry:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            self._control_value = u
+            if key != self._evaluated_key:
+                self._pending_point = (key, t, np.array(x, dtype=float), u)
+            return entry[quantity].copy()
+
+        self._run_at(key, t, x, u)
+        value = get_value()
+
+        if self.cache_size > 0:
+            if entry is None:
+                entry = self._cache[key] = {}
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+            entry[quantity] = value.copy()
+
+        return value
+
+    def state_equation_function(self, t, x, u=None):
+        return self._evaluate('state_rate', t, x, u, lambda: self.state_rate)
+
+    def sample_state_rates(self, res):
+        """
+        Return the state rates at every sample of a result of simulate, an array of
+        shape (number of samples, number of states). Each rate is evaluated with the
+        control the sample was integrated with: SimuPy passes the outputs of a
+        standalone system as its input, while the 'rk' integrator uses the control set
+        on the problem.
+        """
+        if self.dim_input and self.integrator == 'simupy':
+            controls = res.y
+        else:
+            controls = [None] * res.t.size
+
+        return np.array([
+            self.state_equation_function(t, x, u)
+            for t, x, u in zip(res.t, res.x, controls)
+        ]).reshape(res.t.size, -1)
 
     def output_equation_function(self, t, x):
         if self.output_nan:
             return np.ones(self.dim_output) * np.nan
-        self.time = t
-        self.state = x
-        self.compute()
-        return self.output
+        return self._evaluate('output', t, x, None, lambda: self.output)
+
+    def simulate(self, tspan, *args, first_step=None, **kwargs):
+        if self.integrator == 'simupy':
+            return super().simulate(tspan, *args, **kwargs)
+
+        t0, tf = tspan[0], tspan[-1]
+        x0 = np.atleast_1d(np.asarray(self.initial_condition, dtype=float))
+        self.prepare_to_integrate(t0, x0)
+        options = dict(self.integrator_options)
+        # a first step given here (from a reference trajectory) only replaces the
+        # estimate of the integrator
+        if first_step is not None and options.get('first_step') is None:
+            options['first_step'] = first_step
+        return _ProblemSimulation(self, **options).simulate(t0, x0, tf)
 
     def prepare_to_integrate(self, t0, x0):
         self.output_nan = False
@@ -392,18 +677,27 @@ class SimuPyProblem(SimulationMixin):
         )
         self.event_channel_names.append(channel_name)
         self.num_events = len(self.event_channel_names)
+        self.clear_cache()
 
     def clear_triggers(self):
         self.triggers = []
         self.event_channel_names = []
         self.num_events = 0
+        self.clear_cache()
 
     def event_equation_function(self, t, x):
-        self.output_equation_function(t, x)
-        self.compute()
-        event_values = [self.evaluate_trigger(trigger) for trigger in self.triggers]
-        # print(event_values)
-        return np.array(event_values)
+        # trigger values that are attributes are not part of the cache key, so they
+        # are stored along with the event values
+        trigger_attrs = tuple(
+            np.asarray(getattr(self, trigger.value)).tobytes()
+            for trigger in self.triggers
+            if isinstance(trigger.value, str) and hasattr(self, trigger.value)
+        )
+        return self._evaluate(
+            ('events',) + trigger_attrs, t, x, None,
+            lambda: np.array([self.evaluate_trigger(trigger)
+                              for trigger in self.triggers]),
+        )
 
     def evaluate_trigger(self, trigger: event_trigger):
         trigger_value = trigger.value
@@ -416,13 +710,701 @@ class SimuPyProblem(SimulationMixin):
         current_value = self.get_val(trigger.state, units=trigger.units).squeeze()
         return current_value - trigger_value
 
-    @property
-    def get_val(self):
-        return self.prob.get_val
+    def get_val(self, *args, **kwargs):
+        self._sync()
+        return self.prob.get_val(*args, **kwargs)
+
+    def set_val(self, name, *args, **kwargs):
+        self._sync()
+        self.prob.set_val(name, *args, **kwargs)
+        if name in self._parameter_values:
+            value = self.prob.get_val(name).tobytes()
+            if value != self._parameter_values[name]:
+                self._parameter_values[name] = value
+                self._parameter_key = None
+                self._evaluated_key = None
+        else:
+            self._evaluated_key = None
+            if name in self.controls:
+                self._control_value = self.control
+            elif name not in self.states and name != self.t_name:
+                # the value of this input is not part of the cache key
+                self.clear_cache()
+
+
+# Dormand-Prince 5(4) coefficients, used by _RKSimulation
+_DOPRI_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+_DOPRI_A = np.array([
+    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    [1 / 5, 0.0, 0.0, 0.0, 0.0, 0.0],
+    [3 / 40, 9 / 40, 0.0, 0.0, 0.0, 0.0],
+    [44 / 45, -56 / 15, 32 / 9, 0.0, 0.0, 0.0],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0.0, 0.0],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656, 0.0],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+])
+# difference between the 5th and 4th order weights, including the last (FSAL) stage
+_DOPRI_E = np.array([71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200,
+                     22 / 525, -1 / 40])
+
+
+# coefficients of the 4th order continuous extension of the steps
+_DOPRI_P = np.array([
+    [1.0, -8048581381 / 2820520608, 8663915743 / 2820520608,
+     -12715105075 / 11282082432],
+    [0.0, 0.0, 0.0, 0.0],
+    [0.0, 131558114200 / 32700410799, -68118460800 / 10900136933,
+     87487479700 / 32700410799],
+    [0.0, -1754552775 / 470086768, 14199869525 / 1410260304,
+     -10690763975 / 1880347072],
+    [0.0, 127303824393 / 49829197408, -318862633887 / 49829197408,
+     701980252875 / 199316789632],
+    [0.0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0.0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+
+def _dense_state(theta, h, x, k):
+    # states at the fraction theta of steps of size h from x, with stage rates k
+    weights = (theta[:, np.newaxis] ** np.arange(1, 5)) @ _DOPRI_P.T
+    return x + h[:, np.newaxis] * np.einsum('is,sij->ij', weights, k)
+
+
+def _step_polynomials(h, x, k):
+    # coefficients (lowest order first) of the continuous extension of steps of size
+    # h from x, with stage rates k, as polynomials in the time since the start of the
+    # steps. Array of shape (number of steps, 5, number of states).
+    weights = np.einsum('sp,sij->ipj', _DOPRI_P, k)
+    scale = h[:, np.newaxis, np.newaxis] ** np.arange(4)[:, np.newaxis]
+    return np.concatenate((x[:, np.newaxis], weights / scale), axis=1)
+
+
+class _RKSimulation(ABC):
+    """
+    Integration of the trajectories of a phase with an explicit Runge-Kutta method
+    (Dormand-Prince 5(4)), either with adaptive steps or with a fixed step size.
+    Trajectories are advanced together, each with its own steps, and end separately at
+    the first zero crossing of an event function or at the final time.
+
+    Subclasses provide the evaluation of the state rates, events and outputs of all
+    trajectories, and the update of the states at events.
+
+    Besides the samples at every step, each result holds the continuous extension of
+    the steps in dense_coeffs, an array of shape (number of samples - 1, 5, number of
+    states) with the polynomial coefficients (lowest order first) of the states from
+    each sample to the next one, in time since the first of the two samples.
+    """
 
-    @property
-    def set_val(self):
-        return self.prob.set_val
+    def __init__(
+        self,
+        problem,
+        num_trajectories,
+        rtol=1e-6,
+        atol=1e-9,
+        step=None,
+        max_step=np.inf,
+        first_step=None,
+        max_steps=10_000,
+        event_tol=1e-9,
+    ):
+        self.problem = problem
+        self.num_trajectories = num_trajectories
+        self.rtol = rtol
+        self.atol = atol
+        self.step = step
+        self.max_step = max_step
+        self.first_step = first_step
+        self.max_steps = max_steps
+        self.event_tol = event_tol
+        self.num_evaluations = 0
+
+    @abstractmethod
+    def _rates(self, t, x):
+        pass
+
+    @abstractmethod
+    def _events(self, t, x):
+        pass
+
+    @abstractmethod
+    def _outputs(self, t, x):
+        pass
+
+    def _update(self, idx, t, x, channels):
+        """
+        Apply the events in the given channels to the trajectories idx at times t and
+        states x. Returns the updated states, and whether each trajectory ended.
+        """
+        return x, np.ones(len(idx), dtype=bool)
+
+    def _state_triggers(self):
+        """
+        Channels whose event function is a state minus a value, as a dictionary of
+        the form {channel:(state index, scale from the state units to the event units)}.
+        The crossing of these events is found directly from the polynomial of the step.
+        """
+        if (
+            type(self.problem).event_equation_function
+            is not SimuPyProblem.event_equation_function
+        ):
+            return {}
+        state_triggers = {}
+        for channel, trigger in enumerate(self.problem.triggers):
+            if trigger.state in self.problem.state_names:
+                scale, _ = units.unit_conversion(
+                    self.problem.states[trigger.state]['units'], trigger.units)
+                state_triggers[channel] = (
+                    self.problem.state_names.index(trigger.state), scale)
+        return state_triggers
+
+    def _initial_step(self, t, x, f, tf):
+        if self.step is not None:
+            return np.full(t.shape, float(self.step))
+        if self.first_step is not None:
+            return np.full(t.shape, float(self.first_step))
+        scale = self.atol + self.rtol * np.abs(x)
+        d0 = np.sqrt(np.mean((x / scale) ** 2, axis=1))
+        d1 = np.sqrt(np.mean((f / scale) ** 2, axis=1))
+        h = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / np.maximum(d1, 1e-300))
+        return np.minimum(np.minimum(h, self.max_step), tf - t)
+
+    def _integrate(self, t0, x0, tf):
+        problem = self.problem
+        num_traj = self.num_trajectories
+        dim_state = problem.dim_state
+
+        t = np.full(num_traj, float(t0))
+        x = np.array(np.broadcast_to(x0, (num_traj, dim_state)), dtype=float)
+        problem.output_nan = False
+
+        f = self._rates(t, x)
+        e = self._events(t, x)
+        results = [
+            SimulationResult(dim_state, problem.dim_output, e.shape[1],
+                             np.array([t0, tf]), initial_size=128)
+            for _ in range(num_traj)
+        ]
+
+        dense = [[] for _ in range(num_traj)]
+
+        def record(idx, t, x, y, e, coeffs=None):
+            for i in idx:
+                results[i].new_result(t[i], x[i], y[i], e[i])
+            if coeffs is not None:
+                # polynomials of the intervals ending at the recorded samples
+                for i, c in zip(idx, coeffs):
+                    dense[i].append(c)
+
+        record(range(num_traj), t, x, self._outputs(t, x), e)
+
+        state_triggers = self._state_triggers()
+        h = self._initial_step(t, x, f, tf)
+        active = t < tf
+        num_steps = np.zeros(num_traj, dtype=int)
+        k = np.empty((7, num_traj, dim_state))
+
+        while np.any(active):
+            h = np.where(active, np.minimum(np.minimum(h, self.max_step), tf - t), 0.0)
+
+            # stages, with the last one evaluated at the end of the step
+            k[0] = f
+            for stage in range(1, 7):
+                x_stage = x + h[:, np.newaxis] * np.tensordot(
+                    _DOPRI_A[stage, :stage], k[:stage], axes=1)
+                k[stage] = self._rates(t + _DOPRI_C[stage] * h, x_stage)
+            x_new = x_stage
+            t_new = t + h
+            # copied, since the rates at located events replace it while k still
+            # holds the stages of the step
+            f_new = k[6].copy()
+
+            if self.step is None:
+                error = h[:, np.newaxis] * np.tensordot(_DOPRI_E, k, axes=1)
+                scale = self.atol + self.rtol * np.maximum(np.abs(x), np.abs(x_new))
+                error_norm = np.sqrt(np.mean((error / scale) ** 2, axis=1))
+                error_norm[~np.isfinite(error_norm)] = np.inf
+
+                accepted = active & (error_norm <= 1.0)
+                with np.errstate(divide='ignore'):
+                    factor = np.clip(0.9 * error_norm ** -0.2, 0.2, 10.0)
+                # no growth right after a rejected step
+                rejected = active & ~accepted
+                factor[rejected] = np.minimum(factor[rejected], 1.0)
+            else:
+                accepted = active.copy()
+                factor = np.ones(num_traj)
+            steps = np.flatnonzero(accepted)
+
+            e_new = np.full_like(e, np.nan)
+            e_new[steps] = self._events(t_new, x_new)[steps]
+            crossed = accepted[:, np.newaxis] & (
+                (np.sign(e) != np.sign(e_new)) & (e != 0.0))
+            located = np.flatnonzero(np.any(crossed, axis=1))
+
+            if located.size:
+                t_event, x_event = self._locate_events(
+                    located, crossed[located], state_triggers, t, x, h, k, e, e_new)
+                t_new[located] = t_event
+                x_new[located] = x_event
+                f_new[located] = self._rates(t_new, x_new)[located]
+                e_new[located] = self._events(t_new, x_new)[located]
+
+            record(steps, t_new, x_new, self._outputs(t_new, x_new), e_new,
+                   _step_polynomials(h[steps], x[steps], k[:, steps]))
+
+            t[steps] = t_new[steps]
+            x[steps] = x_new[steps]
+            f[steps] = f_new[steps]
+            e[steps] = e_new[steps]
+            num_steps[steps] += 1
+            h = h * factor
+
+            if located.size:
+                channels = [np.flatnonzero(row) for row in crossed[located]]
+                x_update, ended = self._update(located, t[located], x[located], channels)
+                active[located[ended]] = False
+                restarted = located[~ended]
+                if restarted.size:
+                    x[restarted] = x_update[~ended]
+                    f[restarted] = self._rates(t, x)[restarted]
+                    e[restarted] = self._events(t, x)[restarted]
+                    # the update happens at a single time, held by a constant
+                    constant = np.zeros((restarted.size, 5, dim_state))
+                    constant[:, 0] = x[restarted]
+                    record(restarted, t, x, self._outputs(t, x), e, constant)
+
+            active &= t < tf
+            if self.step is None:
+                stalled = active & (h <= 10 * np.spacing(np.maximum(np.abs(t), 1.0)))
+                if np.any(stalled):
+                    raise RuntimeError("Step size too small for trajectories %s"
+                                       % np.flatnonzero(stalled))
+            exhausted = active & (num_steps >= self.max_steps)
+            if np.any(exhausted):
+                raise RuntimeError(
+                    "Trajectories %s reached the maximum number of steps (%d)"
+                    % (np.flatnonzero(exhausted), self.max_steps))
+
+        for res, coeffs in zip(results, dense):
+            size = res.res_idx
+            res.t = res.t[:size]
+            res.x = res.x[:size]
+            res.y = res.y[:size]
+            res.e = res.e[:size]
+            res.dense_coeffs = np.array(coeffs).reshape(size - 1, 5, dim_state)
+
+        return results
+
+    def _locate_events(self, located, crossed, state_triggers, t, x, h, k, e, e_new):
+        """
+        Find the times of the first zero crossing of the events within the last step
+        of the located trajectories, on the continuous extension of the step. Events on
+        states are found from the polynomial of the step alone. The others are refined
+        for all located trajectories together, with one evaluation of the events per
+        iteration.
+        """
+        # channel crossed first, estimated from linear interpolation of the events
+        with np.errstate(divide='ignore', invalid='ignore'):
+            theta_linear = e[located] / (e[located] - e_new[located])
+        theta_linear = np.where(crossed, theta_linear, np.inf)
+        channel = np.argmin(theta_linear, axis=1)
+        g_lo = e[located, channel]
+        g_hi = e_new[located, channel]
+
+        theta = np.empty(located.size)
+        on_state = np.isin(channel, list(state_triggers))
+
+        idx = np.flatnonzero(on_state)
+        if idx.size:
+            traj = located[idx]
+            state_idx, scale = np.array(
+                [state_triggers[c] for c in channel[idx]]).T
+            coeffs = k[:, traj, state_idx.astype(int)].T @ _DOPRI_P
+            coeffs *= (scale * h[traj])[:, np.newaxis]
+            g_0 = g_lo[idx]
+
+            def state_events(theta):
+                return g_0 + (
+                    coeffs * theta[:, np.newaxis] ** np.arange(1, 5)).sum(axis=1)
+
+            theta[idx] = _regula_falsi(state_events, g_lo[idx], g_hi[idx],
+                                       self.event_tol)
+
+        idx = np.flatnonzero(~on_state)
+        if idx.size:
+            traj = located[idx]
+            t_run = t.copy()
+            x_run = x.copy()
+
+            def events(theta):
+                t_run[traj] = t[traj] + theta * h[traj]
+                x_run[traj] = _dense_state(theta, h[traj], x[traj], k[:, traj])
+                return self._events(t_run, x_run)[traj, channel[idx]]
+
+            theta[idx] = _regula_falsi(events, g_lo[idx], g_hi[idx], self.event_tol)
+
+        t_event = t[located] + theta * h[located]
+        x_event = _dense_state(theta, h[located], x[located], k[:, located])
+        return t_event, x_event
+
+
+def _regula_falsi(func, g_lo, g_hi, tol, max_iter=100):
+    """
+    Vectorized regula falsi (Illinois) search for the zeros of func(theta) on [0, 1],
+    where func returns one value per element of theta and g_lo and g_hi are the values
+    of opposite signs at 0 and 1. Returns the upper ends of the final brackets, which
+    are on the far side of the zeros.
+    """
+    lo = np.zeros(g_lo.size)
+    hi = np.ones(g_lo.size)
+    side = np.zeros(g_lo.size, dtype=int)
+    for _ in range(max_iter):
+        done = (hi - lo) <= tol
+        if np.all(done):
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            theta = (lo * g_hi - hi * g_lo) / (g_hi - g_lo)
+        theta = np.where(np.isfinite(theta) & (theta > lo) & (theta < hi),
+                         theta, 0.5 * (lo + hi))
+        theta = np.where(done, hi, theta)
+        g = func(theta)
+
+        update_lo = ~done & (np.sign(g) == np.sign(g_lo)) & (g != 0.0)
+        update_hi = ~done & ~update_lo
+        # Illinois modification: halve the value at the end point that is kept twice
+        g_hi = np.where(update_lo & (side == -1), 0.5 * g_hi, g_hi)
+        g_lo = np.where(update_hi & (side == 1), 0.5 * g_lo, g_lo)
+        lo = np.where(update_lo, theta, lo)
+        g_lo = np.where(update_lo, g, g_lo)
+        hi = np.where(update_hi, theta, hi)
+        g_hi = np.where(update_hi, g, g_hi)
+        lo = np.where(update_hi & (g == 0.0), theta, lo)
+        side = np.where(update_lo, -1, np.where(update_hi, 1, side))
+    return hi
+
+
+class BatchSimulation(_RKSimulation):
+    """
+    Forward integration of several independent trajectories of the same phase at once.
+
+    The ODE of the problem must be built with num_nodes equal to the number of
+    trajectories, each node of the model carrying one trajectory. Every stage of the
+    integration then evaluates all trajectories with a single run of the model. The
+    trajectories take their own adaptive steps (Dormand-Prince 5(4)) and end
+    separately, at the first zero crossing of any of the triggers of the problem or at
+    the final time. Trajectories that have ended stay at their final point while the
+    others carry on.
+
+    Trajectories can differ in their initial states, and in any input of the model
+    that is sized by the number of nodes (e.g. the Mach number of a cruise), set on
+    the problem before simulating. Events are only supported through the triggers of
+    the problem: phases that compute their events in a custom event_equation_function
+    or change the problem at an event with update_equation_function (e.g. the ascent
+    phases) can not be batched.
+    """
+
+    def __init__(
+        self,
+        problem: SimuPyProblem,
+        rtol=1e-6,
+        atol=1e-9,
+        step=None,
+        max_step=np.inf,
+        first_step=None,
+        max_steps=10_000,
+        event_tol=1e-9,
+    ):
+        """
+        problem: the SimuPyProblem of the phase, with an ODE built with num_nodes equal
+        to the number of trajectories
+        rtol, atol: relative and absolute tolerances of the local error of each step
+        step: size of the steps of a fixed step integration, without error control
+        max_step, first_step: limits on the size of the steps, and the size of the
+        first one (estimated from the initial state rates by default)
+        max_steps: maximum number of steps of a trajectory
+        event_tol: tolerance on the time of an event, relative to the size of the step
+        the event occurred in
+        """
+        for method in ('event_equation_function', 'update_equation_function'):
+            if getattr(type(problem), method) is not getattr(SimuPyProblem, method):
+                raise ValueError(
+                    f"{type(problem).__name__} defines its own {method} and can not "
+                    "be simulated in a batch")
+
+        super().__init__(
+            problem, problem.ode.options['num_nodes'], rtol=rtol, atol=atol, step=step,
+            max_step=max_step, first_step=first_step, max_steps=max_steps,
+            event_tol=event_tol)
+        self._point = None
+
+    def _run(self, t, x):
+        # run the model with trajectory i at time t[i] and state x[i], unless that is
+        # where it was last run
+        point = (t.tobytes(), x.tobytes())
+        if point == self._point:
+            return
+        problem = self.problem
+        problem._sync()
+        problem._evaluated_key = None
+        if problem._time_map is not None:
+            problem._time_map.set_nodes(t[np.newaxis, :])
+        problem._state_map.set_nodes(x.T)
+        problem.compute()
+        self.num_evaluations += 1
+        self._point = point
+
+    def _rates(self, t, x):
+        self._run(t, x)
+        return self.problem._state_rate_map.get_nodes(self.num_trajectories).T
+
+    def _events(self, t, x):
+        self._run(t, x)
+        problem = self.problem
+        events = np.empty((self.num_trajectories, len(problem.triggers)))
+        for idx, trigger in enumerate(problem.triggers):
+            events[:, idx] = problem.evaluate_trigger(trigger)
+        return events
+
+    def _outputs(self, t, x):
+        self._run(t, x)
+        return self.problem._output_map.get_nodes(self.num_trajectories).T
+
+    def simulate(self, t0, x0, tf=None):
+        """
+        Integrate the trajectories from time t0 and initial states x0, an array of shape
+        (number of trajectories, number of states), or a single state shared by all
+        trajectories. Integration stops at tf (max_allowable_time of the problem by
+        default) if no trigger was crossed.
+
+        Returns a simupy SimulationResult (with arrays t, x, y and e) for each
+        trajectory.
+        """
+        if tf is None:
+            tf = self.problem.max_allowable_time
+        self._point = None
+        results = self._integrate(t0, x0, tf)
+        # the model holds the trajectories, not the point last used by the problem
+        self.problem._evaluated_key = None
+        self._point = None
+        return results
+
+
+class _ProblemSimulation(_RKSimulation):
+    """
+    Integration of the trajectory of a SimuPyProblem through its state, output, event
+    and update equation functions, as done by SimuPyProblem.simulate with the 'rk'
+    integrator.
+    """
+
+    def __init__(self, problem, **options):
+        super().__init__(problem, 1, **options)
+
+    def simulate(self, t0, x0, tf):
+        return self._integrate(t0, x0, tf)[0]
+
+    def _rates(self, t, x):
+        return np.atleast_1d(self.problem.state_equation_function(t[0], x[0]))[None]
+
+    def _events(self, t, x):
+        return np.atleast_1d(self.problem.event_equation_function(t[0], x[0]))[None]
+
+    def _outputs(self, t, x):
+        return np.atleast_1d(self.problem.output_equation_function(t[0], x[0]))[None]
+
+    def _update(self, idx, t, x, channels):
+        problem = self.problem
+        x_update = np.atleast_1d(problem.update_equation_function(
+            t[0], x[0].copy(), event_channels=channels[0]))
+        ended = problem.output_nan or np.any(np.isnan(x_update))
+        return x_update[None], np.array([ended])
+
+
+class _ConstantJacobian():
+    # stands in for the interpolant of a Jacobian when a phase is too short to
+    # interpolate over
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, t):
+        return self.value
+
+
+def _integrate_adjoint(
+    output,
+    phases,
+    costate,
+    param_deriv,
+    initial_state_names,
+    param_names,
+    adjoint_int_opts,
+    verbosity,
+):
+    """
+    Integrate the costates of one trajectory output backward through the phases
+    prepared by SGMTrajBase._compute_adjoint_data. This only depends on its arguments
+    so that the adjoints of several outputs can run concurrently, including in other
+    processes.
+
+    Returns the partials of the output keyed on the name of the input they are taken
+    with respect to, and the results of the costate integration of each phase.
+    """
+    partials = {}
+    costate_reses = []
+    lamda_dot_plus = np.zeros_like(costate)
+
+    # self.sim_results[-1].x[-1, next_prob.state_names.index(output)]
+    if verbosity.value >= 2:
+        print("\nstarting partial for %s" % output, costate)
+
+    dg_dt = 0.
+
+    for phase in phases:
+        t0, tf = phase['t_span']
+        df_dx = phase['df_dx']
+        df_dparam = phase['df_dparam']
+        dg_dx = phase['dg_dx']
+        f_minus = phase['f_minus']
+        f_plus = phase['f_plus']
+        state_update = phase['state_update']
+        dh_dx = phase['dh_dx']
+        dh_dparam = phase['dh_dparam']
+
+        # assumes only 1 of time, state, or output dependence
+        # assume no discontinuous state update, would need an API for that in
+        # compute as well --
+        # but assume some form of event has happened
+
+        # already checked that event_channel_names was well-defined in the
+        # pre-compute, so will just assign the co-state just once
+        for channel_idx, channel_name in enumerate(phase['event_channel_names']):
+            if np.argmin(np.abs(phase['e_final'])) not in [channel_idx]:
+                continue
+
+            state_disc = phase['x_final'] - state_update
+            state_disc[np.where(np.isinf(state_update))] = 0.
+
+            if channel_name != phase['t_name']:
+                lamda_dot = df_dx(phase['t_final']) @ costate
+                # lamda_dot_plus = lamda_dot
+                if verbosity is Verbosity.DEBUG:
+                    if np.any(state_disc):
+                        print("update is non-zero!", phase['name'], phase['state_names'],
+                              state_disc, costate, lamda_dot)
+                        print(
+                            "inner product becomes...",
+                            state_disc[None,
+                                       :] @ dh_dx @ lamda_dot_plus[:, None],
+                            state_disc[None,
+                                       :] @ dh_dx.T @ lamda_dot_plus[:, None]
+                        )
+                    print("dh_dx for", phase['name'], phase['state_names'], "\n", dh_dx)
+                    print("costate", costate)
+                costate_update_terms = [
+                    dh_dx.T @ costate[:, None],
+                    # costate[:, None],
+                    # TODO: should this be f_plus? probably not
+                    (dg_dx.T @ (f_plus - f_minus)
+                     [None, :] @ costate[:, None]) / (dg_dx@f_minus),
+                    # don't believe in lamda_dot terms anymore
+                    # -(dg_dx.T @ state_disc[None, :] @ dh_dx.T @ lamda_dot_plus[:, None]) / (dg_dx@f_minus),
+
+                ]
+
+                # TODO: is this wrong?
+                costate[:] = np.sum(costate_update_terms, axis=0).squeeze()
+
+            if channel_idx in phase['event_trigger_names']:
+                event_trigger_name = phase['event_trigger_names'][channel_idx]
+                if verbosity.value >= 2:
+                    print("setting event trigger data", event_trigger_name)
+                partials[event_trigger_name] = (
+                    + costate[None, :] @ (f_minus - f_plus) /
+                    (dg_dt + dg_dx@f_minus)
+                    # +(lamda_dot_plus[None, :] @ dh_dx @ state_disc[None, :])/(dg_dt + dg_dx@f_minus)
+                )
+
+            # how to account for terminal event? through costate IC.
+            # TODO: Is this wrong?
+            param_deriv += (costate[None, :] @ dh_dparam).squeeze()
+
+        # build co-state systems
+
+        def co_state_rate(t, costate, *args):
+            return df_dx(t) @ costate
+
+        if verbosity.value >= 2:
+            print('dim_state:', phase['dim_state'], "ic:", costate)
+
+        costate_sys = DynamicalSystem(state_equation_function=co_state_rate,
+                                      dim_state=phase['dim_state'])
+        costate_sys.initial_condition = costate
+
+        # simulate co-state system
+        co_res = costate_sys.simulate(
+            (t0, tf), integrator_options=adjoint_int_opts)
+        costate_reses.append(co_res)
+
+        if param_names:
+            df_dparam_val = df_dparam(co_res.t)
+            param_deriv_integrand_data = np.matmul(
+                co_res.x[:, None, :],
+                df_dparam_val
+            ).squeeze()
+            try:
+                param_deriv_integrand = interpolate.make_interp_spline(
+                    co_res.t,
+                    np.atleast_1d(param_deriv_integrand_data),
+                    # k=df_dparam.k
+                    k=min(3, co_res.t.shape[0]-1)
+                )
+            except ValueError as e:
+                print(
+                    "HIT VALUE ERROR!",
+                    output,
+                    phase['name'],
+                    co_res.t.shape,
+                    co_res.x.shape,
+                    df_dparam_val.shape,
+                    df_dparam.k,
+                    "final_results:\n\n",
+                    t0, tf,
+                    co_res.t,
+                    co_res.x,
+                )
+                raise e
+            param_deriv_integrand_antideriv = param_deriv_integrand.antiderivative()
+
+            # TODO: is the sign wrong here?
+            param_deriv -= (
+                param_deriv_integrand_antideriv(t0)
+                - param_deriv_integrand_antideriv(tf)
+            )
+
+        # consume initial condition
+        next_state_names = phase['previous_state_names']
+        if next_state_names is None:
+            break
+        costate = np.zeros(len(next_state_names))
+        lamda_dot_plus = np.zeros_like(costate)
+        lamda_dot_plus_rate = co_state_rate(co_res.t[-1], co_res.x[-1])
+
+        # TODO: do co-states need unit changes? probably not...
+        for state_name in phase['state_names']:
+            costate[next_state_names.index(
+                state_name)] = co_res.x[-1, phase['state_names'].index(state_name)]
+            lamda_dot_plus[
+                next_state_names.index(state_name)
+            ] = lamda_dot_plus_rate[phase['state_names'].index(state_name)]
+
+    for state_to_deriv, param_name in initial_state_names.items():
+        partials[param_name] = costate_reses[-1].x[
+            -1,
+            phase['state_names'].index(state_to_deriv)
+        ]
+    for param_deriv_val, param_deriv_name in zip(param_deriv, param_names):
+        partials[param_deriv_name] = param_deriv_val
+
+    return partials, costate_reses
 
 
 class SGMTrajBase(om.ExplicitComponent):
@@ -436,6 +1418,26 @@ class SGMTrajBase(om.ExplicitComponent):
         self.adjoint_int_opts = DEFAULT_INTEGRATOR_OPTIONS.copy()
         self.adjoint_int_opts['nsteps'] = 5000
         self.adjoint_int_opts['name'] = "dop853"
+        self.options.declare(
+            "adjoint_workers", default=1, types=int,
+            desc="Number of trajectory outputs whose adjoints are integrated "
+                 "concurrently in compute_partials.")
+        self.options.declare(
+            "adjoint_executor", default='process', values=['process', 'thread'],
+            desc="Whether concurrent adjoint integrations run in threads or in "
+                 "separate processes.")
+        self.options.declare(
+            "integrator", default=None, values=[None, 'simupy', 'rk'],
+            desc="Engine used for the forward integration of all phases, 'simupy' or "
+                 "'rk' (see SimuPyProblem). By default each phase uses its own.")
+        self.options.declare(
+            "record_dense_trajectory", default=False, types=bool,
+            desc="If True, every forward integration also records a DenseTrajectory, "
+                 "returned by get_dense_trajectory.")
+        self._adjoint_data = None
+        self._adjoint_executor = None
+        self._dense_trajectory = None
+        self._reference_trajectory = None
 
     def setup_params(
             self,
@@ -549,6 +1551,10 @@ class SGMTrajBase(om.ExplicitComponent):
             }
             for event_trigger_input in traj_event_trigger_input
         }
+        if self.options["integrator"] is not None:
+            for ode in ODEs:
+                ode.integrator = self.options["integrator"]
+
         self.ODEs = ODEs
         self.declare_partials(["*"], ["*"],)
 
@@ -571,6 +1577,8 @@ class SGMTrajBase(om.ExplicitComponent):
             print("initializing compute_traj_loop")
         sim_results = []
         sim_problems = [first_problem]
+        # state rates at the samples of each phase, for the dense trajectory
+        sim_rates = []
         t = t0
         if state0 is not None:
             state = state0
@@ -586,12 +1594,25 @@ class SGMTrajBase(om.ExplicitComponent):
             current_problem = sim_problems[-1]
             current_problem.initial_condition = state
 
+            simulate_kwargs = {}
+            if self._reference_trajectory is not None and \
+                    current_problem.integrator == 'rk':
+                simulate_kwargs['first_step'] = \
+                    self._reference_trajectory.initial_step(len(sim_results))
             sim_result = current_problem.simulate(
-                (t, self.max_allowable_time),
+                (t, self.max_allowable_time), **simulate_kwargs
             )
             if sim_result.t.shape[0] == 2:
                 print("\n"*3, "IMMEDIATE PHASE TERMINATION", current_problem, "\n"*2)
             sim_results.append(sim_result)
+            if self.options['record_dense_trajectory']:
+                # evaluated while the problem still holds the values it was simulated
+                # with, before the next phase updates the parameters. The 'rk'
+                # integrator records the polynomials of its steps instead.
+                if hasattr(sim_result, 'dense_coeffs'):
+                    sim_rates.append(None)
+                else:
+                    sim_rates.append(current_problem.sample_state_rates(sim_result))
 
             t = sim_result.t[-1]
             x = sim_result.x[-1, :]
@@ -622,7 +1643,7 @@ class SGMTrajBase(om.ExplicitComponent):
             current_problem.output_equation_function(t, x)
             state = np.array(
                 [
-                    current_problem.prob.get_val(state_name, units=state_data['units'])
+                    current_problem.get_val(state_name, units=state_data['units'])
                     for state_name, state_data in next_problem.states.items()
                 ]
             ).squeeze()
@@ -634,6 +1655,9 @@ class SGMTrajBase(om.ExplicitComponent):
         # wrap main loop
         self.sim_results = sim_results
         self.sim_problems = sim_problems
+        if self.options['record_dense_trajectory']:
+            self._dense_trajectory = DenseTrajectory.from_simulation(
+                sim_results, sim_problems, state_rates=sim_rates)
 
         # trajectory-specific outputs
         for output in self.traj_final_state_output:
@@ -656,6 +1680,30 @@ class SGMTrajBase(om.ExplicitComponent):
 
         self.last_inputs = np.array(list(inputs.values()))
 
+    def get_dense_trajectory(self):
+        """
+        Return the last simulated trajectory as a DenseTrajectory, which can be
+        evaluated at any time and saved to disk. The trajectory is recorded during the
+        forward integration when the record_dense_trajectory option is set.
+        """
+        if self._dense_trajectory is None:
+            raise RuntimeError(
+                f"{self.msginfo}: no dense trajectory was recorded. Set the "
+                "'record_dense_trajectory' option before running the model.")
+        return self._dense_trajectory
+
+    def set_reference_trajectory(self, trajectory):
+        """
+        Warm start the following forward integrations from a reference trajectory,
+        given as a DenseTrajectory or the name of a file it was saved to. Each phase
+        integrated with the 'rk' integrator starts with the first step the reference
+        took in the phase at the same position, instead of estimating one. Pass None
+        to stop using the reference.
+        """
+        if trajectory is not None and not isinstance(trajectory, DenseTrajectory):
+            trajectory = DenseTrajectory.load(trajectory)
+        self._reference_trajectory = trajectory
+
     def compute_partials(self, inputs, J):
         self.compute_params(inputs)
         # defensive check -- should really make sure ALL inputs are the same, need a
@@ -668,10 +1716,88 @@ class SGMTrajBase(om.ExplicitComponent):
                 " inputs did not match",
             )
 
+        # the Jacobians along the forward trajectory are shared by the adjoints of all
+        # outputs, so they are only evaluated once for each trajectory
+        if self._adjoint_data is None or self._adjoint_data[0] is not self.sim_results:
+            self._adjoint_data = (self.sim_results, self._compute_adjoint_data())
+        costate_ics, param_derivs, phases = self._adjoint_data[1]
+
+        initial_state_names = {
+            state_name: metadata["name"]
+            for state_name, metadata in self.traj_initial_state_input.items()
+        }
+        adjoint_args = [
+            (
+                output,
+                phases,
+                costate_ic.copy(),
+                param_deriv.copy(),
+                initial_state_names,
+                list(self.options["param_dict"].keys()),
+                self.adjoint_int_opts,
+                self.verbosity,
+            )
+            for output, costate_ic, param_deriv in zip(
+                self.all_traj_outputs, costate_ics, param_derivs)
+        ]
+
+        num_workers = min(self.options['adjoint_workers'], len(adjoint_args))
+        if num_workers > 1:
+            executor = self._get_adjoint_executor(num_workers)
+            adjoint_results = list(executor.map(
+                _integrate_adjoint, *zip(*adjoint_args)))
+        else:
+            adjoint_results = [_integrate_adjoint(*args) for args in adjoint_args]
+
+        costate_reses = {}
+        for output, (partials, co_reses) in zip(self.all_traj_outputs, adjoint_results):
+            output_name = self.all_traj_outputs[output]["name"]
+            for wrt_name, val in partials.items():
+                J[output_name, wrt_name] = val
+            costate_reses[output] = co_reses
+        self.costate_reses = costate_reses
+
+    def _get_adjoint_executor(self, num_workers):
+        """
+        Return the pool running concurrent adjoint integrations. It is created on first
+        use and kept for the following calls to compute_partials, until cleanup.
+        """
+        kind = self.options['adjoint_executor']
+        if self._adjoint_executor is not None and \
+                self._adjoint_executor[:2] != (kind, num_workers):
+            self._shutdown_adjoint_executor()
+
+        if self._adjoint_executor is None:
+            if kind == 'process':
+                executor = ProcessPoolExecutor(max_workers=num_workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=num_workers)
+            self._adjoint_executor = (kind, num_workers, executor)
+
+        return self._adjoint_executor[2]
+
+    def _shutdown_adjoint_executor(self):
+        if self._adjoint_executor is not None:
+            self._adjoint_executor[2].shutdown()
+            self._adjoint_executor = None
+
+    def cleanup(self):
+        """
+        Clean up resources prior to exit, including the pool of adjoint workers.
+        """
+        super().cleanup()
+        self._shutdown_adjoint_executor()
+
+    def _compute_adjoint_data(self):
+        """
+        Evaluate the data along the forward trajectory needed by the adjoint of every
+        output: the costate initial conditions, the partials of the outputs with
+        respect to the parameters, and for each phase (last phase first) the
+        interpolated state rate Jacobians and the event and state update terms.
+        """
         param_dict = self.options["param_dict"]
 
         # assume the first problem has the most states?
-        costate_reses = {output: [] for output in self.all_traj_outputs}
         tf_total = self.sim_results[-1].t[-1]
 
         next_res = self.sim_results[-1]
@@ -857,9 +1983,7 @@ class SGMTrajBase(om.ExplicitComponent):
 
             # TODO: why is this failing?
             if skip_interp:
-                mean_df_dx = np.mean(df_dx_data, axis=0)
-
-                df_dxs.append(lambda t: mean_df_dx)
+                df_dxs.append(_ConstantJacobian(np.mean(df_dx_data, axis=0)))
             else:
                 try:
                     df_dxs.append(interpolate.make_interp_spline(
@@ -876,8 +2000,8 @@ class SGMTrajBase(om.ExplicitComponent):
 
             if param_dict:
                 if skip_interp:
-                    mean_df_dparam = np.mean(df_dparam_data, axis=0)
-                    df_dparams.append(lambda t: mean_df_dparam)
+                    df_dparams.append(
+                        _ConstantJacobian(np.mean(df_dparam_data, axis=0)))
                 else:
                     df_dparams.append(interpolate.make_interp_spline(
                         tf_total - res.t[::-1],
@@ -896,186 +2020,62 @@ class SGMTrajBase(om.ExplicitComponent):
             print("size check:", len(self.sim_problems), len(dg_dxs), len(f_minuses),
                   len(f_pluses), )
 
-        # main loop
-        for output, costate_ic, param_deriv in zip(self.all_traj_outputs, costate_ics,
-                                                   param_derivs):
-
-            output_name = self.all_traj_outputs[output]["name"]
-            next_prob = self.sim_problems[-1]
-            costate = costate_ic
-            lamda_dot_plus = np.zeros_like(costate)
-
-            # self.sim_results[-1].x[-1, next_prob.state_names.index(output)]
-            if self.verbosity.value >= 2:
-                print("\nstarting partial for %s" % output, costate)
-
-            dg_dt = 0.
-
-            for (
-                phase_idx,
-                res,
-                prob,
-                df_dx,
-                df_dparam,
-                dg_dx,
-                f_minus,
-                f_plus,
-                state_update,
-                dh_dx,
-                dh_dparam,
-            ) in zip(
-                range(len(self.sim_results), 0, -1),
-                self.sim_results[::-1],
-                self.sim_problems[::-1],
-                df_dxs,
-                df_dparams,
-                dg_dxs,
-                f_minuses,
-                f_pluses,
-                state_updates,
-                dh_dxs,
-                dh_dparams,
-            ):
-
-                t0, tf = tf_total - res.t[[-1, 0]]
-
-                # assumes only 1 of time, state, or output dependence
-                # assume no discontinuous state update, would need an API for that in
-                # compute as well --
-                # but assume some form of event has happened
-
-                # already checked that event_channel_names was well-defined in the
-                # pre-compute, so will just assign the co-state just once
-                for channel_idx, channel_name in enumerate(prob.event_channel_names):
-                    if np.argmin(np.abs(res.e[-1, :])) not in [channel_idx]:
-                        continue
-
-                    state_disc = res.x[-1] - state_update
-                    state_disc[np.where(np.isinf(state_update))] = 0.
-
-                    if channel_name != prob.t_name:
-                        lamda_dot = df_dx(res.t[-1]) @ costate
-                        # lamda_dot_plus = lamda_dot
-                        if self.verbosity is Verbosity.DEBUG:
-                            if np.any(state_disc):
-                                print("update is non-zero!", prob, prob.state_names,
-                                      state_disc, costate, lamda_dot)
-                                print(
-                                    "inner product becomes...",
-                                    state_disc[None,
-                                               :] @ dh_dx @ lamda_dot_plus[:, None],
-                                    state_disc[None,
-                                               :] @ dh_dx.T @ lamda_dot_plus[:, None]
-                                )
-                            print("dh_dx for", prob, prob.state_names, "\n",  dh_dx)
-                            print("costate", costate)
-                        costate_update_terms = [
-                            dh_dx.T @ costate[:, None],
-                            # costate[:, None],
-                            # TODO: should this be f_plus? probably not
-                            (dg_dx.T @ (f_plus - f_minus)
-                             [None, :] @ costate[:, None]) / (dg_dx@f_minus),
-                            # don't believe in lamda_dot terms anymore
-                            # -(dg_dx.T @ state_disc[None, :] @ dh_dx.T @ lamda_dot_plus[:, None]) / (dg_dx@f_minus),
-
-                        ]
-
-                        # TODO: is this wrong?
-                        costate[:] = np.sum(costate_update_terms, axis=0).squeeze()
-
-                    if (
-                        (event_key := (prob, channel_name, channel_idx))
-                        in self.traj_event_trigger_input
-                    ):
-                        event_trigger_name = self.traj_event_trigger_input[event_key]["name"]
-                        if self.verbosity.value >= 2:
-                            print("setting event trigger data", event_trigger_name)
-                        J[output_name, event_trigger_name] = (
-                            + costate[None, :] @ (f_minus - f_plus) /
-                            (dg_dt + dg_dx@f_minus)
-                            # +(lamda_dot_plus[None, :] @ dh_dx @ state_disc[None, :])/(dg_dt + dg_dx@f_minus)
-                        )
-
-                    # how to account for terminal event? through costate IC.
-                    # TODO: Is this wrong?
-                    param_deriv += (costate[None, :] @ dh_dparam).squeeze()
-
-                # build co-state systems
-
-                def co_state_rate(t, costate, *args):
-                    return df_dx(t) @ costate
-
-                if self.verbosity.value >= 2:
-                    print('dim_state:', prob.dim_state, "ic:", costate)
-
-                costate_sys = DynamicalSystem(state_equation_function=co_state_rate,
-                                              dim_state=prob.dim_state)
-                costate_sys.initial_condition = costate
-
-                # simulate co-state system
-                co_res = costate_sys.simulate(
-                    (t0, tf), integrator_options=self.adjoint_int_opts)
-                costate_reses[output].append(co_res)
-
-                if param_dict:
-                    df_dparam_val = df_dparam(co_res.t)
-                    param_deriv_integrand_data = np.matmul(
-                        co_res.x[:, None, :],
-                        df_dparam_val
-                    ).squeeze()
-                    try:
-                        param_deriv_integrand = interpolate.make_interp_spline(
-                            co_res.t,
-                            np.atleast_1d(param_deriv_integrand_data),
-                            # k=df_dparam.k
-                            k=min(3, co_res.t.shape[0]-1)
-                        )
-                    except ValueError as e:
-                        print(
-                            "HIT VALUE ERROR!",
-                            output,
-                            prob,
-                            co_res.t.shape,
-                            co_res.x.shape,
-                            df_dparam_val.shape,
-                            df_dparam.k,
-                            "final_results:\n\n",
-                            t0, tf,
-                            co_res.t,
-                            co_res.x,
-                        )
-                        raise e
-                    param_deriv_integrand_antideriv = param_deriv_integrand.antiderivative()
-
-                    # TODO: is the sign wrong here?
-                    param_deriv -= (
-                        param_deriv_integrand_antideriv(t0)
-                        - param_deriv_integrand_antideriv(tf)
-                    )
-
-                # consume initial condition
-                if prob is not self.sim_problems[0]:
-                    next_prob = self.sim_problems[self.sim_problems.index(prob)-1]
-                else:
-                    break
-                costate = np.zeros(next_prob.dim_state)
-                lamda_dot_plus = np.zeros_like(costate)
-                lamda_dot_plus_rate = co_state_rate(co_res.t[-1], co_res.x[-1])
-
-                # TODO: do co-states need unit changes? probably not...
-                for state_name in prob.state_names:
-                    costate[next_prob.state_names.index(
-                        state_name)] = co_res.x[-1, prob.state_names.index(state_name)]
-                    lamda_dot_plus[
-                        next_prob.state_names.index(state_name)
-                    ] = lamda_dot_plus_rate[prob.state_names.index(state_name)]
-
-            for state_to_deriv, metadata in self.traj_initial_state_input.items():
-                param_name = metadata["name"]
-                J[output_name, param_name] = costate_reses[output][-1].x[
-                    -1,
-                    prob.state_names.index(state_to_deriv)
-                ]
-            for param_deriv_val, param_deriv_name in zip(param_deriv, param_dict):
-                J[output_name, param_deriv_name] = param_deriv_val
-        self.costate_reses = costate_reses
+        # the data of each phase, in the order the adjoint is integrated
+        phases = []
+        for (
+            res,
+            prob,
+            df_dx,
+            df_dparam,
+            dg_dx,
+            f_minus,
+            f_plus,
+            state_update,
+            dh_dx,
+            dh_dparam,
+        ) in zip(
+            self.sim_results[::-1],
+            self.sim_problems[::-1],
+            df_dxs,
+            df_dparams,
+            dg_dxs,
+            f_minuses,
+            f_pluses,
+            state_updates,
+            dh_dxs,
+            dh_dparams,
+        ):
+            if prob is not self.sim_problems[0]:
+                previous_prob = self.sim_problems[self.sim_problems.index(prob)-1]
+                previous_state_names = previous_prob.state_names
+            else:
+                previous_state_names = None
+
+            phases.append(dict(
+                name=repr(prob),
+                t_span=tf_total - res.t[[-1, 0]],
+                t_final=res.t[-1],
+                x_final=res.x[-1],
+                e_final=res.e[-1, :],
+                t_name=prob.t_name,
+                state_names=prob.state_names,
+                dim_state=prob.dim_state,
+                previous_state_names=previous_state_names,
+                event_channel_names=prob.event_channel_names,
+                event_trigger_names={
+                    channel_idx: self.traj_event_trigger_input[event_key]["name"]
+                    for channel_idx, channel_name in enumerate(prob.event_channel_names)
+                    if (event_key := (prob, channel_name, channel_idx))
+                    in self.traj_event_trigger_input
+                },
+                df_dx=df_dx,
+                df_dparam=df_dparam,
+                dg_dx=dg_dx,
+                f_minus=f_minus,
+                f_plus=f_plus,
+                state_update=state_update,
+                dh_dx=dh_dx,
+                dh_dparam=dh_dparam,
+            ))
+
+        return costate_ics, param_derivs, phases
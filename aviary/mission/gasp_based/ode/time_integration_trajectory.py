@@ -0,0 +1,285 @@
+import numpy as np
+from openmdao.utils import units
+
+
+class DenseTrajectory():
+    '''
+    Compact, continuous representation of a trajectory simulated with the time
+    integration (SGM) phases.
+
+    The states of phases integrated with the 'rk' integrator are stored as the
+    polynomials of its continuous extension over every step. SimuPy drives the scipy
+    integrators, which do not expose theirs, so the states of the other phases are
+    stored as piecewise cubic Hermite polynomials built from the states and state
+    rates at every step. The outputs are stored as piecewise linear polynomials. The
+    polynomial coefficients of all phases are kept in contiguous arrays, so the
+    trajectory can be evaluated at any time with a binary search, and saved to and
+    loaded from a single .npz file.
+
+    States or outputs that are not part of a phase are NaN over that phase.
+    '''
+
+    def __init__(
+        self,
+        t_start,
+        state_coeffs,
+        output_coeffs,
+        phase_names,
+        phase_bounds,
+        state_names,
+        state_units,
+        output_names,
+        output_units,
+    ):
+        """
+        t_start: start time of each interval, in ascending order
+        state_coeffs: array of shape (num_intervals, num_coeffs, num_states) holding
+        the coefficients (lowest order first) of the states in time since the start of
+        each interval
+        output_coeffs: same as state_coeffs for the outputs, of shape
+        (num_intervals, 2, num_outputs)
+        phase_names: name of each phase
+        phase_bounds: array of shape (num_phases, 2) holding the initial and final
+        time of each phase
+        """
+        self.t_start = np.asarray(t_start, dtype=float)
+        self.state_coeffs = np.asarray(state_coeffs, dtype=float)
+        self.output_coeffs = np.asarray(output_coeffs, dtype=float)
+        self.phase_names = list(phase_names)
+        self.phase_bounds = np.asarray(phase_bounds, dtype=float).reshape(-1, 2)
+        self.state_names = list(state_names)
+        self.state_units = list(state_units)
+        self.output_names = list(output_names)
+        self.output_units = list(output_units)
+
+    @classmethod
+    def from_simulation(cls, sim_results, sim_problems, state_rates=None):
+        """
+        Build the trajectory from the results of the time integration phases (as
+        stored by SGMTrajBase.compute_traj_loop) and the problems that produced them.
+
+        state_rates: the state rates at the samples of each result, as returned by
+        SimuPyProblem.sample_state_rates. They are only needed for results without
+        the dense_coeffs of the 'rk' integrator, and entries can be None. Missing rates
+        are evaluated now, so the problems must still hold the parameters they were
+        simulated with.
+        """
+        if state_rates is None:
+            state_rates = [None] * len(sim_results)
+
+        state_units = {}
+        output_units = {}
+        for prob in sim_problems:
+            for name, data in prob.states.items():
+                state_units.setdefault(name, data['units'])
+            for name, unit in prob.outputs.items():
+                output_units.setdefault(name, unit)
+        state_names = list(state_units)
+        output_names = list(output_units)
+
+        t_starts = []
+        state_coeffs = []
+        output_coeffs = []
+        phase_names = []
+        phase_bounds = []
+        for res, prob, rates in zip(sim_results, sim_problems, state_rates):
+            t = res.t
+            phase_names.append(getattr(prob, 'phase_name', type(prob).__name__))
+            phase_bounds.append((t[0], t[-1]))
+
+            dense_coeffs = getattr(res, 'dense_coeffs', None)
+            if dense_coeffs is None:
+                if rates is None:
+                    rates = prob.sample_state_rates(res)
+                x = np.stack([res.x, rates], axis=1)
+            else:
+                x = dense_coeffs
+
+            # the states and state rates at the samples, or the polynomials of the
+            # steps from each sample to the next one, in the merged layout
+            coeffs = np.full(x.shape[:2] + (len(state_names),), np.nan)
+            for idx, (name, data) in enumerate(prob.states.items()):
+                scale, offset = _conversion(data['units'], state_units[name])
+                col = state_names.index(name)
+                coeffs[:, :, col] = x[:, :, idx] * scale
+                coeffs[:, 0, col] += offset * scale
+
+            y = np.full((t.size, len(output_names)), np.nan)
+            for idx, (name, unit) in enumerate(prob.outputs.items()):
+                scale, offset = _conversion(unit, output_units[name])
+                y[:, output_names.index(name)] = (res.y[:, idx] + offset) * scale
+
+            # events can leave repeated times, which do not form an interval
+            h = np.diff(t)
+            keep = h > 0.0
+            h = h[keep, np.newaxis]
+            if dense_coeffs is None:
+                x0 = coeffs[:-1, 0][keep]
+                x1 = coeffs[1:, 0][keep]
+                f0 = coeffs[:-1, 1][keep]
+                f1 = coeffs[1:, 1][keep]
+                slope = (x1 - x0) / h
+                state_coeffs.append(np.stack([
+                    x0,
+                    f0,
+                    (3.0 * slope - 2.0 * f0 - f1) / h,
+                    (f0 + f1 - 2.0 * slope) / h**2,
+                ], axis=1))
+            else:
+                state_coeffs.append(coeffs[keep])
+
+            y0 = y[:-1][keep]
+            output_coeffs.append(np.stack([y0, (y[1:][keep] - y0) / h], axis=1))
+            t_starts.append(t[:-1][keep])
+
+        # phases with polynomials of a lower order are padded with zeros
+        num_coeffs = max(coeffs.shape[1] for coeffs in state_coeffs)
+        state_coeffs = [
+            np.pad(coeffs, ((0, 0), (0, num_coeffs - coeffs.shape[1]), (0, 0)))
+            for coeffs in state_coeffs]
+
+        return cls(
+            np.concatenate(t_starts),
+            np.concatenate(state_coeffs),
+            np.concatenate(output_coeffs),
+            phase_names,
+            phase_bounds,
+            state_names,
+            [state_units[name] for name in state_names],
+            output_names,
+            [output_units[name] for name in output_names],
+        )
+
+    @property
+    def t_initial(self):
+        return self.phase_bounds[0, 0]
+
+    @property
+    def t_final(self):
+        return self.phase_bounds[-1, 1]
+
+    def initial_step(self, phase):
+        """
+        Return the length of the first interval of the phase with the given index,
+        which is the first step taken by the integrator in that phase, or None if the
+        trajectory has no interval in that phase.
+        """
+        if phase >= len(self.phase_bounds):
+            return None
+        t0, tf = self.phase_bounds[phase]
+        idx = np.searchsorted(self.t_start, t0, side='left')
+        if idx == self.t_start.size or self.t_start[idx] != t0 or tf <= t0:
+            return None
+        t_next = self.t_start[idx + 1] if idx + 1 < self.t_start.size else tf
+        return min(t_next, tf) - t0
+
+    def _locate(self, t):
+        # at a phase boundary this picks the phase that starts there
+        t = np.asarray(t, dtype=float)
+        idx = np.clip(np.searchsorted(self.t_start, t, side='right') - 1,
+                      0, self.t_start.size - 1)
+        return idx, t - self.t_start[idx]
+
+    def state(self, t):
+        """
+        Return the states at times t, an array of shape t.shape + (num_states,).
+        """
+        idx, dt = self._locate(t)
+        c = self.state_coeffs[idx]
+        dt = dt[..., np.newaxis]
+        val = c[..., -1, :]
+        for j in range(c.shape[-2] - 2, -1, -1):
+            val = val * dt + c[..., j, :]
+        return val
+
+    def state_rate(self, t):
+        """
+        Return the state rates at times t, an array of shape t.shape + (num_states,).
+        """
+        idx, dt = self._locate(t)
+        c = self.state_coeffs[idx]
+        dt = dt[..., np.newaxis]
+        order = c.shape[-2] - 1
+        val = order * c[..., -1, :]
+        for j in range(order - 1, 0, -1):
+            val = val * dt + j * c[..., j, :]
+        return val
+
+    def output(self, t):
+        """
+        Return the outputs at times t, an array of shape t.shape + (num_outputs,).
+        """
+        idx, dt = self._locate(t)
+        c = self.output_coeffs[idx]
+        return c[..., 1, :] * dt[..., np.newaxis] + c[..., 0, :]
+
+    def get_val(self, name, t, units=None):
+        """
+        Return the state or output called name at times t, optionally converted to
+        the given units.
+        """
+        if name in self.state_names:
+            idx = self.state_names.index(name)
+            val = self.state(t)[..., idx]
+            val_units = self.state_units[idx]
+        elif name in self.output_names:
+            idx = self.output_names.index(name)
+            val = self.output(t)[..., idx]
+            val_units = self.output_units[idx]
+        else:
+            raise KeyError(f'"{name}" is not a state or output of the trajectory.')
+
+        if units is not None:
+            scale, offset = _conversion(val_units, units)
+            val = (val + offset) * scale
+        return val
+
+    def save(self, filename):
+        """
+        Save the trajectory to a .npz file.
+        """
+        np.savez(
+            filename,
+            t_start=self.t_start,
+            state_coeffs=self.state_coeffs,
+            output_coeffs=self.output_coeffs,
+            phase_names=np.array(self.phase_names, dtype=str),
+            phase_bounds=self.phase_bounds,
+            state_names=np.array(self.state_names, dtype=str),
+            state_units=np.array(_units_to_str(self.state_units), dtype=str),
+            output_names=np.array(self.output_names, dtype=str),
+            output_units=np.array(_units_to_str(self.output_units), dtype=str),
+        )
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a trajectory saved with save.
+        """
+        with np.load(filename, allow_pickle=False) as data:
+            return cls(
+                data['t_start'],
+                data['state_coeffs'],
+                data['output_coeffs'],
+                data['phase_names'].tolist(),
+                data['phase_bounds'],
+                data['state_names'].tolist(),
+                _str_to_units(data['state_units'].tolist()),
+                data['output_names'].tolist(),
+                _str_to_units(data['output_units'].tolist()),
+            )
+
+
+def _conversion(from_units, to_units):
+    if from_units is None or to_units is None or from_units == to_units:
+        return 1.0, 0.0
+    return units.unit_conversion(from_units, to_units)
+
+
+# units of None are stored as empty strings, since the arrays can not hold None
+def _units_to_str(unit_list):
+    return ['' if unit is None else unit for unit in unit_list]
+
+
+def _str_to_units(unit_list):
+    return [None if unit == '' else unit for unit in unit_list]
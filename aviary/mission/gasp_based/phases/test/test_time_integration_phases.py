@@ -0,0 +1,71 @@
+import unittest
+import warnings
+
+import numpy as np
+from openmdao.utils.assert_utils import assert_near_equal
+
+from aviary.interface.default_phase_info.two_dof import default_mission_subsystems
+from aviary.mission.gasp_based.phases.time_integration_phases import SGMGroundroll
+from aviary.subsystems.propulsion.engine_deck import EngineDeck
+from aviary.utils.functions import set_aviary_initial_values
+from aviary.utils.preprocessors import preprocess_propulsion
+from aviary.utils.process_input_decks import create_vehicle
+from aviary.variable_info.enums import Verbosity
+from aviary.variable_info.variables import Dynamic
+
+
+class LegacySGMGroundroll(SGMGroundroll):
+    """
+    Groundroll ended by the custom event function it used before switching to the
+    velocity trigger.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.clear_triggers()
+        self.event_channel_names = [Dynamic.Mission.VELOCITY]
+        self.num_events = len(self.event_channel_names)
+
+    def event_equation_function(self, t, x):
+        self.time = t
+        self.state = x
+        return self.get_val(Dynamic.Mission.VELOCITY, units='ft/s') - self.VR_value
+
+
+class SGMGroundrollTestCase(unittest.TestCase):
+    def setUp(self):
+        aviary_inputs, _ = create_vehicle(
+            'models/large_single_aisle_1/large_single_aisle_1_GwGm.csv')
+        aviary_inputs.set_val('verbosity', Verbosity.QUIET)
+        preprocess_propulsion(aviary_inputs, [EngineDeck(options=aviary_inputs)])
+
+        self.aviary_inputs = aviary_inputs
+        self.ode_args = dict(aviary_options=aviary_inputs,
+                             core_subsystems=default_mission_subsystems)
+
+    def simulate(self, problem):
+        set_aviary_initial_values(problem.prob.model, self.aviary_inputs)
+        problem.VR_value = 143.1 * 1.68781  # ft/s
+
+        # the mass state is in the units of its rate integrated over seconds
+        problem.initial_condition = np.array([174000. * 3600., 0., 0., .1])
+
+        with warnings.catch_warnings():
+            # the end of the phase is reported as a UserWarning
+            warnings.simplefilter('ignore', UserWarning)
+            return problem.simulate((0., 100.))
+
+    def test_trigger_matches_event_function(self):
+        res = self.simulate(SGMGroundroll(ode_args=self.ode_args))
+        legacy_res = self.simulate(LegacySGMGroundroll(ode_args=self.ode_args))
+
+        # groundroll ends at the rotation speed, well before the final time
+        assert_near_equal(res.x[-1, -1], 143.1 * 1.68781, 1e-6)
+        self.assertLess(res.t[-1], 100.)
+
+        assert_near_equal(res.t[-1], legacy_res.t[-1], 1e-8)
+        assert_near_equal(res.x[-1], legacy_res.x[-1], 1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
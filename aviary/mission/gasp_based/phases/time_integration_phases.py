@@ -47,14 +47,7 @@ class SGMGroundroll(SimuPyProblem):
         self.phase_name = phase_name
         self.VR_value = VR_value
         # self.VR_units = VR_units
-        self.event_channel_names = [Dynamic.Mission.VELOCITY]
-        self.num_events = len(self.event_channel_names)
-        # self.add_trigger(Dynamic.Mission.VELOCITY, "VR_value", units='ft/s')
-
-    def event_equation_function(self, t, x):
-        self.time = t
-        self.state = x
-        return self.get_val(Dynamic.Mission.VELOCITY, units='ft/s') - self.VR_value
+        self.add_trigger(Dynamic.Mission.VELOCITY, "VR_value", units='ft/s')
 
 
 class SGMRotation(SimuPyProblem):
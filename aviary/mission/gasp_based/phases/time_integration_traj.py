@@ -88,7 +88,7 @@ class FlexibleTraj(TimeIntegrationTrajBase):
 
             if next_problem is not None:
                 if type(current_problem) is SGMGroundroll:
-                    next_problem.prob.set_val("start_rotation", t_start_rotation)
+                    next_problem.set_val("start_rotation", t_start_rotation)
                 elif type(current_problem) is SGMRotation:
                     next_problem.rotation.set_val("start_rotation", t_start_rotation)
 
@@ -3,6 +3,7 @@ import numpy as np
 import openmdao.api as om
 from openmdao.components.interp_util.interp import InterpND
 
+from aviary.utils.data_interpolator_builder import precompute_table_coefficients
 from aviary.variable_info.functions import add_aviary_input
 from aviary.variable_info.variables import Aircraft, Dynamic, Mission
 
@@ -10,6 +11,11 @@ from aviary.variable_info.variables import Aircraft, Dynamic, Mission
 class CompressibilityDrag(om.ExplicitComponent):
     """
     Computes compressibility drag coefficient.
+
+    The drag tables are evaluated for all nodes in a single pass, each table at the
+    nodes where it applies, and the table values and derivatives are kept in buffers
+    shared by compute and compute_partials. The evaluation is skipped when none of the
+    inputs have changed since the last call.
     """
 
     def initialize(self):
@@ -46,6 +52,10 @@ class CompressibilityDrag(om.ExplicitComponent):
         self.add_output('compress_drag_coeff', shape=(nn, ), units='unitless',
                         desc="Drag coefficient due to compressibility.")
 
+        # table buffers, one set per dtype so that complex step does not invalidate
+        # the real-valued results
+        self._buffers = {}
+
     def setup_partials(self):
         nn = self.options["num_nodes"]
 
@@ -66,24 +76,45 @@ class CompressibilityDrag(om.ExplicitComponent):
         """
         Calculate compressibility drag.
         """
+        buffers = self._evaluate_tables(inputs)
 
-        del_mach = inputs[Dynamic.Mission.MACH] - inputs[Mission.Design.MACH]
+        outputs['compress_drag_coeff'] = buffers['compress_drag_coeff']
 
-        idx_super = np.where(del_mach > 0.05)
-        idx_sub = np.where(del_mach <= 0.05)
-        cdc_super = self._compute_supersonic(inputs, outputs, idx_super)
-        cdc_sub = self._compute_subsonic(inputs, outputs, idx_sub)
+    def _get_buffers(self, dtype):
+        """
+        Return the preallocated table buffers for the given dtype.
+        """
+        buffers = self._buffers.get(dtype)
 
-        outputs['compress_drag_coeff'][idx_super] = cdc_super
-        outputs['compress_drag_coeff'][idx_sub] = cdc_sub
+        if buffers is None:
+            nn = self.options["num_nodes"]
 
-    def _compute_supersonic(self, inputs, outputs, idx):
+            buffers = self._buffers[dtype] = {
+                'inputs': None,
+                'x': np.empty((nn, 2), dtype=dtype),
+                # table values and derivatives of the wing (PCW or PCAR), fuselage
+                # (BSUB or BSUP), and wing fuselage interference (WFI) drag
+                'CD': np.zeros((3, nn), dtype=dtype),
+                'dCD': np.zeros((3, nn, 2), dtype=dtype),
+                'compress_drag_coeff': np.empty(nn, dtype=dtype)}
+
+        return buffers
+
+    def _evaluate_tables(self, inputs):
         """
-        Calculate compressibility drag for supersonic speeds.
+        Evaluate all drag tables and the compressibility drag coefficient for all
+        nodes, unless the inputs are the same as in the previous evaluation.
         """
+        input_data = inputs.asarray()
+        buffers = self._get_buffers(input_data.dtype)
+
+        if buffers['inputs'] is not None and \
+                np.array_equal(buffers['inputs'], input_data):
+            return buffers
 
-        mach = inputs[Dynamic.Mission.MACH][idx]
-        nn = len(mach)
+        buffers['inputs'] = input_data.copy()
+
+        mach = inputs[Dynamic.Mission.MACH]
         del_mach = mach - inputs[Mission.Design.MACH]
         AR = inputs[Aircraft.Wing.ASPECT_RATIO]
         TC = inputs[Aircraft.Wing.THICKNESS_TO_CHORD]
@@ -96,143 +127,76 @@ class CompressibilityDrag(om.ExplicitComponent):
         fuselage_len_to_diam_ratio = inputs[Aircraft.Fuselage.LENGTH_TO_DIAMETER]
         diam_to_wing_span_ratio = inputs[Aircraft.Fuselage.DIAMETER_TO_WING_SPAN]
 
+        x = buffers['x']
+        CD = buffers['CD']
+        dCD = buffers['dCD']
+
+        subsonic = del_mach.real <= 0.05
+        supersonic = ~subsonic
+        buffers['subsonic'] = subsonic
+
+        # Wing contribution, subsonic (PCW) and supersonic (PCAR).
         ART = AR * np.tan(sweep25 / 57.2958) \
             + (1.0 - wing_taper_ratio) / (1.0 + wing_taper_ratio)
-        x = np.empty((nn, 2), dtype=mach.dtype)
-        x[:, 0] = del_mach
-        x[:, 1] = ART
-        CD3, self.dCD3 = PCARtable.interpolate(x, compute_derivative=True)
-
-        # Negative drag sometimes occurs due to overshoot in the table interp.
-        self.clamp_CD3 = np.where(CD3 <= 0)
-        CD3[self.clamp_CD3] = 0.0
-        self.dCD3[self.clamp_CD3] = 0.0
 
-        compress_drag_coeff = CD3 * (TC ** (5.0 / 3.0) * (1.0 + 0.1 * max_camber_70))
+        x[:, 0] = del_mach
+        x[:, 1] = np.where(subsonic, TC ** (2.0 / 3.0), ART)
+        _interpolate(PCWtable, x, subsonic, CD[0], dCD[0])
+        _interpolate(PCARtable, x, supersonic, CD[0], dCD[0])
 
-        # Contribution of fuselage.
+        # Contribution of fuselage, subsonic (BSUB) and supersonic (BSUP), and the
+        # wing fuselage interference (WFI), which is only present above Mach 1.
         if fuse_area > 0.0:
             SOS = 1.0 + base_area / fuse_area
             x[:, 0] = mach
             x[:, 1] = SOS
-            CD4, self.dCD4 = BSUPtable.interpolate(x, compute_derivative=True)
-
-            # Negative drag sometimes occurs due to overshoot in the table interp.
-            self.clamp_CD4 = np.where(CD4 <= 0)
-            CD4[self.clamp_CD4] = 0.0
-            self.dCD4[self.clamp_CD4] = 0.0
-
-            fuselage_compress_drag_coeff = CD4 * \
-                (fuse_area / wing_area * (1.0 / fuselage_len_to_diam_ratio ** 2))
-
-            compress_drag_coeff += fuselage_compress_drag_coeff
-
-            # Wing fuselage interference.
-            idx_mach = np.where(mach >= 1.0)
-            if len(idx_mach[0]) > 0:
-
-                x[:, 1] = diam_to_wing_span_ratio
-                CD5, self.dCD5 = WFITable.interpolate(
-                    x[idx_mach], compute_derivative=True)
-
-                # TODO: is this some kind of override?
-                if wing_taper_ratio == 1.0:
-                    wing_taper_ratio = 0.5
-
-                int_compress_drag_coeff = CD5 * (1.0 / (1.0 - wing_taper_ratio)
-                                                 / np.cos(sweep25 / 57.2958))
-
-                compress_drag_coeff[idx_mach] += int_compress_drag_coeff
+            _interpolate(BSUBtable, x, subsonic, CD[1], dCD[1])
+            _interpolate(BSUPtable, x, supersonic, CD[1], dCD[1])
 
-            else:
-                CD5 = np.zeros((nn), dtype=mach.dtype)
-                self.dCD5 = np.zeros((nn, 2), dtype=mach.dtype)
+            interference = supersonic & (mach.real >= 1.0)
+            x[:, 1] = diam_to_wing_span_ratio
+            CD[2] = 0.0
+            dCD[2] = 0.0
+            _interpolate(WFITable, x, interference, CD[2], dCD[2])
 
         else:
-            CD4 = np.zeros((nn), dtype=mach.dtype)
-            self.dCD4 = np.zeros((nn, 2), dtype=mach.dtype)
-            CD5 = np.zeros((nn), dtype=mach.dtype)
-            self.dCD5 = np.zeros((nn, 2), dtype=mach.dtype)
+            CD[1:] = 0.0
+            dCD[1:] = 0.0
+            interference = np.zeros(len(mach), dtype=bool)
 
-        self.CD3 = CD3
-        self.CD4 = CD4
-        self.CD5 = CD5
-        return compress_drag_coeff
-
-    def _compute_subsonic(self, inputs, outputs, idx):
-        """
-        Calculate compressibility drag for subsonic speeds.
-        """
-
-        mach = inputs[Dynamic.Mission.MACH][idx]
-        nn = len(mach)
-        del_mach = mach - inputs[Mission.Design.MACH]
-        TC = inputs[Aircraft.Wing.THICKNESS_TO_CHORD]
-        max_camber_70 = inputs[Aircraft.Wing.MAX_CAMBER_AT_70_SEMISPAN]
-        fuse_area = inputs[Aircraft.Fuselage.CROSS_SECTION]
-        base_area = inputs[Aircraft.Design.BASE_AREA]
-        wing_area = inputs[Aircraft.Wing.AREA]
-        fuselage_len_to_diam_ratio = inputs[Aircraft.Fuselage.LENGTH_TO_DIAMETER]
-
-        TOC = TC ** (2.0 / 3.0)
-        x = np.empty((nn, 2), dtype=mach.dtype)
-        x[:, 0] = del_mach
-        x[:, 1] = TOC
-        CD1, self.dCD1 = PCWtable.interpolate(x, compute_derivative=True)
+        buffers['interference'] = interference
 
         # Negative drag sometimes occurs due to overshoot in the table interp.
-        self.clamp_CD1 = np.where(CD1 <= 0)
-        CD1[self.clamp_CD1] = 0.0
-        self.dCD1[self.clamp_CD1] = 0.0
+        clamp = CD[:2].real <= 0
+        CD[:2][clamp] = 0.0
+        dCD[:2][clamp] = 0.0
 
-        compress_drag_coeff = CD1 * (TC ** (5.0 / 3.0) * (1.0 + 0.1 * max_camber_70))
+        CD_wing = CD[0]
+        CD_fuse = CD[1]
 
-        # Contribution of fuselage.
-        if fuse_area > 0.0:
-            SOS = 1.0 + base_area / fuse_area
-            x[:, 0] = mach
-            x[:, 1] = SOS
-            CD2, self.dCD2 = BSUBtable.interpolate(x, compute_derivative=True)
+        compress_drag_coeff = buffers['compress_drag_coeff']
+        compress_drag_coeff[:] = \
+            CD_wing * (TC ** (5.0 / 3.0) * (1.0 + 0.1 * max_camber_70))
 
-            # Negative drag sometimes occurs due to overshoot in the table interp.
-            self.clamp_CD2 = np.where(CD2 <= 0)
-            CD2[self.clamp_CD2] = 0.0
-            self.dCD2[self.clamp_CD2] = 0.0
-
-            fuselage_compress_drag_coeff = CD2 * \
+        if fuse_area > 0.0:
+            compress_drag_coeff += CD_fuse * \
                 (fuse_area / wing_area * (1.0 / fuselage_len_to_diam_ratio ** 2))
 
-            compress_drag_coeff += fuselage_compress_drag_coeff
+            # TODO: is this some kind of override?
+            if wing_taper_ratio == 1.0:
+                wing_taper_ratio = 0.5
 
-        else:
-            CD2 = np.zeros((nn), dtype=mach.dtype)
-            self.dCD2 = np.zeros((nn, 2), dtype=mach.dtype)
+            compress_drag_coeff[interference] += CD[2][interference] * \
+                (1.0 / (1.0 - wing_taper_ratio) / np.cos(sweep25 / 57.2958))
 
-        self.CD1 = CD1
-        self.CD2 = CD2
-        return compress_drag_coeff
+        return buffers
 
     def compute_partials(self, inputs, partials):
         """
         Calculate partials of compressibility drag.
-
-        :param inputs: _description_
-        :type inputs: _type_
-        :param partials: _description_
-        :type partials: _type_
         """
+        buffers = self._evaluate_tables(inputs)
 
-        del_mach = inputs[Dynamic.Mission.MACH] - inputs[Mission.Design.MACH]
-
-        idx_super = np.where(del_mach > 0.05)
-        idx_sub = np.where(del_mach <= 0.05)
-        self._compute_partials_supersonic(inputs, partials, idx_super)
-        self._compute_partials_subsonic(inputs, partials, idx_sub)
-
-    def _compute_partials_supersonic(self, inputs, partials, idx):
-
-        mach = inputs[Dynamic.Mission.MACH][idx]
-        nn = len(mach)
         AR = inputs[Aircraft.Wing.ASPECT_RATIO]
         TC = inputs[Aircraft.Wing.THICKNESS_TO_CHORD]
         max_camber_70 = inputs[Aircraft.Wing.MAX_CAMBER_AT_70_SEMISPAN]
@@ -243,222 +207,148 @@ class CompressibilityDrag(om.ExplicitComponent):
         wing_area = inputs[Aircraft.Wing.AREA]
         fuselage_len_to_diam_ratio = inputs[Aircraft.Fuselage.LENGTH_TO_DIAMETER]
 
-        CD3 = self.CD3
-        CD4 = self.CD4
-        CD5 = self.CD5
-
-        dCd3_dCD3 = TC ** (5.0 / 3.0) * (1.0 + max_camber_70 / 10.0)
-        dCd4_dCD4 = (fuse_area / wing_area) * (1.0 / fuselage_len_to_diam_ratio ** 2)
-        dCd5_dCD5 = 1.0 / (1.0 - wing_taper_ratio) / np.cos(sweep25 / 57.2958)
-
-        ddel_mach_ddesign_Mach = -1.0
-        ddel_mach_dMach = 1.0
+        subsonic = buffers['subsonic']
+        interference = buffers['interference']
+        CD = buffers['CD']
+        dCD = buffers['dCD']
+        CD_wing = CD[0]
+        CD_fuse = CD[1]
+
+        # Derivatives from table interpolation. The first input of the wing tables is
+        # del_mach, the second one is TOC (subsonic) or ART (supersonic).
+        dCD_wing_ddel_mach = dCD[0, :, 0]
+        dCD_wing_dTOC = np.where(subsonic, dCD[0, :, 1], 0.0)
+        dCD_wing_dART = np.where(subsonic, 0.0, dCD[0, :, 1])
+        dCD_fuse_dMach = dCD[1, :, 0]
+        dCD_fuse_dSOS = dCD[1, :, 1]
+
+        dCd_dCD_wing = TC ** (5.0 / 3.0) * (1.0 + 0.1 * max_camber_70)
+        dTOC_dTC = (2.0 / 3.0) * TC ** (-1.0 / 3.0)
 
-        # Derivatives from table interpolation
-        dCD3_ddel_mach = self.dCD3[:, 0]
-        dCD3_dART = self.dCD3[:, 1]
-        dCD4_dMach = self.dCD4[:, 0]
-        dCD4_dSOS = self.dCD4[:, 1]
-        dCD5_dMach = self.dCD5[:, 0]
-        dCD5_ddiam_to_wing_span_ratio = self.dCD5[:, 1]
+        dART_dAR = np.tan(sweep25 / 57.2958)
+        dART_dsweep25 = AR * (np.tan(sweep25 / 57.2958)**2 + 1) / 57.2958
+        dART_dwing_taper_ratio = -(1 - wing_taper_ratio) / (wing_taper_ratio + 1)**2 \
+            - 1.0 / (wing_taper_ratio + 1)
 
         # wrt Mach
-        dCd3_dMach = dCd3_dCD3 * dCD3_ddel_mach * ddel_mach_dMach
+        dCd_dMach = dCd_dCD_wing * dCD_wing_ddel_mach
 
         # wrt design_Mach
-        dCd_ddesign_Mach = dCd3_dCD3 * dCD3_ddel_mach * ddel_mach_ddesign_Mach
+        dCd_ddesign_Mach = -dCd_dCD_wing * dCD_wing_ddel_mach
 
         # wrt TC
-        dCd3_dTC = (5.0 / 3.0) * CD3 * TC**(2.0 / 3.0) * (1.0 + 0.1 * max_camber_70)
-        dCd_dTC = dCd3_dTC
+        dCd_dTC = (5.0 / 3.0) * CD_wing * TC**(2.0 / 3.0) * (1.0 + 0.1 * max_camber_70) \
+            + dCd_dCD_wing * dCD_wing_dTOC * dTOC_dTC
 
         # wrt max_camber_70
-        dCd3_dmax_camber_70 = 0.1 * CD3 * TC**(5.0 / 3.0)
-        dCd_dmax_camber_70 = dCd3_dmax_camber_70
+        dCd_dmax_camber_70 = 0.1 * CD_wing * TC**(5.0 / 3.0)
 
-        # wrt AR
-        dART_dAR = np.tan(sweep25 / 57.2958)
-        dCd_dAR = dCd3_dCD3 * dCD3_dART * dART_dAR
+        # wrt AR, SW25, and wing_taper_ratio
+        dCd_dART = dCd_dCD_wing * dCD_wing_dART
+        dCd_dAR = dCd_dART * dART_dAR
+        dCd_dsweep25 = dCd_dART * dART_dsweep25
+        dCd_dwing_taper_ratio = dCd_dART * dART_dwing_taper_ratio
 
-        dART_dwing_taper_ratio = -(1 - wing_taper_ratio) / (wing_taper_ratio + 1)**2 \
-            - 1.0 / (wing_taper_ratio + 1)
-
-        dART_dsweep25 = AR * (np.tan(sweep25 / 57.2958)**2 + 1) / 57.2958
-        dCd3_dsweep25 = dCd3_dCD3 * dCD3_dART * dART_dsweep25
-
-        dCd_ddiam_to_wing_span_ratio = 0
+        # wrt diam_to_wing_span_ratio
+        dCd_ddiam_to_wing_span_ratio = np.zeros_like(dCd_dMach)
 
         if fuse_area > 0.0:
+            dCd_dCD_fuse = fuse_area / wing_area * \
+                (1.0 / fuselage_len_to_diam_ratio ** 2)
 
             # wrt Mach
-            dCd4_dMach = dCd4_dCD4 * dCD4_dMach
-            dCd_dMach = dCd3_dMach + dCd4_dMach
+            dCd_dMach = dCd_dMach + dCd_dCD_fuse * dCD_fuse_dMach
 
             # wrt fuse_area
             dSOS_dfuse_area = -base_area / fuse_area**2
-            dCd4_dfuse_area = CD4 / (wing_area * fuselage_len_to_diam_ratio**2)
-            dCd_dfuse_area = dCd4_dfuse_area + dCd4_dCD4 * dCD4_dSOS * dSOS_dfuse_area
+            dCd_dfuse_area = CD_fuse / (wing_area * fuselage_len_to_diam_ratio**2) \
+                + dCd_dCD_fuse * dCD_fuse_dSOS * dSOS_dfuse_area
 
             # wrt base_area
             dSOS_dbase_area = 1.0 / fuse_area
-            dCd_dbase_area = dCd4_dCD4 * dCD4_dSOS * dSOS_dbase_area
+            dCd_dbase_area = dCd_dCD_fuse * dCD_fuse_dSOS * dSOS_dbase_area
 
             # wrt wing_area
-            dCd_dwing_area = -CD4 * fuse_area / \
+            dCd_dwing_area = -CD_fuse * fuse_area / \
                 (wing_area * fuselage_len_to_diam_ratio)**2
 
             # wrt fuselage_len_to_diam_ratio
-            dCd_dfuselage_len_to_diam_ratio = -2.0 * CD4 * fuse_area \
+            dCd_dfuselage_len_to_diam_ratio = -2.0 * CD_fuse * fuse_area \
                 / (wing_area * fuselage_len_to_diam_ratio**3)
 
-            # wrt diam_to_wing_span_ratio
-            dCd_ddiam_to_wing_span_ratio = np.zeros(dCd_dwing_area.shape,
-                                                    dtype=dCd_dwing_area.dtype)
+            # Wing fuselage interference.
+            if np.any(interference):
+                CD5 = CD[2][interference]
 
-            # wrt wing_taper_ratio
-            dCd_dwing_taper_ratio = dCd3_dCD3 * dCD3_dART * dART_dwing_taper_ratio
+                if wing_taper_ratio == 1.0:
+                    # the taper ratio is overridden by a constant value
+                    dCd5_dwing_taper_ratio = 0.0
+                    wing_taper_ratio = 0.5
 
-            # wrt SW25
-            dCd_dsweep25 = dCd3_dsweep25
+                else:
+                    dCd5_dwing_taper_ratio = CD5 / \
+                        ((1.0 - wing_taper_ratio)**2 * np.cos(sweep25 / 57.2958))
 
-            # Wing fuselage interference.
-            idx_mach = np.where(mach >= 1.0)
-            if len(idx_mach[0]) > 0:
+                dCd5_dCD5 = 1.0 / (1.0 - wing_taper_ratio) / np.cos(sweep25 / 57.2958)
 
-                dCd_dMach[idx_mach] += dCd5_dCD5 * dCD5_dMach
+                dCd_dMach[interference] += dCd5_dCD5 * dCD[2, interference, 0]
 
-                dCd5_dwing_taper_ratio = CD5 / \
-                    ((1.0 - wing_taper_ratio)**2 * np.cos(sweep25 / 57.2958))
-                dCd_dwing_taper_ratio[idx_mach] += dCd5_dwing_taper_ratio
+                dCd_dwing_taper_ratio[interference] += dCd5_dwing_taper_ratio
 
-                # wrt diam_to_wing_span_ratio
-                dCd_ddiam_to_wing_span_ratio[idx_mach] = dCd5_dCD5 * \
-                    dCD5_ddiam_to_wing_span_ratio
+                dCd_ddiam_to_wing_span_ratio[interference] = \
+                    dCd5_dCD5 * dCD[2, interference, 1]
 
-                dCd5_dsweep25 = CD5 * np.sin(sweep25 / 57.2958) / \
+                dCd_dsweep25[interference] += CD5 * np.sin(sweep25 / 57.2958) / \
                     (57.2958 * (1.0 - wing_taper_ratio) * np.cos(sweep25 / 57.2958)**2)
-                dCd_dsweep25[idx_mach] += dCd5_dsweep25
 
         else:
-
-            dCd_dMach = dCd3_dMach
             dCd_dfuse_area = 0.0
             dCd_dbase_area = 0.0
             dCd_dwing_area = 0.0
             dCd_dfuselage_len_to_diam_ratio = 0.0
-            dCd_dwing_taper_ratio = dCd3_dCD3 * dCD3_dART * dART_dwing_taper_ratio
-            dCd_dsweep25 = dCd3_dsweep25
 
-        partials["compress_drag_coeff", Dynamic.Mission.MACH][idx] = dCd_dMach
-        partials["compress_drag_coeff", Mission.Design.MACH][idx, 0] = dCd_ddesign_Mach
-        partials["compress_drag_coeff", Aircraft.Wing.THICKNESS_TO_CHORD][idx, 0] = dCd_dTC
-        partials["compress_drag_coeff",
-                 Aircraft.Wing.MAX_CAMBER_AT_70_SEMISPAN][idx, 0] = dCd_dmax_camber_70
+        partials["compress_drag_coeff", Dynamic.Mission.MACH] = dCd_dMach
+        partials["compress_drag_coeff", Mission.Design.MACH][:, 0] = dCd_ddesign_Mach
+        partials["compress_drag_coeff", Aircraft.Wing.THICKNESS_TO_CHORD][:, 0] = dCd_dTC
         partials["compress_drag_coeff",
-                 Aircraft.Fuselage.CROSS_SECTION][idx, 0] = dCd_dfuse_area
+                 Aircraft.Wing.MAX_CAMBER_AT_70_SEMISPAN][:, 0] = dCd_dmax_camber_70
         partials["compress_drag_coeff",
-                 Aircraft.Design.BASE_AREA][idx,
-                                            0] = dCd_dbase_area
-        partials["compress_drag_coeff", Aircraft.Wing.AREA][idx, 0] = dCd_dwing_area
+                 Aircraft.Fuselage.CROSS_SECTION][:, 0] = dCd_dfuse_area
+        partials["compress_drag_coeff", Aircraft.Design.BASE_AREA][:, 0] = dCd_dbase_area
+        partials["compress_drag_coeff", Aircraft.Wing.AREA][:, 0] = dCd_dwing_area
         partials["compress_drag_coeff",
-                 Aircraft.Fuselage.LENGTH_TO_DIAMETER][idx,
-                                                       0] = dCd_dfuselage_len_to_diam_ratio
+                 Aircraft.Fuselage.LENGTH_TO_DIAMETER][:, 0] = \
+            dCd_dfuselage_len_to_diam_ratio
         partials["compress_drag_coeff",
-                 Aircraft.Wing.TAPER_RATIO][idx, 0] = dCd_dwing_taper_ratio
-        partials["compress_drag_coeff", Aircraft.Wing.SWEEP][idx, 0] = dCd_dsweep25
-        partials["compress_drag_coeff", Aircraft.Wing.ASPECT_RATIO][idx, 0] = dCd_dAR
-        partials["compress_drag_coeff",
-                 Aircraft.Fuselage.DIAMETER_TO_WING_SPAN][idx,
-                                                          0] = dCd_ddiam_to_wing_span_ratio
-
-    def _compute_partials_subsonic(self, inputs, partials, idx):
-
-        mach = inputs[Dynamic.Mission.MACH][idx]
-        nn = len(mach)
-        TC = inputs[Aircraft.Wing.THICKNESS_TO_CHORD]
-        max_camber_70 = inputs[Aircraft.Wing.MAX_CAMBER_AT_70_SEMISPAN]
-        fuse_area = inputs[Aircraft.Fuselage.CROSS_SECTION]
-        base_area = inputs[Aircraft.Design.BASE_AREA]
-        wing_area = inputs[Aircraft.Wing.AREA]
-        fuselage_len_to_diam_ratio = inputs[Aircraft.Fuselage.LENGTH_TO_DIAMETER]
-        CD1 = self.CD1
-        CD2 = self.CD2
-
-        dCd1_dCD1 = TC ** (5.0 / 3.0) * (1.0 + 0.1 * max_camber_70)
-        dCd2_dCD2 = fuse_area / wing_area * (1.0 / fuselage_len_to_diam_ratio ** 2)
-        dTOC_dTC = (2.0 / 3.0) * TC ** (-1.0 / 3.0)
-
-        ddel_mach_dMach = 1.0
-
-        # Derivatives from table interpolation
-        dCD1_ddel_mach = self.dCD1[:, 0]
-        dCD1_dTOC = self.dCD1[:, 1]
-        dCD2_dMach = self.dCD2[:, 0]
-        dCD2_dSOS = self.dCD2[:, 1]
-
-        # wrt Mach
-        dCd1_dMach = dCd1_dCD1 * dCD1_ddel_mach * ddel_mach_dMach
-        dCd2_dMach = dCd2_dCD2 * dCD2_dMach
-        dCd_dMach = dCd1_dMach + dCd2_dMach
-
-        # wrt design_Mach
-        dCd_ddesign_Mach = -dCd1_dCD1 * dCD1_ddel_mach
-
-        # wrt TC
-        dCd1_dTC = (5.0 / 3.0) * CD1 * (1.0 + 0.1 * max_camber_70) * TC**(2.0 / 3.0)
-        dCD1_dTC = dCD1_dTOC * dTOC_dTC
-        dCd_dTC = dCd1_dTC + dCd1_dCD1 * dCD1_dTC
-
-        # wrt max_camber_70
-        dCd_dmax_camber_70 = CD1 * (1.0 / 10.0) * TC**(5.0 / 3.0)
-
-        partials["compress_drag_coeff", Dynamic.Mission.MACH][idx] = dCd_dMach
-        partials["compress_drag_coeff", Mission.Design.MACH][idx, 0] = dCd_ddesign_Mach
-        partials["compress_drag_coeff", Aircraft.Wing.THICKNESS_TO_CHORD][idx, 0] = dCd_dTC
+                 Aircraft.Wing.TAPER_RATIO][:, 0] = dCd_dwing_taper_ratio
+        partials["compress_drag_coeff", Aircraft.Wing.SWEEP][:, 0] = dCd_dsweep25
+        partials["compress_drag_coeff", Aircraft.Wing.ASPECT_RATIO][:, 0] = dCd_dAR
         partials["compress_drag_coeff",
-                 Aircraft.Wing.MAX_CAMBER_AT_70_SEMISPAN][idx, 0] = dCd_dmax_camber_70
+                 Aircraft.Fuselage.DIAMETER_TO_WING_SPAN][:, 0] = \
+            dCd_ddiam_to_wing_span_ratio
 
-        # Contribution of fuselage.
-        if fuse_area > 0.0:
 
-            dCd2_dfuse_area = CD2 / (wing_area * fuselage_len_to_diam_ratio**2)
-            dSOS_dfuse_area = -base_area / fuse_area**2
-            dCd_dfuse_area = dCd2_dfuse_area + dCd2_dCD2 * dCD2_dSOS * dSOS_dfuse_area
+def _interpolate(table, x, idx, values, derivs):
+    """
+    Interpolate the table at the points of x selected by the mask idx, and store the
+    results at the same positions of values and derivs.
+    """
+    x = x[idx]
+    num_points = len(x)
 
-            # wrt base_area
-            dSOS_dbase_area = 1.0 / fuse_area
-            dCd_dbase_area = dCd2_dCD2 * dCD2_dSOS * dSOS_dbase_area
+    if num_points == 0:
+        return
 
-            # wrt wing_area
-            dCd_dwing_area = -CD2 * fuse_area / \
-                (wing_area * fuselage_len_to_diam_ratio)**2
-
-            # wrt fuselage_len_to_diam_ratio
-            dCd_dfuselage_len_to_diam_ratio = -2.0 * CD2 * fuse_area \
-                / (wing_area * fuselage_len_to_diam_ratio**3)
+    precompute_table_coefficients(table)
 
-            partials["compress_drag_coeff",
-                     Aircraft.Fuselage.CROSS_SECTION][idx, 0] = dCd_dfuse_area
-            partials["compress_drag_coeff",
-                     Aircraft.Design.BASE_AREA][idx, 0] = dCd_dbase_area
-            partials["compress_drag_coeff", Aircraft.Wing.AREA][idx, 0] = dCd_dwing_area
-            partials["compress_drag_coeff",
-                     Aircraft.Fuselage.LENGTH_TO_DIAMETER][idx,
-                                                           0] = dCd_dfuselage_len_to_diam_ratio
+    # The tables cache their coefficients differently when interpolating a single
+    # point, and the two caches can not be mixed. Always interpolate multiple points.
+    if num_points == 1:
+        x = np.repeat(x, 2, axis=0)
 
-        else:
-            partials["compress_drag_coeff",
-                     Aircraft.Fuselage.CROSS_SECTION][idx, 0] = 0.0
-            partials["compress_drag_coeff", Aircraft.Design.BASE_AREA][idx, 0] = 0.0
-            partials["compress_drag_coeff", Aircraft.Wing.AREA][idx, 0] = 0.0
-            partials["compress_drag_coeff",
-                     Aircraft.Fuselage.LENGTH_TO_DIAMETER][idx, 0] = 0.0
-
-        partials["compress_drag_coeff", Aircraft.Wing.TAPER_RATIO][idx, 0] = 0.0
-        partials["compress_drag_coeff", Aircraft.Wing.SWEEP][idx, 0] = 0.0
-        partials["compress_drag_coeff", Aircraft.Wing.ASPECT_RATIO][idx, 0] = 0.0
-        partials["compress_drag_coeff",
-                 Aircraft.Fuselage.DIAMETER_TO_WING_SPAN][idx, 0] = 0.0
+    table_values, table_derivs = table.interpolate(x, compute_derivative=True)
+    values[idx] = table_values[:num_points]
+    derivs[idx] = table_derivs[:num_points]
 
 
 # Tables
@@ -547,13 +437,13 @@ WFI = np.array([[13010.0, .10, .120, .140, .150, .160, .170, .180, .190, .200, .
                 [1.900, 0.0, 0.0, .00000, .00060, .00090, .00100, .00100, .00090, .00080, .00050],
                 [2.000, 0.0, 0.0, .00000, .00050, .00090, .00110, .00100, .00090, .00070, .00050]])
 
-PCWtable = InterpND(method='lagrange2', points=(
+PCWtable = InterpND(method='2D-lagrange2', points=(
     PCW[1:, 0], PCW[0, 1:]), values=PCW[1:, 1:], extrapolate=True)
-BSUBtable = InterpND(method='lagrange2', points=(
+BSUBtable = InterpND(method='2D-lagrange2', points=(
     BSUB[1:, 0], BSUB[0, 1:]), values=BSUB[1:, 1:], extrapolate=True)
-PCARtable = InterpND(method='lagrange2', points=(
+PCARtable = InterpND(method='2D-lagrange2', points=(
     PCAR[1:, 0], PCAR[0, 1:]), values=PCAR[1:, 1:], extrapolate=True)
-BSUPtable = InterpND(method='lagrange2', points=(
+BSUPtable = InterpND(method='2D-lagrange2', points=(
     BSUP[1:, 0], BSUP[0, 1:]), values=BSUP[1:, 1:], extrapolate=True)
-WFITable = InterpND(method='lagrange2', points=(
+WFITable = InterpND(method='2D-lagrange2', points=(
     WFI[1:, 0], WFI[0, 1:]), values=WFI[1:, 1:], extrapolate=True)
@@ -14,7 +14,8 @@ from aviary.subsystems.aerodynamics.flops_based.lift import LiftEqualsWeight
 from aviary.subsystems.aerodynamics.flops_based.lift_dependent_drag import \
     LiftDependentDrag
 from aviary.subsystems.aerodynamics.flops_based.mux_component import MuxComponent
-from aviary.subsystems.aerodynamics.flops_based.skin_friction import SkinFriction
+from aviary.subsystems.aerodynamics.flops_based.skin_friction import (
+    ExplicitSkinFriction, SkinFriction)
 from aviary.subsystems.aerodynamics.flops_based.skin_friction_drag import \
     SkinFrictionDrag
 from aviary.utils.aviary_values import AviaryValues
@@ -33,6 +34,11 @@ class ComputedAeroGroup(om.Group):
         self.options.declare(
             'aviary_options', types=AviaryValues,
             desc='collection of Aircraft/Mission specific options')
+        self.options.declare(
+            'skin_friction_method', default='implicit',
+            values=['implicit', 'explicit'],
+            desc='Solve the skin friction equations with a Newton solver (implicit), '
+                 'or converge them inside the skin friction component (explicit)')
 
     def setup(self):
         num_nodes = self.options["num_nodes"]
@@ -101,7 +107,11 @@ class ComputedAeroGroup(om.Group):
                 Aircraft.Fuselage.DIAMETER_TO_WING_SPAN,
                 Aircraft.Fuselage.LENGTH_TO_DIAMETER])
 
-        comp = SkinFriction(num_nodes=num_nodes, aviary_options=aviary_options)
+        if self.options['skin_friction_method'] == 'explicit':
+            comp = ExplicitSkinFriction(
+                num_nodes=num_nodes, aviary_options=aviary_options)
+        else:
+            comp = SkinFriction(num_nodes=num_nodes, aviary_options=aviary_options)
         self.add_subsystem(
             'SkinFrictionCoef', comp,
             promotes_inputs=[
@@ -3,6 +3,7 @@ import numpy as np
 import openmdao.api as om
 from openmdao.components.interp_util.interp import InterpND
 
+from aviary.utils.data_interpolator_builder import precompute_table_coefficients
 from aviary.variable_info.functions import add_aviary_input
 from aviary.variable_info.variables import Aircraft, Dynamic, Mission
 
@@ -68,39 +69,85 @@ class LiftDependentDrag(om.ExplicitComponent):
         # Derivative of FCDP w.r.t A variable at value of A
         dFCDP_dA = 2.0 * FCDP1 * FCDP2 * (FCDP2 - FCDP1) * den ** 2
 
-        dFCDP_dDEL = 2.0 * den * (dFCDP1 * (FCDP2 - FCDP1 * FCDP2 * den * (A - A1)) +
-                                  dFCDP2 * (FCDP1 + FCDP1 * FCDP2 * den * (A - A2)))
+        dFCDP_dDEL1 = 2.0 * den * (FCDP2 - FCDP1 * FCDP2 * den * (A - A1))
+        dFCDP_dDEL2 = 2.0 * den * (FCDP1 + FCDP1 * FCDP2 * den * (A - A2))
+        dFCDP_dDEL = dFCDP1 * dFCDP_dDEL1[:, np.newaxis] + \
+            dFCDP2 * dFCDP_dDEL2[:, np.newaxis]
 
         return FCDP, dFCDP_dDEL[:, 0], dFCDP_dDEL[:, 1], dFCDP_dA
 
-    def inner_interp(self, arrA, FCDP1, FCDP2, FCDP3, FCDP4, FCDP5, dFCDP1, dFCDP2, dFCDP3, dFCDP4, dFCDP5, A):
+    def inner_interp(self, arrA, FCDP, dFCDP, A):
 
-        # Derivative of FCDP w.r.t A variable at value of A
-        arrFCDP = np.array([FCDP1, FCDP2, FCDP3, FCDP4, FCDP5])
-        arrFCDP = np.reshape(arrFCDP, (5))
-        interp_arrFCDP = InterpND(method='lagrange2', points=(arrA), values=arrFCDP)
-        FCDP, deriv = interp_arrFCDP.interpolate(A, compute_derivative=True)  # at A
-        dFCDP_dA = deriv[:, 0]  # at A
-
-        # Derivative of FCDP w.r.t DELM variable at value of A
-        arrdFCDP_dDELM = np.array(
-            [dFCDP1[:, 0], dFCDP2[:, 0], dFCDP3[:, 0], dFCDP4[:, 0], dFCDP5[:, 0]])
-        arrdFCDP_dDELM = np.reshape(arrdFCDP_dDELM, (5))
-        interp_arrdFCDP_dDELM = InterpND(
-            method='lagrange2', points=(arrA), values=arrdFCDP_dDELM)
-        dFCDP_dDELM, deriv = interp_arrdFCDP_dDELM.interpolate(
-            A, compute_derivative=True)  # at A
-
-        # Derivative of FCDP w.r.t DELCL variable at value of A
-        arrdFCDP_dDELCL = np.array(
-            [dFCDP1[:, 1], dFCDP2[:, 1], dFCDP3[:, 1], dFCDP4[:, 1], dFCDP5[:, 1]])
-        arrdFCDP_dDELCL = np.reshape(arrdFCDP_dDELCL, (5))
-        interp_arrdFCDP_dDELCL = InterpND(
-            method='lagrange2', points=(arrA), values=arrdFCDP_dDELCL)
-        dFCDP_dDELCL, deriv = interp_arrdFCDP_dDELCL.interpolate(
-            A, compute_derivative=True)  # at A
-
-        return FCDP[0], dFCDP_dDELM[0], dFCDP_dDELCL[0], dFCDP_dA[0]
+        # FCDP is a weighted sum of the table values, so the weights of each table at A
+        # (and their derivatives w.r.t. A) are found by interpolating unit values
+        weights = np.empty(len(arrA), dtype=A.dtype)
+        dweights_dA = np.empty(len(arrA), dtype=A.dtype)
+        for i, interp in enumerate(_weight_interps[tuple(arrA)]):
+            weight, deriv = interp.interpolate(A, compute_derivative=True)  # at A
+            weights[i] = weight[0]
+            dweights_dA[i] = deriv[0, 0]
+
+        dFCDP_dA = dweights_dA @ FCDP
+        dFCDP_dDELM = weights @ dFCDP[..., 0]
+        dFCDP_dDELCL = weights @ dFCDP[..., 1]
+        FCDP = weights @ FCDP
+
+        return FCDP, dFCDP_dDELM, dFCDP_dDELCL, dFCDP_dA
+
+    def select_tables(self, A, low_mach):
+        """
+        Return the values of the aspect ratio parameter A of the tables used at A, and
+        the tables, for Mach numbers up to 0.075 above design Mach (low_mach) or beyond.
+        """
+        if low_mach:
+
+            if A < 0.5:
+                return _AR_tables['edge_low']
+
+            elif 0.5 <= A < 6:
+                return _AR_tables['inner']
+
+            else:
+                return _AR_tables['edge_high']
+
+        else:
+
+            if A < 0.7:
+                return _ARS_tables['edge_low']
+
+            elif 0.7 <= A <= 1.4:
+                return _ARS_tables['inner_low']
+
+            elif 1.4 < A <= 2.0:
+                return _ARS_tables['inner_high']
+
+            else:
+                return _ARS_tables['edge_high']
+
+    def interp_tables(self, x, A, arrA, tables):
+        """
+        Interpolate FCDP and its derivatives at all points in x from the tables at the
+        given values of the aspect ratio parameter A (arrA).
+        """
+        num_points = len(x)
+        # The tables cache their coefficients differently when interpolating a single
+        # point, and the two caches can not be mixed. Always interpolate multiple points.
+        if num_points == 1:
+            x = np.repeat(x, 2, axis=0)
+
+        FCDP = np.empty((len(tables), num_points), dtype=x.dtype)
+        dFCDP = np.empty((len(tables), num_points, 2), dtype=x.dtype)
+        for i, table in enumerate(tables):
+            precompute_table_coefficients(table)
+            values, derivs = table.interpolate(x, compute_derivative=True)
+            FCDP[i] = values[:num_points]
+            dFCDP[i] = derivs[:num_points]
+
+        if len(tables) == 2:
+            return self.edge_interp(
+                arrA[0], arrA[1], FCDP[0], FCDP[1], dFCDP[0], dFCDP[1], A)
+
+        return self.inner_interp(arrA, FCDP, dFCDP, A)
 
     def compute(self, inputs, outputs):
         """
@@ -127,96 +174,16 @@ class LiftDependentDrag(om.ExplicitComponent):
         DELM = mach - MDES
         A = self.A = AR * TC ** (1.0/3.0)
 
-        for i in range(0, nn):
-
-            x = np.array([DELM[i], DELCL[i]])
-
-            if DELM[i].real <= 0.075:
-
-                if A.real < 0.5:
+        x = np.column_stack([DELM, DELCL])
+        low_mach = DELM.real <= 0.075
 
-                    FCDP1, dFCDP1 = AR05table.interpolate(x, compute_derivative=True)
-                    FCDP2, dFCDP2 = AR1table.interpolate(x, compute_derivative=True)
-
-                    A1 = 0.5
-                    A2 = 1.0
-                    FCDP[i], dFCDP_dDELM[i], dFCDP_dDELCL[i], dFCDP_dA[i] = self.edge_interp(
-                        A1, A2, FCDP1, FCDP2, dFCDP1, dFCDP2, A
-                    )
-
-                elif 0.5 <= A.real < 6:
-
-                    FCDP1, dFCDP1 = AR05table.interpolate(x, compute_derivative=True)
-                    FCDP2, dFCDP2 = AR1table.interpolate(x, compute_derivative=True)
-                    FCDP3, dFCDP3 = AR2table.interpolate(x, compute_derivative=True)
-                    FCDP4, dFCDP4 = AR4table.interpolate(x, compute_derivative=True)
-                    FCDP5, dFCDP5 = AR6table.interpolate(x, compute_derivative=True)
-
-                    arrA = np.array([0.5, 1, 2, 4, 6])
-                    FCDP[i], dFCDP_dDELM[i], dFCDP_dDELCL[i], dFCDP_dA[i] = self.inner_interp(
-                        arrA, FCDP1, FCDP2, FCDP3, FCDP4, FCDP5, dFCDP1, dFCDP2, dFCDP3, dFCDP4, dFCDP5, A
-                    )
-
-                else:
-
-                    FCDP1, dFCDP1 = AR4table.interpolate(x, compute_derivative=True)
-                    FCDP2, dFCDP2 = AR6table.interpolate(x, compute_derivative=True)
-
-                    A1 = 4.0
-                    A2 = 6.0
-                    FCDP[i], dFCDP_dDELM[i], dFCDP_dDELCL[i], dFCDP_dA[i] = self.edge_interp(
-                        A1, A2, FCDP1, FCDP2, dFCDP1, dFCDP2, A
-                    )
-
-            else:
-
-                if A.real < 0.7:
-
-                    FCDP1, dFCDP1 = ARS07table.interpolate(x, compute_derivative=True)
-                    FCDP2, dFCDP2 = ARS08table.interpolate(x, compute_derivative=True)
-
-                    A1 = 0.7
-                    A2 = 0.8
-                    FCDP[i], dFCDP_dDELM[i], dFCDP_dDELCL[i], dFCDP_dA[i] = self.edge_interp(
-                        A1, A2, FCDP1, FCDP2, dFCDP1, dFCDP2, A
-                    )
-
-                elif 0.7 <= A.real <= 1.4:
-
-                    FCDP1, dFCDP1 = ARS07table.interpolate(x, compute_derivative=True)
-                    FCDP2, dFCDP2 = ARS08table.interpolate(x, compute_derivative=True)
-                    FCDP3, dFCDP3 = ARS10table.interpolate(x, compute_derivative=True)
-                    FCDP4, dFCDP4 = ARS12table.interpolate(x, compute_derivative=True)
-                    FCDP5, dFCDP5 = ARS14table.interpolate(x, compute_derivative=True)
-
-                    arrA = np.array([0.7, 0.8, 1.0, 1.2, 1.4])
-                    FCDP[i], dFCDP_dDELM[i], dFCDP_dDELCL[i], dFCDP_dA[i] = self.inner_interp(
-                        arrA, FCDP1, FCDP2, FCDP3, FCDP4, FCDP5, dFCDP1, dFCDP2, dFCDP3, dFCDP4, dFCDP5, A
-                    )
-
-                elif 1.4 < A.real <= 2.0:
-
-                    FCDP1, dFCDP1 = ARS12table.interpolate(x, compute_derivative=True)
-                    FCDP2, dFCDP2 = ARS14table.interpolate(x, compute_derivative=True)
-                    FCDP3, dFCDP3 = ARS16table.interpolate(x, compute_derivative=True)
-                    FCDP4, dFCDP4 = ARS18table.interpolate(x, compute_derivative=True)
-                    FCDP5, dFCDP5 = ARS20table.interpolate(x, compute_derivative=True)
-
-                    arrA = np.array([1.2, 1.4, 1.6, 1.8, 2.0])
-                    FCDP[i], dFCDP_dDELM[i], dFCDP_dDELCL[i], dFCDP_dA[i] = self.inner_interp(
-                        arrA, FCDP1, FCDP2, FCDP3, FCDP4, FCDP5, dFCDP1, dFCDP2, dFCDP3, dFCDP4, dFCDP5, A
-                    )
-
-                else:
-
-                    FCDP1, dFCDP1 = ARS18table.interpolate(x, compute_derivative=True)
-                    FCDP2, dFCDP2 = ARS20table.interpolate(x, compute_derivative=True)
-
-                    A1 = 1.8
-                    A2 = 2.0
-                    FCDP[i], dFCDP_dDELM[i], dFCDP_dDELCL[i], dFCDP_dA[i] = self.edge_interp(
-                        A1, A2, FCDP1, FCDP2, dFCDP1, dFCDP2, A
-                    )
+        # all nodes in the same Mach range use the same tables, since A does not vary
+        # between nodes
+        for idx, is_low_mach in ((low_mach, True), (~low_mach, False)):
+            if np.any(idx):
+                arrA, tables = self.select_tables(A.real, is_low_mach)
+                FCDP[idx], dFCDP_dDELM[idx], dFCDP_dDELCL[idx], dFCDP_dA[idx] = \
+                    self.interp_tables(x[idx], A, arrA, tables)
 
         DCDP = FCDP * (1.0 + CAM/10.0) * A/AR
         self.clamp_indices = np.where(DCDP < 0)
@@ -591,29 +558,55 @@ ARS20 = np.array(
          0.084000,  0.108000,  0.131000,  0.210000,  0.290000],
      [1.100000,   0.000000,  0.003600,  0.022000,  0.048000,  0.075000,  0.102000,  0.128000,  0.155000,  0.269000,  0.375000]])
 
-AR05table = InterpND(method='lagrange2', points=(
+AR05table = InterpND(method='2D-lagrange2', points=(
     AR05[1:, 0], AR05[0, 1:]), values=AR05[1:, 1:], extrapolate=True)
-AR1table = InterpND(method='lagrange2', points=(
+AR1table = InterpND(method='2D-lagrange2', points=(
     AR1[1:, 0], AR1[0, 1:]), values=AR1[1:, 1:], extrapolate=True)
-AR2table = InterpND(method='lagrange2', points=(
+AR2table = InterpND(method='2D-lagrange2', points=(
     AR2[1:, 0], AR2[0, 1:]), values=AR2[1:, 1:], extrapolate=True)
-AR4table = InterpND(method='lagrange2', points=(
+AR4table = InterpND(method='2D-lagrange2', points=(
     AR4[1:, 0], AR4[0, 1:]), values=AR4[1:, 1:], extrapolate=True)
-AR6table = InterpND(method='lagrange2', points=(
+AR6table = InterpND(method='2D-lagrange2', points=(
     AR6[1:, 0], AR6[0, 1:]), values=AR6[1:, 1:], extrapolate=True)
-ARS07table = InterpND(method='lagrange2', points=(
+ARS07table = InterpND(method='2D-lagrange2', points=(
     ARS07[1:, 0], ARS07[0, 1:]), values=ARS07[1:, 1:], extrapolate=True)
-ARS08table = InterpND(method='lagrange2', points=(
+ARS08table = InterpND(method='2D-lagrange2', points=(
     ARS08[1:, 0], ARS08[0, 1:]), values=ARS08[1:, 1:], extrapolate=True)
-ARS10table = InterpND(method='lagrange2', points=(
+ARS10table = InterpND(method='2D-lagrange2', points=(
     ARS10[1:, 0], ARS10[0, 1:]), values=ARS10[1:, 1:], extrapolate=True)
-ARS12table = InterpND(method='lagrange2', points=(
+ARS12table = InterpND(method='2D-lagrange2', points=(
     ARS12[1:, 0], ARS12[0, 1:]), values=ARS12[1:, 1:], extrapolate=True)
-ARS14table = InterpND(method='lagrange2', points=(
+ARS14table = InterpND(method='2D-lagrange2', points=(
     ARS14[1:, 0], ARS14[0, 1:]), values=ARS14[1:, 1:], extrapolate=True)
-ARS16table = InterpND(method='lagrange2', points=(
+ARS16table = InterpND(method='2D-lagrange2', points=(
     ARS16[1:, 0], ARS16[0, 1:]), values=ARS16[1:, 1:], extrapolate=True)
-ARS18table = InterpND(method='lagrange2', points=(
+ARS18table = InterpND(method='2D-lagrange2', points=(
     ARS18[1:, 0], ARS18[0, 1:]), values=ARS18[1:, 1:], extrapolate=True)
-ARS20table = InterpND(method='lagrange2', points=(
+ARS20table = InterpND(method='2D-lagrange2', points=(
     ARS20[1:, 0], ARS20[0, 1:]), values=ARS20[1:, 1:], extrapolate=True)
+
+# Tables of FCDP blended by LiftDependentDrag for each range of A, with the value of A
+# of each table
+_AR_tables = {
+    'edge_low': (np.array([0.5, 1.0]), (AR05table, AR1table)),
+    'inner': (np.array([0.5, 1.0, 2.0, 4.0, 6.0]),
+              (AR05table, AR1table, AR2table, AR4table, AR6table)),
+    'edge_high': (np.array([4.0, 6.0]), (AR4table, AR6table)),
+}
+
+_ARS_tables = {
+    'edge_low': (np.array([0.7, 0.8]), (ARS07table, ARS08table)),
+    'inner_low': (np.array([0.7, 0.8, 1.0, 1.2, 1.4]),
+                  (ARS07table, ARS08table, ARS10table, ARS12table, ARS14table)),
+    'inner_high': (np.array([1.2, 1.4, 1.6, 1.8, 2.0]),
+                   (ARS12table, ARS14table, ARS16table, ARS18table, ARS20table)),
+    'edge_high': (np.array([1.8, 2.0]), (ARS18table, ARS20table)),
+}
+
+# interpolants of the weight of each table over A, used by LiftDependentDrag.inner_interp
+_weight_interps = {
+    tuple(arrA): [InterpND(method='lagrange2', points=arrA, values=unit)
+                  for unit in np.eye(len(arrA))]
+    for arrA, tables in (*_AR_tables.values(), *_ARS_tables.values())
+    if len(tables) > 2
+}
@@ -5,28 +5,16 @@ from aviary.utils.aviary_values import AviaryValues
 from aviary.variable_info.variables import Aircraft, Dynamic
 
 
-class SkinFriction(om.ImplicitComponent):
+class _SkinFrictionEquations:
     """
-    Computes skin friction coefficient using the Sommer and Short T Prime method as used
-    in FLOPS AERSCL.
-
-    The fixed-point iteration scheme has been replaced with Newton's method, which can
-    converge the equations for multiple mach numbers and characteristic lengths
-    simultaneously.
+    Options, variables and equations shared by SkinFriction and ExplicitSkinFriction.
     """
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    CONLOG = 2.302585
+    sea_level_pressure = 14.6959 * 144  # psi -> psf
 
-        self.CONLOG = 2.302585
-        self.TAW = 1.0
-        self.sea_level_pressure = 14.6959 * 144  # psi -> psf
-
-        self.nonlinear_solver = om.NewtonSolver(solve_subsystems=False,
-                                                atol=1e-12, rtol=1e-12)
-        self.linear_solver = om.DirectSolver()
-        self.nonlinear_solver.options['iprint'] = -1
-        self.linear_solver.options['iprint'] = -1
+    # adiabatic wall temperature, set by the initial guess
+    TAW = 1.0
 
     def initialize(self):
         """
@@ -65,44 +53,10 @@ class SkinFriction(om.ImplicitComponent):
         self.add_output('Re', np.ones((nn, nc)), units='unitless', res_ref=1e6)
         self.add_output('wall_temp', np.ones((nn, nc)), units='degR')
 
-    def setup_partials(self):
-        nn = self.options["num_nodes"]
-        nc = self.nc
-        n = nn * nc
-
-        row_col = np.arange(n)
-        self.declare_partials('Re', 'Re', rows=row_col, cols=row_col, val=1.0)
-        self.declare_partials(
-            'skin_friction_coeff', 'skin_friction_coeff',
-            rows=row_col, cols=row_col, val=1.0)
-
-        self.declare_partials(
-            'cf_iter', ['wall_temp', 'cf_iter'], rows=row_col, cols=row_col)
-        self.declare_partials(
-            'wall_temp', ['wall_temp', 'cf_iter'], rows=row_col, cols=row_col)
-        self.declare_partials(
-            'skin_friction_coeff', ['wall_temp', 'cf_iter'], rows=row_col, cols=row_col)
-
-        col = np.arange(nn)
-        cols = np.repeat(col, nc)
-        self.declare_partials(
-            'cf_iter', [Dynamic.Mission.TEMPERATURE, Dynamic.Mission.STATIC_PRESSURE, Dynamic.Mission.MACH], rows=row_col, cols=cols)
-        self.declare_partials(
-            'wall_temp', [Dynamic.Mission.TEMPERATURE, Dynamic.Mission.STATIC_PRESSURE, Dynamic.Mission.MACH], rows=row_col, cols=cols)
-        self.declare_partials(
-            'Re', [Dynamic.Mission.TEMPERATURE, Dynamic.Mission.STATIC_PRESSURE, Dynamic.Mission.MACH], rows=row_col, cols=cols)
-        self.declare_partials(
-            'skin_friction_coeff', [Dynamic.Mission.TEMPERATURE,
-                                    Dynamic.Mission.STATIC_PRESSURE, Dynamic.Mission.MACH],
-            rows=row_col, cols=cols)
-
-        col = np.arange(nc)
-        cols = np.tile(col, nn)
-        self.declare_partials('Re', 'characteristic_lengths', rows=row_col, cols=cols)
-        self.declare_partials(
-            'cf_iter', 'characteristic_lengths', rows=row_col, cols=cols)
-
-    def guess_nonlinear(self, inputs, outputs, resids):
+    def _guess_states(self, inputs, outputs):
+        """
+        Set the initial guess of the outputs, and the adiabatic wall temperature.
+        """
         nn = self.options["num_nodes"]
         nc = self.nc
 
@@ -125,7 +79,10 @@ class SkinFriction(om.ImplicitComponent):
         # INITIAL GUESS AT SKIN FRICTION COEFFICIENT
         outputs['cf_iter'] = (0.242 / (np.log(reynolds_num * 0.0015) / self.CONLOG)) ** 2
 
-    def apply_nonlinear(self, inputs, outputs, residuals):
+    def _compute_residuals(self, inputs, outputs, residuals):
+        """
+        Compute the residuals of the skin friction equations.
+        """
         T, pressure, mach, length = inputs.values()
         cf = outputs['cf_iter']
         wall_temp = outputs['wall_temp']
@@ -167,7 +124,11 @@ class SkinFriction(om.ImplicitComponent):
         residuals['skin_friction_coeff'] = \
             outputs['skin_friction_coeff'] - outputs['cf_iter'] / wall_temp_ratio
 
-    def linearize(self, inputs, outputs, partials):
+    def _compute_residual_partials(self, inputs, outputs, partials):
+        """
+        Compute the partials of the residuals of the skin friction equations, with the
+        adiabatic wall temperature held constant.
+        """
         nn = self.options["num_nodes"]
         nc = self.nc
 
@@ -277,3 +238,226 @@ class SkinFriction(om.ImplicitComponent):
         partials['skin_friction_coeff', 'wall_temp'] = np.einsum(
             'ij,i->ij', dskf_dwtr, dwtr_dwt).ravel()
         partials['skin_friction_coeff', 'cf_iter'] = (- 1.0 / wall_temp_ratio).ravel()
+
+
+class SkinFriction(_SkinFrictionEquations, om.ImplicitComponent):
+    """
+    Computes skin friction coefficient using the Sommer and Short T Prime method as used
+    in FLOPS AERSCL.
+
+    The fixed-point iteration scheme has been replaced with Newton's method, which can
+    converge the equations for multiple mach numbers and characteristic lengths
+    simultaneously.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.nonlinear_solver = om.NewtonSolver(solve_subsystems=False,
+                                                atol=1e-12, rtol=1e-12)
+        self.linear_solver = om.DirectSolver()
+        self.nonlinear_solver.options['iprint'] = -1
+        self.linear_solver.options['iprint'] = -1
+
+    def setup_partials(self):
+        nn = self.options["num_nodes"]
+        nc = self.nc
+        n = nn * nc
+
+        row_col = np.arange(n)
+        self.declare_partials('Re', 'Re', rows=row_col, cols=row_col, val=1.0)
+        self.declare_partials(
+            'skin_friction_coeff', 'skin_friction_coeff',
+            rows=row_col, cols=row_col, val=1.0)
+
+        self.declare_partials(
+            'cf_iter', ['wall_temp', 'cf_iter'], rows=row_col, cols=row_col)
+        self.declare_partials(
+            'wall_temp', ['wall_temp', 'cf_iter'], rows=row_col, cols=row_col)
+        self.declare_partials(
+            'skin_friction_coeff', ['wall_temp', 'cf_iter'], rows=row_col, cols=row_col)
+
+        col = np.arange(nn)
+        cols = np.repeat(col, nc)
+        self.declare_partials(
+            'cf_iter', [Dynamic.Mission.TEMPERATURE, Dynamic.Mission.STATIC_PRESSURE, Dynamic.Mission.MACH], rows=row_col, cols=cols)
+        self.declare_partials(
+            'wall_temp', [Dynamic.Mission.TEMPERATURE, Dynamic.Mission.STATIC_PRESSURE, Dynamic.Mission.MACH], rows=row_col, cols=cols)
+        self.declare_partials(
+            'Re', [Dynamic.Mission.TEMPERATURE, Dynamic.Mission.STATIC_PRESSURE, Dynamic.Mission.MACH], rows=row_col, cols=cols)
+        self.declare_partials(
+            'skin_friction_coeff', [Dynamic.Mission.TEMPERATURE,
+                                    Dynamic.Mission.STATIC_PRESSURE, Dynamic.Mission.MACH],
+            rows=row_col, cols=cols)
+
+        col = np.arange(nc)
+        cols = np.tile(col, nn)
+        self.declare_partials('Re', 'characteristic_lengths', rows=row_col, cols=cols)
+        self.declare_partials(
+            'cf_iter', 'characteristic_lengths', rows=row_col, cols=cols)
+
+    def guess_nonlinear(self, inputs, outputs, resids):
+        self._guess_states(inputs, outputs)
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        self._compute_residuals(inputs, outputs, residuals)
+
+    def linearize(self, inputs, outputs, partials):
+        self._compute_residual_partials(inputs, outputs, partials)
+
+
+class ExplicitSkinFriction(_SkinFrictionEquations, om.ExplicitComponent):
+    """
+    Computes skin friction coefficient with the same equations and variables as
+    SkinFriction, without a nonlinear solver.
+
+    The equations are converged inside the component with a vectorized Newton iteration
+    for each mach number and characteristic length, starting from the solution of the
+    previous evaluation when one is available. Partials come from implicit
+    differentiation of the converged equations.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.max_iter = 30
+        self.tol = 1e-13
+        # converged wall temperature and skin friction coefficient of the last
+        # evaluation with real inputs
+        self._solution = None
+
+    def setup_partials(self):
+        nn = self.options["num_nodes"]
+        nc = self.nc
+        n = nn * nc
+
+        row_col = np.arange(n)
+        outputs = ['cf_iter', 'skin_friction_coeff', 'Re', 'wall_temp']
+
+        self.declare_partials(
+            outputs,
+            [Dynamic.Mission.TEMPERATURE, Dynamic.Mission.STATIC_PRESSURE,
+             Dynamic.Mission.MACH],
+            rows=row_col, cols=np.repeat(np.arange(nn), nc))
+
+        self.declare_partials(
+            outputs, 'characteristic_lengths',
+            rows=row_col, cols=np.tile(np.arange(nc), nn))
+
+    def compute(self, inputs, outputs):
+        # initial guess, which also sets the adiabatic wall temperature
+        states = {'skin_friction_coeff': 0.0}
+        self._guess_states(inputs, states)
+        guess = (states['wall_temp'], states['cf_iter'])
+
+        converged = False
+        if self._solution is not None:
+            states['wall_temp'], states['cf_iter'] = self._solution
+            converged = self._solve(inputs, states)
+
+        if not converged:
+            states['wall_temp'], states['cf_iter'] = guess
+            if not self._solve(inputs, states):
+                raise om.AnalysisError(
+                    f'{self.msginfo}: skin friction coefficient failed to converge in '
+                    f'{self.max_iter} iterations.')
+
+        residuals = {}
+        self._compute_residuals(inputs, states, residuals)
+
+        if np.isrealobj(states['cf_iter']):
+            self._solution = (states['wall_temp'], states['cf_iter'])
+
+        outputs['cf_iter'] = states['cf_iter']
+        outputs['wall_temp'] = states['wall_temp']
+        outputs['Re'] = states['Re']
+        # residual is skin_friction_coeff - cf_iter / wall_temp_ratio
+        outputs['skin_friction_coeff'] = -residuals['skin_friction_coeff']
+
+    def compute_partials(self, inputs, partials):
+        if self._solution is None:
+            # no evaluation with real inputs yet, converge the equations first
+            self.compute(inputs, {})
+
+        wall_temp, cf = self._solution
+        states = {'skin_friction_coeff': 0.0}
+        self._guess_states(inputs, states)
+        states['wall_temp'] = wall_temp
+        states['cf_iter'] = cf
+
+        residuals = {}
+        res_partials = {}
+        self._compute_residuals(inputs, states, residuals)
+        self._compute_residual_partials(inputs, states, res_partials)
+
+        # The adiabatic wall temperature is held constant by SkinFriction, but it
+        # depends on temperature and mach number
+        T = inputs[Dynamic.Mission.TEMPERATURE]
+        mach = inputs[Dynamic.Mission.MACH]
+        dreswt_dTAW = ((residuals['wall_temp'] + 0.5 * wall_temp) / self.TAW).ravel()
+        res_partials['wall_temp', Dynamic.Mission.TEMPERATURE] = \
+            res_partials['wall_temp', Dynamic.Mission.TEMPERATURE] \
+            + dreswt_dTAW * np.repeat(1.0 + 0.176 * mach * mach, self.nc)
+        res_partials['wall_temp', Dynamic.Mission.MACH] = \
+            res_partials['wall_temp', Dynamic.Mission.MACH] \
+            + dreswt_dTAW * np.repeat(0.352 * mach * T, self.nc)
+
+        # partials of the wall temperature and skin friction coefficient residuals
+        # w.r.t. the wall temperature and skin friction coefficient at each point
+        a = res_partials['wall_temp', 'wall_temp']
+        b = res_partials['wall_temp', 'cf_iter']
+        c = res_partials['cf_iter', 'wall_temp']
+        d = res_partials['cf_iter', 'cf_iter']
+        det = a * d - b * c
+
+        for wrt in (Dynamic.Mission.TEMPERATURE, Dynamic.Mission.STATIC_PRESSURE,
+                    Dynamic.Mission.MACH, 'characteristic_lengths'):
+            dreswt = res_partials.get(('wall_temp', wrt), 0.0)
+            drescf = res_partials.get(('cf_iter', wrt), 0.0)
+
+            dwt = -(d * dreswt - b * drescf) / det
+            dcf = -(a * drescf - c * dreswt) / det
+
+            partials['wall_temp', wrt] = dwt
+            partials['cf_iter', wrt] = dcf
+            partials['Re', wrt] = -res_partials['Re', wrt]
+            partials['skin_friction_coeff', wrt] = -(
+                res_partials.get(('skin_friction_coeff', wrt), 0.0)
+                + res_partials['skin_friction_coeff', 'wall_temp'] * dwt
+                + res_partials['skin_friction_coeff', 'cf_iter'] * dcf)
+
+    def _solve(self, inputs, states):
+        """
+        Converge the wall temperature and skin friction coefficient in states with
+        Newton's method, independently at each point. Return whether it converged.
+        """
+        shape = states['cf_iter'].shape
+        residuals = {}
+        partials = {}
+
+        for _ in range(self.max_iter):
+            self._compute_residuals(inputs, states, residuals)
+            self._compute_residual_partials(inputs, states, partials)
+
+            a = partials['wall_temp', 'wall_temp'].reshape(shape)
+            b = partials['wall_temp', 'cf_iter'].reshape(shape)
+            c = partials['cf_iter', 'wall_temp'].reshape(shape)
+            d = partials['cf_iter', 'cf_iter'].reshape(shape)
+            det = a * d - b * c
+
+            reswt = residuals['wall_temp']
+            rescf = residuals['cf_iter']
+            dwt = (d * reswt - b * rescf) / det
+            dcf = (a * rescf - c * reswt) / det
+
+            wall_temp = states['wall_temp'] = states['wall_temp'] - dwt
+            cf = states['cf_iter'] = states['cf_iter'] - dcf
+
+            if not (np.all(np.isfinite(cf)) and np.all(cf.real > 0.0)):
+                return False
+
+            if np.all(np.abs(dwt) <= self.tol * np.abs(wall_temp)) and \
+                    np.all(np.abs(dcf) <= self.tol * np.abs(cf)):
+                return True
+
+        return False
@@ -20,6 +20,10 @@ class SolvedAlphaGroup(om.Group):
 
     The aerodynamics data can come from a file or can come from the output of
     a component in the aviary pre_mission group.
+
+    Each solve starts from the angle of attack found by inverting the lift table
+    at the lift coefficient needed at each node, corrected by the error of that
+    estimate in the previous solve.
     """
 
     def initialize(self):
@@ -92,8 +96,129 @@ class SolvedAlphaGroup(om.Group):
                                             ('computed_lift', Dynamic.Mission.LIFT)]
                            )
 
+        # inverse lift table estimate of alpha in the previous solve
+        self._alpha_estimate = None
+
         self.linear_solver = om.DirectSolver()
         newton = self.nonlinear_solver = om.NewtonSolver(solve_subsystems=True)
         newton.options['iprint'] = 2
         newton.options['atol'] = 1e-9
         newton.options['rtol'] = 1e-12
+
+    def guess_nonlinear(self, inputs, outputs, residuals):
+        if self.under_complex_step or not self.options['structured']:
+            return
+
+        mass = inputs[Dynamic.Mission.MASS]
+        weight = mass * grav_metric
+
+        # lift coefficient needed to balance the weight
+        units = self._guess_units()
+        gamma = self.DynamicPressure.options['gamma']
+        pressure = om.convert_units(
+            inputs[Dynamic.Mission.STATIC_PRESSURE],
+            units[Dynamic.Mission.STATIC_PRESSURE], 'N/m**2')
+        wing_area = om.convert_units(
+            inputs[Aircraft.Wing.AREA], units[Aircraft.Wing.AREA], 'm**2')
+        mach = inputs['DynamicPressure.' + Dynamic.Mission.MACH]
+        CL = weight / (0.5 * gamma * pressure * mach**2 * wing_area)
+
+        alpha_estimate = self._invert_lift_table(inputs, CL)
+
+        alpha = alpha_estimate
+        prev_estimate = self._alpha_estimate
+
+        if prev_estimate is not None and \
+                np.all(np.abs(residuals['balance.alpha']) <= 1e-6 * weight):
+            # The previous solve converged, correct for the error of its estimate. This
+            # error changes slowly between optimizer iterations.
+            alpha = alpha + (outputs['balance.alpha'] - prev_estimate)
+
+        self._alpha_estimate = alpha_estimate
+        outputs['balance.alpha'] = alpha
+
+    def _guess_units(self):
+        """
+        Return the units of the inputs used by guess_nonlinear, by promoted name.
+        """
+        units = getattr(self, '_guess_input_units', None)
+
+        if units is None:
+            meta = self.get_io_metadata(iotypes='input', metadata_keys=['units'])
+            units = self._guess_input_units = {
+                data['prom_name']: data['units'] for data in meta.values()}
+
+        return units
+
+    def _invert_lift_table(self, inputs, CL):
+        """
+        Return the angle of attack (deg) at which the lift table reaches the given lift
+        coefficient at each node. The table is linearly interpolated in altitude and
+        Mach, and only its part up to the maximum lift coefficient is used, where it is
+        monotone in alpha.
+        """
+        interp_comp = self.tabular_aero.free_aero_interp
+        if not self.options['training_data']:
+            # the table interpolator is grouped with the CL max interpolator
+            interp_comp = interp_comp.free_aero_interp
+            lift_table = interp_comp.training_outputs['lift_coefficient']
+        else:
+            lift_table = inputs[Aircraft.Design.LIFT_POLAR]
+
+        pnames = interp_comp.pnames
+        axes = [pnames.index(name) for name in
+                (Dynamic.Mission.ALTITUDE, Dynamic.Mission.MACH, 'angle_of_attack')]
+        altitude_grid, mach_grid, alpha_grid = [interp_comp.inputs[i] for i in axes]
+        lift_table = np.transpose(lift_table, axes)
+
+        alpha_grid = om.convert_units(
+            np.asarray(alpha_grid, dtype=float),
+            self._guess_units()['tabular_aero.alpha'], 'deg')
+
+        # lift curves at the altitude and Mach number of each node
+        i_alt, w_alt = _linear_weights(altitude_grid, inputs[Dynamic.Mission.ALTITUDE])
+        i_mach, w_mach = _linear_weights(
+            mach_grid, inputs['DynamicPressure.' + Dynamic.Mission.MACH])
+
+        w_alt = w_alt[:, np.newaxis]
+        w_mach = w_mach[:, np.newaxis]
+        lift_curves = \
+            (1.0 - w_alt) * (1.0 - w_mach) * lift_table[i_alt, i_mach] + \
+            (1.0 - w_alt) * w_mach * lift_table[i_alt, i_mach + 1] + \
+            w_alt * (1.0 - w_mach) * lift_table[i_alt + 1, i_mach] + \
+            w_alt * w_mach * lift_table[i_alt + 1, i_mach + 1]
+
+        # past the maximum lift coefficient, hold it for the rest of the curve
+        lift_curves = np.maximum.accumulate(lift_curves, axis=1)
+        CL = CL[:, np.newaxis]
+
+        # segment of each lift curve containing CL, extrapolated at either end
+        idx = np.sum(lift_curves < CL, axis=1) - 1
+        idx = np.clip(idx, 0, len(alpha_grid) - 2)[:, np.newaxis]
+
+        CL_0 = np.take_along_axis(lift_curves, idx, axis=1)
+        dCL = np.take_along_axis(lift_curves, idx + 1, axis=1) - CL_0
+        alpha_0 = alpha_grid[idx]
+        dalpha = alpha_grid[idx + 1] - alpha_0
+
+        # CL is above the maximum lift coefficient, use the angle of attack at stall
+        alpha_stall = alpha_grid[np.argmax(lift_curves, axis=1)][:, np.newaxis]
+
+        valid = dCL > 0.0
+        alpha = np.where(
+            valid, alpha_0 + (CL - CL_0) * dalpha / np.where(valid, dCL, 1.0),
+            alpha_stall)
+
+        return alpha[:, 0]
+
+
+def _linear_weights(grid, x):
+    """
+    Return the index of the lower grid point of the interval containing each x, and the
+    weight of the upper grid point for linear interpolation (or extrapolation).
+    """
+    grid = np.asarray(grid, dtype=float)
+    idx = np.clip(np.searchsorted(grid, x) - 1, 0, len(grid) - 2)
+    weight = (x - grid[idx]) / (grid[idx + 1] - grid[idx])
+
+    return idx, weight
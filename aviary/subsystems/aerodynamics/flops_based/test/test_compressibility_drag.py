@@ -2,7 +2,7 @@ import unittest
 
 import numpy as np
 import openmdao.api as om
-from openmdao.utils.assert_utils import assert_check_partials
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
 
 from aviary.subsystems.aerodynamics.flops_based.compressibility_drag import \
     CompressibilityDrag
@@ -59,6 +59,66 @@ class CompressibilityDragTest(unittest.TestCase):
         # TODO: need to test outputs too
         assert_check_partials(derivs, atol=1e-12, rtol=1e-12)
 
+    def test_input_changes(self):
+        # Table results are reused while the inputs do not change, make sure that they
+        # are updated when they do.
+        mach = np.array([.5, .79, .85, .9, 1.05, 1.2]) + 1e-5
+        nn = len(mach)
+
+        prob = self._setup_problem(nn)
+        prob.set_val('mach', mach)
+        prob.run_model()
+
+        prob.set_val(Aircraft.Wing.THICKNESS_TO_CHORD, 0.11)
+        prob.set_val(Aircraft.Fuselage.CROSS_SECTION, 100.0)
+        prob.set_val(Aircraft.Wing.AREA, 1200.0)
+        prob.run_model()
+
+        expected = self._setup_problem(nn)
+        expected.set_val('mach', mach)
+        expected.set_val(Aircraft.Wing.THICKNESS_TO_CHORD, 0.11)
+        expected.set_val(Aircraft.Fuselage.CROSS_SECTION, 100.0)
+        expected.set_val(Aircraft.Wing.AREA, 1200.0)
+        expected.run_model()
+
+        assert_near_equal(
+            prob.get_val('compress_drag_coeff'),
+            expected.get_val('compress_drag_coeff'), 1e-15)
+
+        derivs = prob.check_partials(out_stream=None, method="cs")
+        assert_check_partials(derivs, atol=1e-12, rtol=1e-12)
+
+    def test_single_node(self):
+        for mach in (.6, 1.1):
+            with self.subTest(mach=mach):
+                prob = self._setup_problem(1)
+                prob.set_val('mach', mach + 1e-5)
+                prob.run_model()
+
+                derivs = prob.check_partials(out_stream=None, method="cs")
+                assert_check_partials(derivs, atol=1e-12, rtol=1e-12)
+
+    def _setup_problem(self, nn):
+        prob = om.Problem()
+        prob.model.add_subsystem(
+            'drag', CompressibilityDrag(num_nodes=nn), promotes=['*'])
+
+        prob.setup(force_alloc_complex=True)
+
+        prob.set_val(Mission.Design.MACH, .8 - 1e-5)
+        prob.set_val(Aircraft.Wing.THICKNESS_TO_CHORD, 0.13)
+        prob.set_val(Aircraft.Fuselage.CROSS_SECTION, 128.2)
+        prob.set_val(Aircraft.Design.BASE_AREA, 0.01)
+        prob.set_val(Aircraft.Wing.AREA, 1370.0)
+        prob.set_val(Aircraft.Wing.TAPER_RATIO, 0.432)
+        prob.set_val(Aircraft.Wing.ASPECT_RATIO, 11.5)
+        prob.set_val(Aircraft.Wing.SWEEP, 25.07)
+        prob.set_val(Aircraft.Fuselage.DIAMETER_TO_WING_SPAN, 0.15 + 1e-5)
+        prob.set_val(Aircraft.Fuselage.LENGTH_TO_DIAMETER, 10.12345)
+        prob.set_val(Aircraft.Wing.MAX_CAMBER_AT_70_SEMISPAN, 0.)
+
+        return prob
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,12 @@ from aviary.variable_info.variables_in import VariablesIn
 class MissionDragTest(unittest.TestCase):
 
     def test_basic_large_single_aisle_1(self):
+        self._check_large_single_aisle_1('implicit')
+
+    def test_explicit_skin_friction(self):
+        self._check_large_single_aisle_1('explicit')
+
+    def _check_large_single_aisle_1(self, skin_friction_method):
         flops_inputs = get_flops_inputs('LargeSingleAisle1FLOPS')
         flops_outputs = get_flops_outputs('LargeSingleAisle1FLOPS')
 
@@ -68,7 +74,8 @@ class MissionDragTest(unittest.TestCase):
         model.add_subsystem(
             'aero', aero.build_mission(num_nodes=nn,
                                        aviary_inputs=flops_inputs,
-                                       **{'method': 'computed'}),
+                                       **{'method': 'computed',
+                                          'skin_friction_method': skin_friction_method}),
             promotes=['*']
         )
 
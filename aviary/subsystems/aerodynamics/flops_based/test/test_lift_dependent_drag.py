@@ -2,10 +2,11 @@ import unittest
 
 import numpy as np
 import openmdao.api as om
-from openmdao.utils.assert_utils import assert_check_partials
+from openmdao.components.interp_util.interp import InterpND
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
 
-from aviary.subsystems.aerodynamics.flops_based.lift_dependent_drag import \
-    LiftDependentDrag
+from aviary.subsystems.aerodynamics.flops_based.lift_dependent_drag import (
+    AR2, ARS14, AR2table, ARS14table, LiftDependentDrag)
 from aviary.variable_info.variables import Aircraft, Dynamic, Mission
 
 
@@ -83,6 +84,65 @@ class LiftDependentDragTest(unittest.TestCase):
         # TODO: need to test outputs too
         assert_check_partials(derivs, atol=1e-12, rtol=1e-12)
 
+    def test_batched_nodes(self):
+        P = 2.60239151
+        Sref = 1370.0
+
+        CL = np.array([0.3, 0.35, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65])
+        mach = np.array([0.4, 0.45, 0.5, 0.55, 0.6, 0.85, 0.9, 0.95])
+        lift = 0.5 * CL * Sref * 1.4 * P * mach ** 2
+
+        # one aspect ratio in each range of every table set
+        for AR in (0.6, 1.7, 3.1, 5.0, 15.0):
+            with self.subTest(AR=AR):
+                results = []
+                # all nodes at once, then one node at a time
+                for nn in (len(CL), 1):
+                    prob = om.Problem()
+                    prob.model.add_subsystem(
+                        'drag', LiftDependentDrag(num_nodes=nn), promotes=['*'])
+                    prob.setup(force_alloc_complex=True)
+
+                    prob.set_val(Aircraft.Wing.AREA, val=Sref)
+                    prob.set_val(Aircraft.Wing.MAX_CAMBER_AT_70_SEMISPAN, val=1.0)
+                    prob.set_val(Aircraft.Wing.SWEEP, val=25.03)
+                    prob.set_val(Aircraft.Wing.ASPECT_RATIO, val=AR)
+                    prob.set_val(Aircraft.Wing.THICKNESS_TO_CHORD, val=0.125)
+                    prob.set_val(Mission.Design.LIFT_COEFFICIENT, val=0.3)
+                    prob.set_val(Mission.Design.MACH, val=0.765)
+
+                    CD = []
+                    for idx in np.split(np.arange(len(CL)), len(CL) // nn):
+                        prob.set_val(Dynamic.Mission.MACH, val=mach[idx])
+                        prob.set_val(Dynamic.Mission.LIFT, val=lift[idx])
+                        prob.set_val(Dynamic.Mission.STATIC_PRESSURE, val=P)
+                        prob.run_model()
+                        CD.extend(prob.get_val('CD'))
+
+                    results.append(CD)
+
+                assert_near_equal(results[0], results[1], 1e-14)
+
+                derivs = prob.check_partials(out_stream=None, method="cs")
+                assert_check_partials(derivs, atol=1e-12, rtol=1e-12)
+
+    def test_tables(self):
+        # the tables store the coefficients of each cell, which gives the same results
+        # as direct Lagrange interpolation
+        for data, table in ((AR2, AR2table), (ARS14, ARS14table)):
+            grid = (data[1:, 0], data[0, 1:])
+            interp = InterpND(method='lagrange2', points=grid, values=data[1:, 1:],
+                              extrapolate=True)
+
+            x = np.column_stack([np.linspace(grid[0][0] - 0.1, grid[0][-1] + 0.1, 50),
+                                 np.linspace(grid[1][-1] + 0.1, grid[1][0] - 0.1, 50)])
+
+            expected, expected_derivs = interp.interpolate(x, compute_derivative=True)
+            values, derivs = table.interpolate(x, compute_derivative=True)
+
+            assert_near_equal(values, expected, 1e-11)
+            assert_near_equal(derivs, expected_derivs, 1e-11)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,7 +4,8 @@ import numpy as np
 import openmdao.api as om
 from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
 
-from aviary.subsystems.aerodynamics.flops_based.skin_friction import SkinFriction
+from aviary.subsystems.aerodynamics.flops_based.skin_friction import (
+    ExplicitSkinFriction, SkinFriction)
 from aviary.utils.aviary_values import AviaryValues
 from aviary.variable_info.variables import Aircraft
 
@@ -127,5 +128,61 @@ class SkinFrictionCoeffTest(unittest.TestCase):
         assert_near_equal(np.max(Re_diff), 0.0, 1e-4)
 
 
+class ExplicitSkinFrictionTest(unittest.TestCase):
+
+    def test_match_implicit(self):
+        n = 12
+        nc = 3
+
+        machs = np.array([.2, .3, .4, .5, .6, .7, .75, .775, .8, .825, .85, .875])
+        lens = np.linspace(1, 2, nc)
+        temp = np.linspace(389.97, 518.67, n)
+        pres = np.linspace(374.74437747, 2116.22, n)
+
+        options = {}
+        options[Aircraft.VerticalTail.NUM_TAILS] = (0, 'unitless')
+        options[Aircraft.Fuselage.NUM_FUSELAGES] = (1, 'unitless')
+        options[Aircraft.Engine.NUM_ENGINES] = ([0], 'unitless')
+
+        prob = om.Problem()
+        model = prob.model
+
+        for name, comp_class in (('implicit', SkinFriction),
+                                 ('explicit', ExplicitSkinFriction)):
+            model.add_subsystem(
+                name, comp_class(num_nodes=n, aviary_options=AviaryValues(options)),
+                promotes_inputs=['*'])
+
+        model.nonlinear_solver = om.NewtonSolver(
+            solve_subsystems=False, atol=1e-14, rtol=1e-14, iprint=-1)
+        model.linear_solver = om.DirectSolver()
+
+        prob.setup(force_alloc_complex=True)
+
+        prob.set_val('temperature', temp, 'degR')
+        prob.set_val('static_pressure', pres, 'lbf/ft**2')
+        prob.set_val('mach', machs)
+        prob.set_val('characteristic_lengths', lens, 'ft')
+
+        prob.run_model()
+
+        for name in ('skin_friction_coeff', 'Re', 'wall_temp', 'cf_iter'):
+            assert_near_equal(prob.get_val(f'explicit.{name}'),
+                              prob.get_val(f'implicit.{name}'), 1e-12)
+
+        derivs = prob.check_partials(
+            method='cs', out_stream=None, includes=['explicit'])
+
+        assert_check_partials(derivs, atol=1e-08, rtol=1e-10)
+
+        # partials do not depend on a previous evaluation with real inputs
+        J = prob.compute_totals('explicit.skin_friction_coeff', 'mach')
+        prob.model.explicit._solution = None
+        assert_near_equal(
+            prob.compute_totals('explicit.skin_friction_coeff', 'mach')[
+                'explicit.skin_friction_coeff', 'mach'],
+            J['explicit.skin_friction_coeff', 'mach'], 1e-12)
+
+
 if __name__ == "__main__":
     unittest.main()
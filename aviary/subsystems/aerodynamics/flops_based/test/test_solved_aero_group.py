@@ -10,11 +10,13 @@ from openmdao.utils.assert_utils import assert_near_equal
 
 from aviary.interface.methods_for_level2 import AviaryProblem
 
+from aviary.subsystems.aerodynamics.flops_based.solved_alpha_group import (
+    SolvedAlphaGroup, grav_metric)
 from aviary.subsystems.subsystem_builder_base import SubsystemBuilderBase
 from aviary.utils.csv_data_file import read_data_file
 from aviary.utils.named_values import NamedValues
 from aviary.interface.default_phase_info.height_energy import phase_info
-from aviary.variable_info.variables import Aircraft
+from aviary.variable_info.variables import Aircraft, Dynamic
 
 from copy import deepcopy
 
@@ -201,6 +203,38 @@ class TestSolvedAero(unittest.TestCase):
         assert_near_equal(CL_pass, CL_base, 1e-6)
         assert_near_equal(CD_pass, CD_base, 1e-6)
 
+    def test_alpha_guess(self):
+        # The initial alpha from the inverted lift table, corrected by the error of the
+        # previous estimate, should only leave a single Newton iteration.
+        nn = 8
+
+        prob = om.Problem()
+        prob.model.add_subsystem(
+            'aero', SolvedAlphaGroup(num_nodes=nn, aero_data=polar_file),
+            promotes=['*'])
+        prob.setup()
+
+        solver = prob.model.aero.nonlinear_solver
+        solver.options['iprint'] = -1
+
+        prob.set_val(Dynamic.Mission.MACH, np.linspace(0.72, 0.78, nn))
+        prob.set_val(Dynamic.Mission.ALTITUDE, np.linspace(33000, 37000, nn), 'ft')
+        prob.set_val(Dynamic.Mission.STATIC_PRESSURE,
+                     np.linspace(550, 450, nn), 'lbf/ft**2')
+        prob.set_val(Aircraft.Wing.AREA, 1370., 'ft**2')
+
+        for mass in (70000., 72000., 90000.):
+            with self.subTest(mass=mass):
+                prob.set_val(Dynamic.Mission.MASS,
+                             np.linspace(mass, 0.9 * mass, nn), 'kg')
+                prob.run_model()
+
+                self.assertEqual(solver._iter_count, 1)
+
+                assert_near_equal(
+                    prob.get_val(Dynamic.Mission.LIFT, 'N'),
+                    prob.get_val(Dynamic.Mission.MASS, 'kg') * grav_metric, 1e-9)
+
 
 class FakeCalcDragPolar(om.ExplicitComponent):
     """
@@ -106,6 +106,17 @@ asigma = np.array(
     ]
 )
 
+# flat plate area coefficients of the profile drag components other than the wing,
+# with the reference lengths of their Reynolds number corrections
+_profile_components = [
+    ("fus_fe_coeff", Aircraft.Fuselage.LENGTH),
+    ("nac_fe_coeff", Aircraft.Nacelle.AVG_LENGTH),
+    ("vtail_fe_coeff", Aircraft.VerticalTail.AVERAGE_CHORD),
+    ("htail_fe_coeff", Aircraft.HorizontalTail.AVERAGE_CHORD),
+    ("strut_fe_coeff", Aircraft.Strut.CHORD),
+]
+_profile_lengths = dict(_profile_components)
+
 
 def deg2rad(d):
     """Complex step safe deg2rad"""
@@ -145,6 +156,34 @@ def cla(ar, sweep, mach):
     )
 
 
+def cla_partials(ar, sweep, mach):
+    """Partials of the lift-curve slope from cla wrt aspect ratio, sweep (in radians)
+    and Mach number
+    """
+    cos = np.cos(sweep)
+    # cla = pi * ar / (1 + sqrt(1 + q))
+    q = (ar / (2 * cos)) ** 2 * (1 - (mach * cos) ** 2)
+    root = np.sqrt(1 + q)
+    den = 1 + root
+    dcla_dq = -np.pi * ar / den**2 / (2 * root)
+
+    dcla_dar = np.pi / den + dcla_dq * (ar / (2 * cos**2) - ar * mach**2 / 2)
+    dcla_dsweep = dcla_dq * ar**2 * np.sin(sweep) / (2 * cos**3)
+    dcla_dmach = -dcla_dq * ar**2 * mach / 2
+
+    return dcla_dar, dcla_dsweep, dcla_dmach
+
+
+def seed_partials(names):
+    """One-hot derivative seeds for forward propagation of partials.
+
+    Returns a dict with an array of shape (len(names), 1) for each name. Propagating
+    these through a calculation gives the derivatives wrt all of the inputs stacked
+    along the first axis, which broadcast against vectors of nodes.
+    """
+    return dict(zip(names, np.eye(len(names))[..., np.newaxis]))
+
+
 def sigmoid(x, x0, alpha=0.1):
     """Sigmoid used to smoothly transition between piecewise functions"""
     if alpha == 0:
@@ -152,6 +191,23 @@ def sigmoid(x, x0, alpha=0.1):
     return 1 / (1 + np.exp(-(x - x0) / alpha))
 
 
+def _re_correction(reli, length):
+    """Return the Reynolds number correction factor of a component, with its
+    derivatives wrt the Reynolds number per foot and the reference length.
+    """
+    # protect against Mach 0, any other small Mach should be ok
+    good_mask = reli.real > 1
+    fre = np.ones_like(reli)
+    dfre_dre = np.zeros_like(reli)
+
+    re = reli[good_mask] * length
+    log_re = np.log10(re) / 7
+    fre[good_mask] = log_re**-2.6
+    dfre_dre[good_mask] = -2.6 * log_re**-3.6 / (7 * np.log(10) * re)
+
+    return fre, dfre_dre * length, dfre_dre * reli
+
+
 class WingTailRatios(om.ExplicitComponent):
     """Static calculation of ratios between tail and wing parameters"""
 
@@ -204,18 +260,16 @@ class WingTailRatios(om.ExplicitComponent):
                 Aircraft.Wing.SPAN,
                 Aircraft.Wing.TAPER_RATIO,
             ],
-            method="cs",
         )
         self.declare_partials(
-            "bbar", [Aircraft.HorizontalTail.SPAN, Aircraft.Wing.SPAN], method="cs"
+            "bbar", [Aircraft.HorizontalTail.SPAN, Aircraft.Wing.SPAN]
         )
         self.declare_partials(
-            "sbar", [Aircraft.HorizontalTail.AREA, Aircraft.Wing.AREA], method="cs"
+            "sbar", [Aircraft.HorizontalTail.AREA, Aircraft.Wing.AREA]
         )
         self.declare_partials(
             "cbar",
             [Aircraft.HorizontalTail.AVERAGE_CHORD, Aircraft.Wing.AVERAGE_CHORD],
-            method="cs",
         )
 
     def compute(self, inputs, outputs):
@@ -243,6 +297,50 @@ class WingTailRatios(om.ExplicitComponent):
         outputs["sbar"] = htail_area / wing_area
         outputs["cbar"] = htail_chord / avg_chord
 
+    def compute_partials(self, inputs, J):
+        (
+            wing_area,
+            wingspan,
+            avg_chord,
+            taper_ratio,
+            tc_ratio_root,
+            wing_loc,
+            htail_loc,
+            span_htail,
+            span_vtail,
+            htail_area,
+            htail_chord,
+            cabin_width,
+        ) = inputs.values()
+
+        trtw = tc_ratio_root * 2 * wing_area / wingspan / (1 + taper_ratio)
+        gap = htail_loc * span_vtail - 0.5 * (cabin_width - trtw) * (2 * wing_loc - 1)
+        # derivative of cs.abs
+        sign = np.where(gap.real < 0, -1.0, 1.0)
+        # derivative of hbar wrt trtw
+        dhbar_dtrtw = sign * 0.5 * (2 * wing_loc - 1) / wingspan
+
+        J["hbar", Aircraft.HorizontalTail.VERTICAL_TAIL_FRACTION] = \
+            sign * span_vtail / wingspan
+        J["hbar", Aircraft.VerticalTail.SPAN] = sign * htail_loc / wingspan
+        J["hbar", Aircraft.Fuselage.AVG_DIAMETER] = \
+            -sign * 0.5 * (2 * wing_loc - 1) / wingspan
+        J["hbar", Aircraft.Wing.MOUNTING_TYPE] = -sign * (cabin_width - trtw) / wingspan
+        J["hbar", Aircraft.Wing.THICKNESS_TO_CHORD_ROOT] = \
+            dhbar_dtrtw * 2 * wing_area / wingspan / (1 + taper_ratio)
+        J["hbar", Aircraft.Wing.AREA] = \
+            dhbar_dtrtw * tc_ratio_root * 2 / wingspan / (1 + taper_ratio)
+        J["hbar", Aircraft.Wing.SPAN] = \
+            -(dhbar_dtrtw * trtw + sign * gap / wingspan) / wingspan
+        J["hbar", Aircraft.Wing.TAPER_RATIO] = -dhbar_dtrtw * trtw / (1 + taper_ratio)
+
+        J["bbar", Aircraft.HorizontalTail.SPAN] = 1 / wingspan
+        J["bbar", Aircraft.Wing.SPAN] = -span_htail / wingspan**2
+        J["sbar", Aircraft.HorizontalTail.AREA] = 1 / wing_area
+        J["sbar", Aircraft.Wing.AREA] = -htail_area / wing_area**2
+        J["cbar", Aircraft.HorizontalTail.AVERAGE_CHORD] = 1 / avg_chord
+        J["cbar", Aircraft.Wing.AVERAGE_CHORD] = -htail_chord / avg_chord**2
+
 
 class Xlifts(om.ExplicitComponent):
     """Compute lift ratio and lift-curve slope for given stability margin"""
@@ -290,31 +388,52 @@ class Xlifts(om.ExplicitComponent):
         self.add_output("lift_ratio", units="unitless", shape=nn, desc="Lift ratio")
 
     def setup_partials(self):
-        ar = np.arange(self.options["num_nodes"])
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn)
+        zeros = np.zeros(nn, dtype=int)
+
+        for name in ("lift_ratio", "lift_curve_slope"):
+            self.declare_partials(name, Dynamic.Mission.MACH, rows=ar, cols=ar)
+            self.declare_partials(
+                name,
+                [
+                    Aircraft.Wing.ASPECT_RATIO,
+                    Aircraft.Wing.SWEEP,
+                    Aircraft.HorizontalTail.VERTICAL_TAIL_FRACTION,
+                    Aircraft.HorizontalTail.SWEEP,
+                    Aircraft.HorizontalTail.MOMENT_RATIO,
+                    "sbar",
+                    "cbar",
+                    "hbar",
+                    "bbar",
+                ],
+                rows=ar, cols=zeros,
+            )
 
-        self.declare_partials("lift_ratio", "*", method="cs")
-        self.declare_partials("lift_ratio", Dynamic.Mission.MACH,
-                              rows=ar, cols=ar, method="cs")
-        self.declare_partials("lift_curve_slope", "*", method="cs")
         self.declare_partials(
-            "lift_curve_slope",
-            [
-                Aircraft.Wing.ASPECT_RATIO,
-                Aircraft.Wing.SWEEP,
-                Aircraft.HorizontalTail.VERTICAL_TAIL_FRACTION,
-                Aircraft.HorizontalTail.SWEEP,
-                Aircraft.HorizontalTail.MOMENT_RATIO,
-                "sbar",
-                "cbar",
-                "hbar",
-                "bbar",
-            ],
-            method="cs",
+            "lift_ratio",
+            [Aircraft.Design.STATIC_MARGIN, Aircraft.Design.CG_DELTA],
+            rows=ar, cols=zeros,
         )
-        self.declare_partials("lift_curve_slope", Dynamic.Mission.MACH,
-                              rows=ar, cols=ar, method="cs")
 
     def compute(self, inputs, outputs):
+        claw, lift_ratio = self._lift(inputs)
+
+        outputs["lift_curve_slope"] = claw
+        outputs["lift_ratio"] = lift_ratio
+
+    def compute_partials(self, inputs, J):
+        (claw, dclaw), (lift_ratio, dlift_ratio) = self._lift(inputs, partials=True)
+
+        for idx, name in enumerate(inputs):
+            if name not in (Aircraft.Design.STATIC_MARGIN, Aircraft.Design.CG_DELTA):
+                J["lift_curve_slope", name] = dclaw[idx]
+            J["lift_ratio", name] = dlift_ratio[idx]
+
+    def _lift(self, inputs, partials=False):
+        """Compute the lift-curve slope and lift ratio, optionally with their
+        derivatives wrt all inputs, stacked in the order of the inputs.
+        """
         (
             mach,
             static_margin,
@@ -340,71 +459,112 @@ class Xlifts(om.ExplicitComponent):
 
         # stability contribution from each surface
         claw0 = cla(AR, deg2rad(sweep_c4), mach)
-        clat0 = cla(art, deg2rad(htail_sweep), mach) * (0.9 + 0.1 * htail_loc)
+        clat0_fac = 0.9 + 0.1 * htail_loc
+        clat0_ = cla(art, deg2rad(htail_sweep), mach)
+        clat0 = clat0_ * clat0_fac
 
         # Hayes reverse flow theorem to estimate downwash effects on wing and canard
-        eps1 = 1 / (4 * np.pi * np.sqrt(xt**2 + h**2))
+        r1 = np.sqrt(xt**2 + h**2)
+        r3 = np.sqrt(xt**2 + h**2 + AR**2 / 4)
+        r5 = np.sqrt(xt**2 + h**2 + art**2 * cbar**2 / 4)
+        eps1 = 1 / (4 * np.pi * r1)
         eps2 = 1 / np.pi / AR
-        eps3 = cs.abs(xt) / (np.pi * AR * np.sqrt(xt**2 + h**2 + AR**2 / 4))
+        eps3 = cs.abs(xt) / (np.pi * AR * r3)
         eps4 = 1 / np.pi / art
-        eps5 = cs.abs(xt) / (
-            np.pi * art * np.sqrt(xt**2 + h**2 + art**2 * cbar**2 / 4)
-        )
+        eps5 = cs.abs(xt) / (np.pi * art * r5)
 
-        claw = (
-            claw0
-            * (1 - clat0 * (eps4 - eps5 - cbar * eps1))
-            / (1 - clat0 * claw0 * (eps1 + eps2 + eps3) * (eps4 - eps5 - cbar * eps1))
-        )
+        e_tail = eps4 - eps5 - cbar * eps1
+        e_wing = eps1 + eps2 + eps3
+
+        num = claw0 * (1 - clat0 * e_tail)
+        den = 1 - clat0 * claw0 * e_wing * e_tail
+        claw = num / den
 
-        clat = clat0 * (1 - claw * (eps1 + eps2 + eps3))
+        clat = clat0 * (1 - claw * e_wing)
 
         abar = clat / claw
         c = 1 / (1 + 1 / abar / sbar)
         lift_ratio = (c - delta) / (1 + delta - c)
 
-        outputs["lift_curve_slope"] = claw
-        outputs["lift_ratio"] = lift_ratio
+        if not partials:
+            return claw, lift_ratio
 
+        d = seed_partials(inputs)
+        dmach = d[Dynamic.Mission.MACH]
+        dAR = d[Aircraft.Wing.ASPECT_RATIO]
+        dsbar = d["sbar"]
+        dcbar = d["cbar"]
 
-class AeroGeom(om.ExplicitComponent):
-    """Compute drag parameters from cruise conditions and geometric parameters.
+        ddelta = (
+            (d[Aircraft.Design.STATIC_MARGIN] + d[Aircraft.Design.CG_DELTA])
+            * h_tail_moment
+            + (static_margin + delta_cg) * d[Aircraft.HorizontalTail.MOMENT_RATIO]
+        )
+        dxt = -xt**2 * d[Aircraft.HorizontalTail.MOMENT_RATIO]
+        dabs_xt = np.where(xt.real < 0, -1.0, 1.0) * dxt
+        dart = (
+            bbar**2 / sbar * dAR + 2 * AR * bbar / sbar * d["bbar"] - art / sbar * dsbar
+        )
+        dh = AR * d["hbar"] + hbar * dAR
+
+        dclaw0_dar, dclaw0_dsweep, dclaw0_dmach = cla_partials(
+            AR, deg2rad(sweep_c4), mach)
+        dclaw0 = (
+            dclaw0_dar * dAR
+            + dclaw0_dsweep * deg2rad(d[Aircraft.Wing.SWEEP])
+            + dclaw0_dmach * dmach
+        )
+        dclat0_dar, dclat0_dsweep, dclat0_dmach = cla_partials(
+            art, deg2rad(htail_sweep), mach)
+        dclat0 = clat0_fac * (
+            dclat0_dar * dart
+            + dclat0_dsweep * deg2rad(d[Aircraft.HorizontalTail.SWEEP])
+            + dclat0_dmach * dmach
+        ) + 0.1 * clat0_ * d[Aircraft.HorizontalTail.VERTICAL_TAIL_FRACTION]
+
+        dr1 = (xt * dxt + h * dh) / r1
+        dr3 = (xt * dxt + h * dh + AR / 4 * dAR) / r3
+        dr5 = (
+            xt * dxt + h * dh + art * cbar**2 / 4 * dart + art**2 * cbar / 4 * dcbar
+        ) / r5
+        deps1 = -eps1 / r1 * dr1
+        deps2 = -eps2 / AR * dAR
+        deps3 = dabs_xt / (np.pi * AR * r3) - eps3 * (dAR / AR + dr3 / r3)
+        deps4 = -eps4 / art * dart
+        deps5 = dabs_xt / (np.pi * art * r5) - eps5 * (dart / art + dr5 / r5)
+
+        de_tail = deps4 - deps5 - cbar * deps1 - eps1 * dcbar
+        de_wing = deps1 + deps2 + deps3
+
+        dnum = dclaw0 * (1 - clat0 * e_tail) - \
+            claw0 * (dclat0 * e_tail + clat0 * de_tail)
+        dden = -(
+            dclat0 * claw0 * e_wing * e_tail
+            + clat0 * dclaw0 * e_wing * e_tail
+            + clat0 * claw0 * de_wing * e_tail
+            + clat0 * claw0 * e_wing * de_tail
+        )
+        dclaw = (dnum - claw * dden) / den
 
-    This corresponds to the AERO subroutine in GASP. The primary outputs are parameters
-    SA* which build up the total aircraft drag coefficient.
-    """
+        dclat = dclat0 * (1 - claw * e_wing) - clat0 * (dclaw * e_wing + claw * de_wing)
 
-    def initialize(self):
-        self.options.declare("num_nodes", default=1, types=int)
-        self.options.declare(
-            "include_strut",
-            default=False,
-            types=bool,
-            desc="Whether the aircraft has a strut or not",
-        )
+        dabar = (dclat - abar * dclaw) / claw
+        u = abar * sbar
+        dc = (dabar * sbar + abar * dsbar) / (1 + u) ** 2
+        dlift_ratio = (dc - ddelta) / (1 + delta - c) ** 2
 
-    def setup(self):
-        nn = self.options["num_nodes"]
+        return (claw, dclaw), (lift_ratio, dlift_ratio)
 
-        self.add_input(
-            Dynamic.Mission.MACH, val=0.0, units="unitless", shape=nn, desc="Current Mach number")
-        self.add_input(
-            Dynamic.Mission.SPEED_OF_SOUND,
-            val=1.0,
-            units="ft/s",
-            shape=nn,
-            desc="Speed of sound at current altitude",
-        )
-        self.add_input(
-            "nu",
-            val=1.0,
-            units="ft**2/s",
-            shape=nn,
-            desc="Kinematic viscosity at current altitude",
-        )
 
-        self.add_input("ufac", units="unitless", shape=nn, desc="UFAC")
+class StaticAeroGeom(om.ExplicitComponent):
+    """Compute the node-independent drag parameters from geometric parameters.
 
+    This is the part of the AERO subroutine in GASP that depends only on the design:
+    the compressibility drag parameters SA1-SA4, and the form factor, interference
+    and Oswald efficiency terms that scale the profile and induced drag.
+    """
+
+    def setup(self):
         # form factors
         # user could input these directly or use functions to estimate from geometry
 
@@ -454,16 +614,8 @@ class AeroGeom(om.ExplicitComponent):
 
         add_aviary_input(self, Aircraft.Wing.SPAN, val=0.0)
 
-        add_aviary_input(self, Aircraft.Wing.AVERAGE_CHORD, val=0.0)
-
-        add_aviary_input(self, Aircraft.HorizontalTail.AVERAGE_CHORD, val=0.0)
-
-        add_aviary_input(self, Aircraft.VerticalTail.AVERAGE_CHORD, val=0.0)
-
         add_aviary_input(self, Aircraft.Fuselage.LENGTH, val=0.0)
 
-        add_aviary_input(self, Aircraft.Nacelle.AVG_LENGTH, val=0.0)
-
         add_aviary_input(self, Aircraft.HorizontalTail.AREA, val=0.0)
 
         add_aviary_input(self, Aircraft.Fuselage.WETTED_AREA, val=0.0)
@@ -478,119 +630,66 @@ class AeroGeom(om.ExplicitComponent):
 
         add_aviary_input(self, Aircraft.Wing.THICKNESS_TO_CHORD_UNWEIGHTED, val=0.0)
 
-        add_aviary_input(self, Aircraft.Strut.CHORD, val=0.0)
-
         # outputs
-        for i in range(7):
-            name = f"SA{i+1}"
-            self.add_output(name, units="unitless", shape=nn, desc=f"{name}: Drag param")
+        for i in range(4):
+            name = f"SA{i+1}_static"
+            self.add_output(name, units="unitless", desc=f"SA{i+1}: Drag param")
 
         self.add_output(
-            "cf", units="unitless", shape=nn,
-            desc="CFIN: Skin friction coefficient at Re=1e7"
-        )
+            "fus_fe_coeff", units="unitless",
+            desc="Fuselage flat plate area per unit skin friction coefficient and "
+            "Reynolds number correction, divided by the wing area")
+        self.add_output(
+            "nac_fe_coeff", units="unitless",
+            desc="Nacelle flat plate area per unit skin friction coefficient and "
+            "Reynolds number correction, divided by the wing area")
+        self.add_output(
+            "vtail_fe_coeff", units="unitless",
+            desc="Vertical tail flat plate area per unit skin friction coefficient and "
+            "Reynolds number correction, divided by the wing area")
+        self.add_output(
+            "htail_fe_coeff", units="unitless",
+            desc="Horizontal tail flat plate area per unit skin friction coefficient "
+            "and Reynolds number correction, divided by the wing area")
+        self.add_output(
+            "strut_fe_coeff", units="unitless",
+            desc="Strut flat plate area per unit skin friction coefficient and "
+            "Reynolds number correction, divided by the wing area")
+        self.add_output(
+            "cd0_fixed", units="unitless",
+            desc="Profile drag coefficient independent of skin friction: fuselage and "
+            "drag increments, and wing-fuselage interference without shielding")
+        self.add_output(
+            "wing_shield_coeff", units="unitless",
+            desc="Wing area shielded by the fuselage times the interference factor, "
+            "divided by the wing area")
+        self.add_output(
+            "cdi_ufac_coeff", units="unitless",
+            desc="Induced drag coefficient term inversely proportional to UFAC, "
+            "1 / (pi * AR * SIWB)")
+        self.add_output(
+            "sweep_factor", units="unitless",
+            desc="Wing profile drag factor in the Oswald efficiency, 1 / cos(sweep)**2")
 
     def setup_partials(self):
-        # self.declare_coloring(method="cs", show_summary=False)
-        self.declare_partials("*", "*", dependent=False)
-        ar = np.arange(self.options["num_nodes"])
-
-        self.declare_partials(
-            "SA1",
-            [
-                Aircraft.Wing.MIN_PRESSURE_LOCATION,
-                Aircraft.Wing.MAX_THICKNESS_LOCATION,
-                Aircraft.Wing.ASPECT_RATIO,
-                Aircraft.Wing.SWEEP,
-                Aircraft.Wing.TAPER_RATIO,
-                Aircraft.Wing.THICKNESS_TO_CHORD_UNWEIGHTED,
-            ],
-            method="cs",
-        )
-        self.declare_partials(
-            "SA2",
-            [
-                Aircraft.Wing.MIN_PRESSURE_LOCATION,
-                Aircraft.Wing.MAX_THICKNESS_LOCATION,
-                Aircraft.Wing.ASPECT_RATIO,
-                Aircraft.Wing.SWEEP,
-                Aircraft.Wing.TAPER_RATIO,
-            ],
-            method="cs",
-        )
-        self.declare_partials(
-            "SA3",
-            [
-                Aircraft.Wing.ASPECT_RATIO,
-                Aircraft.Wing.SWEEP,
-                Aircraft.Wing.TAPER_RATIO,
-                Aircraft.Wing.THICKNESS_TO_CHORD_UNWEIGHTED,
-            ],
-            method="cs",
-        )
-        self.declare_partials(
-            "SA4", [Aircraft.Wing.THICKNESS_TO_CHORD_UNWEIGHTED], method="cs"
-        )
-        self.declare_partials("cf", [Dynamic.Mission.MACH],
-                              rows=ar, cols=ar, method="cs")
-
-        # diag partials for SA5-SA7
-        self.declare_partials(
-            "SA5", [Dynamic.Mission.MACH, Dynamic.Mission.SPEED_OF_SOUND, "nu"], rows=ar, cols=ar, method="cs"
-        )
-        self.declare_partials(
-            "SA6", [Dynamic.Mission.MACH, Dynamic.Mission.SPEED_OF_SOUND, "nu"], rows=ar, cols=ar, method="cs"
-        )
-        self.declare_partials(
-            "SA7", [Dynamic.Mission.MACH, Dynamic.Mission.SPEED_OF_SOUND, "nu", "ufac"], rows=ar, cols=ar, method="cs"
-        )
-
-        # dense partials for SA5-SA7
-        most_params = [
-            Aircraft.Wing.FORM_FACTOR,
-            Aircraft.Fuselage.FORM_FACTOR,
-            Aircraft.Nacelle.FORM_FACTOR,
-            Aircraft.VerticalTail.FORM_FACTOR,
-            Aircraft.HorizontalTail.FORM_FACTOR,
-            Aircraft.Wing.FUSELAGE_INTERFERENCE_FACTOR,
-            Aircraft.Strut.FUSELAGE_INTERFERENCE_FACTOR,
-            Aircraft.Design.DRAG_COEFFICIENT_INCREMENT,
-            Aircraft.Fuselage.FLAT_PLATE_AREA_INCREMENT,
-            Aircraft.Wing.CENTER_DISTANCE,
-            Aircraft.Wing.MOUNTING_TYPE,
-            Aircraft.Wing.TAPER_RATIO,
-            Aircraft.Strut.AREA_RATIO,
-            Aircraft.Wing.THICKNESS_TO_CHORD_ROOT,
-            Aircraft.Wing.THICKNESS_TO_CHORD_TIP,
-            Aircraft.Wing.SPAN,
-            Aircraft.Wing.AVERAGE_CHORD,
-            Aircraft.HorizontalTail.AVERAGE_CHORD,
-            Aircraft.VerticalTail.AVERAGE_CHORD,
-            Aircraft.Fuselage.LENGTH,
-            Aircraft.Nacelle.AVG_LENGTH,
-            Aircraft.HorizontalTail.AREA,
-            Aircraft.Fuselage.WETTED_AREA,
-            Aircraft.Nacelle.SURFACE_AREA,
-            Aircraft.Wing.AREA,
-            Aircraft.Fuselage.AVG_DIAMETER,
-            Aircraft.VerticalTail.AREA,
-        ]
-        self.declare_partials("SA5", most_params, method="cs")
-        self.declare_partials(
-            "SA6", [Aircraft.Wing.FORM_FACTOR, Aircraft.Wing.AVERAGE_CHORD], method="cs"
-        )
-        self.declare_partials(
-            "SA7",
-            most_params + [Aircraft.Wing.ASPECT_RATIO, Aircraft.Wing.SWEEP],
-            method="cs",
-        )
+        self.declare_partials("*", "*")
 
     def compute(self, inputs, outputs):
+        values, _ = self._static_geom(inputs)
+        for name, val in values.items():
+            outputs[name] = val
+
+    def compute_partials(self, inputs, J):
+        _, derivs = self._static_geom(inputs)
+        for name, deriv in derivs.items():
+            for idx, wrt in enumerate(inputs):
+                J[name, wrt] = deriv[idx]
+
+    def _static_geom(self, inputs):
+        """Compute the outputs, and their derivatives wrt all inputs stacked in the
+        order of the inputs.
+        """
         (
-            mach,
-            sos,
-            nu,
-            ufac,
             ff_wing,
             ff_fus,
             ff_nac,
@@ -611,11 +710,7 @@ class AeroGeom(om.ExplicitComponent):
             tc_ratio_root,
             tc_ratio_tip,
             wingspan,
-            avg_chord,
-            htail_chord,
-            vtail_chord,
             fus_len,
-            nac_len,
             htail_area,
             fus_SA,
             nacelle_area,
@@ -623,105 +718,183 @@ class AeroGeom(om.ExplicitComponent):
             cabin_width,
             vtail_area,
             tc_ratio,
-            strut_chord,
         ) = inputs.values()
-        # skin friction coeff at Re = 10**7
-        cf = 0.455 / 7**2.58 / (1 + 0.144 * mach**2) ** 0.65
 
-        t = cs.abs(np.tan(deg2rad(sweep_c4)))
+        d = seed_partials(inputs)
+        dAR = d[Aircraft.Wing.ASPECT_RATIO]
+        dtaper_ratio = d[Aircraft.Wing.TAPER_RATIO]
+        dwingspan = d[Aircraft.Wing.SPAN]
+        dwing_area = d[Aircraft.Wing.AREA]
+        dcabin_width = d[Aircraft.Fuselage.AVG_DIAMETER]
+        dtc_ratio = d[Aircraft.Wing.THICKNESS_TO_CHORD_UNWEIGHTED]
+        dtc_ratio_root = d[Aircraft.Wing.THICKNESS_TO_CHORD_ROOT]
+        dwing_fus_intf = d[Aircraft.Wing.FUSELAGE_INTERFERENCE_FACTOR]
+        dmin_pressure_loc = d[Aircraft.Wing.MIN_PRESSURE_LOCATION]
+
+        values = {}
+        derivs = {}
+
+        sweep = deg2rad(sweep_c4)
+        dsweep = deg2rad(d[Aircraft.Wing.SWEEP])
+        tan_sweep = np.tan(sweep)
+        # derivative of cs.abs
+        sign = np.where(tan_sweep.real < 0, -1.0, 1.0)
+        t = sign * tan_sweep
+        dt = sign * dsweep / np.cos(sweep) ** 2
         yale05 = (1 - taper_ratio) / (1 + taper_ratio)
+        dyale05 = -2 * dtaper_ratio / (1 + taper_ratio) ** 2
+
+        def arctan2_partials(y, dy):
+            """Derivative of arctan2(y, AR)."""
+            return (AR * dy - y * dAR) / (AR**2 + y**2)
+
         # sweep angle to min pressure point
-        dlmps = rad2deg(
-            cs.arctan2(AR * t - 4 * (wing_min_pressure_loc - 0.25) * yale05, AR)
+        y = AR * t - 4 * (wing_min_pressure_loc - 0.25) * yale05
+        dy = (
+            dAR * t + AR * dt - 4 * dmin_pressure_loc * yale05
+            - 4 * (wing_min_pressure_loc - 0.25) * dyale05
         )
+        dlmps = rad2deg(cs.arctan2(y, AR))
+        ddlmps = rad2deg(arctan2_partials(y, dy))
         # sweep angle to max thickness point
-        dlmtcx = rad2deg(
-            cs.arctan2(AR * t - 4 * (wing_max_thickness_loc - 0.25) * yale05, AR)
+        y = AR * t - 4 * (wing_max_thickness_loc - 0.25) * yale05
+        dy = (
+            dAR * t + AR * dt
+            - 4 * d[Aircraft.Wing.MAX_THICKNESS_LOCATION] * yale05
+            - 4 * (wing_max_thickness_loc - 0.25) * dyale05
         )
+        dlmtcx = rad2deg(cs.arctan2(y, AR))
+        ddlmtcx = rad2deg(arctan2_partials(y, dy))
         # sweep angle of the leading edge
-        rlmle = cs.arctan2(AR * t + yale05, AR)
+        y = AR * t + yale05
+        rlmle = cs.arctan2(y, AR)
+        drlmle = arctan2_partials(y, dAR * t + AR * dt + dyale05)
         fk = 1 / (1 + yale05 / AR * 4 * taper_ratio**2)
-
-        # Reynolds number per foot
-        # here we make a smooth transition between a minimum reli (approximately
-        # corresponding to Mach 0.1 at SLS) to help with takeoff. GASP doesn't call AERO
-        # before takeoff, so the RELI used corresponds to the cruise point, and this
-        # isn't a problem.
-        reli_y1 = 700000 * np.ones(self.options["num_nodes"])
-        reli_y2 = sos * mach / nu
-        sig = sigmoid(mach, 0.1, alpha=0.005)
-        reli = (1 - sig) * reli_y1 + sig * reli_y2
-
-        # Re correction factors: fuselage, wing, nacelle, vtail, htail, strut, tip tank
-        # protect against Mach 0, any other small Mach should be ok
-        dtype = complex if self.under_complex_step else float
-        ffre, fwre, fnre, fvtre, fhtre, fstrtre = np.ones(
-            (6, self.options["num_nodes"]), dtype=dtype
+        dfk = -4 * fk**2 * (
+            dyale05 * taper_ratio**2 / AR
+            + 2 * yale05 * taper_ratio * dtaper_ratio / AR
+            - yale05 * taper_ratio**2 * dAR / AR**2
         )
-        if self.under_complex_step:
-            good_mask = reli.real > 1
-        else:
-            good_mask = reli > 1
-        ffre[good_mask] = (np.log10(reli[good_mask] * fus_len) / 7) ** -2.6
-        fwre[good_mask] = (np.log10(reli[good_mask] * avg_chord) / 7) ** -2.6
-        fnre[good_mask] = (np.log10(reli[good_mask] * nac_len) / 7) ** -2.6
-        fvtre[good_mask] = (np.log10(reli[good_mask] * vtail_chord) / 7) ** -2.6
-        fhtre[good_mask] = (np.log10(reli[good_mask] * htail_chord) / 7) ** -2.6
-        if self.options["include_strut"]:
-            fstrtre = (np.log10(reli[good_mask] * strut_chord) / 7) ** -2.6
 
         # fuselage form drag factor
-        fffus = (
-            1 + 1.5 * (cabin_width / fus_len) ** 1.5 + 7 * (cabin_width / fus_len) ** 3
-        )
+        ratio = cabin_width / fus_len
+        dratio = (dcabin_width - ratio * d[Aircraft.Fuselage.LENGTH]) / fus_len
+        fffus = 1 + 1.5 * ratio**1.5 + 7 * ratio**3
+        dfffus = (2.25 * ratio**0.5 + 21 * ratio**2) * dratio
 
-        # flat plate equivalent areas
-        fef = ff_fus * fus_SA * cf * ffre * fffus + fe_fus_inc
-        few = ff_wing * wing_area * cf * fwre
+        # flat plate equivalent areas per unit cf and Re correction factor
         # TODO replace 2 with num_engines
-        fen = 2 * ff_nac * nacelle_area * cf * fnre
-        fevt = ff_vtail * vtail_area * cf * fvtre
-        feht = ff_htail * htail_area * cf * fhtre
-        festrt = strut_fus_intf * strut_wing_area_ratio * wing_area * cf * fstrtre
+        values["fus_fe_coeff"] = val = ff_fus * fus_SA * fffus / wing_area
+        derivs["fus_fe_coeff"] = (
+            d[Aircraft.Fuselage.FORM_FACTOR] * fus_SA * fffus
+            + ff_fus * d[Aircraft.Fuselage.WETTED_AREA] * fffus
+            + ff_fus * fus_SA * dfffus
+            - val * dwing_area
+        ) / wing_area
+        for name, ff, area, dff, darea, num in (
+            ("nac_fe_coeff", ff_nac, nacelle_area, d[Aircraft.Nacelle.FORM_FACTOR],
+             d[Aircraft.Nacelle.SURFACE_AREA], 2),
+            ("vtail_fe_coeff", ff_vtail, vtail_area,
+             d[Aircraft.VerticalTail.FORM_FACTOR], d[Aircraft.VerticalTail.AREA], 1),
+            ("htail_fe_coeff", ff_htail, htail_area,
+             d[Aircraft.HorizontalTail.FORM_FACTOR], d[Aircraft.HorizontalTail.AREA],
+             1),
+        ):
+            values[name] = val = num * ff * area / wing_area
+            derivs[name] = (
+                num * (dff * area + ff * darea) - val * dwing_area) / wing_area
+        values["strut_fe_coeff"] = strut_fus_intf * strut_wing_area_ratio
+        derivs["strut_fe_coeff"] = (
+            d[Aircraft.Strut.FUSELAGE_INTERFERENCE_FACTOR] * strut_wing_area_ratio
+            + strut_fus_intf * d[Aircraft.Strut.AREA_RATIO]
+        )
 
         # begin INTERFERENCE - get flat plate equivalent for wing-fuselage interference
         croot = 2 * wing_area / (wingspan * (1 + taper_ratio))
-        # wing profile drag coefficient
-        cdw0 = few / wing_area
+        dcroot = croot * (
+            dwing_area / wing_area - dwingspan / wingspan
+            - dtaper_ratio / (1 + taper_ratio)
+        )
         zw_rf = 2 * wing_loc - 1
+        dzw_rf = 2 * d[Aircraft.Wing.MOUNTING_TYPE]
         x = tc_ratio_root * croot / cabin_width
-        if cs.abs(zw_rf + x) >= 1:
-            widthftop = 0.0
-        else:
-            widthftop = cabin_width * np.sqrt(1 - (zw_rf + x) ** 2)
-        if cs.abs(zw_rf - x) >= 1:
-            widthfbot = 0.0
-        else:
-            widthfbot = cabin_width * np.sqrt(1 - (zw_rf - x) ** 2)
+        dx = (dtc_ratio_root * croot + tc_ratio_root * dcroot - x * dcabin_width) \
+            / cabin_width
+
+        def fuselage_width(z, dz):
+            """Width of the fuselage at the height z, in fuselage radii, of a wing
+            surface, and its derivative.
+            """
+            if cs.abs(z) >= 1:
+                return 0.0, 0.0
+            root = np.sqrt(1 - z**2)
+            return cabin_width * root, dcabin_width * root - cabin_width * z * dz / root
+
+        widthftop, dwidthftop = fuselage_width(zw_rf + x, dzw_rf + dx)
+        widthfbot, dwidthfbot = fuselage_width(zw_rf - x, dzw_rf - dx)
         wbodywf = 0.5 * (widthftop + widthfbot)
-        tcbodywf = tc_ratio_root - wbodywf / wingspan * (tc_ratio_root - tc_ratio_tip)
-        cbodywf = croot * (1 - wbodywf / wingspan * (1 - taper_ratio))
+        dwbodywf = 0.5 * (dwidthftop + dwidthfbot)
+        wbob = wbodywf / wingspan
+        dwbob = (dwbodywf - wbob * dwingspan) / wingspan
+        tcbodywf = tc_ratio_root - wbob * (tc_ratio_root - tc_ratio_tip)
+        dtcbodywf = (
+            dtc_ratio_root - dwbob * (tc_ratio_root - tc_ratio_tip)
+            - wbob * (dtc_ratio_root - d[Aircraft.Wing.THICKNESS_TO_CHORD_TIP])
+        )
+        cbodywf = croot * (1 - wbob * (1 - taper_ratio))
+        dcbodywf = dcroot * (1 - wbob * (1 - taper_ratio)) - croot * (
+            dwbob * (1 - taper_ratio) - wbob * dtaper_ratio)
         # factor due to vertical location
         kvwf = ckv[0] + zw_rf * (ckv[1] + zw_rf * ckv[2])
+        dkvwf = (ckv[1] + 2 * zw_rf * ckv[2]) * dzw_rf
         # factor due to longitudinal location
         klwf = ckl[0] + wing_center_dist * (
             ckl[1]
             + wing_center_dist
             * (ckl[2] + wing_center_dist * (ckl[3] + wing_center_dist * ckl[4]))
         )
+        dklwf = (
+            ckl[1]
+            + wing_center_dist
+            * (2 * ckl[2]
+               + wing_center_dist * (3 * ckl[3] + 4 * wing_center_dist * ckl[4]))
+        ) * d[Aircraft.Wing.CENTER_DISTANCE]
         # factor due to fuselage diameter / thickness
         kdtwf = ckdt[0] + ckdt[1] * cabin_width / (tcbodywf * cbodywf)
+        dkdtwf = ckdt[1] * (
+            dcabin_width
+            - cabin_width * (dtcbodywf / tcbodywf + dcbodywf / cbodywf)
+        ) / (tcbodywf * cbodywf)
         # interference drag independent of shielded area
         feintwf = 1.5 * tcbodywf**3 * cbodywf**2 * kvwf * klwf * kdtwf
+        dfeintwf = 1.5 * (
+            3 * tcbodywf**2 * dtcbodywf * cbodywf**2 * kvwf * klwf * kdtwf
+            + 2 * tcbodywf**3 * cbodywf * dcbodywf * kvwf * klwf * kdtwf
+            + tcbodywf**3 * cbodywf**2 * (
+                dkvwf * klwf * kdtwf + kvwf * dklwf * kdtwf + kvwf * klwf * dkdtwf)
+        )
         areashieldwf = 0.5 * (croot + cbodywf) * wbodywf
-        feshieldwf = cdw0 * areashieldwf
-        feiwf = wing_fus_intf * (feintwf - feshieldwf)
+        dareashieldwf = 0.5 * (
+            (dcroot + dcbodywf) * wbodywf + (croot + cbodywf) * dwbodywf)
+        # the interference drag of the shielded area is scaled by the wing profile
+        # drag coefficient, which depends on the flight condition
+        values["wing_shield_coeff"] = val = wing_fus_intf * areashieldwf / wing_area
+        derivs["wing_shield_coeff"] = (
+            dwing_fus_intf * areashieldwf + wing_fus_intf * dareashieldwf
+            - val * dwing_area
+        ) / wing_area
         # end INTERFERENCE
 
-        # total flat plate equivalent area
-        fe = few + fef + fevt + feht + fen + feiwf + festrt + cd0_inc * wing_area
+        fe = fe_fus_inc + wing_fus_intf * feintwf
+        values["cd0_fixed"] = fe / wing_area + cd0_inc
+        derivs["cd0_fixed"] = (
+            d[Aircraft.Fuselage.FLAT_PLATE_AREA_INCREMENT]
+            + dwing_fus_intf * feintwf + wing_fus_intf * dfeintwf
+            - fe / wing_area * dwing_area
+        ) / wing_area + d[Aircraft.Design.DRAG_COEFFICIENT_INCREMENT]
 
         wfob = cabin_width / wingspan
+        dwfob = (dcabin_width - wfob * dwingspan) / wingspan
         siwb = (
             1
             - 0.0088 * wfob
@@ -729,45 +902,295 @@ class AeroGeom(om.ExplicitComponent):
             - 2.303 * wfob**3
             + 6.0606 * wfob**4
         )
+        dsiwb = (
+            -0.0088 - 3.4728 * wfob - 6.909 * wfob**2 + 24.2424 * wfob**3
+        ) * dwfob
+        values["cdi_ufac_coeff"] = val = 1.0 / (np.pi * AR * siwb)
+        derivs["cdi_ufac_coeff"] = -val * (dAR / AR + dsiwb / siwb)
+        values["sweep_factor"] = 1.0 / np.cos(sweep) ** 2
+        derivs["sweep_factor"] = 2 * np.sin(sweep) / np.cos(sweep) ** 3 * dsweep
 
-        # wing-free profile drag coefficient
-        cdpo = (fe - few) / wing_area
+        # compressibility drag parameters
+        # sa1--4 are static, depending only on geometry
+        sweep_term = 1 + 0.0033 * (4 * dlmps - 3 * dlmtcx)
+        dsweep_term = 0.0033 * (4 * ddlmps - 3 * ddlmtcx)
+        tc_term = 1 - 1.4 * tc_ratio - 0.06 * (1 - wing_min_pressure_loc)
+        dtc_term = -1.4 * dtc_ratio + 0.06 * dmin_pressure_loc
+        values["SA1_static"] = sweep_term * tc_term - 0.0368
+        derivs["SA1_static"] = dsweep_term * tc_term + sweep_term * dtc_term
+        values["SA2_static"] = -0.33 * (0.65 - wing_min_pressure_loc) * sweep_term
+        derivs["SA2_static"] = -0.33 * (
+            (0.65 - wing_min_pressure_loc) * dsweep_term - dmin_pressure_loc * sweep_term
+        )
+        le_term = 1.5 - 2 * fk**2 * np.sin(rlmle) ** 2
+        dle_term = -4 * fk * np.sin(rlmle) * (
+            dfk * np.sin(rlmle) + fk * np.cos(rlmle) * drlmle)
+        values["SA3_static"] = le_term * tc_ratio ** (5 / 3.0)
+        derivs["SA3_static"] = (
+            dle_term * tc_ratio ** (5 / 3.0)
+            + le_term * 5 / 3.0 * tc_ratio ** (2 / 3.0) * dtc_ratio
+        )
+        values["SA4_static"] = 0.75 * tc_ratio
+        derivs["SA4_static"] = 0.75 * dtc_ratio
 
-        # Oswald efficiency
-        see = 1.0 / (
-            (1 / ufac / siwb)
-            + 1.1938 * AR * (cdw0 / (np.cos(deg2rad(sweep_c4))) ** 2 + cdpo)
+        return values, derivs
+
+
+class AeroGeom(om.ExplicitComponent):
+    """Compute drag parameters from cruise conditions and geometric parameters.
+
+    This corresponds to the AERO subroutine in GASP. The primary outputs are parameters
+    SA* which build up the total aircraft drag coefficient. The terms that depend only
+    on the design come from StaticAeroGeom, this component adds the dependence on the
+    flight condition at each node.
+    """
+
+    def initialize(self):
+        self.options.declare("num_nodes", default=1, types=int)
+        self.options.declare(
+            "include_strut",
+            default=False,
+            types=bool,
+            desc="Whether the aircraft has a strut or not",
         )
 
-        # compressibility drag parameters
-        # sa1--4 are static, depending only on geometry
-        sa1 = (1 + 0.0033 * (4 * dlmps - 3 * dlmtcx)) * (
-            1 - 1.4 * tc_ratio - 0.06 * (1 - wing_min_pressure_loc)
-        ) - 0.0368
-        sa2 = (
-            -0.33
-            * (0.65 - wing_min_pressure_loc)
-            * (1 + 0.0033 * (4 * dlmps - 3 * dlmtcx))
+    def setup(self):
+        nn = self.options["num_nodes"]
+
+        self.add_input(
+            Dynamic.Mission.MACH, val=0.0, units="unitless", shape=nn, desc="Current Mach number")
+        self.add_input(
+            Dynamic.Mission.SPEED_OF_SOUND,
+            val=1.0,
+            units="ft/s",
+            shape=nn,
+            desc="Speed of sound at current altitude",
         )
-        sa3 = (1.5 - 2 * fk**2 * np.sin(rlmle) ** 2) * tc_ratio ** (5 / 3.0)
-        sa4 = 0.75 * tc_ratio
+        self.add_input(
+            "nu",
+            val=1.0,
+            units="ft**2/s",
+            shape=nn,
+            desc="Kinematic viscosity at current altitude",
+        )
+
+        self.add_input("ufac", units="unitless", shape=nn, desc="UFAC")
+
+        add_aviary_input(self, Aircraft.Wing.FORM_FACTOR, val=1.25)
+
+        # reference lengths of the Reynolds number corrections
+
+        add_aviary_input(self, Aircraft.Wing.AVERAGE_CHORD, val=0.0)
+
+        add_aviary_input(self, Aircraft.Fuselage.LENGTH, val=0.0)
+
+        add_aviary_input(self, Aircraft.Nacelle.AVG_LENGTH, val=0.0)
+
+        add_aviary_input(self, Aircraft.VerticalTail.AVERAGE_CHORD, val=0.0)
+
+        add_aviary_input(self, Aircraft.HorizontalTail.AVERAGE_CHORD, val=0.0)
+
+        add_aviary_input(self, Aircraft.Strut.CHORD, val=0.0)
+
+        # from static geometry
+        for i in range(4):
+            name = f"SA{i+1}_static"
+            self.add_input(name, units="unitless", desc=f"SA{i+1}: Drag param")
+
+        for name, _ in _profile_components:
+            self.add_input(
+                name, units="unitless",
+                desc="Flat plate area per unit skin friction coefficient and Reynolds "
+                "number correction, divided by the wing area")
+        self.add_input(
+            "cd0_fixed", units="unitless",
+            desc="Profile drag coefficient independent of skin friction")
+        self.add_input(
+            "wing_shield_coeff", units="unitless",
+            desc="Wing area shielded by the fuselage times the interference factor, "
+            "divided by the wing area")
+        self.add_input(
+            "cdi_ufac_coeff", units="unitless",
+            desc="Induced drag coefficient term inversely proportional to UFAC")
+        self.add_input(
+            "sweep_factor", units="unitless",
+            desc="Wing profile drag factor in the Oswald efficiency")
+
+        # outputs
+        for i in range(7):
+            name = f"SA{i+1}"
+            self.add_output(name, units="unitless", shape=nn, desc=f"{name}: Drag param")
+
+        self.add_output(
+            "cf", units="unitless", shape=nn,
+            desc="CFIN: Skin friction coefficient at Re=1e7"
+        )
+
+    def setup_partials(self):
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn)
+        # partials wrt scalar inputs are single columns
+        zeros = np.zeros(nn, dtype=int)
+
+        for i in range(4):
+            self.declare_partials(
+                f"SA{i+1}", f"SA{i+1}_static", rows=ar, cols=zeros, val=1.0)
+
+        self.declare_partials("cf", Dynamic.Mission.MACH, rows=ar, cols=ar)
+
+        flight_cond = [Dynamic.Mission.MACH, Dynamic.Mission.SPEED_OF_SOUND, "nu"]
+        wing = [Aircraft.Wing.FORM_FACTOR, Aircraft.Wing.AVERAGE_CHORD]
+        profile = [name for name, _ in _profile_components] + [
+            "cd0_fixed", "wing_shield_coeff"]
+        for name, length in _profile_components:
+            if length != Aircraft.Strut.CHORD or self.options["include_strut"]:
+                profile.append(length)
+
+        self.declare_partials("SA5", flight_cond, rows=ar, cols=ar)
+        self.declare_partials("SA5", wing + profile, rows=ar, cols=zeros)
+
+        self.declare_partials("SA6", flight_cond, rows=ar, cols=ar)
+        self.declare_partials("SA6", wing, rows=ar, cols=zeros)
+
+        self.declare_partials("SA7", flight_cond + ["ufac"], rows=ar, cols=ar)
+        self.declare_partials(
+            "SA7", wing + profile + ["cdi_ufac_coeff", "sweep_factor"],
+            rows=ar, cols=zeros)
+
+    def compute(self, inputs, outputs):
+        mach = inputs[Dynamic.Mission.MACH]
+        ufac = inputs["ufac"]
+        ff_wing = inputs[Aircraft.Wing.FORM_FACTOR]
+        wing_shield = inputs["wing_shield_coeff"]
+
+        # skin friction coeff at Re = 10**7
+        cf = 0.455 / 7**2.58 / (1 + 0.144 * mach**2) ** 0.65
+
+        reli, _ = self._reynolds(inputs)
+        fwre, _, _ = _re_correction(reli, inputs[Aircraft.Wing.AVERAGE_CHORD])
+
+        # wing profile drag coefficient
+        cdw0 = ff_wing * cf * fwre
+
+        # profile drag of everything but the wing, the wing-fuselage interference
+        # drag is reduced by the drag of the shielded wing area
+        cdpo = inputs["cd0_fixed"] - wing_shield * cdw0
+        for name, fre, _, _ in self._re_corrections(inputs, reli):
+            cdpo = cdpo + inputs[name] * cf * fre
+
+        for i in range(4):
+            outputs[f"SA{i+1}"] = inputs[f"SA{i+1}_static"]
 
         # profile drag of everything but the wing
-        sa5 = cdpo
+        outputs["SA5"] = cdpo
         # wing profile drag
-        sa6 = ff_wing * fwre
-        # induced drag
-        sa7 = 1.0 / (np.pi * see * AR)
-
-        outputs["SA1"] = sa1
-        outputs["SA2"] = sa2
-        outputs["SA3"] = sa3
-        outputs["SA4"] = sa4
-        outputs["SA5"] = sa5
-        outputs["SA6"] = sa6
-        outputs["SA7"] = sa7
+        outputs["SA6"] = ff_wing * fwre
+        # induced drag, 1 / (pi * AR * e) with the Oswald efficiency e
+        outputs["SA7"] = inputs["cdi_ufac_coeff"] / ufac + 1.1938 / np.pi * (
+            cdw0 * inputs["sweep_factor"] + cdpo)
         outputs["cf"] = cf
 
+    def compute_partials(self, inputs, J):
+        mach = inputs[Dynamic.Mission.MACH]
+        ufac = inputs["ufac"]
+        ff_wing = inputs[Aircraft.Wing.FORM_FACTOR]
+        wing_shield = inputs["wing_shield_coeff"]
+        sweep_factor = inputs["sweep_factor"]
+        c7 = 1.1938 / np.pi
+
+        cf = 0.455 / 7**2.58 / (1 + 0.144 * mach**2) ** 0.65
+        dcf_dmach = -0.65 * cf * 0.288 * mach / (1 + 0.144 * mach**2)
+
+        reli, dreli = self._reynolds(inputs)
+        fwre, dfwre_dreli, dfwre_dchord = _re_correction(
+            reli, inputs[Aircraft.Wing.AVERAGE_CHORD])
+        cdw0 = ff_wing * cf * fwre
+
+        # profile drag of everything but the wing, per unit cf
+        cdpo_cf = 0.0
+        dcdpo_cf_dreli = 0.0
+        for name, fre, dfre_dreli, dfre_dlength in self._re_corrections(inputs, reli):
+            coeff = inputs[name]
+            cdpo_cf = cdpo_cf + coeff * fre
+            dcdpo_cf_dreli = dcdpo_cf_dreli + coeff * dfre_dreli
+
+            J["SA5", name] = cf * fre
+            J["SA7", name] = c7 * cf * fre
+            if dfre_dlength is not None:
+                length = _profile_lengths[name]
+                J["SA5", length] = cf * coeff * dfre_dlength
+                J["SA7", length] = c7 * cf * coeff * dfre_dlength
+
+        J["cf", Dynamic.Mission.MACH] = dcf_dmach
+
+        for wrt, dreli_dwrt in zip(
+                [Dynamic.Mission.MACH, Dynamic.Mission.SPEED_OF_SOUND, "nu"], dreli):
+            dfwre = dfwre_dreli * dreli_dwrt
+            dcdw0 = ff_wing * cf * dfwre
+            dcdpo = cf * dcdpo_cf_dreli * dreli_dwrt - wing_shield * dcdw0
+            if wrt == Dynamic.Mission.MACH:
+                dcdw0 = dcdw0 + ff_wing * dcf_dmach * fwre
+                dcdpo = dcdpo + dcf_dmach * (cdpo_cf - wing_shield * ff_wing * fwre)
+
+            J["SA5", wrt] = dcdpo
+            J["SA6", wrt] = ff_wing * dfwre
+            J["SA7", wrt] = c7 * (sweep_factor * dcdw0 + dcdpo)
+
+        J["SA7", "ufac"] = -inputs["cdi_ufac_coeff"] / ufac**2
+
+        # wing terms enter through cdw0
+        for wrt, dcdw0, dsa6 in (
+                (Aircraft.Wing.FORM_FACTOR, cf * fwre, fwre),
+                (Aircraft.Wing.AVERAGE_CHORD, ff_wing * cf * dfwre_dchord,
+                 ff_wing * dfwre_dchord)):
+            J["SA5", wrt] = -wing_shield * dcdw0
+            J["SA6", wrt] = dsa6
+            J["SA7", wrt] = c7 * (sweep_factor - wing_shield) * dcdw0
+
+        J["SA5", "cd0_fixed"] = 1.0
+        J["SA7", "cd0_fixed"] = c7
+        J["SA5", "wing_shield_coeff"] = -cdw0
+        J["SA7", "wing_shield_coeff"] = -c7 * cdw0
+        J["SA7", "cdi_ufac_coeff"] = 1.0 / ufac
+        J["SA7", "sweep_factor"] = c7 * cdw0
+
+    def _reynolds(self, inputs):
+        """Return the Reynolds number per foot and its derivatives wrt Mach, speed of
+        sound and kinematic viscosity.
+        """
+        mach = inputs[Dynamic.Mission.MACH]
+        sos = inputs[Dynamic.Mission.SPEED_OF_SOUND]
+        nu = inputs["nu"]
+
+        # here we make a smooth transition between a minimum reli (approximately
+        # corresponding to Mach 0.1 at SLS) to help with takeoff. GASP doesn't call AERO
+        # before takeoff, so the RELI used corresponds to the cruise point, and this
+        # isn't a problem.
+        reli_y1 = 700000
+        reli_y2 = sos * mach / nu
+        sig = sigmoid(mach, 0.1, alpha=0.005)
+        reli = (1 - sig) * reli_y1 + sig * reli_y2
+
+        dsig_dmach = sig * (1 - sig) / 0.005
+        dreli = (
+            dsig_dmach * (reli_y2 - reli_y1) + sig * sos / nu,
+            sig * mach / nu,
+            -sig * reli_y2 / nu,
+        )
+
+        return reli, dreli
+
+    def _re_corrections(self, inputs, reli):
+        """Yield the name of the flat plate area coefficient, the Re correction factor
+        and its derivatives wrt reli and the reference length for the fuselage,
+        nacelle, vtail, htail and strut.
+        """
+        for name, length in _profile_components:
+            if length == Aircraft.Strut.CHORD and not self.options["include_strut"]:
+                yield name, np.ones_like(reli), np.zeros_like(reli), None
+            else:
+                yield (name, *_re_correction(reli, inputs[length]))
+
 
 class AeroSetup(om.Group):
     """Calculations for setting up aero"""
@@ -829,6 +1252,7 @@ class AeroSetup(om.Group):
                 promotes=["*"],
             )
 
+        self.add_subsystem("static_geom", StaticAeroGeom(), promotes=["*"])
         self.add_subsystem("geom", AeroGeom(num_nodes=nn), promotes=["*"])
 
 
@@ -909,28 +1333,42 @@ class DragCoef(om.ExplicitComponent):
             shape=nn, desc="CD increment with landing gear down")
 
     def setup_partials(self):
-        # self.declare_coloring(method="cs", show_summary=False)
-        self.declare_partials("*", "*", dependent=False)
-        ar = np.arange(self.options["num_nodes"])
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn)
+        zeros = np.zeros(nn, dtype=int)
 
-        self.declare_partials("CD_base", ["*"], method="cs")
         self.declare_partials(
             "CD_base",
             [Dynamic.Mission.ALTITUDE, "CL", "cf", "SA5", "SA6", "SA7"],
             rows=ar,
             cols=ar,
-            method="cs",
         )
-        # self.declare_partials(
-        #     "CD_base", [Mission.Design.GROSS_MASS, "dCD_flaps_model", "wing_area"], val=0
-        # )
+        self.declare_partials(
+            "CD_base",
+            [
+                "flap_defl",
+                Aircraft.Wing.HEIGHT,
+                "airport_alt",
+                Aircraft.Wing.FLAP_CHORD_RATIO,
+                "dCL_flaps_model",
+                "dCL_flaps_coef",
+                "CDI_factor",
+                Aircraft.Wing.AVERAGE_CHORD,
+                Aircraft.Wing.SPAN,
+            ],
+            rows=ar,
+            cols=zeros,
+        )
 
-        self.declare_partials("dCD_flaps_full", ["dCD_flaps_model"], val=1)
+        self.declare_partials(
+            "dCD_flaps_full", ["dCD_flaps_model"], rows=ar, cols=zeros, val=1
+        )
 
         self.declare_partials(
             "dCD_gear_full",
             [Mission.Design.GROSS_MASS, Aircraft.Wing.AREA, "flap_defl"],
-            method="cs",
+            rows=ar,
+            cols=zeros,
         )
 
     def compute(self, inputs, outputs):
@@ -978,6 +1416,84 @@ class DragCoef(om.ExplicitComponent):
         outputs["dCD_flaps_full"] = dCD_flaps_model
         outputs["dCD_gear_full"] = dcd_gear
 
+    def compute_partials(self, inputs, J):
+        (
+            alt,
+            CL,
+            gross_mass_initial,
+            flap_defl,
+            wing_height,
+            airport_alt,
+            flap_chord_ratio,
+            dCL_flaps_model,
+            dCD_flaps_model,
+            dCL_flaps_coef,
+            CDI_factor,
+            avg_chord,
+            wingspan,
+            wing_area,
+            cf,
+            SA5,
+            SA6,
+            SA7,
+        ) = inputs.values()
+        gross_wt_initial = gross_mass_initial * GRAV_ENGLISH_LBM
+        d = seed_partials(inputs)
+        dflap_defl = deg2rad(d["flap_defl"])
+
+        dcd0 = d["SA5"] + SA6 * d["cf"] + cf * d["SA6"]
+
+        cl_wing = CL - dCL_flaps_coef * dCL_flaps_model
+        dcl_wing = (
+            d["CL"] - dCL_flaps_model * d["dCL_flaps_coef"]
+            - dCL_flaps_coef * d["dCL_flaps_model"]
+        )
+        cdi = SA7 * cl_wing**2 / CDI_factor
+        dcdi = (
+            cl_wing**2 * d["SA7"] + 2 * SA7 * cl_wing * dcl_wing
+            - cdi * d["CDI_factor"]
+        ) / CDI_factor
+
+        hac = wing_height + alt - airport_alt
+        dhac = d[Aircraft.Wing.HEIGHT] + d[Dynamic.Mission.ALTITUDE] - d["airport_alt"]
+        sin_flap = np.sin(deg2rad(flap_defl))
+        heff = 2 * hac - sin_flap * flap_chord_ratio * avg_chord
+        dheff = 2 * dhac - (
+            np.cos(deg2rad(flap_defl)) * flap_chord_ratio * avg_chord * dflap_defl
+            + sin_flap * avg_chord * d[Aircraft.Wing.FLAP_CHORD_RATIO]
+            + sin_flap * flap_chord_ratio * d[Aircraft.Wing.AVERAGE_CHORD]
+        )
+        hob = heff / wingspan
+        dhob = (dheff - hob * d[Aircraft.Wing.SPAN]) / wingspan
+        sig = np.exp(-2.48 * hob**0.768)
+        dsig = -2.48 * 0.768 * hob**-0.232 * sig * dhob
+        betag = np.sqrt(1 + hob**2) - hob
+        dbetag = (hob / np.sqrt(1 + hob**2) - 1) * dhob
+        c1 = betag * CL / (12.5664 * hac)
+        dc1 = (dbetag * CL + betag * d["CL"]) / (12.5664 * hac) - c1 * dhac / hac
+
+        ddcd_ground = (
+            -(dsig - dc1) * cdi / (1.0 - c1)
+            - (sig - c1) * (dcdi + cdi * dc1 / (1.0 - c1)) / (1.0 - c1)
+            - dc1 * SA6 * cf
+            - c1 * (cf * d["SA6"] + SA6 * d["cf"])
+        )
+        dCD_base = dcd0 + dcdi + ddcd_ground
+
+        for idx, name in enumerate(inputs):
+            if name not in (
+                Mission.Design.GROSS_MASS, "dCD_flaps_model", Aircraft.Wing.AREA
+            ):
+                J["CD_base", name] = dCD_base[idx]
+
+        grfe = 0.0033 * gross_wt_initial**0.785
+        gear_flap_fac = 1 - 0.454545 * flap_defl / 50
+        J["dCD_gear_full", Mission.Design.GROSS_MASS] = (
+            0.785 * grfe / gross_mass_initial / wing_area * gear_flap_fac
+        )
+        J["dCD_gear_full", Aircraft.Wing.AREA] = -grfe / wing_area**2 * gear_flap_fac
+        J["dCD_gear_full", "flap_defl"] = -grfe / wing_area * 0.454545 / 50
+
 
 class DragCoefClean(om.ExplicitComponent):
     """Clean drag coefficient for high-speed flight"""
@@ -1011,17 +1527,18 @@ class DragCoefClean(om.ExplicitComponent):
         self.add_output("CD", units="unitless", shape=nn, desc="Drag coefficient")
 
     def setup_partials(self):
-        ar = np.arange(self.options["num_nodes"])
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn)
 
         self.declare_partials(
             "CD",
             [Dynamic.Mission.MACH, "CL", "cf", "SA1", "SA2", "SA5", "SA6", "SA7"],
             rows=ar,
             cols=ar,
-            method="cs",
         )
         self.declare_partials(
-            "CD", [Aircraft.Design.SUPERCRITICAL_DIVERGENCE_SHIFT], method="cs"
+            "CD", [Aircraft.Design.SUPERCRITICAL_DIVERGENCE_SHIFT],
+            rows=ar, cols=np.zeros(nn, dtype=int),
         )
 
     def compute(self, inputs, outputs):
@@ -1043,6 +1560,29 @@ class DragCoefClean(om.ExplicitComponent):
 
         outputs["CD"] = cd0 + cdi + delcdm
 
+    def compute_partials(self, inputs, J):
+        mach, CL, div_drag_supercrit, cf, SA1, SA2, SA5, SA6, SA7 = inputs.values()
+
+        mach_div = SA1 + SA2 * CL + div_drag_supercrit
+
+        sig = sigmoid(mach, mach_div, alpha=0.005)
+        dsig_dmach = sig * (1 - sig) / 0.005
+        ddelcdm_dmach = (
+            dsig_dmach * 10 * (mach - mach_div) ** 3 + sig * 30 * (mach - mach_div) ** 2
+        )
+        # delcdm depends on mach - mach_div
+        ddelcdm_dmach_div = -ddelcdm_dmach
+
+        J["CD", Dynamic.Mission.MACH] = ddelcdm_dmach
+        J["CD", "CL"] = 2 * SA7 * CL + ddelcdm_dmach_div * SA2
+        J["CD", "cf"] = SA6
+        J["CD", "SA1"] = ddelcdm_dmach_div
+        J["CD", "SA2"] = ddelcdm_dmach_div * CL
+        J["CD", "SA5"] = 1.0
+        J["CD", "SA6"] = cf
+        J["CD", "SA7"] = CL**2
+        J["CD", Aircraft.Design.SUPERCRITICAL_DIVERGENCE_SHIFT] = ddelcdm_dmach_div
+
 
 class LiftCoeff(om.ExplicitComponent):
     """GASP lift coefficient calculation for low-speed near-ground flight"""
@@ -1109,24 +1649,38 @@ class LiftCoeff(om.ExplicitComponent):
             "CL_max", units="unitless", shape=nn, desc="Max lift coefficient")
 
     def setup_partials(self):
-        # self.declare_coloring(method="cs", show_summary=False)
-        self.declare_partials("*", "*", dependent=False)
-        ar = np.arange(self.options["num_nodes"])
-
-        dynvars = ["alpha", Dynamic.Mission.ALTITUDE, "lift_curve_slope", "lift_ratio"]
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn)
+        zeros = np.zeros(nn, dtype=int)
+
+        dynvars = ["alpha", Dynamic.Mission.ALTITUDE, "lift_curve_slope"]
+        params = [
+            Aircraft.Wing.ZERO_LIFT_ANGLE,
+            Aircraft.Wing.SWEEP,
+            Aircraft.Wing.ASPECT_RATIO,
+            Aircraft.Wing.HEIGHT,
+            "airport_alt",
+            "flap_defl",
+            Aircraft.Wing.FLAP_CHORD_RATIO,
+            Aircraft.Wing.TAPER_RATIO,
+            "dCL_flaps_model",
+            Aircraft.Wing.AVERAGE_CHORD,
+            Aircraft.Wing.SPAN,
+        ]
 
-        self.declare_partials("CL_base", ["*"], method="cs")
-        self.declare_partials("CL_base", dynvars, rows=ar, cols=ar, method="cs")
+        self.declare_partials("CL_base", dynvars + ["lift_ratio"], rows=ar, cols=ar)
+        self.declare_partials("CL_base", params, rows=ar, cols=zeros)
 
-        self.declare_partials("dCL_flaps_full", ["dCL_flaps_model"], method="cs")
         self.declare_partials(
-            "dCL_flaps_full", ["lift_ratio"], rows=ar, cols=ar, method="cs")
+            "dCL_flaps_full", ["dCL_flaps_model"], rows=ar, cols=zeros)
+        self.declare_partials("dCL_flaps_full", ["lift_ratio"], rows=ar, cols=ar)
 
-        self.declare_partials("alpha_stall", ["*"], method="cs")
-        self.declare_partials("alpha_stall", dynvars, rows=ar, cols=ar, method="cs")
+        self.declare_partials("alpha_stall", dynvars, rows=ar, cols=ar)
+        self.declare_partials(
+            "alpha_stall", params + ["CL_max_flaps"], rows=ar, cols=zeros)
 
-        self.declare_partials("CL_max", ["CL_max_flaps"], method="cs")
-        self.declare_partials("CL_max", ["lift_ratio"], rows=ar, cols=ar, method="cs")
+        self.declare_partials("CL_max", ["CL_max_flaps"], rows=ar, cols=zeros)
+        self.declare_partials("CL_max", ["lift_ratio"], rows=ar, cols=ar)
 
     def compute(self, inputs, outputs):
         (
@@ -1148,34 +1702,170 @@ class LiftCoeff(om.ExplicitComponent):
             wingspan,
         ) = inputs.values()
 
+        kclge = self._ground_factor(inputs)
+        kclge = np.clip(kclge, 1.0, None)
+
+        outputs["CL_base"] = kclge * lift_curve_slope * \
+            deg2rad(alpha - alpha0) * (1 + lift_ratio)
+        outputs["dCL_flaps_full"] = dCL_flaps_model * (1 + lift_ratio)
+
+        outputs["alpha_stall"] = (
+            rad2deg((CL_max_flaps - dCL_flaps_model) /
+                    (kclge * lift_curve_slope)) + alpha0
+        )
+        outputs["CL_max"] = CL_max_flaps * (1 + lift_ratio)
+
+    def compute_partials(self, inputs, J):
+        (
+            alpha,
+            alt,
+            lift_curve_slope,
+            lift_ratio,
+            alpha0,
+            sweep_c4,
+            AR,
+            wing_height,
+            airport_alt,
+            flap_defl,
+            flap_chord_ratio,
+            taper_ratio,
+            CL_max_flaps,
+            dCL_flaps_model,
+            avg_chord,
+            wingspan,
+        ) = inputs.values()
+        d = seed_partials(inputs)
+
+        kclge, dkclge = self._ground_factor(inputs, d)
+        # the factor is constant where it is clipped
+        dkclge = dkclge * (kclge > 1.0)
+        kclge = np.clip(kclge, 1.0, None)
+
+        alpha_rad = deg2rad(alpha - alpha0)
+        dalpha_rad = deg2rad(d["alpha"] - d[Aircraft.Wing.ZERO_LIFT_ANGLE])
+        dlift_curve_slope = d["lift_curve_slope"]
+
+        dCL_base = (
+            (dkclge * lift_curve_slope + kclge * dlift_curve_slope) * alpha_rad
+            + kclge * lift_curve_slope * dalpha_rad
+        ) * (1 + lift_ratio) + kclge * lift_curve_slope * alpha_rad * d["lift_ratio"]
+
+        cl_ratio = (CL_max_flaps - dCL_flaps_model) / (kclge * lift_curve_slope)
+        dcl_ratio = (
+            (d["CL_max_flaps"] - d["dCL_flaps_model"])
+            - cl_ratio * (dkclge * lift_curve_slope + kclge * dlift_curve_slope)
+        ) / (kclge * lift_curve_slope)
+        dalpha_stall = rad2deg(dcl_ratio) + d[Aircraft.Wing.ZERO_LIFT_ANGLE]
+
+        for idx, name in enumerate(inputs):
+            if name != "CL_max_flaps":
+                J["CL_base", name] = dCL_base[idx]
+            if name != "lift_ratio":
+                J["alpha_stall", name] = dalpha_stall[idx]
+
+        J["dCL_flaps_full", "dCL_flaps_model"] = 1 + lift_ratio
+        J["dCL_flaps_full", "lift_ratio"] = dCL_flaps_model
+        J["CL_max", "CL_max_flaps"] = 1 + lift_ratio
+        J["CL_max", "lift_ratio"] = CL_max_flaps
+
+    def _ground_factor(self, inputs, d=None):
+        """Compute the ground effect factor on the lift-curve slope before clipping.
+
+        If derivative seeds d are given, also return the derivatives of the factor.
+        """
+        (
+            alpha,
+            alt,
+            lift_curve_slope,
+            lift_ratio,
+            alpha0,
+            sweep_c4,
+            AR,
+            wing_height,
+            airport_alt,
+            flap_defl,
+            flap_chord_ratio,
+            taper_ratio,
+            CL_max_flaps,
+            dCL_flaps_model,
+            avg_chord,
+            wingspan,
+        ) = inputs.values()
+
         # ground effects - factor on lift-curve slope
         hac = wing_height + alt - airport_alt
         heff = 2 * hac - np.sin(deg2rad(flap_defl)) * flap_chord_ratio * avg_chord
         sig = np.exp(-2.48 * (heff / wingspan) ** 0.768)
         betag = (1 + (heff / wingspan) ** 2) ** 0.5 - heff / wingspan
-        rlmc2 = cs.arctan2(
-            AR * np.tan(deg2rad(sweep_c4)) - ((1 - taper_ratio) / (1 + taper_ratio)), AR
-        )
+        taper_term = (1 - taper_ratio) / (1 + taper_ratio)
+        rlmc2 = cs.arctan2(AR * np.tan(deg2rad(sweep_c4)) - taper_term, AR)
         c3 = 2 * np.cos(rlmc2) + np.sqrt(AR**2 + (2 * np.cos(rlmc2)) ** 2)
         c4 = betag / (12.5664 * hac / avg_chord)
         cloge = lift_curve_slope * deg2rad(alpha - alpha0) + dCL_flaps_model
+        clsh = lift_curve_slope / (16 * hac / avg_chord)
         kclge = (
             1
             + sig
             - sig * AR * np.cos(rlmc2) / c3
-            - c4 * (cloge - lift_curve_slope / (16 * hac / avg_chord))
+            - c4 * (cloge - clsh)
         )
-        kclge = np.clip(kclge, 1.0, None)
 
-        outputs["CL_base"] = kclge * lift_curve_slope * \
-            deg2rad(alpha - alpha0) * (1 + lift_ratio)
-        outputs["dCL_flaps_full"] = dCL_flaps_model * (1 + lift_ratio)
+        if d is None:
+            return kclge
 
-        outputs["alpha_stall"] = (
-            rad2deg((CL_max_flaps - dCL_flaps_model) /
-                    (kclge * lift_curve_slope)) + alpha0
+        dAR = d[Aircraft.Wing.ASPECT_RATIO]
+        davg_chord = d[Aircraft.Wing.AVERAGE_CHORD]
+        dlift_curve_slope = d["lift_curve_slope"]
+
+        dhac = d[Aircraft.Wing.HEIGHT] + d[Dynamic.Mission.ALTITUDE] - d["airport_alt"]
+        sin_flap = np.sin(deg2rad(flap_defl))
+        dheff = 2 * dhac - (
+            np.cos(deg2rad(flap_defl)) * flap_chord_ratio * avg_chord
+            * deg2rad(d["flap_defl"])
+            + sin_flap * avg_chord * d[Aircraft.Wing.FLAP_CHORD_RATIO]
+            + sin_flap * flap_chord_ratio * davg_chord
+        )
+        hob = heff / wingspan
+        dhob = (dheff - hob * d[Aircraft.Wing.SPAN]) / wingspan
+        dsig = -2.48 * 0.768 * hob**-0.232 * sig * dhob
+        dbetag = (hob / np.sqrt(1 + hob**2) - 1) * dhob
+
+        tan = np.tan(deg2rad(sweep_c4))
+        y = AR * tan - taper_term
+        dy = (
+            tan * dAR
+            + AR / np.cos(deg2rad(sweep_c4)) ** 2 * deg2rad(d[Aircraft.Wing.SWEEP])
+            + 2 / (1 + taper_ratio) ** 2 * d[Aircraft.Wing.TAPER_RATIO]
+        )
+        drlmc2 = (AR * dy - y * dAR) / (AR**2 + y**2)
+        cos = np.cos(rlmc2)
+        dcos = -np.sin(rlmc2) * drlmc2
+        root = np.sqrt(AR**2 + (2 * cos) ** 2)
+        dc3 = 2 * dcos + (AR * dAR + 4 * cos * dcos) / root
+
+        dc4 = (
+            (dbetag * avg_chord + betag * davg_chord) / (12.5664 * hac)
+            - c4 * dhac / hac
+        )
+        dcloge = (
+            deg2rad(alpha - alpha0) * dlift_curve_slope
+            + lift_curve_slope * deg2rad(d["alpha"] - d[Aircraft.Wing.ZERO_LIFT_ANGLE])
+            + d["dCL_flaps_model"]
+        )
+        dclsh = (
+            (dlift_curve_slope * avg_chord + lift_curve_slope * davg_chord) / (16 * hac)
+            - clsh * dhac / hac
+        )
+
+        dkclge = (
+            dsig
+            - (dsig * AR * cos + sig * dAR * cos + sig * AR * dcos) / c3
+            + sig * AR * cos * dc3 / c3**2
+            - dc4 * (cloge - clsh)
+            - c4 * (dcloge - dclsh)
         )
-        outputs["CL_max"] = CL_max_flaps * (1 + lift_ratio)
+
+        return kclge, dkclge
 
 
 class LiftCoeffClean(om.ExplicitComponent):
@@ -1219,35 +1909,37 @@ class LiftCoeffClean(om.ExplicitComponent):
             "CL_max", units="unitless", shape=nn, desc="Max lift coefficient")
 
     def setup_partials(self):
-        # self.declare_coloring(method="cs", show_summary=False)
-        self.declare_partials("*", "*", dependent=False)
-        ar = np.arange(self.options["num_nodes"])
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn)
+        zeros = np.zeros(nn, dtype=int)
 
         if self.options["output_alpha"]:
             self.declare_partials(
-                "alpha", ["CL", "lift_ratio", "lift_curve_slope"], rows=ar, cols=ar, method="cs"
+                "alpha", ["CL", "lift_ratio", "lift_curve_slope"], rows=ar, cols=ar
+            )
+            self.declare_partials(
+                "alpha", [Aircraft.Wing.ZERO_LIFT_ANGLE], rows=ar, cols=zeros, val=1.0
             )
-            self.declare_partials("alpha", [Aircraft.Wing.ZERO_LIFT_ANGLE], method="cs")
         else:
             self.declare_partials(
-                "CL", ["lift_curve_slope", "alpha", "lift_ratio"], rows=ar, cols=ar, method="cs"
+                "CL", ["lift_curve_slope", "alpha", "lift_ratio"], rows=ar, cols=ar
             )
-            self.declare_partials("CL", [Aircraft.Wing.ZERO_LIFT_ANGLE], method="cs")
+            self.declare_partials(
+                "CL", [Aircraft.Wing.ZERO_LIFT_ANGLE], rows=ar, cols=zeros)
 
         self.declare_partials(
-            "alpha_stall", ["lift_curve_slope"], rows=ar, cols=ar, method="cs")
+            "alpha_stall", ["lift_curve_slope"], rows=ar, cols=ar)
         self.declare_partials(
-            "alpha_stall",
-            [
-                Mission.Design.LIFT_COEFFICIENT_MAX_FLAPS_UP,
-                Aircraft.Wing.ZERO_LIFT_ANGLE,
-            ],
-            method="cs",
+            "alpha_stall", [Mission.Design.LIFT_COEFFICIENT_MAX_FLAPS_UP],
+            rows=ar, cols=zeros,
+        )
+        self.declare_partials(
+            "alpha_stall", [Aircraft.Wing.ZERO_LIFT_ANGLE], rows=ar, cols=zeros, val=1.0
         )
 
-        self.declare_partials("CL_max", ["lift_ratio"], rows=ar, cols=ar, method="cs")
+        self.declare_partials("CL_max", ["lift_ratio"], rows=ar, cols=ar)
         self.declare_partials(
-            "CL_max", [Mission.Design.LIFT_COEFFICIENT_MAX_FLAPS_UP], method="cs"
+            "CL_max", [Mission.Design.LIFT_COEFFICIENT_MAX_FLAPS_UP], rows=ar, cols=zeros
         )
 
     def compute(self, inputs, outputs):
@@ -1263,6 +1955,30 @@ class LiftCoeffClean(om.ExplicitComponent):
         outputs["alpha_stall"] = rad2deg(CL_max_flaps / lift_curve_slope) + alpha0
         outputs["CL_max"] = CL_max_flaps * (1 + lift_ratio)
 
+    def compute_partials(self, inputs, J):
+        _, lift_curve_slope, lift_ratio, alpha0, CL_max_flaps = inputs.values()
+        if self.options["output_alpha"]:
+            CL = inputs["CL"]
+            clw = CL / (1 + lift_ratio)
+            J["alpha", "CL"] = rad2deg(1 / ((1 + lift_ratio) * lift_curve_slope))
+            J["alpha", "lift_ratio"] = \
+                -rad2deg(clw / lift_curve_slope) / (1 + lift_ratio)
+            J["alpha", "lift_curve_slope"] = -rad2deg(clw / lift_curve_slope**2)
+        else:
+            alpha = inputs["alpha"]
+            J["CL", "lift_curve_slope"] = deg2rad(alpha - alpha0) * (1 + lift_ratio)
+            J["CL", "alpha"] = lift_curve_slope * deg2rad(1.0) * (1 + lift_ratio)
+            J["CL", "lift_ratio"] = lift_curve_slope * deg2rad(alpha - alpha0)
+            J["CL", Aircraft.Wing.ZERO_LIFT_ANGLE] = \
+                -lift_curve_slope * deg2rad(1.0) * (1 + lift_ratio)
+
+        J["alpha_stall", "lift_curve_slope"] = \
+            -rad2deg(CL_max_flaps / lift_curve_slope**2)
+        J["alpha_stall", Mission.Design.LIFT_COEFFICIENT_MAX_FLAPS_UP] = \
+            rad2deg(1 / lift_curve_slope)
+        J["CL_max", "lift_ratio"] = CL_max_flaps
+        J["CL_max", Mission.Design.LIFT_COEFFICIENT_MAX_FLAPS_UP] = 1 + lift_ratio
+
 
 class CruiseAero(om.Group):
     """Top-level aerodynamics group for cruise (no flaps, no landing gear)"""
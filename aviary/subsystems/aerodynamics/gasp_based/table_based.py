@@ -8,7 +8,9 @@ from pathlib import Path
 from aviary.constants import GRAV_ENGLISH_LBM
 from aviary.subsystems.aerodynamics.gasp_based.common import AeroForces, TimeRamp
 from aviary.utils.named_values import NamedValues, get_keys
-from aviary.utils.data_interpolator_builder import build_data_interpolator
+from aviary.utils.data_interpolator_builder import (
+    CachedMetaModelStructuredComp, build_data_interpolator, get_cached_data,
+    hash_named_values)
 from aviary.utils.csv_data_file import read_data_file
 from aviary.utils.functions import get_path
 from aviary.utils.named_values import get_items
@@ -390,25 +392,10 @@ def _build_free_aero_interp(num_nodes=0, aero_data=None, training_data=False,
     if isinstance(aero_data, Path):
         aero_data = read_data_file(aero_data, aliases=aliases)
 
-    # aero_data is modified in-place, deepcopy required
-    interp_data = aero_data.deepcopy()
-
-    interp_data = _structure_special_grid(interp_data)
-
-    required_inputs = {Dynamic.Mission.ALTITUDE, Dynamic.Mission.MACH,
-                       'angle_of_attack'}
-    required_outputs = {'lift_coefficient', 'drag_coefficient'}
-
-    missing_variables = []
-    if not required_inputs <= get_keys(interp_data):
-        missing_variables.append([key for key in
-                                  required_inputs.difference(get_keys(interp_data))])
-    if not training_data and not required_outputs <= get_keys(interp_data):
-        missing_variables.append([key for key in
-                                  required_outputs.difference(get_keys(interp_data))])
-    if missing_variables:
-        raise KeyError('GASP-based aerodynamics interpolation missing required '
-                       f'variables: {missing_variables}')
+    # the prepared data is shared, and modified in-place below, deepcopy required
+    interp_data = get_cached_data(
+        hash_named_values(aero_data, 'free_aero', training_data),
+        lambda: _prepare_free_aero_data(aero_data, training_data)).deepcopy()
 
     if training_data:
         method = 'lagrange2'
@@ -435,9 +422,9 @@ def _build_free_aero_interp(num_nodes=0, aero_data=None, training_data=False,
         # free aero CL at max alpha is the same across altitudes but ignore that for now
         cl_max = interp_data.get_val('lift_coefficient', 'unitless')[0, :, -1]
         # add a 1d metamodel for cl_max, promoting all variables
-        meta_1d = om.MetaModelStructuredComp(method='1D-lagrange2',
-                                             vec_size=num_nodes,
-                                             extrapolate=extrapolate)
+        meta_1d = CachedMetaModelStructuredComp(method='1D-lagrange2',
+                                                vec_size=num_nodes,
+                                                extrapolate=extrapolate)
         meta_1d.add_input(Dynamic.Mission.MACH, 0.0, units="unitless",
                           shape=num_nodes,
                           training_data=interp_data.get_val(Dynamic.Mission.MACH,
@@ -449,6 +436,31 @@ def _build_free_aero_interp(num_nodes=0, aero_data=None, training_data=False,
         return group
 
 
+def _prepare_free_aero_data(aero_data, training_data):
+    """validates and restructures the data for cruise aero"""
+    # aero_data is modified in-place, deepcopy required
+    interp_data = aero_data.deepcopy()
+
+    interp_data = _structure_special_grid(interp_data)
+
+    required_inputs = {Dynamic.Mission.ALTITUDE, Dynamic.Mission.MACH,
+                       'angle_of_attack'}
+    required_outputs = {'lift_coefficient', 'drag_coefficient'}
+
+    missing_variables = []
+    if not required_inputs <= get_keys(interp_data):
+        missing_variables.append([key for key in
+                                  required_inputs.difference(get_keys(interp_data))])
+    if not training_data and not required_outputs <= get_keys(interp_data):
+        missing_variables.append([key for key in
+                                  required_outputs.difference(get_keys(interp_data))])
+    if missing_variables:
+        raise KeyError('GASP-based aerodynamics interpolation missing required '
+                       f'variables: {missing_variables}')
+
+    return interp_data
+
+
 def _build_flaps_aero_interp(num_nodes=0, aero_data=None, training_data=False,
                              method='slinear', structured=True, extrapolate=False):
     """creates interpolation components for cruise aero"""
@@ -462,6 +474,24 @@ def _build_flaps_aero_interp(num_nodes=0, aero_data=None, training_data=False,
     if isinstance(aero_data, Path):
         aero_data = read_data_file(aero_data, aliases=aliases)
 
+    # the prepared data is shared, and modified in-place below, deepcopy required
+    interp_data = get_cached_data(
+        hash_named_values(aero_data, 'flaps_aero', training_data),
+        lambda: _prepare_flaps_aero_data(aero_data, training_data)).deepcopy()
+
+    return build_data_interpolator(num_nodes=num_nodes,
+                                   interpolator_data=interp_data,
+                                   interpolator_outputs={'delta_lift_coefficient': 'unitless',
+                                                         'delta_drag_coefficient': 'unitless',
+                                                         'delta_lift_coefficient_max': 'unitless'},
+                                   method=method,
+                                   structured=structured,
+                                   training_data=training_data,
+                                   extrapolate=extrapolate)
+
+
+def _prepare_flaps_aero_data(aero_data, training_data):
+    """validates and restructures the data for flaps aero, adding the max delta CL"""
     # aero_data is modified in-place, deepcopy required
     interp_data = aero_data.deepcopy()
 
@@ -488,24 +518,13 @@ def _build_flaps_aero_interp(num_nodes=0, aero_data=None, training_data=False,
                       )  # units don't matter, not using values
     mach = np.unique(interp_data.get_val(Dynamic.Mission.MACH, 'unitless'))
 
-    dcl_max = np.zeros_like(dcl)
-    shape = (defl.size, mach.size, alpha.size)
-    dcl_max = np.resize(dcl_max, shape)
-    dcl = np.reshape(dcl, shape)
-    for i in range(defl.size):
-        dcl_max[i, :, :] = np.broadcast_to(dcl[i, :, -1], (alpha.size, mach.size)).T
+    # delta CL at the highest alpha, for every alpha
+    dcl = np.reshape(dcl, (defl.size, mach.size, alpha.size))
+    dcl_max = np.repeat(dcl[..., -1:], alpha.size, axis=-1)
 
     interp_data.set_val('delta_lift_coefficient_max', dcl_max.flatten(), 'unitless')
 
-    return build_data_interpolator(num_nodes=num_nodes,
-                                   interpolator_data=interp_data,
-                                   interpolator_outputs={'delta_lift_coefficient': 'unitless',
-                                                         'delta_drag_coefficient': 'unitless',
-                                                         'delta_lift_coefficient_max': 'unitless'},
-                                   method=method,
-                                   structured=structured,
-                                   training_data=training_data,
-                                   extrapolate=extrapolate)
+    return interp_data
 
 
 def _build_ground_aero_interp(num_nodes=0, aero_data=None, training_data=False,
@@ -518,6 +537,25 @@ def _build_ground_aero_interp(num_nodes=0, aero_data=None, training_data=False,
     if isinstance(aero_data, Path):
         aero_data = read_data_file(aero_data, aliases=aliases)
 
+    # the prepared data is shared, and modified in-place below, deepcopy required
+    interp_data = get_cached_data(
+        hash_named_values(aero_data, 'ground_aero', training_data),
+        lambda: _prepare_ground_aero_data(aero_data, training_data)).deepcopy()
+
+    # extrapolation fine especially for HOB over max
+    return build_data_interpolator(num_nodes=num_nodes,
+                                   interpolator_data=interp_data,
+                                   interpolator_outputs={'delta_lift_coefficient': 'unitless',
+                                                         'delta_drag_coefficient': 'unitless',
+                                                         'delta_lift_coefficient_max': 'unitless'},
+                                   method=method,
+                                   structured=structured,
+                                   training_data=training_data,
+                                   extrapolate=extrapolate)
+
+
+def _prepare_ground_aero_data(aero_data, training_data):
+    """validates the data for ground aero, adding the max delta CL"""
     # aero_data is modified in-place, deepcopy required
     interp_data = aero_data.deepcopy()
 
@@ -541,25 +579,13 @@ def _build_ground_aero_interp(num_nodes=0, aero_data=None, training_data=False,
     mach = np.unique(interp_data.get_val(Dynamic.Mission.MACH, 'unitless'))
     hob = np.unique(interp_data.get_val('hob', 'unitless'))
 
-    dcl_max = np.zeros_like(dcl)
-    shape = (mach.size, hob.size, alpha.size)
-    dcl_max = np.resize(dcl_max, shape)
-    dcl = np.reshape(dcl, shape)
-    for i in range(mach.size):
-        dcl_max[i, :, :] = np.broadcast_to(dcl[i, :, -1], (alpha.size, hob.size)).T
+    # delta CL at the highest alpha, for every alpha
+    dcl = np.reshape(dcl, (mach.size, hob.size, alpha.size))
+    dcl_max = np.repeat(dcl[..., -1:], alpha.size, axis=-1)
 
     interp_data.set_val('delta_lift_coefficient_max', dcl_max.flatten(), 'unitless')
 
-    # extrapolation fine especially for HOB over max
-    return build_data_interpolator(num_nodes=num_nodes,
-                                   interpolator_data=interp_data,
-                                   interpolator_outputs={'delta_lift_coefficient': 'unitless',
-                                                         'delta_drag_coefficient': 'unitless',
-                                                         'delta_lift_coefficient_max': 'unitless'},
-                                   method=method,
-                                   structured=structured,
-                                   training_data=training_data,
-                                   extrapolate=extrapolate)
+    return interp_data
 
 
 def _structure_special_grid(aero_data):
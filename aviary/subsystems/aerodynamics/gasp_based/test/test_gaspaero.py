@@ -2,11 +2,14 @@ import json
 import os
 import unittest
 
+import numpy as np
 import openmdao.api as om
 import pandas as pd
-from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
 
-from aviary.subsystems.aerodynamics.gasp_based.gaspaero import CruiseAero, LowSpeedAero
+from aviary.subsystems.aerodynamics.gasp_based.gaspaero import (AeroGeom, CruiseAero,
+                                                                LowSpeedAero,
+                                                                StaticAeroGeom)
 from aviary.variable_info.variables import Aircraft, Dynamic, Mission
 
 here = os.path.abspath(os.path.dirname(__file__))
@@ -140,6 +143,160 @@ class GASPAeroTest(unittest.TestCase):
         assert_near_equal(prob["alpha_in.drag"], prob["alpha_out.drag"], tolerance=1e-6)
 
 
+class AeroGeomTest(unittest.TestCase):
+    """Test the partials of the node-dependent drag parameters"""
+
+    def test_partials(self):
+        nn = 6
+        for include_strut in (False, True):
+            with self.subTest(include_strut=include_strut):
+                prob = om.Problem()
+                prob.model.add_subsystem(
+                    "static_geom", StaticAeroGeom(), promotes=["*"])
+                prob.model.add_subsystem(
+                    "geom", AeroGeom(num_nodes=nn, include_strut=include_strut),
+                    promotes=["*"])
+                prob.setup(check=False, force_alloc_complex=True)
+
+                prob.set_val(Aircraft.Wing.AREA, setup_data["sw"])
+                prob.set_val(Aircraft.Wing.SPAN, setup_data["b"])
+                prob.set_val(Aircraft.Wing.AVERAGE_CHORD, setup_data["cbarw"])
+                prob.set_val(Aircraft.HorizontalTail.AREA, setup_data["sht"])
+                prob.set_val(Aircraft.HorizontalTail.AVERAGE_CHORD, setup_data["cbarht"])
+                prob.set_val(Aircraft.VerticalTail.AREA, setup_data["svt"])
+                prob.set_val(Aircraft.VerticalTail.AVERAGE_CHORD, setup_data["cbarvt"])
+                prob.set_val(Aircraft.Fuselage.AVG_DIAMETER, setup_data["swf"])
+                prob.set_val(Aircraft.Fuselage.LENGTH, setup_data["elf"])
+                prob.set_val(Aircraft.Fuselage.WETTED_AREA, setup_data["sf"])
+                prob.set_val(Aircraft.Nacelle.AVG_LENGTH, setup_data["eln"])
+                prob.set_val(
+                    Aircraft.Nacelle.SURFACE_AREA, setup_data["sn"] / setup_data["enp"])
+                prob.set_val(
+                    Aircraft.Wing.THICKNESS_TO_CHORD_UNWEIGHTED, setup_data["tc"])
+                prob.set_val(Aircraft.Strut.CHORD, 2.0)
+                prob.set_val(Aircraft.Strut.AREA_RATIO, 0.1)
+                prob.set_val(Aircraft.Strut.FUSELAGE_INTERFERENCE_FACTOR, 1.1)
+
+                # includes Mach numbers in the low speed transition of the Re
+                prob.set_val(Dynamic.Mission.MACH, np.linspace(0.05, 0.85, nn))
+                prob.set_val(
+                    Dynamic.Mission.SPEED_OF_SOUND, np.linspace(1116.4, 968.1, nn))
+                prob.set_val("nu", np.linspace(1.6e-4, 4.5e-4, nn))
+                prob.set_val("ufac", np.linspace(0.95, 1.0, nn))
+
+                prob.run_model()
+
+                partial_data = prob.check_partials(
+                    method="cs", out_stream=None, includes=["geom"])
+                assert_check_partials(partial_data, atol=1e-10, rtol=1e-9)
+
+    def test_static_partials(self):
+        # high and low wings, where the fuselage width at one of the wing surfaces
+        # is clipped to zero, and forward and aft sweep
+        for wing_loc, sweep in ((0.2, 25.0), (0.5, -10.0), (1.0, 30.0)):
+            with self.subTest(wing_loc=wing_loc, sweep=sweep):
+                prob = om.Problem()
+                prob.model.add_subsystem(
+                    "static_geom", StaticAeroGeom(), promotes=["*"])
+                prob.setup(check=False, force_alloc_complex=True)
+
+                prob.set_val(Aircraft.Wing.AREA, setup_data["sw"])
+                prob.set_val(Aircraft.Wing.SPAN, setup_data["b"])
+                prob.set_val(Aircraft.HorizontalTail.AREA, setup_data["sht"])
+                prob.set_val(Aircraft.VerticalTail.AREA, setup_data["svt"])
+                prob.set_val(Aircraft.Fuselage.AVG_DIAMETER, setup_data["swf"])
+                prob.set_val(Aircraft.Fuselage.LENGTH, setup_data["elf"])
+                prob.set_val(Aircraft.Fuselage.WETTED_AREA, setup_data["sf"])
+                prob.set_val(
+                    Aircraft.Nacelle.SURFACE_AREA, setup_data["sn"] / setup_data["enp"])
+                prob.set_val(
+                    Aircraft.Wing.THICKNESS_TO_CHORD_UNWEIGHTED, setup_data["tc"])
+                prob.set_val(Aircraft.Strut.AREA_RATIO, 0.1)
+                prob.set_val(Aircraft.Strut.FUSELAGE_INTERFERENCE_FACTOR, 1.1)
+                prob.set_val(Aircraft.Wing.MOUNTING_TYPE, wing_loc)
+                prob.set_val(Aircraft.Wing.SWEEP, sweep)
+
+                prob.run_model()
+
+                partial_data = prob.check_partials(method="cs", out_stream=None)
+                assert_check_partials(partial_data, atol=1e-10, rtol=1e-9)
+
+
+class AeroPartialsTest(unittest.TestCase):
+    """Test the analytic partials of the lift and drag coefficient components"""
+
+    nn = 5
+    # all components with analytic partials, except for the geometry
+    includes = ["*ratios", "*xlifts", "*lift_coef", "*drag_coef"]
+
+    def test_ground(self):
+        nn = self.nn
+        prob = om.Problem()
+        prob.model.add_subsystem(
+            "aero", LowSpeedAero(num_nodes=nn, input_atmos=True), promotes=["*"]
+        )
+        prob.setup(check=False, force_alloc_complex=True)
+
+        _init_geom(prob)
+
+        prob.set_val(Aircraft.Wing.HEIGHT, 8.0)
+        prob.set_val(Aircraft.Wing.FLAP_CHORD_RATIO, setup_data["cfoc"])
+        prob.set_val(Mission.Design.GROSS_MASS, setup_data["wgto"])
+        prob.set_val("flap_defl", setup_data["delfto"])
+        prob.set_val("CL_max_flaps", setup_data["clmwto"])
+        prob.set_val("dCL_flaps_model", setup_data["dclto"])
+        prob.set_val("dCD_flaps_model", setup_data["dcdto"])
+
+        # the ground effect factor on the lift-curve slope is clipped at the
+        # higher altitudes
+        prob.set_val(Dynamic.Mission.MACH, np.linspace(0.1, 0.3, nn))
+        prob.set_val(Dynamic.Mission.ALTITUDE, np.linspace(10, 300, nn))
+        prob.set_val("alpha", np.linspace(-2, 12, nn))
+        prob.set_val(Dynamic.Mission.SPEED_OF_SOUND, 1116.4)
+        prob.set_val("nu", 1.6e-4)
+
+        prob.run_model()
+
+        partial_data = prob.check_partials(
+            method="cs", out_stream=None, includes=self.includes)
+        assert_check_partials(partial_data, atol=1e-10, rtol=1e-10)
+
+    def test_cruise(self):
+        nn = self.nn
+        for output_alpha in (False, True):
+            with self.subTest(output_alpha=output_alpha):
+                prob = om.Problem()
+                prob.model.add_subsystem(
+                    "aero",
+                    CruiseAero(
+                        num_nodes=nn, input_atmos=True, output_alpha=output_alpha),
+                    promotes=["*"],
+                )
+                prob.setup(check=False, force_alloc_complex=True)
+
+                _init_geom(prob)
+
+                prob.set_val(
+                    Mission.Design.LIFT_COEFFICIENT_MAX_FLAPS_UP, setup_data["clmwfu"])
+                prob.set_val(
+                    Aircraft.Design.SUPERCRITICAL_DIVERGENCE_SHIFT, setup_data["scfac"])
+
+                # includes Mach numbers above drag divergence
+                prob.set_val(Dynamic.Mission.MACH, np.linspace(0.5, 0.85, nn))
+                prob.set_val(Dynamic.Mission.SPEED_OF_SOUND, setup_data["cruise_sos"])
+                prob.set_val("nu", setup_data["cruise_nu"])
+                if output_alpha:
+                    prob.set_val("CL", np.linspace(0.2, 0.8, nn))
+                else:
+                    prob.set_val("alpha", np.linspace(-2, 6, nn))
+
+                prob.run_model()
+
+                partial_data = prob.check_partials(
+                    method="cs", out_stream=None, includes=self.includes)
+                assert_check_partials(partial_data, atol=1e-10, rtol=1e-10)
+
+
 def _init_geom(prob):
     """Initialize user inputs and geometry/sizing data"""
     # i.e. common auto IVC vars for the setup + cruise and ground aero models
@@ -27,6 +27,8 @@ import warnings
 
 import numpy as np
 import openmdao.api as om
+from openmdao.components.interp_util.interp import TABLE_METHODS
+from openmdao.components.interp_util.interp_semi import InterpNDSemi
 from openmdao.core.system import System
 
 from openmdao.utils.units import convert_units
@@ -42,6 +44,7 @@ from aviary.variable_info.variable_meta_data import _MetaData
 from aviary.variable_info.variables import Aircraft, Dynamic, Mission, Settings
 from aviary.variable_info.enums import Verbosity
 from aviary.utils.csv_data_file import read_data_file
+from aviary.utils.data_interpolator_builder import CachedMetaModelStructuredComp
 from aviary.interface.utils.markdown_utils import round_it
 
 
@@ -306,6 +309,8 @@ class EngineDeck(EngineModel):
             Normalize throttles/hybrid throttles.
 
             Fill flight idle points.
+
+            Pre-solve max thrust for each flight condition.
         """
         self._read_data(data)
 
@@ -331,6 +336,10 @@ class EngineDeck(EngineModel):
         if self.get_val(Aircraft.Engine.GENERATE_FLIGHT_IDLE):
             self._generate_flight_idle()
 
+        if self.use_thrust:
+            # tabulate max thrust for each flight condition
+            self._set_max_thrust()
+
     def _read_data(self, raw_data: NamedValues):
         """
         Import tabular engine data; either from memory or from a data file.
@@ -543,32 +552,6 @@ class EngineDeck(EngineModel):
 
         Modifies unpacked data in place, updates packed data.
         """
-        def _extrapolate(array):
-            """
-            Linearly extrapolate variable to idle thrust point.
-
-            Parameters
-            ----------
-            array : numpy.ndarray
-                Data used for extrapolation.
-
-            Returns
-            -------
-            rvalue : float
-                Extrapolated flight idle value.
-            """
-            y0 = array[0]
-            y1 = array[1]
-
-            if y0 == 0 and y1 == 0:
-                return 0
-
-            rvalue = (
-                y0 + (y1 - y0) * extrap_term
-            )
-
-            return rvalue
-
         idle_thrust_fract = self.get_val(Aircraft.Engine.FLIGHT_IDLE_THRUST_FRACTION)
         idle_min_fract = self.get_val(Aircraft.Engine.FLIGHT_IDLE_MIN_FRACTION)
         idle_max_fract = self.get_val(Aircraft.Engine.FLIGHT_IDLE_MAX_FRACTION)
@@ -585,9 +568,9 @@ class EngineDeck(EngineModel):
             direct_calc_vars.append(SHAFT_POWER)
 
         # stored information about packed data
-        mach_max_count = self.mach_max_count
         alt_max_count = self.alt_max_count
-        data_indices = self.data_indices
+        data_max_count = self.data_max_count
+        data_indices = self.data_indices[:, :alt_max_count]
 
         # Throttle is already normalized from 0 to 1. Set flight idle to -0.1, which will
         # get re-normalized to 0
@@ -597,8 +580,6 @@ class EngineDeck(EngineModel):
         throttle_idle = -0.1
         hybrid_throttle_idle = 0
 
-        idle_points = {key: np.empty(0) for key in packed_data}
-
         # Normally, only one idle point is needed - however, when hybrid throttle is
         # present, there needs to be a sweep of points for a given Mach/alt/throttle
         # to satisfy the interpolator's requirements for at least 3 points per dimension
@@ -610,108 +591,80 @@ class EngineDeck(EngineModel):
             # How far apart the "fake" points should be from the actual idle point
             # This time, we want an arbitrarily small number
             h_tol = 1e-4
-
-        for M in range(mach_max_count):
-            for A in range(alt_max_count):
-                # if no data at this Mach, alt index combination, skip
-                if data_indices[M, A] == 0:
-                    continue
-
-                # don't generate flight idle points if thrust is already zero or negative
-                # at lowest index
-                if packed_data[THRUST][M, A, 0] <= self.thrust_tol:
-                    continue
-
-                # define known data for idle point (independent variables)
-                idle_points[MACH] = np.append(
-                    idle_points[MACH], [packed_data[MACH][M, A, 0]] * num_points)
-                idle_points[ALTITUDE] = np.append(
-                    idle_points[ALTITUDE], [packed_data[ALTITUDE][M, A, 0]] * num_points)
-                idle_points[THROTTLE] = np.append(
-                    idle_points[THROTTLE], [throttle_idle] * num_points)
-                if self.use_hybrid_throttle:
-                    hybrid_throttle_range = np.linspace(hybrid_throttle_idle-h_tol,
-                                                        hybrid_throttle_idle+h_tol,
-                                                        num_points)
-                    idle_points[HYBRID_THROTTLE] = np.append(
-                        idle_points[HYBRID_THROTTLE], hybrid_throttle_range)
-                else:
-                    idle_points[HYBRID_THROTTLE] = np.append(
-                        idle_points[HYBRID_THROTTLE], hybrid_throttle_idle)
-
-                # if there is only one data point at this Mach, alt combination, use
-                # thrust fraction instead of extrapolation
-                # TODO idle currently calculated using lowest index data points - this is not
-                #      guaranteed to be at hybrid throttle idle point, could be negative
-                if data_indices[M, A] == 1:
-                    for key in packed_data:
-                        if key not in [
-                                MACH,
-                                ALTITUDE,
-                                THROTTLE,
-                                HYBRID_THROTTLE] + direct_calc_vars:
-                            idle_value = packed_data[key][M, A, 0] * idle_thrust_fract
-                            var_min = packed_data[key][M, A, -1] * idle_min_fract
-                            var_max = packed_data[key][M, A, -1] * idle_max_fract
-
-                            if idle_value < var_min:
-                                idle_value = var_min
-                            elif idle_value > var_max:
-                                idle_value = var_max
-
-                            idle_points[key] = np.append(idle_points[key],
-                                                         [idle_value] * num_points)
-                            # add Mach, alt combination to idle_points with idle power
-                            # codes
-
-                    # thrust, shaft powers do not get idle_min/max checks
-                    for var in direct_calc_vars:
-                        idle_points[var] = np.append(idle_points[var],
-                                                     [[packed_data[var][M, A, 0]
-                                                       * idle_thrust_fract]] * num_points)
-                    # move to next data point
-                    continue
-
-                # calculate idle thrust, shaft powers as a percentage of max thrust at Mach, alt point
-                for var in direct_calc_vars:
-                    idle_calc_value = packed_data[var][M, A, data_indices[M, A] - 1]\
-                        * idle_thrust_fract
-
-                    # add this point to idle_points
-                    idle_points[var] = np.append(idle_points[var],
-                                                 [idle_calc_value] * num_points)
-
-                    # Calculate term for linear extrapolation - shaft power has highest
-                    # "preference" since it is last in the list, followed by corrected
-                    # shaft power then finally thrust. This is designed for compatibility
-                    # with turboshaft engine decks in TurbopropModels.
-                    # Only one extrapolation term can be used for all dependent vars
-                    extrap_term = (idle_calc_value - packed_data[var][M, A, 0]) / (
-                        packed_data[var][M, A, 1] - packed_data[var][M, A, 0])
-
-                # compute idle data
-                for key in packed_data:
-                    # skip independent variables or thrust, which is already calculated
-                    if key not in [
-                            MACH,
-                            ALTITUDE,
-                            THROTTLE,
-                            HYBRID_THROTTLE] + direct_calc_vars:
-                        # extrapolate to idle from lowest two throttle points in data
-                        idle_value = _extrapolate(packed_data[key][M, A])
-
-                        # idle cannot be below or above user-set limits
-                        var_min = packed_data[key][M, A, -1] * idle_min_fract
-                        var_max = packed_data[key][M, A, -1] * idle_max_fract
-
-                        if idle_value < var_min:
-                            idle_value = var_min
-                        elif idle_value > var_max:
-                            idle_value = var_max
-
-                        # store newly computed idle point
-                        idle_points[key] = np.append(idle_points[key],
-                                                     [idle_value] * num_points)
+            hybrid_throttle_range = np.linspace(hybrid_throttle_idle-h_tol,
+                                                hybrid_throttle_idle+h_tol,
+                                                num_points)
+        else:
+            hybrid_throttle_range = np.array([hybrid_throttle_idle], dtype=float)
+
+        # Generate idle points for every Mach, alt index combination with data, unless
+        # thrust is already zero or negative at lowest index
+        M, A = np.nonzero(
+            (data_indices != 0) & ~(packed_data[THRUST][:, :, 0] <= self.thrust_tol))
+        num_idle = len(M)
+
+        # Index of last data point at each flight condition.
+        # If there is only one data point at a Mach, alt combination, use thrust
+        # fraction instead of extrapolation
+        # TODO idle currently calculated using lowest index data points - this is not
+        #      guaranteed to be at hybrid throttle idle point, could be negative
+        last_idx = data_indices[M, A] - 1
+        single_point = last_idx == 0
+        second_idx = min(1, data_max_count - 1)
+
+        # define known data for idle point (independent variables)
+        idle_values = {
+            MACH: packed_data[MACH][M, A, 0],
+            ALTITUDE: packed_data[ALTITUDE][M, A, 0],
+            THROTTLE: np.full(num_idle, throttle_idle, dtype=float),
+        }
+
+        # calculate idle thrust, shaft powers as a percentage of max thrust at Mach, alt
+        # point - these do not get idle_min/max checks
+        extrap_term = np.full(num_idle, np.nan)
+        for var in direct_calc_vars:
+            idle_values[var] = packed_data[var][M, A, last_idx] * idle_thrust_fract
+
+            # Calculate term for linear extrapolation - shaft power has highest
+            # "preference" since it is last in the list, followed by corrected
+            # shaft power then finally thrust. This is designed for compatibility
+            # with turboshaft engine decks in TurbopropModels.
+            # Only one extrapolation term can be used for all dependent vars
+            with np.errstate(divide='ignore', invalid='ignore'):
+                extrap_term = (idle_values[var] - packed_data[var][M, A, 0]) / (
+                    packed_data[var][M, A, second_idx] - packed_data[var][M, A, 0])
+
+        # compute idle data
+        for key in packed_data:
+            # skip independent variables or thrust, which is already calculated
+            if key in idle_values or key == HYBRID_THROTTLE:
+                continue
+
+            y0 = packed_data[key][M, A, 0]
+            y1 = packed_data[key][M, A, second_idx]
+
+            # extrapolate to idle from lowest two throttle points in data, or use
+            # thrust fraction for single points
+            with np.errstate(invalid='ignore'):
+                extrap_value = np.where(
+                    (y0 == 0) & (y1 == 0), 0.0, y0 + (y1 - y0) * extrap_term)
+            idle_value = np.where(single_point, y0 * idle_thrust_fract, extrap_value)
+
+            # idle cannot be below or above user-set limits
+            var_min = packed_data[key][M, A, -1] * idle_min_fract
+            var_max = packed_data[key][M, A, -1] * idle_max_fract
+
+            idle_values[key] = np.where(idle_value < var_min, var_min,
+                                        np.where(idle_value > var_max,
+                                                 var_max, idle_value))
+
+        # store newly computed idle points
+        idle_points = {}
+        for key in packed_data:
+            if key == HYBRID_THROTTLE:
+                idle_points[key] = np.tile(hybrid_throttle_range, num_idle)
+            else:
+                idle_points[key] = np.repeat(idle_values[key], num_points)
 
         # add idle points to data
         for key in packed_data:
@@ -745,89 +698,93 @@ class EngineDeck(EngineModel):
     def _build_engine_interpolator(self, num_nodes, aviary_inputs):
         """
         Builds the OpenMDAO metamodel component for the engine deck.
-        Currently only the semistructured model is supported.
+        A structured interpolator is used if the engine data forms a full grid,
+        otherwise the semistructured model is used.
         """
         interp_method = self.get_val(Aircraft.Engine.INTERPOLATION_METHOD)
-        # interpolator object for engine data
-        engine = om.MetaModelSemiStructuredComp(
-            method=interp_method, extrapolate=True, vec_size=num_nodes)
 
         units = default_units
         for key in self.engine_variables:
             units[key] = self.engine_variables[key]
         self.engine_variable_units = units
 
-        # add inputs and outputs to interpolator
-        engine.add_input(Dynamic.Mission.MACH,
-                         self.data[MACH],
-                         units='unitless',
-                         desc='Current flight Mach number')
-        engine.add_input(Dynamic.Mission.ALTITUDE,
-                         self.data[ALTITUDE],
-                         units=units[ALTITUDE],
-                         desc='Current flight altitude')
-        engine.add_input(Dynamic.Mission.THROTTLE,
-                         self.data[THROTTLE],
-                         units='unitless',
-                         desc='Current engine throttle')
+        # inputs and outputs of interpolator
+        inputs = [(Dynamic.Mission.MACH,
+                   self.data[MACH],
+                   'unitless',
+                   'Current flight Mach number'),
+                  (Dynamic.Mission.ALTITUDE,
+                   self.data[ALTITUDE],
+                   units[ALTITUDE],
+                   'Current flight altitude'),
+                  (Dynamic.Mission.THROTTLE,
+                   self.data[THROTTLE],
+                   'unitless',
+                   'Current engine throttle')]
         if self.use_hybrid_throttle:
-            engine.add_input(Dynamic.Mission.HYBRID_THROTTLE,
-                             self.data[HYBRID_THROTTLE],
-                             units='unitless',
-                             desc='Current engine hybrid throttle')
-        engine.add_output('thrust_net_unscaled',
-                          self.data[THRUST],
-                          units=units[THRUST],
-                          desc='Current net thrust produced (unscaled)')
-        engine.add_output('fuel_flow_rate_unscaled',
-                          self.data[FUEL_FLOW],
-                          units=units[FUEL_FLOW],
-                          desc='Current fuel flow rate (unscaled)')
-        engine.add_output('electric_power_unscaled',
-                          self.data[ELECTRIC_POWER],
-                          units=units[ELECTRIC_POWER],
-                          desc='Current electric energy rate (unscaled)')
-        engine.add_output('nox_rate_unscaled',
-                          self.data[NOX_RATE],
-                          units=units[NOX_RATE],
-                          desc='Current NOx emission rate (unscaled)')
+            inputs.append((Dynamic.Mission.HYBRID_THROTTLE,
+                           self.data[HYBRID_THROTTLE],
+                           'unitless',
+                           'Current engine hybrid throttle'))
+
+        outputs = [('thrust_net_unscaled',
+                    self.data[THRUST],
+                    units[THRUST],
+                    'Current net thrust produced (unscaled)'),
+                   ('fuel_flow_rate_unscaled',
+                    self.data[FUEL_FLOW],
+                    units[FUEL_FLOW],
+                    'Current fuel flow rate (unscaled)'),
+                   ('electric_power_unscaled',
+                    self.data[ELECTRIC_POWER],
+                    units[ELECTRIC_POWER],
+                    'Current electric energy rate (unscaled)'),
+                   ('nox_rate_unscaled',
+                    self.data[NOX_RATE],
+                    units[NOX_RATE],
+                    'Current NOx emission rate (unscaled)')]
         # Shaft power and temperature are not summed to system-level totals, so their
         # inclusion in outputs is optional
         if self.use_shaft_power:
             if SHAFT_POWER in self.engine_variables:
-                shaft_power_data = self.data[SHAFT_POWER]
-                shaft_power_units = units[SHAFT_POWER]
-                desc = 'Current shaft power (unscaled)'
-                engine.add_output('shaft_power_unscaled',
-                                  shaft_power_data,
-                                  units=shaft_power_units,
-                                  desc=desc)
+                outputs.append(('shaft_power_unscaled',
+                                self.data[SHAFT_POWER],
+                                units[SHAFT_POWER],
+                                'Current shaft power (unscaled)'))
             else:
-                shaft_power_data = self.data[SHAFT_POWER_CORRECTED]
-                shaft_power_units = units[SHAFT_POWER_CORRECTED]
-                desc = 'Current corrected shaft power (unscaled)'
-                engine.add_output('shaft_power_corrected_unscaled',
-                                  shaft_power_data,
-                                  units=shaft_power_units,
-                                  desc=desc)
+                outputs.append(('shaft_power_corrected_unscaled',
+                                self.data[SHAFT_POWER_CORRECTED],
+                                units[SHAFT_POWER_CORRECTED],
+                                'Current corrected shaft power (unscaled)'))
         if self.use_t4:
-            engine.add_output(Dynamic.Mission.TEMPERATURE_ENGINE_T4,
-                              self.data[TEMPERATURE],
-                              units=units[TEMPERATURE],
-                              desc='Current turbine exit temperature')
+            outputs.append((Dynamic.Mission.TEMPERATURE_ENGINE_T4,
+                            self.data[TEMPERATURE],
+                            units[TEMPERATURE],
+                            'Current turbine exit temperature'))
         # if self.use_exit_area:
-        # engine.add_output('exit_area_unscaled',
-        #                   self.data[EXIT_AREA],
-        #                   units='ft**2',
-        #                   desc='Current exit area (unscaled)')
+        # outputs.append(('exit_area_unscaled',
+        #                 self.data[EXIT_AREA],
+        #                 'ft**2',
+        #                 'Current exit area (unscaled)'))
+        if not self.use_thrust:
+            # If engine does not use thrust, a separate component for max thrust is not
+            # necessary.
+            # Add unscaled max thrust as output of interpolator, which will have a
+            # default value of zero at every flight condition
+            outputs.append(('thrust_net_max_unscaled',
+                            self.data[THRUST],
+                            units[THRUST],
+                            'Current max net thrust produced (unscaled)'))
 
-        return engine
+        return build_interpolator(interp_method, num_nodes, inputs, outputs,
+                                  extrapolate=True)
 
     def build_mission(self, num_nodes, aviary_inputs) -> om.Group:
         """
         Creates interpolator objects to be added to mission-level propulsion subsystem.
         Interpolators must be re-generated for each ODE due to potentialy different
-        num_nodes in each mission segment.
+        num_nodes in each mission segment, but the coefficients of structured tables
+        are shared through a process-wide cache.
 
         Parameters
         ----------
@@ -848,17 +805,13 @@ class EngineDeck(EngineModel):
         engine = self._build_engine_interpolator(num_nodes, aviary_inputs)
         units = self.engine_variable_units
 
-        # Create copy of interpolation component that computes max thrust for current
-        # flight condition
-        # NOTE max thrust is assumed to occur at maximum throttle and hybrid throttle
-        #      for each flight condition
-        # TODO Use solver to find throttle/hybrid throttle for maximum thrust at given flight condition?
-        #      Pre-solve max throttle/hybrid throttle for each flight condition, interpolate on
-        #      reduced data set?
+        # Create interpolation component that computes max thrust (and max throttle/max
+        # hybrid throttle if they depend on flight condition) for current flight
+        # condition from the data pre-solved in _set_max_thrust()
         if self.use_thrust:
             if self.global_throttle or (self.global_hybrid_throttle
                                         and self.use_hybrid_throttle):
-                # create IndepVarComp to pass maximum throttle is to max thrust interpolator
+                # create IndepVarComp to pass maximum throttle
                 fixed_throttles = om.IndepVarComp()
                 if self.global_throttle:
                     fixed_throttles.add_output('throttle_max',
@@ -872,84 +825,40 @@ class EngineDeck(EngineModel):
                                                self.hybrid_throttle_max,
                                                units='unitless',
                                                desc='Engine maximum hybrid throttle')
-            if not (self.global_throttle or (self.global_hybrid_throttle
-                                             and self.use_hybrid_throttle)):
-                interp_throttles = om.MetaModelSemiStructuredComp(method=interp_method,
-                                                                  extrapolate=False,
-                                                                  vec_size=num_nodes)
-
-                packed_data = self.packed_data
-                mach_table = np.array([])
-                alt_table = np.array([])
-
-                for M in range(self.mach_max_count):
-                    for A in range(self.alt_max_count):
-                        if self.data_indices[M, A] != 0:
-                            mach_table = np.append(
-                                mach_table, packed_data[MACH][M, A, 0])
-                            alt_table = np.append(
-                                alt_table, packed_data[ALTITUDE][M, A, 0])
-
-                # add inputs and outputs to interpolator
-                interp_throttles.add_input(Dynamic.Mission.MACH,
-                                           mach_table,
-                                           units='unitless',
-                                           desc='Current flight Mach number')
-                interp_throttles.add_input(Dynamic.Mission.ALTITUDE,
-                                           alt_table,
-                                           units=units[ALTITUDE],
-                                           desc='Current flight altitude')
-                if not self.global_throttle:
-                    interp_throttles.add_output('throttle_max',
-                                                self.throttle_max,
-                                                units='unitless',
-                                                desc='max throttle avaliable at current '
-                                                'flight condition')
-                if not self.global_hybrid_throttle and self.use_hybrid_throttle:
-                    interp_throttles.add_output('hybrid_throttle_max',
-                                                self.hybrid_throttle_max,
-                                                units='unitless',
-                                                desc='max hybrid throttle avaliable at '
-                                                     'current flight condition')
-
-            # Calculation of max thrust currently done with a duplicate of the engine
-            # model and scaling components
-            max_thrust_engine = om.MetaModelSemiStructuredComp(
-                method=interp_method, extrapolate=False, vec_size=num_nodes)
-
-            max_thrust_engine.add_input(Dynamic.Mission.MACH,
-                                        self.data[MACH],
-                                        units='unitless',
-                                        desc='Current flight Mach number')
-            max_thrust_engine.add_input(Dynamic.Mission.ALTITUDE,
-                                        self.data[ALTITUDE],
-                                        units=units[ALTITUDE],
-                                        desc='Current flight altitude')
-            # replace throttle coming from mission with max value based on flight condition
-            max_thrust_engine.add_input('throttle_max',
-                                        self.data[THROTTLE],
-                                        units='unitless',
-                                        desc='Current engine throttle')
-            if self.use_hybrid_throttle:
-                # replace hybrid throttle coming from mission with max value based on
-                # flight condition
-                max_thrust_engine.add_input('hybrid_throttle_max',
-                                            self.data[HYBRID_THROTTLE],
-                                            units='unitless',
-                                            desc='Current engine hybrid throttle')
-            max_thrust_engine.add_output('thrust_net_max_unscaled',
-                                         self.data[THRUST],
-                                         units=units[THRUST],
-                                         desc='Current thrust produced')
-        else:
-            # If engine does not use thrust, a separate component for max thrust is not
-            # necessary.
-            # Add unscaled max thrust as output of interpolator, which will have a
-            # default value of zero at every flight condition
-            engine.add_output('thrust_net_max_unscaled',
-                              self.data[THRUST],
-                              units=units[THRUST],
-                              desc='Current max net thrust produced (unscaled)')
+
+            # re-solve max thrust if interpolation method changed after _setup()
+            if self.max_thrust_method != interp_method:
+                self._set_max_thrust()
+            max_thrust_data = self.max_thrust_data
+
+            max_thrust_inputs = [(Dynamic.Mission.MACH,
+                                  max_thrust_data[MACH],
+                                  'unitless',
+                                  'Current flight Mach number'),
+                                 (Dynamic.Mission.ALTITUDE,
+                                  max_thrust_data[ALTITUDE],
+                                  units[ALTITUDE],
+                                  'Current flight altitude')]
+            max_thrust_outputs = [('thrust_net_max_unscaled',
+                                   max_thrust_data[THRUST],
+                                   units[THRUST],
+                                   'Current thrust produced')]
+            if not self.global_throttle:
+                max_thrust_outputs.append(('throttle_max',
+                                           max_thrust_data[THROTTLE],
+                                           'unitless',
+                                           'max throttle avaliable at current '
+                                           'flight condition'))
+            if not self.global_hybrid_throttle and self.use_hybrid_throttle:
+                max_thrust_outputs.append(('hybrid_throttle_max',
+                                           max_thrust_data[HYBRID_THROTTLE],
+                                           'unitless',
+                                           'max hybrid throttle avaliable at '
+                                           'current flight condition'))
+
+            max_thrust_engine = build_interpolator(interp_method, num_nodes,
+                                                   max_thrust_inputs, max_thrust_outputs,
+                                                   extrapolate=False)
 
         # add created subsystems to engine_group
         engine_group.add_subsystem('interpolation',
@@ -963,13 +872,6 @@ class EngineDeck(EngineModel):
                                            fixed_throttles,
                                            promotes_outputs=['*'])
 
-            if not (self.global_throttle or (self.global_hybrid_throttle
-                                             and self.use_hybrid_throttle)):
-                engine_group.add_subsystem('interp_max_throttles',
-                                           interp_throttles,
-                                           promotes_inputs=['*'],
-                                           promotes_outputs=['*'])
-
             engine_group.add_subsystem(
                 'max_thrust_interpolation',
                 max_thrust_engine,
@@ -1152,6 +1054,54 @@ class EngineDeck(EngineModel):
                 scaled_thrust = ref_thrust
                 self.set_val(Aircraft.Engine.SCALED_SLS_THRUST, scaled_thrust, 'lbf')
 
+    def _set_max_thrust(self):
+        """
+        Pre-solve maximum thrust for each flight condition (Mach, altitude combination)
+        in the engine data, so max thrust during the mission can be interpolated on
+        this reduced data set instead of the full engine data.
+
+        Max thrust is assumed to occur at maximum throttle and hybrid throttle for each
+        flight condition. It is interpolated from the engine data in the same way as
+        the mission interpolator would, so interpolating the reduced data set over Mach
+        and altitude gives the same result.
+
+        Requires sorted, packed data with normalized throttles.
+        """
+        # options may not have been preprocessed yet
+        if Aircraft.Engine.INTERPOLATION_METHOD in self.options:
+            interp_method = self.get_val(Aircraft.Engine.INTERPOLATION_METHOD)
+        else:
+            interp_method = _MetaData[Aircraft.Engine.INTERPOLATION_METHOD][
+                'default_value']
+        packed_data = self.packed_data
+        flight_conditions = self.data_indices != 0
+
+        mach = packed_data[MACH][:, :, 0][flight_conditions]
+        alt = packed_data[ALTITUDE][:, :, 0][flight_conditions]
+        num_points = len(mach)
+
+        max_thrust_data = {MACH: mach,
+                           ALTITUDE: alt,
+                           THROTTLE: np.ones(num_points) * self.throttle_max,
+                           HYBRID_THROTTLE:
+                               np.ones(num_points) * self.hybrid_throttle_max}
+
+        independent_vars = [MACH, ALTITUDE, THROTTLE]
+        if self.use_hybrid_throttle:
+            independent_vars.append(HYBRID_THROTTLE)
+
+        engine = InterpNDSemi(
+            np.column_stack([self.data[key] for key in independent_vars]),
+            self.data[THRUST],
+            method=interp_method,
+            extrapolate=False)
+
+        max_thrust_data[THRUST] = engine.interpolate(
+            np.column_stack([max_thrust_data[key] for key in independent_vars]))
+
+        self.max_thrust_data = max_thrust_data
+        self.max_thrust_method = interp_method
+
     def _normalize_throttle(self):
         """
         Normalize throttle and hybrid throttle options. Requires packed data.
@@ -1164,7 +1114,7 @@ class EngineDeck(EngineModel):
         Normalization can be "global" (using max and min values from entire data set), or
         "local" (using the max and min values from each individual flight condition).
         """
-        def _hybrid_throttle_norm(hybrid_throttle_list):
+        def _hybrid_throttle_norm(hybrid_throttle_list, minimum, maximum):
             """
             Normalize hybrid throttle to the scale:
 
@@ -1180,95 +1130,79 @@ class EngineDeck(EngineModel):
             ----------
             hybrid_throttle_list : (list, numpy.ndarray)
                 Hybrid throttle data to be normalized.
+            minimum : (float, numpy.ndarray)
+                Minimum hybrid throttle of the data range each point belongs to.
+            maximum : (float, numpy.ndarray)
+                Maximum hybrid throttle of the data range each point belongs to.
 
             Returns
             -------
             norm_hybrid_list : numpy.ndarray
                 Normalized hybrid throttle data from hybrid_throttle_list.
             """
-            norm_hybrid_list = np.array(hybrid_throttle_list)
-            # Split throttle into positive and negative components
-            # (track index to preserve order)
-            # Throttle points at zero do not need to be tracked - they are already
+            hybrid_throttle = np.array(hybrid_throttle_list)
+            # Throttle points at zero do not need to be normalized - they are already
             # "normalized", and zero is always assumed to be in the normalization range
             # (max or min)
-            hybrid_throttle_neg_idx = np.where(norm_hybrid_list < 0)
-            if not hybrid_throttle_neg_idx[0].size == 0:
-                hybrid_throttle_neg = norm_hybrid_list[hybrid_throttle_neg_idx]
-
-                # normalize negative component from -1 to 0
-                hybrid_throttle_neg_norm = normalize(hybrid_throttle_neg, maximum=0) - 1
-                norm_hybrid_list[hybrid_throttle_neg_idx] = hybrid_throttle_neg_norm
-
-            hybrid_throttle_pos_idx = np.where(norm_hybrid_list > 0)
-            if not hybrid_throttle_pos_idx[0].size == 0:
-                hybrid_throttle_pos = norm_hybrid_list[hybrid_throttle_pos_idx]
-
-                # normalize positive component from 0 to 1
-                hybrid_throttle_pos_norm = normalize(hybrid_throttle_pos, minimum=0)
-
-                norm_hybrid_list[hybrid_throttle_pos_idx] = hybrid_throttle_pos_norm
+            # Negative component is normalized from -1 to 0, positive component from
+            # 0 to 1
+            with np.errstate(divide='ignore', invalid='ignore'):
+                norm_hybrid_list = np.where(
+                    hybrid_throttle < 0,
+                    normalize(hybrid_throttle, maximum=0, minimum=minimum) - 1,
+                    np.where(hybrid_throttle > 0,
+                             normalize(hybrid_throttle, minimum=0, maximum=maximum),
+                             hybrid_throttle))
 
             return norm_hybrid_list
 
-        normalized_throttle = np.array([])
-        normalized_hybrid_throttle = np.array([])
-        throttle_min = np.array([])
-        throttle_max = np.array([])
-
-        # information on packed data
-        packed_throttle = self.packed_data[THROTTLE]
-        packed_hybrid_throttle = self.packed_data[HYBRID_THROTTLE]
-        data_indices = self.data_indices
-
-        # for each unique flight condition...
-        for M in range(self.mach_max_count):
-            for A in range(self.alt_max_count):
-                if data_indices[M, A] == 0:
-                    # skip point if there is no data
-                    continue
-
-                if not self.global_throttle:
-                    throttle_list = normalize(
-                        packed_throttle[M, A][:data_indices[M, A]+1])
-                    # normalize throttles for this flight condition from 0 to 1
-                    normalized_throttle = np.append(normalized_throttle, throttle_list)
-                    throttle_min = np.append(throttle_min, min(throttle_list))
-                    throttle_max = np.append(throttle_max, max(throttle_list))
-
-                if not self.global_hybrid_throttle and self.use_hybrid_throttle:
-                    # normalize hybrid throttles for this flight condition
-                    hybrid_throttle_list = _hybrid_throttle_norm(
-                        packed_hybrid_throttle[M, A][:data_indices[M, A]+1])
-                    normalized_hybrid_throttle = np.append(
-                        normalized_hybrid_throttle, hybrid_throttle_list)
-                    hybrid_throttle_min = np.append(
-                        hybrid_throttle_min, min(hybrid_throttle_list))
-                    hybrid_throttle_max = np.append(
-                        hybrid_throttle_max, max(hybrid_throttle_list))
+        if not self.global_throttle or (
+                not self.global_hybrid_throttle and self.use_hybrid_throttle):
+            # position of the data for each unique flight condition in packed data
+            packed_idx, block_starts = self._get_packed_indices()
+            block_sizes = np.diff(block_starts, append=len(packed_idx[0]))
+
+            def _block_range(values):
+                # min and max of each flight condition, repeated for each of its points
+                block_min = np.minimum.reduceat(values, block_starts)
+                block_max = np.maximum.reduceat(values, block_starts)
+                return (np.repeat(block_min, block_sizes),
+                        np.repeat(block_max, block_sizes))
 
         # store normalized throttle data
         if self.global_throttle:
             self.data[THROTTLE] = normalize(self.data[THROTTLE])
-            self.throttle_min = min(self.data[THROTTLE])
-            self.throttle_max = max(self.data[THROTTLE])
+            self.throttle_min = np.min(self.data[THROTTLE])
+            self.throttle_max = np.max(self.data[THROTTLE])
         else:
+            # normalize throttles for each flight condition from 0 to 1
+            throttle = self.packed_data[THROTTLE][packed_idx]
+            throttle_min, throttle_max = _block_range(throttle)
+            normalized_throttle = normalize(throttle, throttle_max, throttle_min)
+
             self.data[THROTTLE] = normalized_throttle
-            self.throttle_min = throttle_min
-            self.throttle_max = throttle_max
+            self.throttle_min = np.minimum.reduceat(normalized_throttle, block_starts)
+            self.throttle_max = np.maximum.reduceat(normalized_throttle, block_starts)
 
         # store normalized hybrid throttle data
         if self.use_hybrid_throttle:
             if self.global_hybrid_throttle:
-                norm_hybrid_throttle = _hybrid_throttle_norm(self.data[HYBRID_THROTTLE])
-
-                self.hybrid_throttle_min = min(self.data[HYBRID_THROTTLE])
-                self.hybrid_throttle_max = max(self.data[HYBRID_THROTTLE])
-                self.data[HYBRID_THROTTLE] = norm_hybrid_throttle
+                hybrid_throttle = self.data[HYBRID_THROTTLE]
+                self.hybrid_throttle_min = np.min(hybrid_throttle)
+                self.hybrid_throttle_max = np.max(hybrid_throttle)
+                self.data[HYBRID_THROTTLE] = _hybrid_throttle_norm(
+                    hybrid_throttle, self.hybrid_throttle_min, self.hybrid_throttle_max)
             else:
+                # normalize hybrid throttles for each flight condition
+                hybrid_throttle = self.packed_data[HYBRID_THROTTLE][packed_idx]
+                normalized_hybrid_throttle = _hybrid_throttle_norm(
+                    hybrid_throttle, *_block_range(hybrid_throttle))
+
                 self.data[HYBRID_THROTTLE] = normalized_hybrid_throttle
-                self.hybrid_throttle_min = hybrid_throttle_min
-                self.hybrid_throttle_max = hybrid_throttle_max
+                self.hybrid_throttle_min = np.minimum.reduceat(
+                    normalized_hybrid_throttle, block_starts)
+                self.hybrid_throttle_max = np.maximum.reduceat(
+                    normalized_hybrid_throttle, block_starts)
 
         # repack data to keep it up to date
         self._pack_data()
@@ -1312,28 +1246,39 @@ class EngineDeck(EngineModel):
         mach_max_count = self.mach_max_count
         alt_max_count = self.alt_max_count
         data_max_count = self.data_max_count
-        data_indices = self.data_indices
+
+        packed_idx, _ = self._get_packed_indices()
+        # the last flight condition may not have all of its data points
+        num_rows = min(len(packed_idx[0]), self.model_length)
+        packed_idx = tuple(idx[:num_rows] for idx in packed_idx)
 
         packed_data = self.packed_data = {}
-        idx = 0
 
         for key in self.data:
             packed_data[key] = np.zeros((mach_max_count, alt_max_count, data_max_count))
+            packed_data[key][packed_idx] = self.data[key][:num_rows]
 
-        for M in range(mach_max_count):
+    def _get_packed_indices(self):
+        """
+        Locate the unpacked data in the packed data arrays. Requires counted data.
+
+        Returns
+        -------
+        packed_idx : tuple of numpy.ndarray
+            Mach, altitude, and data point index of each row of unpacked data.
+        block_starts : numpy.ndarray
+            Row of unpacked data where each unique flight condition starts.
+        """
+        # Mach, alt index of each flight condition with data
+        mach_idx, alt_idx = np.nonzero(self.data_indices[:, :self.alt_max_count])
+        # number of data points is index+1
+        num_points = self.data_indices[mach_idx, alt_idx] + 1
+        block_starts = np.cumsum(num_points) - num_points
 
-            for A in range(alt_max_count):
-                if data_indices[M, A] == 0:
-                    # skip point if there is no data
-                    continue
+        block_idx = np.repeat(np.arange(len(num_points)), num_points)
+        point_idx = np.arange(len(block_idx)) - block_starts[block_idx]
 
-                # number of data points is index+1
-                for D in range(data_indices[M, A] + 1):
-                    for key in self.data:
-                        unpacked_data = self.data[key]
-                        if idx < len(unpacked_data):
-                            packed_data[key][M, A, D] = unpacked_data[idx]
-                    idx += 1
+        return (mach_idx[block_idx], alt_idx[block_idx], point_idx), block_starts
 
     def _count_data(self):
         """
@@ -1346,81 +1291,44 @@ class EngineDeck(EngineModel):
             If insufficient number of altitude points (<2) provided for a given Mach
             number.
         """
-        mach_count = 0
-        # First mach number must have at least one altitude associated with it
-        alt_count = 1
-        max_alt_count = 0
-        # First mach number must have at least one data point associated with it
-        data_count = 1
-        max_data_count = 0
-
-        # data_indices stores how many data points there are for a given Mach/alt combo
-        data_indices = np.array([[]])
-
-        curr_mach = curr_alt = np.inf
-
         mach_numbers = self.data[MACH]
         altitudes = self.data[ALTITUDE]
 
-        # Loop through data. Keep track of last unique value (curr_*) to compare each new
-        #   value with
-        # Count number of altitudes per mach, number of data points per
-        #   mach/altitude combination, compare with max_count
-        for idx in range(self.model_length):
-            mach_num = mach_numbers[idx]
-            alt = altitudes[idx]
-
-            if math.isclose(mach_num, curr_mach, abs_tol=self.mach_tol):
-
-                if math.isclose(alt, curr_alt, abs_tol=self.alt_tol):
-                    data_indices[mach_count - 1, alt_count - 1] = data_count
-                    data_count += 1
-
-                else:
-                    # new altitude for this mach number, count it
-                    curr_alt = alt
-                    alt_count += 1
-                    data_indices = extend_array(data_indices, [mach_count, alt_count])
-
-                    if data_count > max_data_count:
-                        max_data_count = data_count
-                    # new altitude means reset data counter
-                    data_count = 1
-                    # count data associated with new altitude
-                    data_indices[mach_count - 1, alt_count - 1] = 1
+        # first row of each Mach number, and of each altitude for a given Mach number
+        new_mach = np.zeros(self.model_length, dtype=bool)
+        new_mach[0] = True
+        new_mach = group_starts(mach_numbers, self.mach_tol, new_mach)
+        new_alt = group_starts(altitudes, self.alt_tol, new_mach)
+
+        mach_starts = np.flatnonzero(new_mach)
+        alt_starts = np.flatnonzero(new_alt)
+        mach_count = len(mach_starts)
+
+        # Mach index, altitude index and number of data points of each Mach/alt combo
+        alt_mach_idx = np.cumsum(new_mach)[alt_starts] - 1
+        alt_idx = np.arange(len(alt_starts)) - np.searchsorted(alt_starts, mach_starts)[
+            alt_mach_idx]
+        data_count = np.diff(alt_starts, append=self.model_length)
+        alt_count = np.bincount(alt_mach_idx)
+
+        # if there are less than two altitudes for a Mach number, quit
+        # (the altitudes of the last Mach number are not checked)
+        too_few_alts = np.flatnonzero(alt_count[:-1] < 2)
+        if too_few_alts.size:
+            raise UserWarning('Only one altitude provided for Mach number '
+                              f'{mach_numbers[too_few_alts[0] + 1]:6.3f} in engine data '
+                              f'file <{self.get_val(Aircraft.Engine.DATA_FILE).name}>'
+                              )
 
-            else:
-                # new Mach number
-                # if there are less than two altitudes for this Mach number, quit
-                if alt_count < 2 and mach_count > 0:
-                    raise UserWarning('Only one altitude provided for Mach number '
-                                      f'{mach_numbers[mach_count]:6.3f} in engine data file '
-                                      f'<{self.get_val(Aircraft.Engine.DATA_FILE).name}>'
-                                      )
-
-                # record and count mach numbers
-                curr_mach = mach_num
-                mach_count += 1
-
-                # new mach comes with new altitude, record and count it
-                if alt_count > max_alt_count:
-                    max_alt_count = alt_count
-                # new mach means reset altitude counter
-                curr_alt = alt
-                alt_count = 1
-                data_indices = extend_array(data_indices, [mach_count, alt_count])
-
-                if data_count > max_data_count:
-                    max_data_count = data_count
-                # new mach means reset data counter
-                data_count = 1
-                # count data associated with new altitude
-                data_indices[mach_count - 1, alt_count - 1] = 1
+        # data_indices stores how many data points there are for a given Mach/alt combo
+        data_indices = np.zeros((mach_count, alt_count.max()), dtype=int)
+        data_indices[alt_mach_idx, alt_idx] = np.maximum(data_count - 1, 1)
 
+        # max counts do not include the last Mach number or Mach/alt combo
         self.mach_max_count = mach_count
-        self.alt_max_count = max_alt_count
-        self.data_max_count = max_data_count
-        self.data_indices = data_indices.astype(int)
+        self.alt_max_count = int(np.max(alt_count[:-1], initial=1))
+        self.data_max_count = int(np.max(data_count[:-1], initial=1))
+        self.data_indices = data_indices
 
 
 #####################
@@ -1434,6 +1342,147 @@ EngineModels besides EngineDeck, move them to propulsion utils.
 """
 
 
+def group_starts(values, tol, new_group):
+    """
+    Find the first entry of each group of approximately equal values in sorted data.
+    Each group starts at the first value that is not within tolerance of the first
+    value of the previous group.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Data to be grouped, sorted in ascending order between forced group starts.
+    tol : float
+        Absolute tolerance for two values to be considered equal.
+    new_group : numpy.ndarray
+        Boolean array that is True where a new group must start regardless of value.
+
+    Returns
+    -------
+    new_group : numpy.ndarray
+        Boolean array that is True at the first entry of each group.
+    """
+    # runs of identical values always belong to the same group
+    new_run = new_group.copy()
+    new_run[1:] |= values[1:] != values[:-1]
+    run_starts = np.flatnonzero(new_run)
+    run_values = values[run_starts]
+    forced = new_group[run_starts]
+
+    # same test as math.isclose() with the default relative tolerance
+    diff = np.abs(run_values[1:] - run_values[:-1])
+    close = diff <= np.maximum(
+        1e-9 * np.maximum(np.abs(run_values[1:]), np.abs(run_values[:-1])), tol)
+
+    if np.any(close & ~forced[1:]):
+        # some runs are merged - compare each run with the first value of its group,
+        # which depends on how earlier runs were grouped
+        group_value = np.inf
+        for idx, value in enumerate(run_values):
+            if forced[idx] or not math.isclose(value, group_value, abs_tol=tol):
+                forced[idx] = True
+                group_value = value
+
+    else:
+        forced[:] = True
+
+    new_group = np.zeros_like(new_group)
+    new_group[run_starts[forced]] = True
+
+    return new_group
+
+
+def get_structured_grid(training_data):
+    """
+    Determine if the given training data forms a full rectangular grid.
+
+    Parameters
+    ----------
+    training_data : list of numpy.ndarray
+        Training data for each independent variable, with points sorted in ascending
+        order by the first variable, then the second, and so on.
+
+    Returns
+    -------
+    grid : list of numpy.ndarray
+        Unique values of each independent variable if the training data forms a full
+        grid, otherwise None.
+    """
+    grid = [np.unique(values) for values in training_data]
+
+    if math.prod(len(points) for points in grid) != len(training_data[0]):
+        return None
+
+    for values, points in zip(training_data, np.meshgrid(*grid, indexing='ij')):
+        if not np.array_equal(values, points.ravel()):
+            return None
+
+    return grid
+
+
+def build_interpolator(method, num_nodes, inputs, outputs, extrapolate=True):
+    """
+    Create a metamodel interpolation component from tabular data.
+
+    Data that forms a full rectangular grid is interpolated with a
+    MetaModelStructuredComp, using the table version of the interpolation method
+    (which computes and stores the polynomial coefficients of each grid cell) if one
+    exists for the number of inputs. Other data is interpolated with a
+    MetaModelSemiStructuredComp. The coefficients of the tables are taken from a
+    process-wide cache, so they are only computed once for all components built from
+    the same data.
+
+    Parameters
+    ----------
+    method : str
+        Interpolation method.
+    num_nodes : int
+        Number of points interpolated at once.
+    inputs : list of tuple
+        Name, training data, units and description of each input. Training data must
+        be sorted in ascending order by the first input, then the second, and so on.
+    outputs : list of tuple
+        Name, training data, units and description of each output.
+    extrapolate : bool
+        Extrapolate option of the semistructured interpolator.
+
+    Returns
+    -------
+    interpolator : CachedMetaModelStructuredComp or MetaModelSemiStructuredComp
+        Interpolation component with the given inputs and outputs.
+    """
+    grid = get_structured_grid([data for _, data, _, _ in inputs])
+
+    if grid is None:
+        interpolator = om.MetaModelSemiStructuredComp(
+            method=method, extrapolate=extrapolate, vec_size=num_nodes)
+
+        for name, data, units, desc in inputs:
+            interpolator.add_input(name, data, units=units, desc=desc)
+        for name, data, units, desc in outputs:
+            interpolator.add_output(name, data, units=units, desc=desc)
+
+    else:
+        table_method = f'{len(grid)}D-{method}'
+        if table_method in TABLE_METHODS:
+            method = table_method
+
+        # MetaModelSemiStructuredComp extrapolates even when extrapolate is False,
+        # while MetaModelStructuredComp raises an error. Always extrapolate so both
+        # behave the same way.
+        interpolator = CachedMetaModelStructuredComp(
+            method=method, extrapolate=True, vec_size=num_nodes)
+
+        shape = tuple(len(points) for points in grid)
+        for (name, _, units, desc), points in zip(inputs, grid):
+            interpolator.add_input(name, training_data=points, units=units, desc=desc)
+        for name, data, units, desc in outputs:
+            interpolator.add_output(name, training_data=np.reshape(data, shape),
+                                    units=units, desc=desc)
+
+    return interpolator
+
+
 def normalize(base_list, maximum=None, minimum=None):
     """
     Normalize the given list from 0 to 1.
@@ -1444,22 +1493,26 @@ def normalize(base_list, maximum=None, minimum=None):
     ----------
     base_list : (list, numpy.ndarray)
         Data that is to be normalized.
-    maximum : float
-        Overwritten maximum value of data that will scale to 1 when normalized.
-    minimum : float
-        Overwritten minimum value of data that will scale to 0 when normalized. 
+    maximum : (float, numpy.ndarray)
+        Overwritten maximum value of data that will scale to 1 when normalized. An
+        array gives a separate maximum for each point.
+    minimum : (float, numpy.ndarray)
+        Overwritten minimum value of data that will scale to 0 when normalized. An
+        array gives a separate minimum for each point.
 
     Returns
     -------
     norm_list : numpy.ndarray
         Normalized data from base_list.
     """
+    base_list = np.asarray(base_list, dtype=float)
+
     if maximum is None:
-        maximum = max(base_list)
+        maximum = np.max(base_list)
     if minimum is None:
-        minimum = min(base_list)
+        minimum = np.min(base_list)
 
-    norm_list = np.array([(x - minimum) / (maximum - minimum) for x in base_list])
+    norm_list = (base_list - minimum) / (maximum - minimum)
 
     return norm_list
 
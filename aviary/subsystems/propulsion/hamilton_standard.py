@@ -2,6 +2,7 @@ import warnings
 import numpy as np
 import openmdao.api as om
 from aviary.utils.aviary_values import AviaryValues
+from aviary.utils.legacy_tables import BivariateTable, UnivariateTable
 from aviary.variable_info.enums import Verbosity
 from aviary.variable_info.variables import Aircraft, Dynamic, Settings
 from aviary.constants import RHO_SEA_LEVEL_ENGLISH, TSLS_DEGR
@@ -457,6 +458,29 @@ comp_mach_CT_arr = np.array([
     .225, .260, .320, .375, .430, .495, .550, .610, .660, .710, .740, .775,  # X = 0.30
 ])
 
+# precompiled versions of the tables above, used by HamiltonStandard
+AFCP_tables = [UnivariateTable(Act_Factor_arr, row) for row in AFCPC]
+AFCT_tables = [UnivariateTable(Act_Factor_arr, row) for row in AFCTC]
+BL_P_corr_tables = [UnivariateTable(CPEC, row) for row in BL_P_corr_table]
+BL_T_corr_tables = [UnivariateTable(CTEC, row) for row in BL_T_corr_table]
+CP_CLi_tables = [UnivariateTable(CP_CLi_table[k][:cli_arr_len[k]], XPCLI[k])
+                 for k in range(len(CL_arr))]
+CT_CLi_tables = [UnivariateTable(CT_CLi_table[k][:cli_arr_len[k]], XTCLI[k])
+                 for k in range(len(CL_arr))]
+# blade angle as a function of effective CP, and CT as a function of blade angle
+CP_Angle_tables = [
+    [UnivariateTable(CP_Angle_table[i][k][:ang_arr_len[k]], Blade_angle_table[k])
+     for k in range(len(advance_ratio_array))]
+    for i in range(len(num_blades_arr))]
+CT_Angle_tables = [
+    [UnivariateTable(Blade_angle_table[k][:ang_arr_len[k]], CT_Angle_table[i][k])
+     for k in range(len(advance_ratio_array))]
+    for i in range(len(num_blades_arr))]
+TF_CLI_table = UnivariateTable(advance_ratio_array, TF_CLI_arr)
+mach_corr_tables = [UnivariateTable(advance_ratio_array2, row)
+                    for row in mach_corr_table]
+comp_mach_CT_table = BivariateTable.from_legacy_array(comp_mach_CT_arr, 1)
+
 
 class PreHamiltonStandard(om.ExplicitComponent):
     """
@@ -552,6 +576,10 @@ class HamiltonStandard(om.ExplicitComponent):
     The original documentation is available at 
     https://ntrs.nasa.gov/api/citations/19720010354/downloads/19720010354.pdf
     It computes the thrust coefficient of a propeller blade.
+
+    All nodes are evaluated together using the precompiled tables. Since
+    the nodes are independent of each other, the partials are diagonal and are
+    computed by complex stepping every node at once.
     """
 
     def initialize(self):
@@ -577,244 +605,320 @@ class HamiltonStandard(om.ExplicitComponent):
         # Tip Compressibility loss factor
         self.add_output('comp_tip_loss_factor', val=np.zeros(nn), units='unitless')
 
-        self.declare_partials('*', '*', method='fd', form='forward')
+    def setup_partials(self):
+        arange = np.arange(self.options['num_nodes'])
+
+        # blade angle and thrust coefficient do not depend on the compressibility
+        # correction
+        self.declare_partials(['thrust_coefficient', 'blade_angle'], [
+            'power_coefficient',
+            'advance_ratio',
+        ], rows=arange, cols=arange)
+        self.declare_partials('comp_tip_loss_factor', [
+            'power_coefficient',
+            'advance_ratio',
+            Dynamic.Mission.MACH,
+            'tip_mach',
+        ], rows=arange, cols=arange)
+        self.declare_partials('*', [
+            Aircraft.Engine.PROPELLER_ACTIVITY_FACTOR,
+            Aircraft.Engine.PROPELLER_INTEGRATED_LIFT_COEFFICIENT,
+        ])
 
     def compute(self, inputs, outputs):
+        ct, ang_blade, xft = self._compute_tables(
+            inputs['power_coefficient'],
+            inputs['advance_ratio'],
+            inputs[Dynamic.Mission.MACH],
+            inputs['tip_mach'],
+            inputs[Aircraft.Engine.PROPELLER_ACTIVITY_FACTOR][0],
+            inputs[Aircraft.Engine.PROPELLER_INTEGRATED_LIFT_COEFFICIENT][0])
+
+        outputs['blade_angle'] = ang_blade
+        outputs['thrust_coefficient'] = ct
+        outputs['comp_tip_loss_factor'] = xft
+
+    def compute_partials(self, inputs, partials):
+        nn = self.options['num_nodes']
+        step = 1.0e-30
+        names = [
+            'power_coefficient',
+            'advance_ratio',
+            Dynamic.Mission.MACH,
+            'tip_mach',
+            Aircraft.Engine.PROPELLER_ACTIVITY_FACTOR,
+            Aircraft.Engine.PROPELLER_INTEGRATED_LIFT_COEFFICIENT,
+        ]
+
+        for wrt in names:
+            args = [inputs[name].astype(complex) for name in names]
+            args[names.index(wrt)] += step * 1j
+            args[4] = args[4][0]
+            args[5] = args[5][0]
+
+            ct, ang_blade, xft = self._compute_tables(*args, report=False)
+
+            if wrt in (Dynamic.Mission.MACH, 'tip_mach'):
+                partials['comp_tip_loss_factor', wrt] = xft.imag / step
+                continue
+
+            shape = (nn,) if wrt in names[:4] else (nn, 1)
+            partials['thrust_coefficient', wrt] = (ct.imag / step).reshape(shape)
+            partials['blade_angle', wrt] = (ang_blade.imag / step).reshape(shape)
+            partials['comp_tip_loss_factor', wrt] = (xft.imag / step).reshape(shape)
+
+    def _compute_tables(
+        self, power_coefficient, advance_ratio, mach, tip_mach, act_factor, cli,
+        report=True
+    ):
+        """
+        Run the Hamilton Standard table lookups for all nodes at once. Returns
+        thrust coefficient, blade angle and compressibility tip loss factor.
+        Messages about table extrapolation are only issued when report is True.
+        """
         verbosity = self.options['aviary_options'].get_val(Settings.VERBOSITY)
         num_blades = self.options['aviary_options'].get_val(
             Aircraft.Engine.NUM_PROPELLER_BLADES)
 
-        for i_node in range(self.options['num_nodes']):
-            ichck = 0
-            run_flag = 0
-            xft = 1.0
-            AF_adj_CP = np.zeros(7)  # AFCP: an AF adjustment of CP to be assigned
-            AF_adj_CT = np.zeros(7)  # AFCT: an AF adjustment of CT to be assigned
-            CTT = np.zeros(7)
-            BLL = np.zeros(7)
-            BLLL = np.zeros(7)
-            PXCLI = np.zeros(7)
-            XFFT = np.zeros(6)
-            CTG = np.zeros(11)
-            CTG1 = np.zeros(11)
-            TXCLI = np.zeros(6)
-            CTTT = np.zeros(4)
-            XXXFT = np.zeros(4)
-            act_factor = inputs[Aircraft.Engine.PROPELLER_ACTIVITY_FACTOR][0]
-            for k in range(2):
-                AF_adj_CP[k], run_flag = _unint(Act_Factor_arr, AFCPC[k], act_factor)
-                AF_adj_CT[k], run_flag = _unint(Act_Factor_arr, AFCTC[k], act_factor)
-            for k in range(2, 7):
-                AF_adj_CP[k] = AF_adj_CP[1]
-                AF_adj_CT[k] = AF_adj_CT[1]
-            if (inputs['advance_ratio'][i_node] <= 0.5):
-                AFCTE = 2.*inputs['advance_ratio'][i_node] * \
-                    (AF_adj_CT[1] - AF_adj_CT[0]) + AF_adj_CT[0]
-            else:
-                AFCTE = AF_adj_CT[1]
-
-            # bounding J (advance ratio) for setting up interpolation
-            if (inputs['advance_ratio'][i_node] <= 1.0):
-                J_begin = 0
-                J_end = 3
-            elif (inputs['advance_ratio'][i_node] <= 1.5):
-                J_begin = 1
-                J_end = 4
-            elif (inputs['advance_ratio'][i_node] <= 2.0):
-                J_begin = 2
-                J_end = 5
-            else:
-                J_begin = 3
-                J_end = 6
-
-            CL_tab_idx_begin = 0  # NCLT
-            CL_tab_idx_end = 0  # NCLTT
-            # flag that given lift coeff (cli) does not fall on a node point of CL_arr
-            CL_tab_idx_flg = 0  # NCL_flg
-            ifnd = 0
-            cli = inputs[Aircraft.Engine.PROPELLER_INTEGRATED_LIFT_COEFFICIENT][0]
-            power_coefficient = inputs['power_coefficient'][i_node]
-            for ii in range(6):
-                cl_idx = ii
-                if (abs(cli - CL_arr[ii]) <= 0.0009):
-                    ifnd = 1
-                    break
-            if (ifnd == 0):
-                if (cli <= 0.6):
-                    CL_tab_idx_begin = 0
-                    CL_tab_idx_end = 3
-                elif (cli <= 0.7):
-                    CL_tab_idx_begin = 1
-                    CL_tab_idx_end = 4
-                else:
-                    CL_tab_idx_begin = 2
-                    CL_tab_idx_end = 5
-            else:
-                CL_tab_idx_begin = cl_idx
-                CL_tab_idx_end = cl_idx
-                # flag that given lift coeff (cli) falls on a node point of CL_arr
-                CL_tab_idx_flg = 1
-
-            lmod = (num_blades % 2) + 1
-            if (lmod == 1):
-                nbb = 1
-                idx_blade = int(num_blades/2.0)
-                # even number of blades idx_blade = 1 if 2 blades;
-                #                       idx_blade = 2 if 4 blades;
-                #                       idx_blade = 3 if 6 blades;
-                #                       idx_blade = 4 if 8 blades.
-                idx_blade = idx_blade - 1
+        nn = power_coefficient.size
+        dtype = np.result_type(power_coefficient, advance_ratio, mach, tip_mach,
+                               act_factor, cli, float)
+        rows = np.arange(nn)
+        advance_ratio_r = advance_ratio.real
+        cli_vec = np.full(nn, cli, dtype=dtype)
+        ichck = np.zeros(nn, dtype=int)
+
+        AF_adj_CP = np.zeros(7, dtype=dtype)  # AFCP: an AF adjustment of CP
+        AF_adj_CT = np.zeros(7, dtype=dtype)  # AFCT: an AF adjustment of CT
+        for k in range(2):
+            AF_adj_CP[k] = AFCP_tables[k].evaluate(act_factor)[0][0]
+            AF_adj_CT[k] = AFCT_tables[k].evaluate(act_factor)[0][0]
+        AF_adj_CP[2:] = AF_adj_CP[1]
+        AF_adj_CT[2:] = AF_adj_CT[1]
+        AFCTE = np.where(advance_ratio_r <= 0.5,
+                         2.*advance_ratio*(AF_adj_CT[1] - AF_adj_CT[0]) + AF_adj_CT[0],
+                         AF_adj_CT[1])
+
+        # bounding J (advance ratio) for setting up interpolation
+        J_begin = np.select(
+            [advance_ratio_r <= 1.0, advance_ratio_r <= 1.5, advance_ratio_r <= 2.0],
+            [0, 1, 2], default=3)
+        J_end = J_begin + 3
+        J_cols = J_begin[:, np.newaxis] + np.arange(4)
+
+        CL_tab_idx_begin = 0  # NCLT
+        CL_tab_idx_end = 0  # NCLTT
+        # flag that given lift coeff (cli) does not fall on a node point of CL_arr
+        CL_tab_idx_flg = 0  # NCL_flg
+        ifnd = 0
+        for ii in range(6):
+            cl_idx = ii
+            if (abs(cli.real - CL_arr[ii]) <= 0.0009):
+                ifnd = 1
+                break
+        if (ifnd == 0):
+            if (cli.real <= 0.6):
+                CL_tab_idx_begin = 0
+                CL_tab_idx_end = 3
+            elif (cli.real <= 0.7):
+                CL_tab_idx_begin = 1
+                CL_tab_idx_end = 4
             else:
-                nbb = 4
-                # odd number of blades
-                idx_blade = 0  # start from first blade
-
-            for ibb in range(nbb):
-                # nbb = 1 even number of blades. No interpolation needed
-                # nbb = 4 odd number of blades. So, interpolation done
-                #       using 4 sets of even J (advance ratio) interpolation
-                for kdx in range(J_begin, J_end+1):
-                    CP_Eff = power_coefficient*AF_adj_CP[kdx]
-                    PBL, run_flag = _unint(CPEC, BL_P_corr_table[idx_blade], CP_Eff)
-                    # PBL = number of blades correction for power_coefficient
-                    CPE1 = CP_Eff*PBL*PF_CLI_arr[kdx]
-                    CL_tab_idx = CL_tab_idx_begin
-                    for kl in range(CL_tab_idx_begin, CL_tab_idx_end+1):
-                        CPE1X = CPE1
-                        if (CPE1 < CP_CLi_table[CL_tab_idx][0]):
-                            CPE1X = CP_CLi_table[CL_tab_idx][0]
-                        cli_len = cli_arr_len[CL_tab_idx]
-                        PXCLI[kl], run_flag = _unint(
-                            CP_CLi_table[CL_tab_idx][:cli_len], XPCLI[CL_tab_idx], CPE1X)
-                        if (run_flag == 1):
-                            ichck = ichck + 1
-                        if (verbosity is Verbosity.DEBUG or ichck <= 1):
-                            if (run_flag == 1):
-                                warnings.warn(
-                                    f"Mach,VTMACH,J,power_coefficient,CP_Eff =: {inputs[Dynamic.Mission.MACH][i_node]},{inputs['tip_mach'][i_node]},{inputs['advance_ratio'][i_node]},{power_coefficient},{CP_Eff}")
-                            if (kl == 4 and CPE1 < 0.010):
-                                print(
-                                    f"Extrapolated data is being used for CLI=.6--CPE1,PXCLI,L= , {CPE1},{PXCLI[kl]},{idx_blade}   Suggest inputting CLI=.5")
-                            if (kl == 5 and CPE1 < 0.010):
-                                print(
-                                    f"Extrapolated data is being used for CLI=.7--CPE1,PXCLI,L= , {CPE1},{PXCLI[kl]},{idx_blade}   Suggest inputting CLI=.5")
-                            if (kl == 6 and CPE1 < 0.010):
+                CL_tab_idx_begin = 2
+                CL_tab_idx_end = 5
+        else:
+            CL_tab_idx_begin = cl_idx
+            CL_tab_idx_end = cl_idx
+            # flag that given lift coeff (cli) falls on a node point of CL_arr
+            CL_tab_idx_flg = 1
+        CL_slice = slice(CL_tab_idx_begin, CL_tab_idx_begin + 4)
+
+        lmod = (num_blades % 2) + 1
+        if (lmod == 1):
+            nbb = 1
+            idx_blade = int(num_blades/2.0)
+            # even number of blades idx_blade = 1 if 2 blades;
+            #                       idx_blade = 2 if 4 blades;
+            #                       idx_blade = 3 if 6 blades;
+            #                       idx_blade = 4 if 8 blades.
+            idx_blade = idx_blade - 1
+        else:
+            nbb = 4
+            # odd number of blades
+            idx_blade = 0  # start from first blade
+
+        BLLL = np.zeros((nn, 4), dtype=dtype)
+        CTTT = np.zeros((nn, 4), dtype=dtype)
+        XXXFT = np.zeros((nn, 4), dtype=dtype)
+        xft = np.ones(nn, dtype=dtype)
+
+        for ibb in range(nbb):
+            # nbb = 1 even number of blades. No interpolation needed
+            # nbb = 4 odd number of blades. So, interpolation done
+            #       using 4 sets of even J (advance ratio) interpolation
+            BLL = np.zeros((nn, 7), dtype=dtype)
+            CTT = np.zeros((nn, 7), dtype=dtype)
+            for kdx in range(7):
+                # nodes that use advance ratio kdx in their interpolation
+                nodes = np.where((J_begin <= kdx) & (kdx <= J_end))[0]
+                if nodes.size == 0:
+                    continue
+
+                CP_Eff = power_coefficient[nodes]*AF_adj_CP[kdx]
+                PBL, run_flag = BL_P_corr_tables[idx_blade].evaluate(CP_Eff)
+                # PBL = number of blades correction for power_coefficient
+                CPE1 = CP_Eff*PBL*PF_CLI_arr[kdx]
+                PXCLI = np.zeros((nodes.size, 7), dtype=dtype)
+                CL_tab_idx = CL_tab_idx_begin
+                for kl in range(CL_tab_idx_begin, CL_tab_idx_end+1):
+                    CPE1X = np.where(CPE1.real < CP_CLi_table[CL_tab_idx][0],
+                                     CP_CLi_table[CL_tab_idx][0], CPE1)
+                    PXCLI[:, kl], run_flag = CP_CLi_tables[CL_tab_idx].evaluate(CPE1X)
+                    ichck[nodes] += run_flag == 1
+                    if report:
+                        show = (verbosity is Verbosity.DEBUG) | (ichck[nodes] <= 1)
+                        for k in np.where(show & (run_flag == 1))[0]:
+                            i_node = nodes[k]
+                            warnings.warn(
+                                "Mach,VTMACH,J,power_coefficient,CP_Eff =: "
+                                f"{mach[i_node]},{tip_mach[i_node]},"
+                                f"{advance_ratio[i_node]},{power_coefficient[i_node]},"
+                                f"{CP_Eff[k]}")
+                        if kl in (4, 5, 6):
+                            for k in np.where(show & (CPE1.real < 0.010))[0]:
                                 print(
-                                    f"Extrapolated data is being used for CLI=.8--CPE1,PXCLI,L= , {CPE1},{PXCLI[kl]},{idx_blade}   Suggest inputting CLI=.5")
-                        NERPT = 1
-                        CL_tab_idx = CL_tab_idx+1
-                    if (CL_tab_idx_flg != 1):
-                        PCLI, run_flag = _unint(
-                            CL_arr[CL_tab_idx_begin:CL_tab_idx_begin+4], PXCLI[CL_tab_idx_begin:CL_tab_idx_begin+4], inputs[Aircraft.Engine.PROPELLER_INTEGRATED_LIFT_COEFFICIENT][0])
-                    else:
-                        PCLI = PXCLI[CL_tab_idx_begin]
-                        # PCLI = CLI adjustment to power_coefficient
-                    CP_Eff = CP_Eff*PCLI  # the effective CP at baseline point for kdx
-                    ang_len = ang_arr_len[kdx]
-                    BLL[kdx], run_flag = _unint(
-                        CP_Angle_table[idx_blade][kdx][:ang_len], Blade_angle_table[kdx], CP_Eff)  # blade angle at baseline point for kdx
-                    try:
-                        CTT[kdx], run_flag = _unint(
-                            Blade_angle_table[kdx], CT_Angle_table[idx_blade][kdx][:ang_len], BLL[kdx])  # thrust coeff at baseline point for kdx
-                    except IndexError:
+                                    "Extrapolated data is being used for "
+                                    f"CLI=.{kl + 2}--CPE1,PXCLI,L= , {CPE1[k]},"
+                                    f"{PXCLI[k, kl]},{idx_blade}   Suggest inputting "
+                                    "CLI=.5")
+                    CL_tab_idx = CL_tab_idx+1
+                if (CL_tab_idx_flg != 1):
+                    PCLI, run_flag = UnivariateTable(
+                        CL_arr[CL_slice], PXCLI[:, CL_slice]).evaluate(cli_vec[nodes])
+                else:
+                    PCLI = PXCLI[:, CL_tab_idx_begin]
+                    # PCLI = CLI adjustment to power_coefficient
+                CP_Eff = CP_Eff*PCLI  # the effective CP at baseline point for kdx
+                BLL[nodes, kdx], run_flag = CP_Angle_tables[idx_blade][kdx].evaluate(
+                    CP_Eff)  # blade angle at baseline point for kdx
+                ang_len = ang_arr_len[kdx]
+                if ang_len < Blade_angle_table[kdx].size:
+                    # the legacy lookup of CTT runs past the end of the data in the
+                    # last interval of a shortened row
+                    ang = Blade_angle_table[kdx]
+                    BLL_r = BLL[nodes, kdx].real
+                    if np.any((BLL_r > ang[ang_len - 2]) & (BLL_r != ang[ang_len - 1])):
                         raise om.AnalysisError(
-                            "interp failed for CTT (thrust coefficient) in hamilton_standard.py")
-                    if (run_flag > 1):
-                        NERPT = 2
+                            "interp failed for CTT (thrust coefficient) in "
+                            "hamilton_standard.py")
+                CTT[nodes, kdx], run_flag = CT_Angle_tables[idx_blade][kdx].evaluate(
+                    BLL[nodes, kdx])  # thrust coeff at baseline point for kdx
+                if report:
+                    NERPT = 2
+                    for flag in run_flag[run_flag > 1]:
                         print(
-                            f"ERROR IN PROP. PERF.-- NERPT={NERPT}, run_flag={run_flag}")
-
-                BLLL[ibb], run_flag = _unint(
-                    advance_ratio_array[J_begin:J_begin+4], BLL[J_begin:J_begin+4], inputs['advance_ratio'][i_node])
-                ang_blade = BLLL[ibb]
-                CTTT[ibb], run_flag = _unint(
-                    advance_ratio_array[J_begin:J_begin+4], CTT[J_begin:J_begin+4], inputs['advance_ratio'][i_node])
-
-                # make extra correction. CTG is an "error" function, and the iteration (loop counter = "IL") tries to drive CTG/CT to 0
-                # ERR_CT = CTG1[il]/CTTT[ibb], where CTG1 =CT_Eff - CTTT(IBB).
-                CTG[0] = .100
-                CTG[1] = .200
-                TFCLII, run_flag = _unint(
-                    advance_ratio_array, TF_CLI_arr, inputs['advance_ratio'][i_node])
-                NCTG = 10
-                ifnd1 = 0
-                ifnd2 = 0
-                for il in range(NCTG):
-                    ct = CTG[il]
-                    CT_Eff = CTG[il]*AFCTE
-                    TBL, run_flag = _unint(CTEC, BL_T_corr_table[idx_blade], CT_Eff)
-                    # TBL = number of blades correction for thrust_coefficient
-                    CTE1 = CT_Eff*TBL*TFCLII
-                    CL_tab_idx = CL_tab_idx_begin
-                    for kl in range(CL_tab_idx_begin, CL_tab_idx_end+1):
-                        CTE1X = CTE1
-                        if (CTE1 < CT_CLi_table[CL_tab_idx][0]):
-                            CTE1X = CT_CLi_table[CL_tab_idx][0]
-                        cli_len = cli_arr_len[CL_tab_idx]
-                        TXCLI[kl], run_flag = _unint(
-                            CT_CLi_table[CL_tab_idx][:cli_len], XTCLI[CL_tab_idx][:cli_len], CTE1X)
+                            f"ERROR IN PROP. PERF.-- NERPT={NERPT}, run_flag={flag}")
+
+            BLLL[:, ibb], run_flag = UnivariateTable(
+                advance_ratio_array[J_cols],
+                BLL[rows[:, np.newaxis], J_cols]).evaluate(advance_ratio)
+            ang_blade = BLLL[:, ibb]
+            CTTT[:, ibb], run_flag = UnivariateTable(
+                advance_ratio_array[J_cols],
+                CTT[rows[:, np.newaxis], J_cols]).evaluate(advance_ratio)
+
+            # make extra correction. CTG is an "error" function, and the iteration
+            # (loop counter = "IL") tries to drive CTG/CT to 0
+            # ERR_CT = CTG1[il]/CTTT[ibb], where CTG1 =CT_Eff - CTTT(IBB).
+            CTG = np.zeros((nn, 11), dtype=dtype)
+            CTG1 = np.zeros((nn, 11), dtype=dtype)
+            CTG[:, 0] = .100
+            CTG[:, 1] = .200
+            TFCLII, run_flag = TF_CLI_table.evaluate(advance_ratio)
+            NCTG = 10
+            ct = np.zeros(nn, dtype=dtype)
+            ifnd1 = np.zeros(nn, dtype=bool)
+            ifnd2 = np.zeros(nn, dtype=bool)
+            for il in range(NCTG):
+                # nodes that have not converged yet
+                nodes = np.where(~ifnd1 & ~ifnd2)[0]
+                if nodes.size == 0:
+                    break
+
+                ct[nodes] = CTG[nodes, il]
+                CT_Eff = CTG[nodes, il]*AFCTE[nodes]
+                TBL, run_flag = BL_T_corr_tables[idx_blade].evaluate(CT_Eff)
+                # TBL = number of blades correction for thrust_coefficient
+                CTE1 = CT_Eff*TBL*TFCLII[nodes]
+                TXCLI = np.zeros((nodes.size, 6), dtype=dtype)
+                XFFT = np.zeros((nodes.size, 6), dtype=dtype)
+                CL_tab_idx = CL_tab_idx_begin
+                for kl in range(CL_tab_idx_begin, CL_tab_idx_end+1):
+                    CTE1X = np.where(CTE1.real < CT_CLi_table[CL_tab_idx][0],
+                                     CT_CLi_table[CL_tab_idx][0], CTE1)
+                    TXCLI[:, kl], run_flag = CT_CLi_tables[CL_tab_idx].evaluate(CTE1X)
+                    if report:
                         NERPT = 5
-                        if (run_flag == 1):
+                        for flag in run_flag[run_flag == 1]:
                             # off lower bound only.
                             print(
-                                f"ERROR IN PROP. PERF.-- NERPT={NERPT}, run_flag={run_flag}, il = {il}, kl = {kl}")
-                        if (inputs['advance_ratio'][i_node] != 0.0):
-                            ZMCRT, run_flag = _unint(
-                                advance_ratio_array2, mach_corr_table[CL_tab_idx], inputs['advance_ratio'][i_node])
-                            DMN = inputs[Dynamic.Mission.MACH][i_node] - ZMCRT
-                        else:
-                            ZMCRT = mach_tip_corr_arr[CL_tab_idx]
-                            DMN = inputs['tip_mach'][i_node] - ZMCRT
-                        XFFT[kl] = 1.0  # compressibility tip loss factor
-                        if (DMN > 0.0):
-                            CTE2 = CT_Eff*TXCLI[kl]*TBL
-                            XFFT[kl], run_flag = _biquad(comp_mach_CT_arr, 1, DMN, CTE2)
-                        CL_tab_idx = CL_tab_idx + 1
-                    if (CL_tab_idx_flg != 1):
-                        cli = inputs[Aircraft.Engine.PROPELLER_INTEGRATED_LIFT_COEFFICIENT][0]
-                        TCLII, run_flag = _unint(
-                            CL_arr[CL_tab_idx_begin:CL_tab_idx_begin+4], TXCLI[CL_tab_idx_begin:CL_tab_idx_begin+4], cli)
-                        xft, run_flag = _unint(
-                            CL_arr[CL_tab_idx_begin:CL_tab_idx_begin+4], XFFT[CL_tab_idx_begin:CL_tab_idx_begin+4], cli)
-                    else:
-                        TCLII = TXCLI[CL_tab_idx_begin]
-                        xft = XFFT[CL_tab_idx_begin]
-                    ct = CTG[il]
-                    CT_Eff = CTG[il]*AFCTE*TCLII
-                    CTG1[il] = CT_Eff - CTTT[ibb]
-                    if (abs(CTG1[il]/CTTT[ibb]) < 0.001):
-                        ifnd1 = 1
-                        break
-                    if (il > 0):
-                        CTG[il+1] = -CTG1[il-1] * \
-                            (CTG[il] - CTG[il-1])/(CTG1[il] - CTG1[il-1]) + CTG[il-1]
-                        if (CTG[il+1] <= 0):
-                            ifnd2 = 1
-                            break
-
-                if (ifnd1 == 0 and ifnd2 == 0):
-                    raise ValueError(
-                        f"Integrated design cl adjustment not working properly for ct definition (ibb={ibb})")
-                if (ifnd1 == 0 and ifnd2 == 1):
-                    ct = 0.0
-                CTTT[ibb] = ct
-                XXXFT[ibb] = xft
-                idx_blade = idx_blade + 1
-
-            if (nbb != 1):
-                # interpolation by the number of blades if odd number
-                ang_blade, run_flag = _unint(
-                    num_blades_arr, BLLL[:4], num_blades)
-                ct, run_flag = _unint(num_blades_arr, CTTT, num_blades)
-                xft, run_flag = _unint(num_blades_arr, XXXFT, num_blades)
-
-            # NOTE this could be handled via the metamodel comps (extrapolate flag)
-            if ichck > 0:
-                print(f"  table look-up error = {ichck} (if you go outside the tables.)")
-
-            outputs['blade_angle'][i_node] = ang_blade
-            outputs['thrust_coefficient'][i_node] = ct
-            outputs['comp_tip_loss_factor'][i_node] = xft
+                                f"ERROR IN PROP. PERF.-- NERPT={NERPT}, "
+                                f"run_flag={flag}, il = {il}, kl = {kl}")
+                    ZMCRT, run_flag = mach_corr_tables[CL_tab_idx].evaluate(
+                        advance_ratio[nodes])
+                    DMN = np.where(advance_ratio_r[nodes] != 0.0,
+                                   mach[nodes] - ZMCRT,
+                                   tip_mach[nodes] - mach_tip_corr_arr[CL_tab_idx])
+                    XFFT[:, kl] = 1.0  # compressibility tip loss factor
+                    comp = DMN.real > 0.0
+                    if comp.any():
+                        CTE2 = CT_Eff[comp]*TXCLI[comp, kl]*TBL[comp]
+                        XFFT[comp, kl], run_flag = comp_mach_CT_table.evaluate(
+                            DMN[comp], CTE2)
+                    CL_tab_idx = CL_tab_idx + 1
+                if (CL_tab_idx_flg != 1):
+                    TCLII, run_flag = UnivariateTable(
+                        CL_arr[CL_slice], TXCLI[:, CL_slice]).evaluate(cli_vec[nodes])
+                    xft[nodes], run_flag = UnivariateTable(
+                        CL_arr[CL_slice], XFFT[:, CL_slice]).evaluate(cli_vec[nodes])
+                else:
+                    TCLII = TXCLI[:, CL_tab_idx_begin]
+                    xft[nodes] = XFFT[:, CL_tab_idx_begin]
+                CT_Eff = CTG[nodes, il]*AFCTE[nodes]*TCLII
+                CTG1[nodes, il] = CT_Eff - CTTT[nodes, ibb]
+                converged = np.abs((CTG1[nodes, il]/CTTT[nodes, ibb]).real) < 0.001
+                ifnd1[nodes[converged]] = True
+                if (il > 0):
+                    nodes = nodes[~converged]
+                    CTG[nodes, il+1] = -CTG1[nodes, il-1] * \
+                        (CTG[nodes, il] - CTG[nodes, il-1]) / \
+                        (CTG1[nodes, il] - CTG1[nodes, il-1]) + CTG[nodes, il-1]
+                    ifnd2[nodes[CTG[nodes, il+1].real <= 0]] = True
+
+            if np.any(~ifnd1 & ~ifnd2):
+                raise ValueError(
+                    "Integrated design cl adjustment not working properly for ct "
+                    f"definition (ibb={ibb})")
+            ct[~ifnd1 & ifnd2] = 0.0
+            CTTT[:, ibb] = ct
+            XXXFT[:, ibb] = xft
+            idx_blade = idx_blade + 1
+
+        if (nbb != 1):
+            # interpolation by the number of blades if odd number
+            num_blades_vec = np.full(nn, num_blades, dtype=float)
+            ang_blade, run_flag = UnivariateTable(
+                num_blades_arr, BLLL).evaluate(num_blades_vec)
+            ct, run_flag = UnivariateTable(num_blades_arr, CTTT).evaluate(num_blades_vec)
+            xft, run_flag = UnivariateTable(
+                num_blades_arr, XXXFT).evaluate(num_blades_vec)
+
+        # NOTE this could be handled via the metamodel comps (extrapolate flag)
+        if report:
+            for n_err in ichck[ichck > 0]:
+                print(f"  table look-up error = {n_err} (if you go outside the tables.)")
+
+        return ct, ang_blade, xft
 
 
 class PostHamiltonStandard(om.ExplicitComponent):
@@ -2,11 +2,15 @@ import csv
 import unittest
 from pathlib import Path
 
+import numpy as np
+import openmdao.api as om
 from openmdao.utils.assert_utils import assert_near_equal
 
 from aviary.subsystems.propulsion.engine_deck import EngineDeck
 from aviary.subsystems.propulsion.utils import EngineModelVariables as keys
+from aviary.utils.aviary_values import AviaryValues
 from aviary.utils.named_values import NamedValues
+from aviary.variable_info.variables import Aircraft, Dynamic
 from aviary.validation_cases.validation_data.flops_data.FLOPS_Test_Data import \
     FLOPS_Test_Data
 
@@ -130,6 +134,80 @@ class EngineDeckTest(unittest.TestCase):
         assert_near_equal(thrust, expected_thrust, tolerance=tol)
         assert_near_equal(fuel_flow_rate, expected_fuel_flow_rate, tolerance=tol)
 
+    def test_structured_grid(self):
+        options = _grid_deck_options()
+
+        nn = 5
+        test_mach = np.linspace(0.1, 0.9, nn)
+        test_alt = np.linspace(1000.0, 45000.0, nn)
+        test_throttle = np.linspace(1.0, 0.2, nn)
+        expected_thrust = _thrust_func(test_mach, test_alt, test_throttle)
+
+        # full grid, then ragged data with a throttle point missing
+        for keep, interp_class in ((slice(None), om.MetaModelStructuredComp),
+                                   (slice(1, None), om.MetaModelSemiStructuredComp)):
+            engine = EngineDeck('engine', options, _grid_deck_data(keep))
+            interp = engine._build_engine_interpolator(nn, options)
+            self.assertIsInstance(interp, interp_class)
+
+            prob = om.Problem()
+            prob.model.add_subsystem('interp', interp, promotes=['*'])
+            prob.setup()
+            prob.set_val(Dynamic.Mission.MACH, test_mach)
+            prob.set_val(Dynamic.Mission.ALTITUDE, test_alt, units='ft')
+            prob.set_val(Dynamic.Mission.THROTTLE, test_throttle)
+            prob.run_model()
+
+            assert_near_equal(prob.get_val('thrust_net_unscaled', units='lbf'),
+                              expected_thrust, 1e-10)
+
+    def test_max_thrust(self):
+        engine = EngineDeck('engine', _grid_deck_options(), _grid_deck_data())
+
+        # max thrust is pre-solved at max throttle for each Mach, altitude combination
+        mach, alt = np.meshgrid([0.0, 0.4, 0.8], [0.0, 20000.0, 40000.0], indexing='ij')
+        max_thrust_data = engine.max_thrust_data
+
+        assert_near_equal(max_thrust_data[keys.MACH], mach.ravel())
+        assert_near_equal(max_thrust_data[keys.ALTITUDE], alt.ravel())
+        assert_near_equal(max_thrust_data[keys.THRUST],
+                          _thrust_func(mach, alt, 1.0).ravel(), 1e-12)
+
+
+def _grid_deck_options():
+    options = AviaryValues()
+    options.set_val(Aircraft.Engine.SCALE_PERFORMANCE, False)
+    options.set_val(Aircraft.Engine.IGNORE_NEGATIVE_THRUST, False)
+    options.set_val(Aircraft.Engine.GEOPOTENTIAL_ALT, False)
+    options.set_val(Aircraft.Engine.GENERATE_FLIGHT_IDLE, False)
+    options.set_val(Aircraft.Engine.INTERPOLATION_METHOD, 'slinear')
+    return options
+
+
+def _grid_deck_points():
+    mach, alt, throttle = np.meshgrid([0.0, 0.4, 0.8],
+                                      [0.0, 20000.0, 40000.0],
+                                      [0.0, 0.5, 1.0],
+                                      indexing='ij')
+    return mach.ravel(), alt.ravel(), throttle.ravel()
+
+
+def _grid_deck_data(keep=slice(None)):
+    mach, alt, throttle = _grid_deck_points()
+
+    data = NamedValues()
+    data.set_val('mach', mach[keep], 'unitless')
+    data.set_val('altitude', alt[keep], 'ft')
+    data.set_val('throttle', throttle[keep], 'unitless')
+    data.set_val('thrust', _thrust_func(mach, alt, throttle)[keep], 'lbf')
+    data.set_val('fuel_flow', np.ones(mach.size)[keep], 'lbm/h')
+    return data
+
+
+def _thrust_func(mach, alt, throttle):
+    # multilinear, so it is exactly reproduced by linear interpolation
+    return 1000.0 * (1.0 + throttle) * (1.0 - alt / 80000.0) * (1.0 + mach)
+
 
 if __name__ == "__main__":
     unittest.main()
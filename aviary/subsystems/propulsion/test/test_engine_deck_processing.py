@@ -0,0 +1,501 @@
+import math
+import time
+import unittest
+import warnings
+
+import numpy as np
+from openmdao.utils.assert_utils import assert_near_equal
+
+from aviary.subsystems.propulsion.engine_deck import (
+    ALTITUDE, HYBRID_THROTTLE, MACH, SHAFT_POWER, SHAFT_POWER_CORRECTED, THROTTLE,
+    THRUST, EngineDeck, extend_array)
+from aviary.utils.aviary_values import AviaryValues
+from aviary.utils.functions import get_path
+from aviary.variable_info.variables import Aircraft
+
+
+engine_decks = [
+    'turbofan_22k.deck',
+    'turbofan_23k_1.deck',
+    'turbofan_24k_1.deck',
+    'turbofan_24k_2.deck',
+    'turbofan_28k.deck',
+    'turboprop_1120hp.deck',
+    'turboprop_4465hp.deck',
+]
+
+
+class EngineDeckProcessingTest(unittest.TestCase):
+    """
+    Compare the vectorized engine data processing of EngineDeck against the
+    original implementation, which processed the data one row at a time.
+    """
+
+    def _build_decks(self, filename, flight_idle):
+        options = AviaryValues()
+        options.set_val(Aircraft.Engine.DATA_FILE,
+                        get_path('models/engines/' + filename))
+        options.set_val(Aircraft.Engine.GENERATE_FLIGHT_IDLE, flight_idle)
+
+        decks = []
+        times = []
+        for deck_class in (_ReferenceEngineDeck, EngineDeck):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                start = time.perf_counter()
+                decks.append(deck_class('engine', options.deepcopy()))
+                times.append(time.perf_counter() - start)
+
+        return decks, times
+
+    def test_match_reference(self):
+        for filename in engine_decks:
+            for flight_idle in (False, True):
+                with self.subTest(deck=filename, flight_idle=flight_idle):
+                    (expected, deck), _ = self._build_decks(filename, flight_idle)
+                    _assert_decks_equal(self, deck, expected)
+
+    def test_local_throttle(self):
+        (expected, deck), _ = self._build_decks('turbofan_28k.deck', True)
+        for engine in (expected, deck):
+            engine.global_throttle = False
+            engine._normalize_throttle()
+
+        _assert_decks_equal(self, deck, expected)
+        assert_near_equal(deck.throttle_min, expected.throttle_min, 0.0)
+        assert_near_equal(deck.throttle_max, expected.throttle_max, 0.0)
+
+    def bench_test_processing_speed(self):
+        print()
+        print(f'{"deck":<24}{"reference (s)":>16}{"vectorized (s)":>16}')
+        for filename in engine_decks:
+            (expected, deck), times = self._build_decks(filename, True)
+            _assert_decks_equal(self, deck, expected)
+
+            # only time the data processing that was vectorized
+            for engine, idx in ((expected, 0), (deck, 1)):
+                start = time.perf_counter()
+                engine._pack_data()
+                engine._normalize_throttle()
+                engine._generate_flight_idle()
+                times[idx] = time.perf_counter() - start
+
+            print(f'{filename:<24}{times[0]:>16.4f}{times[1]:>16.4f}')
+            self.assertLess(times[1], times[0])
+
+
+def _assert_decks_equal(test, deck, expected):
+    for attr in ('model_length', 'mach_max_count', 'alt_max_count',
+                 'data_max_count', 'throttle_min', 'throttle_max'):
+        test.assertTrue(np.array_equal(getattr(deck, attr), getattr(expected, attr)),
+                        attr)
+
+    assert_near_equal(deck.data_indices, expected.data_indices, 0.0)
+
+    for key in expected.data:
+        assert_near_equal(deck.data[key], expected.data[key], 0.0)
+        assert_near_equal(deck.packed_data[key], expected.packed_data[key], 0.0)
+
+    if hasattr(expected, 'idle_points'):
+        for key in expected.idle_points:
+            assert_near_equal(deck.idle_points[key], expected.idle_points[key], 0.0)
+
+    if hasattr(expected, 'max_thrust_data'):
+        for key in expected.max_thrust_data:
+            assert_near_equal(deck.max_thrust_data[key],
+                              expected.max_thrust_data[key], 0.0)
+
+
+class _ReferenceEngineDeck(EngineDeck):
+    """
+    EngineDeck using the original, row by row implementation of the engine data
+    processing.
+    """
+
+    def _generate_flight_idle(self):
+        def _extrapolate(array):
+            y0 = array[0]
+            y1 = array[1]
+
+            if y0 == 0 and y1 == 0:
+                return 0
+
+            rvalue = (
+                y0 + (y1 - y0) * extrap_term
+            )
+
+            return rvalue
+
+        idle_thrust_fract = self.get_val(Aircraft.Engine.FLIGHT_IDLE_THRUST_FRACTION)
+        idle_min_fract = self.get_val(Aircraft.Engine.FLIGHT_IDLE_MIN_FRACTION)
+        idle_max_fract = self.get_val(Aircraft.Engine.FLIGHT_IDLE_MAX_FRACTION)
+
+        packed_data = self.packed_data
+
+        # variables whose idle value is directly calculated based on FLIGHT_IDLE_THRUST_FRACTION
+        direct_calc_vars = []
+        if THRUST in self.engine_variables:
+            direct_calc_vars.append(THRUST)
+        if SHAFT_POWER_CORRECTED in self.engine_variables:
+            direct_calc_vars.append(SHAFT_POWER_CORRECTED)
+        if SHAFT_POWER in self.engine_variables:
+            direct_calc_vars.append(SHAFT_POWER)
+
+        # stored information about packed data
+        mach_max_count = self.mach_max_count
+        alt_max_count = self.alt_max_count
+        data_indices = self.data_indices
+
+        # Throttle is already normalized from 0 to 1. Set flight idle to -0.1, which will
+        # get re-normalized to 0
+        # -0.1 is chosen to avoid stretching out the data range while at the same time
+        # avoiding "discontinuities" in engine data from arbitrarily small negative
+        # throttle (e.g. -1e-6). Basically, this is an arbitrary number
+        throttle_idle = -0.1
+        hybrid_throttle_idle = 0
+
+        idle_points = {key: np.empty(0) for key in packed_data}
+
+        # Normally, only one idle point is needed - however, when hybrid throttle is
+        # present, there needs to be a sweep of points for a given Mach/alt/throttle
+        # to satisfy the interpolator's requirements for at least 3 points per dimension
+        # The data values at each point in the sweep are kept identical (e.g. same thrust,
+        # fuel flow, etc. as calculated by extrapolation)
+        num_points = 1
+        if self.use_hybrid_throttle:
+            num_points = 3
+            # How far apart the "fake" points should be from the actual idle point
+            # This time, we want an arbitrarily small number
+            h_tol = 1e-4
+
+        for M in range(mach_max_count):
+            for A in range(alt_max_count):
+                # if no data at this Mach, alt index combination, skip
+                if data_indices[M, A] == 0:
+                    continue
+
+                # don't generate flight idle points if thrust is already zero or negative
+                # at lowest index
+                if packed_data[THRUST][M, A, 0] <= self.thrust_tol:
+                    continue
+
+                # define known data for idle point (independent variables)
+                idle_points[MACH] = np.append(
+                    idle_points[MACH], [packed_data[MACH][M, A, 0]] * num_points)
+                idle_points[ALTITUDE] = np.append(
+                    idle_points[ALTITUDE], [packed_data[ALTITUDE][M, A, 0]] * num_points)
+                idle_points[THROTTLE] = np.append(
+                    idle_points[THROTTLE], [throttle_idle] * num_points)
+                if self.use_hybrid_throttle:
+                    hybrid_throttle_range = np.linspace(hybrid_throttle_idle-h_tol,
+                                                        hybrid_throttle_idle+h_tol,
+                                                        num_points)
+                    idle_points[HYBRID_THROTTLE] = np.append(
+                        idle_points[HYBRID_THROTTLE], hybrid_throttle_range)
+                else:
+                    idle_points[HYBRID_THROTTLE] = np.append(
+                        idle_points[HYBRID_THROTTLE], hybrid_throttle_idle)
+
+                # if there is only one data point at this Mach, alt combination, use
+                # thrust fraction instead of extrapolation
+                # TODO idle currently calculated using lowest index data points - this is not
+                #      guaranteed to be at hybrid throttle idle point, could be negative
+                if data_indices[M, A] == 1:
+                    for key in packed_data:
+                        if key not in [
+                                MACH,
+                                ALTITUDE,
+                                THROTTLE,
+                                HYBRID_THROTTLE] + direct_calc_vars:
+                            idle_value = packed_data[key][M, A, 0] * idle_thrust_fract
+                            var_min = packed_data[key][M, A, -1] * idle_min_fract
+                            var_max = packed_data[key][M, A, -1] * idle_max_fract
+
+                            if idle_value < var_min:
+                                idle_value = var_min
+                            elif idle_value > var_max:
+                                idle_value = var_max
+
+                            idle_points[key] = np.append(idle_points[key],
+                                                         [idle_value] * num_points)
+                            # add Mach, alt combination to idle_points with idle power
+                            # codes
+
+                    # thrust, shaft powers do not get idle_min/max checks
+                    for var in direct_calc_vars:
+                        idle_points[var] = np.append(idle_points[var],
+                                                     [[packed_data[var][M, A, 0]
+                                                       * idle_thrust_fract]] * num_points)
+                    # move to next data point
+                    continue
+
+                # calculate idle thrust, shaft powers as a percentage of max thrust at Mach, alt point
+                for var in direct_calc_vars:
+                    idle_calc_value = packed_data[var][M, A, data_indices[M, A] - 1]\
+                        * idle_thrust_fract
+
+                    # add this point to idle_points
+                    idle_points[var] = np.append(idle_points[var],
+                                                 [idle_calc_value] * num_points)
+
+                    # Calculate term for linear extrapolation - shaft power has highest
+                    # "preference" since it is last in the list, followed by corrected
+                    # shaft power then finally thrust. This is designed for compatibility
+                    # with turboshaft engine decks in TurbopropModels.
+                    # Only one extrapolation term can be used for all dependent vars
+                    extrap_term = (idle_calc_value - packed_data[var][M, A, 0]) / (
+                        packed_data[var][M, A, 1] - packed_data[var][M, A, 0])
+
+                # compute idle data
+                for key in packed_data:
+                    # skip independent variables or thrust, which is already calculated
+                    if key not in [
+                            MACH,
+                            ALTITUDE,
+                            THROTTLE,
+                            HYBRID_THROTTLE] + direct_calc_vars:
+                        # extrapolate to idle from lowest two throttle points in data
+                        idle_value = _extrapolate(packed_data[key][M, A])
+
+                        # idle cannot be below or above user-set limits
+                        var_min = packed_data[key][M, A, -1] * idle_min_fract
+                        var_max = packed_data[key][M, A, -1] * idle_max_fract
+
+                        if idle_value < var_min:
+                            idle_value = var_min
+                        elif idle_value > var_max:
+                            idle_value = var_max
+
+                        # store newly computed idle point
+                        idle_points[key] = np.append(idle_points[key],
+                                                     [idle_value] * num_points)
+
+        # add idle points to data
+        for key in packed_data:
+            self.data[key] = np.append(self.data[key], idle_points[key])
+
+        # update model length
+        self.model_length = len(self.data[ALTITUDE])
+
+        # save idle points, in case they are wanted later
+        self.idle_points = idle_points
+
+        # Re-sort and re-pack data with flight idle information to keep data
+        # structures consistent
+        self._pack_data()
+
+        # Re-normalize throttle since "dummy" idle values were used
+        self._normalize_throttle()
+
+    def _normalize_throttle(self):
+        def _hybrid_throttle_norm(hybrid_throttle_list):
+            norm_hybrid_list = np.array(hybrid_throttle_list)
+            # Split throttle into positive and negative components
+            # (track index to preserve order)
+            # Throttle points at zero do not need to be tracked - they are already
+            # "normalized", and zero is always assumed to be in the normalization range
+            # (max or min)
+            hybrid_throttle_neg_idx = np.where(norm_hybrid_list < 0)
+            if not hybrid_throttle_neg_idx[0].size == 0:
+                hybrid_throttle_neg = norm_hybrid_list[hybrid_throttle_neg_idx]
+
+                # normalize negative component from -1 to 0
+                hybrid_throttle_neg_norm = _legacy_normalize(
+                    hybrid_throttle_neg, maximum=0) - 1
+                norm_hybrid_list[hybrid_throttle_neg_idx] = hybrid_throttle_neg_norm
+
+            hybrid_throttle_pos_idx = np.where(norm_hybrid_list > 0)
+            if not hybrid_throttle_pos_idx[0].size == 0:
+                hybrid_throttle_pos = norm_hybrid_list[hybrid_throttle_pos_idx]
+
+                # normalize positive component from 0 to 1
+                hybrid_throttle_pos_norm = _legacy_normalize(
+                    hybrid_throttle_pos, minimum=0)
+
+                norm_hybrid_list[hybrid_throttle_pos_idx] = hybrid_throttle_pos_norm
+
+            return norm_hybrid_list
+
+        normalized_throttle = np.array([])
+        normalized_hybrid_throttle = np.array([])
+        throttle_min = np.array([])
+        throttle_max = np.array([])
+
+        # information on packed data
+        packed_throttle = self.packed_data[THROTTLE]
+        packed_hybrid_throttle = self.packed_data[HYBRID_THROTTLE]
+        data_indices = self.data_indices
+
+        # for each unique flight condition...
+        for M in range(self.mach_max_count):
+            for A in range(self.alt_max_count):
+                if data_indices[M, A] == 0:
+                    # skip point if there is no data
+                    continue
+
+                if not self.global_throttle:
+                    throttle_list = _legacy_normalize(
+                        packed_throttle[M, A][:data_indices[M, A]+1])
+                    # normalize throttles for this flight condition from 0 to 1
+                    normalized_throttle = np.append(normalized_throttle, throttle_list)
+                    throttle_min = np.append(throttle_min, min(throttle_list))
+                    throttle_max = np.append(throttle_max, max(throttle_list))
+
+                if not self.global_hybrid_throttle and self.use_hybrid_throttle:
+                    # normalize hybrid throttles for this flight condition
+                    hybrid_throttle_list = _hybrid_throttle_norm(
+                        packed_hybrid_throttle[M, A][:data_indices[M, A]+1])
+                    normalized_hybrid_throttle = np.append(
+                        normalized_hybrid_throttle, hybrid_throttle_list)
+                    hybrid_throttle_min = np.append(
+                        hybrid_throttle_min, min(hybrid_throttle_list))
+                    hybrid_throttle_max = np.append(
+                        hybrid_throttle_max, max(hybrid_throttle_list))
+
+        # store normalized throttle data
+        if self.global_throttle:
+            self.data[THROTTLE] = _legacy_normalize(self.data[THROTTLE])
+            self.throttle_min = min(self.data[THROTTLE])
+            self.throttle_max = max(self.data[THROTTLE])
+        else:
+            self.data[THROTTLE] = normalized_throttle
+            self.throttle_min = throttle_min
+            self.throttle_max = throttle_max
+
+        # store normalized hybrid throttle data
+        if self.use_hybrid_throttle:
+            if self.global_hybrid_throttle:
+                norm_hybrid_throttle = _hybrid_throttle_norm(self.data[HYBRID_THROTTLE])
+
+                self.hybrid_throttle_min = min(self.data[HYBRID_THROTTLE])
+                self.hybrid_throttle_max = max(self.data[HYBRID_THROTTLE])
+                self.data[HYBRID_THROTTLE] = norm_hybrid_throttle
+            else:
+                self.data[HYBRID_THROTTLE] = normalized_hybrid_throttle
+                self.hybrid_throttle_min = hybrid_throttle_min
+                self.hybrid_throttle_max = hybrid_throttle_max
+
+        # repack data to keep it up to date
+        self._pack_data()
+
+    def _pack_data(self):
+        # method requires sorted data
+        self._sort_data()
+        # get updated data count
+        self._count_data()
+
+        mach_max_count = self.mach_max_count
+        alt_max_count = self.alt_max_count
+        data_max_count = self.data_max_count
+        data_indices = self.data_indices
+
+        packed_data = self.packed_data = {}
+        idx = 0
+
+        for key in self.data:
+            packed_data[key] = np.zeros((mach_max_count, alt_max_count, data_max_count))
+
+        for M in range(mach_max_count):
+
+            for A in range(alt_max_count):
+                if data_indices[M, A] == 0:
+                    # skip point if there is no data
+                    continue
+
+                # number of data points is index+1
+                for D in range(data_indices[M, A] + 1):
+                    for key in self.data:
+                        unpacked_data = self.data[key]
+                        if idx < len(unpacked_data):
+                            packed_data[key][M, A, D] = unpacked_data[idx]
+                    idx += 1
+
+    def _count_data(self):
+        mach_count = 0
+        # First mach number must have at least one altitude associated with it
+        alt_count = 1
+        max_alt_count = 0
+        # First mach number must have at least one data point associated with it
+        data_count = 1
+        max_data_count = 0
+
+        # data_indices stores how many data points there are for a given Mach/alt combo
+        data_indices = np.array([[]])
+
+        curr_mach = curr_alt = np.inf
+
+        mach_numbers = self.data[MACH]
+        altitudes = self.data[ALTITUDE]
+
+        # Loop through data. Keep track of last unique value (curr_*) to compare each new
+        #   value with
+        # Count number of altitudes per mach, number of data points per
+        #   mach/altitude combination, compare with max_count
+        for idx in range(self.model_length):
+            mach_num = mach_numbers[idx]
+            alt = altitudes[idx]
+
+            if math.isclose(mach_num, curr_mach, abs_tol=self.mach_tol):
+
+                if math.isclose(alt, curr_alt, abs_tol=self.alt_tol):
+                    data_indices[mach_count - 1, alt_count - 1] = data_count
+                    data_count += 1
+
+                else:
+                    # new altitude for this mach number, count it
+                    curr_alt = alt
+                    alt_count += 1
+                    data_indices = extend_array(data_indices, [mach_count, alt_count])
+
+                    if data_count > max_data_count:
+                        max_data_count = data_count
+                    # new altitude means reset data counter
+                    data_count = 1
+                    # count data associated with new altitude
+                    data_indices[mach_count - 1, alt_count - 1] = 1
+
+            else:
+                # new Mach number
+                # if there are less than two altitudes for this Mach number, quit
+                if alt_count < 2 and mach_count > 0:
+                    raise UserWarning('Only one altitude provided for Mach number '
+                                      f'{mach_numbers[mach_count]:6.3f} in engine data file '
+                                      f'<{self.get_val(Aircraft.Engine.DATA_FILE).name}>'
+                                      )
+
+                # record and count mach numbers
+                curr_mach = mach_num
+                mach_count += 1
+
+                # new mach comes with new altitude, record and count it
+                if alt_count > max_alt_count:
+                    max_alt_count = alt_count
+                # new mach means reset altitude counter
+                curr_alt = alt
+                alt_count = 1
+                data_indices = extend_array(data_indices, [mach_count, alt_count])
+
+                if data_count > max_data_count:
+                    max_data_count = data_count
+                # new mach means reset data counter
+                data_count = 1
+                # count data associated with new altitude
+                data_indices[mach_count - 1, alt_count - 1] = 1
+
+        self.mach_max_count = mach_count
+        self.alt_max_count = max_alt_count
+        self.data_max_count = max_data_count
+        self.data_indices = data_indices.astype(int)
+
+
+def _legacy_normalize(base_list, maximum=None, minimum=None):
+    if maximum is None:
+        maximum = max(base_list)
+    if minimum is None:
+        minimum = min(base_list)
+
+    return np.array([(x - minimum) / (maximum - minimum) for x in base_list])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import unittest
+
+import numpy as np
+import openmdao.api as om
+
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
+
+from aviary.subsystems.propulsion.hamilton_standard import (
+    AFCPC, AFCTC, CL_arr, CP_Angle_table, CP_CLi_table, CPEC, CT_CLi_table, CTEC,
+    PF_CLI_arr, TF_CLI_arr, XPCLI, XTCLI, Act_Factor_arr, BL_P_corr_table,
+    BL_T_corr_table, Blade_angle_table, CT_Angle_table, HamiltonStandard,
+    advance_ratio_array, advance_ratio_array2, ang_arr_len, cli_arr_len,
+    comp_mach_CT_arr, mach_corr_table, mach_tip_corr_arr, num_blades_arr, _biquad,
+    _unint)
+from aviary.variable_info.options import get_option_defaults
+from aviary.variable_info.variables import Aircraft, Dynamic
+
+
+def legacy_hamilton_standard(power_coefficient, advance_ratio, mach, tip_mach,
+                             act_factor, cli, num_blades):
+    """
+    Scalar Hamilton Standard table lookups of one node, as computed with _unint and
+    _biquad before the component was vectorized.
+    """
+    AF_adj_CP = np.zeros(7)
+    AF_adj_CT = np.zeros(7)
+    CTT = np.zeros(7)
+    BLL = np.zeros(7)
+    BLLL = np.zeros(7)
+    PXCLI = np.zeros(7)
+    XFFT = np.zeros(6)
+    CTG = np.zeros(11)
+    CTG1 = np.zeros(11)
+    TXCLI = np.zeros(6)
+    CTTT = np.zeros(4)
+    XXXFT = np.zeros(4)
+    xft = 1.0
+
+    for k in range(2):
+        AF_adj_CP[k], _ = _unint(Act_Factor_arr, AFCPC[k], act_factor)
+        AF_adj_CT[k], _ = _unint(Act_Factor_arr, AFCTC[k], act_factor)
+    AF_adj_CP[2:] = AF_adj_CP[1]
+    AF_adj_CT[2:] = AF_adj_CT[1]
+    if advance_ratio <= 0.5:
+        AFCTE = 2.*advance_ratio*(AF_adj_CT[1] - AF_adj_CT[0]) + AF_adj_CT[0]
+    else:
+        AFCTE = AF_adj_CT[1]
+
+    if advance_ratio <= 1.0:
+        J_begin, J_end = 0, 3
+    elif advance_ratio <= 1.5:
+        J_begin, J_end = 1, 4
+    elif advance_ratio <= 2.0:
+        J_begin, J_end = 2, 5
+    else:
+        J_begin, J_end = 3, 6
+
+    on_node = np.where(np.abs(cli - CL_arr[:6]) <= 0.0009)[0]
+    if on_node.size:
+        CL_begin = CL_end = on_node[0]
+    elif cli <= 0.6:
+        CL_begin, CL_end = 0, 3
+    elif cli <= 0.7:
+        CL_begin, CL_end = 1, 4
+    else:
+        CL_begin, CL_end = 2, 5
+    CL_slice = slice(CL_begin, CL_begin + 4)
+
+    if num_blades % 2 == 0:
+        nbb = 1
+        idx_blade = int(num_blades/2.0) - 1
+    else:
+        nbb = 4
+        idx_blade = 0
+
+    for ibb in range(nbb):
+        for kdx in range(J_begin, J_end+1):
+            CP_Eff = power_coefficient*AF_adj_CP[kdx]
+            PBL, _ = _unint(CPEC, BL_P_corr_table[idx_blade], CP_Eff)
+            CPE1 = CP_Eff*PBL*PF_CLI_arr[kdx]
+            for kl in range(CL_begin, CL_end+1):
+                CPE1X = max(CPE1, CP_CLi_table[kl][0])
+                PXCLI[kl], _ = _unint(
+                    CP_CLi_table[kl][:cli_arr_len[kl]], XPCLI[kl], CPE1X)
+            if on_node.size:
+                PCLI = PXCLI[CL_begin]
+            else:
+                PCLI, _ = _unint(CL_arr[CL_slice], PXCLI[CL_slice], cli)
+            CP_Eff = CP_Eff*PCLI
+            ang_len = ang_arr_len[kdx]
+            BLL[kdx], _ = _unint(
+                CP_Angle_table[idx_blade][kdx][:ang_len], Blade_angle_table[kdx],
+                CP_Eff)
+            CTT[kdx], _ = _unint(
+                Blade_angle_table[kdx], CT_Angle_table[idx_blade][kdx][:ang_len],
+                BLL[kdx])
+
+        J_slice = slice(J_begin, J_begin + 4)
+        BLLL[ibb], _ = _unint(advance_ratio_array[J_slice], BLL[J_slice], advance_ratio)
+        ang_blade = BLLL[ibb]
+        CTTT[ibb], _ = _unint(advance_ratio_array[J_slice], CTT[J_slice], advance_ratio)
+
+        CTG[0] = .100
+        CTG[1] = .200
+        TFCLII, _ = _unint(advance_ratio_array, TF_CLI_arr, advance_ratio)
+        found = False
+        for il in range(10):
+            ct = CTG[il]
+            CT_Eff = CTG[il]*AFCTE
+            TBL, _ = _unint(CTEC, BL_T_corr_table[idx_blade], CT_Eff)
+            CTE1 = CT_Eff*TBL*TFCLII
+            for kl in range(CL_begin, CL_end+1):
+                CTE1X = max(CTE1, CT_CLi_table[kl][0])
+                cli_len = cli_arr_len[kl]
+                TXCLI[kl], _ = _unint(
+                    CT_CLi_table[kl][:cli_len], XTCLI[kl][:cli_len], CTE1X)
+                if advance_ratio != 0.0:
+                    ZMCRT, _ = _unint(
+                        advance_ratio_array2, mach_corr_table[kl], advance_ratio)
+                    DMN = mach - ZMCRT
+                else:
+                    DMN = tip_mach - mach_tip_corr_arr[kl]
+                XFFT[kl] = 1.0
+                if DMN > 0.0:
+                    XFFT[kl], _ = _biquad(
+                        comp_mach_CT_arr, 1, DMN, CT_Eff*TXCLI[kl]*TBL)
+            if on_node.size:
+                TCLII = TXCLI[CL_begin]
+                xft = XFFT[CL_begin]
+            else:
+                TCLII, _ = _unint(CL_arr[CL_slice], TXCLI[CL_slice], cli)
+                xft, _ = _unint(CL_arr[CL_slice], XFFT[CL_slice], cli)
+            CTG1[il] = CTG[il]*AFCTE*TCLII - CTTT[ibb]
+            if abs(CTG1[il]/CTTT[ibb]) < 0.001:
+                found = True
+                break
+            if il > 0:
+                CTG[il+1] = -CTG1[il-1] * \
+                    (CTG[il] - CTG[il-1])/(CTG1[il] - CTG1[il-1]) + CTG[il-1]
+                if CTG[il+1] <= 0:
+                    ct = 0.0
+                    found = True
+                    break
+
+        if not found:
+            raise ValueError('legacy ct iteration did not converge')
+
+        CTTT[ibb] = ct
+        XXXFT[ibb] = xft
+        idx_blade += 1
+
+    if nbb != 1:
+        ang_blade, _ = _unint(num_blades_arr, BLLL[:4], num_blades)
+        ct, _ = _unint(num_blades_arr, CTTT, num_blades)
+        xft, _ = _unint(num_blades_arr, XXXFT, num_blades)
+
+    return ct, ang_blade, xft
+
+
+class HamiltonStandardTest(unittest.TestCase):
+    def build_problem(self, num_blades, cli):
+        options = get_option_defaults()
+        options.set_val(Aircraft.Engine.NUM_PROPELLER_BLADES,
+                        val=num_blades, units='unitless')
+
+        nn = 6
+        prob = om.Problem()
+        prob.model.add_subsystem(
+            'hs', HamiltonStandard(num_nodes=nn, aviary_options=options),
+            promotes=['*'])
+        prob.setup(force_alloc_complex=True)
+
+        prob.set_val('power_coefficient', [0.05, 0.1, 0.12, 0.15, 0.25, 0.2])
+        prob.set_val('advance_ratio', [0.0, 0.6, 1.2, 1.7, 2.1, 2.6])
+        prob.set_val(Dynamic.Mission.MACH, [0.0, 0.2, 0.3, 0.4, 0.5, 0.8])
+        prob.set_val('tip_mach', [0.7, 0.72, 0.75, 0.78, 0.8, 0.9])
+        prob.set_val(Aircraft.Engine.PROPELLER_ACTIVITY_FACTOR, 114.0)
+        prob.set_val(Aircraft.Engine.PROPELLER_INTEGRATED_LIFT_COEFFICIENT, cli)
+
+        return prob
+
+    def test_vectorized_nodes(self):
+        # every node must match the scalar lookups of the legacy implementation
+        for num_blades, cli in [(3, 0.55), (4, 0.5), (4, 0.45)]:
+            prob = self.build_problem(num_blades, cli)
+            prob.run_model()
+
+            for i in range(6):
+                ct, ang_blade, xft = legacy_hamilton_standard(
+                    prob.get_val('power_coefficient')[i],
+                    prob.get_val('advance_ratio')[i],
+                    prob.get_val(Dynamic.Mission.MACH)[i],
+                    prob.get_val('tip_mach')[i],
+                    114.0, cli, num_blades)
+
+                assert_near_equal(
+                    prob.get_val('thrust_coefficient')[i], ct, tolerance=1e-12)
+                assert_near_equal(
+                    prob.get_val('blade_angle')[i], ang_blade, tolerance=1e-12)
+                assert_near_equal(
+                    prob.get_val('comp_tip_loss_factor')[i], xft, tolerance=1e-12)
+
+    def test_partials(self):
+        for num_blades, cli in [(4, 0.5), (3, 0.45)]:
+            prob = self.build_problem(num_blades, cli)
+            prob.run_model()
+
+            partial_data = prob.check_partials(
+                out_stream=None, method='fd', form='forward', step=1e-7)
+            assert_check_partials(partial_data, atol=5e-4, rtol=5e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import getpass
+import hashlib
 import numpy as np
+import os
 import re
+import tempfile
 import warnings
 
 from datetime import datetime
@@ -13,8 +16,15 @@ from aviary.utils.functions import get_path
 from aviary.utils.named_values import NamedValues
 
 
+# If True, read_data_file() saves the parsed contents of each data file it reads to a
+# binary sidecar file (the data file name with '.npz' appended), and reads from that
+# file instead of parsing the data file again as long as the data file is unchanged.
+# Can be overridden for individual calls with the use_cache argument.
+cache_data_files = False
+
+
 def read_data_file(filename: (str, Path), metadata=None, aliases=None,
-                   save_comments=False):
+                   save_comments=False, use_cache=None):
     """
     Read data file in Aviary format, which is data delimited by commas with any amount of
     whitespace allowed between data entries. Spaces are not allowed in openMDAO
@@ -36,6 +46,11 @@ def read_data_file(filename: (str, Path), metadata=None, aliases=None,
     save_comments : bool, optional
         flag if comments in data file should be returned along with data. Defaults to 
         False.
+    use_cache : bool, optional
+        flag if the parsed contents of the data file should be read from (and saved to)
+        a binary sidecar file, which is only used if the modification time and hash of
+        the data file match the ones it was created from. Defaults to the value of
+        cache_data_files.
 
     Returns
     -------
@@ -48,8 +63,20 @@ def read_data_file(filename: (str, Path), metadata=None, aliases=None,
     """
     filepath = get_path(filename)
 
+    if use_cache is None:
+        use_cache = cache_data_files
+
+    contents = None
+    if use_cache:
+        contents = _load_cached_contents(filepath)
+    if contents is None:
+        contents = _parse_data_file(filepath)
+        if use_cache:
+            _save_cached_contents(filepath, contents)
+
+    header_line, header_count, table, comments, error_count = contents
+
     data = NamedValues()
-    comments = []
 
     # prep aliases for case-insensitive matching, with spaces == underscores
     if aliases:
@@ -58,6 +85,115 @@ def read_data_file(filename: (str, Path), metadata=None, aliases=None,
                 aliases[key] = [aliases[key]]
             aliases[key] = [re.sub('\s', '_', item).lower() for item in aliases[key]]
 
+    # dictionary of header name: units
+    header = {}
+    # list of which column goes with each valid header entry
+    valid_indices = []
+    for index in range(len(header_line)):
+        item = re.split('[(]', header_line[index])
+        item = [item[i].strip(') ') for i in range(len(item))]
+        # openMDAO vars can't have spaces, convert to underscores
+        name = re.sub('\s', '_', item[0])
+        if aliases:
+            # "reverse" lookup name in alias dict
+            for key in aliases:
+                if name.lower() in aliases[key]:
+                    name = key
+                    break
+        # 'default' default_units
+        default_units = 'unitless'
+        # if metadata is provided, ensure variable exists and update
+        # default_units
+        if metadata is not None:
+            if name not in metadata.keys():
+                warnings.warn(f'Header <{name}> was not recognized, and '
+                              'will be skipped'
+                              )
+                continue
+            else:
+                default_units = metadata[name]['units']
+
+        # if units are provided, check that they are valid
+        if len(item) > 1:
+            units = item[-1]
+            if valid_units(item[1]):
+                # check that units are compatible with expected units
+                if metadata is not None:
+                    if not is_compatible(units, default_units):
+                        # Raising error here, as trying to use default
+                        # units could mean accidental conversion which
+                        # would significantly impact analysis
+                        raise ValueError(f'Provided units of <{units}> '
+                                         f'for column <{name}>, which '
+                                         'are not compatible with default '
+                                         f'units of {default_units}')
+            else:
+                # Units were not recognized. Raise error
+                raise ValueError(f'Invalid units <{units}> provided for '
+                                 f'column <{name}> while reading '
+                                 f'<{filepath}>.')
+        else:
+            if metadata is not None and default_units != 'unitless':
+                # units were not provided, but variable should have them
+                # assume default units for that variable
+                warning = f'Units were not provided for column <{name}> '\
+                          f'while reading <{filepath}>. Using default '\
+                          f'units of {default_units}.'
+                warnings.warn(warning)
+            units = default_units
+
+        header[name] = units
+        valid_indices.append(index)
+
+    # only raise error if no valid header found, or non-numerical data found after header
+    if len(header) == 0:
+        raise ValueError(
+            f'Non-numerical value found in data file <{filepath}> on line '
+            f'{str(header_count)}')
+    if error_count is not None:
+        raise ValueError(
+            f'Non-numerical value found in data file <{filepath}> on line '
+            f'{str(error_count)}')
+
+    # store data in NamedValues object
+    for idx, variable in enumerate(header.keys()):
+        # valid_indices matches dictionary order, pull data from correct column
+        if isinstance(table, np.ndarray):
+            val = np.array(table[:, valid_indices[idx]])
+        else:
+            val = np.array([line_data[valid_indices[idx]] for line_data in table])
+        data.set_val(variable, val=val, units=header[variable])
+
+    if save_comments:
+        return data, comments
+    else:
+        return data
+
+
+def _parse_data_file(filepath):
+    """
+    Parse the data file at filepath without interpreting the header.
+
+    Returns
+    -------
+    header_line : list of str
+        entries of the header line
+    header_count : int
+        line number of the header line
+    table : numpy.ndarray or list of list
+        numerical data, as a 2d array if all lines have the same number of entries
+    comments : list of str
+        any comments from file, with comment characters ('#') stripped out
+    error_count : int
+        line number of the first non-numerical line after the header, if any. The file
+        is not read past this line.
+    """
+    comments = []
+    header_line = None
+    header_count = None
+    error_count = None
+    rows = []
+
     with open(filepath, newline=None, encoding='utf-8-sig') as file:
         # csv.reader() and other avaliable packages that can read csv files are not used
         # Manual control of file reading ensures that comments are kept intact and other
@@ -82,95 +218,108 @@ def read_data_file(filename: (str, Path), metadata=None, aliases=None,
                 line_data = [float(var) for var in line_data if var != '']
             # data contains things other than floats
             except (ValueError):
-                # skip checking for header data if not required
+                # the first non-numerical line, if found before any data, is the header
                 if check_for_header:
-                    # dictionary of header name: units
-                    header = {}
-                    # list of which column goes with each valid header entry
-                    valid_indices = []
-                    for index in range(len(line_data)):
-                        item = re.split('[(]', line_data[index])
-                        item = [item[i].strip(') ') for i in range(len(item))]
-                        # openMDAO vars can't have spaces, convert to underscores
-                        name = re.sub('\s', '_', item[0])
-                        if aliases:
-                            # "reverse" lookup name in alias dict
-                            for key in aliases:
-                                if name.lower() in aliases[key]:
-                                    name = key
-                                    break
-                        # 'default' default_units
-                        default_units = 'unitless'
-                        # if metadata is provided, ensure variable exists and update
-                        # default_units
-                        if metadata is not None:
-                            if name not in metadata.keys():
-                                warnings.warn(f'Header <{name}> was not recognized, and '
-                                              'will be skipped'
-                                              )
-                                continue
-                            else:
-                                default_units = metadata[name]['units']
-
-                        # if units are provided, check that they are valid
-                        if len(item) > 1:
-                            units = item[-1]
-                            if valid_units(item[1]):
-                                # check that units are compatible with expected units
-                                if metadata is not None:
-                                    if not is_compatible(units, default_units):
-                                        # Raising error here, as trying to use default
-                                        # units could mean accidental conversion which
-                                        # would significantly impact analysis
-                                        raise ValueError(f'Provided units of <{units}> '
-                                                         f'for column <{name}>, which '
-                                                         'are not compatible with default '
-                                                         f'units of {default_units}')
-                            else:
-                                # Units were not recognized. Raise error
-                                raise ValueError(f'Invalid units <{units}> provided for '
-                                                 f'column <{name}> while reading '
-                                                 f'<{filepath}>.')
-                        else:
-                            if metadata is not None and default_units != 'unitless':
-                                # units were not provided, but variable should have them
-                                # assume default units for that variable
-                                warning = f'Units were not provided for column <{name}> '\
-                                          f'while reading <{filepath}>. Using default '\
-                                          f'units of {default_units}.'
-                                warnings.warn(warning)
-                            units = default_units
-
-                        header[name] = units
-                        valid_indices.append(index)
-
-                    if len(header) > 0:
-                        check_for_header = False
-                        raw_data = {key: [] for key in header.keys()}
-                        continue
-
-                # only raise error if not checking for header, or invalid header found
-                raise ValueError(
-                    f'Non-numerical value found in data file <{filepath}> on line '
-                    f'{str(line_count)}')
+                    check_for_header = False
+                    header_line = line_data
+                    header_count = line_count
+                    continue
+
+                # error is raised after the header has been checked for errors
+                error_count = line_count
+                break
 
             # This point is reached when the first valid numerical entry in data file
             # is found. Stop looking for header data from now on
             check_for_header = False
 
-            # pull out data for each valid header, ignore other columns
-            for idx, variable in enumerate(header.keys()):
-                # valid_indices matches dictionary order, pull data from correct column
-                raw_data[variable].append(line_data[valid_indices[idx]])
+            rows.append(line_data)
 
-    # store data in NamedValues object
-    for variable in header.keys():
-        data.set_val(variable, val=np.array(raw_data[variable]), units=header[variable])
+    if header_line is None:
+        raise ValueError(f'No header found in data file <{filepath}>')
 
-    if save_comments:
-        return data, comments
+    # store data as a table if possible, which is also required for caching
+    if not rows:
+        table = np.empty((0, len(header_line)))
+    elif all(len(line_data) == len(rows[0]) for line_data in rows):
+        table = np.array(rows)
     else:
-        return data
+        table = rows
+
+    return header_line, header_count, table, comments, error_count
+
+
+def _cache_path(filepath):
+    return filepath.with_name(filepath.name + '.npz')
+
+
+def _source_info(filepath):
+    """
+    Return the modification time and hash of the data file at filepath.
+    """
+    contents = filepath.read_bytes()
+    return filepath.stat().st_mtime_ns, hashlib.sha256(contents).hexdigest()
+
+
+def _load_cached_contents(filepath):
+    """
+    Return the contents of the data file at filepath from its cache, or None if there
+    is no valid cache.
+    """
+    cache_path = _cache_path(filepath)
+    if not cache_path.is_file():
+        return None
+
+    mtime, source_hash = _source_info(filepath)
+    try:
+        with np.load(cache_path, allow_pickle=False) as cache:
+            if cache['source_mtime'] != mtime or cache['source_hash'] != source_hash:
+                return None
+
+            return (cache['header_line'].tolist(),
+                    int(cache['header_count']),
+                    cache['table'],
+                    cache['comments'].tolist(),
+                    None)
+    # damaged, unreadable or outdated cache, parse data file instead
+    except Exception:
+        return None
+
+
+def _save_cached_contents(filepath, contents):
+    """
+    Save the contents of the data file at filepath to its cache, if possible.
+    """
+    header_line, header_count, table, comments, error_count = contents
+
+    # lines with different numbers of entries cannot be stored in an array, and files
+    # with errors are not cached
+    if not isinstance(table, np.ndarray) or error_count is not None:
+        return
+
+    mtime, source_hash = _source_info(filepath)
+    cache_path = _cache_path(filepath)
+    temp_path = None
+    try:
+        # Write to a temporary file that replaces the cache once complete, so other
+        # processes reading the same data file never see a partially written cache.
+        # Writing to a file object also keeps numpy from changing the file extension.
+        with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix='.tmp',
+                                         delete=False) as cache:
+            temp_path = cache.name
+            np.savez(cache,
+                     source_mtime=mtime,
+                     source_hash=source_hash,
+                     header_line=np.array(header_line, dtype=str),
+                     header_count=header_count,
+                     table=table,
+                     comments=np.array(comments, dtype=str))
+
+        os.replace(temp_path, cache_path)
+    # data file location may not be writable, cache is optional
+    except OSError:
+        if temp_path is not None:
+            Path(temp_path).unlink(missing_ok=True)
 
 
 def write_data_file(filename: (str, Path) = None, data: NamedValues = None,
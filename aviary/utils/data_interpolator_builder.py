@@ -1,4 +1,8 @@
+import copy
+import hashlib
 import warnings
+from collections import OrderedDict
+
 import numpy as np
 import openmdao.api as om
 
@@ -56,8 +60,9 @@ def build_data_interpolator(num_nodes, interpolator_data=None, interpolator_outp
     Returns
     -------
 
-    interp_comp : om.MetaModelSemiStructuredComp, om.MetaModelStructuredComp
-        OpenMDAO metamodel component using the provided data and flags
+    interp_comp : om.MetaModelSemiStructuredComp, CachedMetaModelStructuredComp
+        OpenMDAO metamodel component using the provided data and flags. Structured
+        components built from the same data share their interpolation tables.
     """
     # Argument checking #
     if interpolator_outputs is None:
@@ -68,6 +73,60 @@ def build_data_interpolator(num_nodes, interpolator_data=None, interpolator_outp
     if isinstance(interpolator_data, Path):
         interpolator_data = read_data_file(interpolator_data)
 
+    if training_data:
+        interpolator_data, indep_keys, structured = _format_data(
+            interpolator_data, interpolator_outputs, structured, training_data)
+
+    else:
+        # Validating, sorting and restructuring the data only needs to happen once for
+        # each set of data, no matter how many phases or problems use it. The data is
+        # still formatted in place, as if it had been done here.
+        key = hash_named_values(interpolator_data, 'format', structured,
+                                *interpolator_outputs)
+        formatted_data, indep_keys, structured = get_cached_data(
+            key,
+            lambda: _format_data(interpolator_data.deepcopy(), interpolator_outputs,
+                                 structured, training_data))
+        interpolator_data.update(formatted_data.deepcopy())
+
+    # create interpolation component
+    if structured:
+        interp_comp = CachedMetaModelStructuredComp(
+            method=method, extrapolate=extrapolate, vec_size=num_nodes,
+            training_data_gradients=training_data)
+    else:
+        interp_comp = om.MetaModelSemiStructuredComp(
+            method=method, extrapolate=extrapolate, vec_size=num_nodes,
+            training_data_gradients=training_data)
+
+    # add interpolator inputs
+    for key in indep_keys:
+        values, units = interpolator_data.get_item(key)
+        interp_comp.add_input(key,
+                              training_data=values,
+                              units=units)
+    # add interpolator outputs
+    for key in interpolator_outputs:
+        if key in interpolator_data:
+            values, units = interpolator_data.get_item(key)
+        if training_data:
+            units = interpolator_outputs[key]
+            interp_comp.add_output(key,
+                                   units=units)
+        else:
+            interp_comp.add_output(key,
+                                   training_data=values,
+                                   units=units)
+
+    return interp_comp
+
+
+def _format_data(interpolator_data, interpolator_outputs, structured, training_data):
+    """
+    Validate interpolator_data and put it in the format needed by the metamodel
+    components, in place. Return the data, the names of the independent variables, and
+    whether the data is used as a structured grid.
+    """
     # Pre-format data: Independent variables placed before dependent variables - position
     #                  of these variables relative to others of their type is preserved
     #                  All data converted to numpy arrays
@@ -205,35 +264,181 @@ def build_data_interpolator(num_nodes, interpolator_data=None, interpolator_outp
             val = np.unique(val)
             interpolator_data.set_val(key, val, units)
 
-    # create interpolation component
-    if structured:
-        interp_comp = om.MetaModelStructuredComp(method=method,
-                                                 extrapolate=extrapolate,
-                                                 vec_size=num_nodes,
-                                                 training_data_gradients=training_data)
+    return interpolator_data, list(get_keys(indep_vars)), structured
+
+
+# Interpolation tables with precomputed coefficients, shared by every metamodel
+# component in this process that is built from the same data, method and options.
+# Tables do not depend on num_nodes, so the coefficients of the same data are only
+# computed once no matter how many phases or problems use it.
+_interp_cache = OrderedDict()
+
+# Interpolation data after validation and restructuring, by a hash of the data as
+# provided, so that it is only formatted once.
+_data_cache = OrderedDict()
+
+# maximum number of tables (and sets of data) kept in the cache, least recently used
+# tables are removed first
+interp_cache_size = 256
+
+
+def clear_interp_cache():
+    """
+    Remove all interpolation tables and formatted data from the process-wide cache.
+    """
+    _interp_cache.clear()
+    _data_cache.clear()
+
+
+def _get_cached(cache, key, build):
+    """
+    Return the cached item for key, building and caching it with build() if needed.
+    """
+    item = cache.get(key)
+    if item is None:
+        item = build()
+        cache[key] = item
+        while len(cache) > interp_cache_size:
+            cache.popitem(last=False)
     else:
-        interp_comp = om.MetaModelSemiStructuredComp(method=method,
-                                                     extrapolate=extrapolate,
-                                                     vec_size=num_nodes,
-                                                     training_data_gradients=training_data)
+        cache.move_to_end(key)
 
-    # add interpolator inputs
-    for key in get_keys(indep_vars):
-        values, units = interpolator_data.get_item(key)
-        interp_comp.add_input(key,
-                              training_data=values,
-                              units=units)
-    # add interpolator outputs
-    for key in interpolator_outputs:
-        if key in interpolator_data:
-            values, units = interpolator_data.get_item(key)
-        if training_data:
-            units = interpolator_outputs[key]
-            interp_comp.add_output(key,
-                                   units=units)
+    return item
+
+
+def get_cached_data(key, build_data):
+    """
+    Return the cached interpolation data for key, building and caching it with
+    build_data() if needed. The data is shared by all callers using the same key, so it
+    must not be modified.
+
+    Parameters
+    ----------
+    key : str
+        Key of the data in the cache, see hash_named_values().
+
+    build_data : callable
+        Function without arguments returning the data when it is not cached yet.
+
+    Returns
+    -------
+    data
+        The value returned by build_data() for this key.
+    """
+    return _get_cached(_data_cache, key, build_data)
+
+
+def hash_named_values(data, *args):
+    """
+    Return a hash of the names, units and values in a NamedValues object, and of any
+    other given strings, flags and arrays.
+
+    Parameters
+    ----------
+    data : NamedValues
+        Interpolation data.
+
+    *args
+        Other strings, flags and arrays identifying how the data is used.
+
+    Returns
+    -------
+    str
+        Hash suitable as a key for get_cached_data().
+    """
+    items = []
+    for key, (val, units) in get_items(data):
+        items.extend((key, units, np.asarray(val)))
+
+    return _hash_data(*args, *items)
+
+
+def _hash_data(*args):
+    """
+    Return a hash of the contents of the given strings, flags and arrays.
+    """
+    data_hash = hashlib.sha1()
+    for arg in args:
+        if isinstance(arg, np.ndarray):
+            data_hash.update(str((arg.dtype, arg.shape)).encode())
+            data_hash.update(np.ascontiguousarray(arg).tobytes())
         else:
-            interp_comp.add_output(key,
-                                   training_data=values,
-                                   units=units)
+            data_hash.update(repr(arg).encode())
+        # separator, so different splits of the same data do not collide
+        data_hash.update(b'|')
 
-    return interp_comp
+    return data_hash.hexdigest()
+
+
+def precompute_table_coefficients(interp):
+    """
+    Compute the coefficients of every cell of a table interpolated with a fixed
+    dimension method ('1D-', '2D-' or '3D-' methods) for several points at once, unless
+    the table has already been evaluated. The coefficients are then only computed once,
+    and stored as real numbers even if the table is first used under complex step.
+
+    Parameters
+    ----------
+    interp : InterpND
+        Interpolator using a fixed dimension method. Call this before its first use.
+    """
+    if interp.table.vec_coeff is None:
+        grid_points = np.meshgrid(*interp.grid, indexing='ij')
+        interp.interpolate(np.column_stack([grid.ravel() for grid in grid_points]))
+
+
+def _copy_table(table):
+    """
+    Return a copy of a fixed dimension interpolation table ('1D-', '2D-' or '3D-'
+    methods) that shares its training data and coefficients, but keeps its own
+    evaluation state, so that copies can be used at the same time from several threads.
+    """
+    table = copy.copy(table)
+    table.last_index = copy.copy(table.last_index)
+    table.coeffs = copy.copy(table.coeffs)
+    return table
+
+
+class CachedMetaModelStructuredComp(om.MetaModelStructuredComp):
+    """
+    MetaModelStructuredComp sharing the coefficients of its interpolation tables with
+    all components in this process built from the same data. Only the fixed dimension
+    table methods ('1D-', '2D-', '3D-') evaluating several points at once store the
+    coefficients of every cell, other components are not affected.
+    """
+
+    def setup(self):
+        super().setup()
+        # the interpolators are created again after every setup, the shared tables
+        # are swapped in on the first compute
+        self._tables_shared = False
+
+    def compute(self, inputs, outputs):
+        if not self._tables_shared:
+            self._share_tables()
+        super().compute(inputs, outputs)
+
+    def _share_tables(self):
+        """
+        Replace the tables of the interpolators by copies of the cached ones.
+        """
+        self._tables_shared = True
+
+        method = self.options['method']
+        if (
+            self.options['training_data_gradients']
+            or self.options['vec_size'] == 1
+            or method[:3] not in ('1D-', '2D-', '3D-')
+        ):
+            # training data can change during execution, and single points are
+            # evaluated without the table of coefficients
+            return
+
+        for interp in self.interps.values():
+            def build_table():
+                precompute_table_coefficients(interp)
+                return interp.table
+
+            key = _hash_data('structured', method, interp.extrapolate, *interp.grid,
+                             np.asarray(interp.values))
+            interp.table = _copy_table(_get_cached(_interp_cache, key, build_table))
@@ -0,0 +1,307 @@
+"""
+Precompiled versions of the table lookup routines used by legacy GASP code.
+
+GASP interpolates its tables over a 4 point interval with a blend of two
+quadratics, which gives continuity of slope between adjacent intervals. On each
+interval the result is a cubic in the independent variable, so the tables here
+compute the polynomial coefficients of every interval once when they are built.
+Lookups then only need a binary search (np.searchsorted) and a polynomial
+evaluation, and all points are handled at once. Branching is done on the real
+part of the inputs, so the tables can be complex stepped.
+"""
+import numpy as np
+from numpy.polynomial import polynomial as P
+
+
+def _polymul(a, b):
+    """
+    Product of the polynomials a and b, stored along the last axis with the lowest
+    order first. Leading axes are broadcast.
+    """
+    prod = np.zeros(np.broadcast_shapes(a.shape[:-1], b.shape[:-1])
+                    + (a.shape[-1] + b.shape[-1] - 1,))
+    for i in range(a.shape[-1]):
+        prod[..., i:i + b.shape[-1]] += a[..., i:i+1] * b
+    return prod
+
+
+def _interval_weights(xa):
+    """
+    Compute the interpolation weights of the 4 point GASP scheme as cubic
+    polynomials for every interval of the breakpoints xa.
+
+    Parameters
+    ----------
+    xa : ndarray
+        Breakpoints in strictly ascending order, at least 4 of them. Leading axes
+        hold separate sets of breakpoints.
+
+    Returns
+    -------
+    first : ndarray
+        Index of the first of the four points used by each interval.
+
+    weights : ndarray
+        Array of shape xa.shape[:-1] + (n - 1, 4, 4), n being the number of
+        breakpoints. weights[..., k, j, :] holds the polynomial coefficients
+        (lowest order first) of the weight of point first[k] + j, as a function of
+        the distance from xa[..., k].
+    """
+    n = xa.shape[-1]
+    k = np.arange(n - 1)
+    # first of the four points, shifted inwards on the first and last intervals
+    first = np.clip(k - 1, 0, n - 4)
+
+    # ra is 1 on the first interval, 0 on the last one and falls linearly from 1 to
+    # 0 across the interior ones
+    h = np.diff(xa, axis=-1)
+    interior = (k > 0) & (k < n - 2)
+    ra = np.stack(np.broadcast_arrays(np.where(k == n - 2, 0.0, 1.0),
+                                      np.where(interior, -1.0 / h, 0.0)), axis=-1)
+    rb = -ra
+    rb[..., 0] += 1.0
+
+    xc = xa[..., first[:, np.newaxis] + np.arange(4)]
+    p1 = xc[..., 1] - xc[..., 0]
+    p2 = xc[..., 2] - xc[..., 1]
+    p3 = xc[..., 3] - xc[..., 2]
+    p4 = p1 + p2
+    p5 = p2 + p3
+    d = np.stack(np.broadcast_arrays(xa[..., :-1, np.newaxis] - xc, 1.0), axis=-1)
+    d1, d2, d3, d4 = [d[..., j, :] for j in range(4)]
+
+    def term(r, da, db, scale):
+        return _polymul(r, _polymul(da, db)) / scale[..., np.newaxis]
+
+    c1 = term(ra, d2, d3, p1*p4)
+    c2 = term(rb, d3, d4, p2*p5) - term(ra, d1, d3, p1*p2)
+    c3 = term(ra, d1, d2, p2*p4) - term(rb, d2, d4, p2*p3)
+    c4 = term(rb, d2, d3, p5*p3)
+
+    return first, np.stack((c1, c2, c3, c4), axis=-2)
+
+
+def _check_breakpoints(xa, name, max_ndim=1):
+    xa = np.asarray(xa, dtype=float)
+    if not 1 <= xa.ndim <= max_ndim or xa.shape[-1] < 4:
+        dims = '1D' if max_ndim == 1 else '1D or 2D'
+        raise ValueError(f'{name} must be a {dims} array with at least 4 breakpoints.')
+    if np.any(np.diff(xa, axis=-1) <= 0.0):
+        raise ValueError(f'{name} must be in strictly ascending order.')
+    return xa
+
+
+def _locate(xa, x):
+    """
+    Return the interval index and the local coordinate of each point of x. When xa
+    is 2D, each point uses its own row of breakpoints.
+    """
+    if xa.ndim == 1:
+        k = np.clip(np.searchsorted(xa, x.real, side='left') - 1, 0, len(xa) - 2)
+        return k, x - xa[k]
+
+    k = np.clip(np.sum(xa < x.real[:, np.newaxis], axis=-1) - 1, 0, xa.shape[-1] - 2)
+    return k, x - xa[np.arange(k.size), k]
+
+
+class UnivariateTable:
+    """
+    Precompiled replacement for the legacy univariate table routine (_unint in
+    hamilton_standard.py). Points outside of the table are given the value at the
+    nearest end of the table, and are flagged with 1 (off low end) or 2 (off high
+    end).
+
+    The table can also hold one row of data per point, as used when the data being
+    interpolated was itself computed for each node. The rows are then given as 2D
+    xa and/or ya, and the i-th point is evaluated on the i-th row.
+
+    Parameters
+    ----------
+    xa : ndarray
+        Breakpoints in strictly ascending order, at least 4 of them. A 2D array
+        holds one row of breakpoints per point.
+
+    ya : ndarray
+        Table values at the breakpoints. Only the first len(xa) values are used. A
+        2D array holds one row of values per point.
+    """
+
+    def __init__(self, xa, ya):
+        self.xa = _check_breakpoints(xa, 'xa', max_ndim=2)
+        ya = np.asarray(ya)
+        # complex values are kept so that tables built on the fly can be complex
+        # stepped
+        ya = ya.astype(np.result_type(ya, float), copy=False)
+        self.ya = ya[..., :self.xa.shape[-1]]
+
+        first, weights = _interval_weights(self.xa)
+        cols = first[:, np.newaxis] + np.arange(4)
+        # polynomial coefficients of each interval, lowest order first
+        self.coeffs = np.einsum('...kjp,...kj->...kp', weights, self.ya[..., cols])
+        self.per_row = self.coeffs.ndim == 3
+
+    def _prepare(self, x):
+        x = np.atleast_1d(x)
+        if self.per_row:
+            x = np.broadcast_to(x, self.coeffs.shape[:1])
+        lmt = np.zeros(x.shape, dtype=int)
+        lmt[x.real < self.xa[..., 0]] = 1
+        lmt[x.real > self.xa[..., -1]] = 2
+        k, t = _locate(self.xa, x)
+        if self.per_row:
+            k = (np.arange(k.size), k)
+        return k, t, lmt
+
+    def evaluate(self, x):
+        """
+        Interpolate the table at x.
+
+        Parameters
+        ----------
+        x : ndarray
+            Points where the table is evaluated.
+
+        Returns
+        -------
+        y : ndarray
+            Interpolated values.
+
+        lmt : ndarray
+            Flag for each point, 0 inside the table, 1 off the low end and 2 off
+            the high end.
+        """
+        k, t, lmt = self._prepare(x)
+        a = self.coeffs[k]
+        y = ((a[..., 3]*t + a[..., 2])*t + a[..., 1])*t + a[..., 0]
+        y = np.where(lmt == 1, self.ya[..., 0],
+                     np.where(lmt == 2, self.ya[..., -1], y))
+        return y, lmt
+
+    def derivative(self, x):
+        """
+        Derivative of the interpolated values with respect to x. It is zero off
+        the ends of the table.
+        """
+        k, t, lmt = self._prepare(x)
+        a = self.coeffs[k]
+        dy = (3.0*a[..., 3]*t + 2.0*a[..., 2])*t + a[..., 1]
+        return np.where(lmt == 0, dy, 0.0)
+
+
+class BivariateTable:
+    """
+    Precompiled replacement for the legacy bivariate table routine (_biquad in
+    hamilton_standard.py). Points outside of the table are moved to the nearest
+    edge of the table and flagged, with the flag being kx + 3*ky where kx and ky
+    are 1 off the low end and 2 off the high end. Following the legacy routine,
+    points beyond the last x breakpoint return zero.
+
+    Parameters
+    ----------
+    xa : ndarray
+        Breakpoints in x, in strictly ascending order, at least 4 of them.
+
+    ya : ndarray
+        Breakpoints in y, in strictly ascending order, at least 4 of them.
+
+    za : ndarray
+        Table values of shape (len(xa), len(ya)).
+    """
+
+    def __init__(self, xa, ya, za):
+        self.xa = _check_breakpoints(xa, 'xa')
+        self.ya = _check_breakpoints(ya, 'ya')
+        self.za = np.asarray(za, dtype=float).reshape(self.xa.size, self.ya.size)
+
+        first_x, weights_x = _interval_weights(self.xa)
+        first_y, weights_y = _interval_weights(self.ya)
+        rows = first_x[:, np.newaxis] + np.arange(4)
+        cols = first_y[:, np.newaxis] + np.arange(4)
+        # bicubic coefficients of each cell, coeffs[kx, ky, p, q] multiplies t**p * u**q
+        z_cells = self.za[rows[:, np.newaxis, :, np.newaxis],
+                          cols[np.newaxis, :, np.newaxis, :]]
+        self.coeffs = np.einsum('ajp,bmq,abjm->abpq', weights_x, weights_y, z_cells)
+
+    @classmethod
+    def from_legacy_array(cls, T, i=1):
+        """
+        Build the table from a flat array in the legacy GASP layout, starting at
+        index i: the number of x values, the number of y values, the x values, the y
+        values, then the table values with y varying fastest.
+        """
+        nx = int(T[i])
+        ny = int(T[i+1])
+        j1 = i + 2
+        xa = T[j1:j1+nx]
+        ya = T[j1+nx:j1+nx+ny]
+        za = T[j1+nx+ny:j1+nx+ny+nx*ny]
+        return cls(xa, ya, za)
+
+    def _prepare(self, x, y):
+        x, y = np.broadcast_arrays(np.atleast_1d(x), np.atleast_1d(y))
+        xa = self.xa
+        ya = self.ya
+
+        kx = np.zeros(x.shape, dtype=int)
+        low = x.real < xa[0]
+        kx[low] = 1
+        x = np.where(low, xa[0], x)
+
+        ky = np.zeros(y.shape, dtype=int)
+        low = y.real < ya[0]
+        high = y.real > ya[-1]
+        ky[low] = 1
+        ky[high] = 2
+        y = np.where(low, ya[0], np.where(high, ya[-1], y))
+
+        off_high_x = x.real > xa[-1]
+        ix, t = _locate(xa, x)
+        iy, u = _locate(ya, y)
+        lmt = np.where(off_high_x, 0, kx + 3*ky)
+        return ix, iy, t, u, lmt, off_high_x, ky
+
+    def evaluate(self, x, y):
+        """
+        Interpolate the table at the points (x, y).
+
+        Parameters
+        ----------
+        x : ndarray
+            x coordinates of the points.
+
+        y : ndarray
+            y coordinates of the points.
+
+        Returns
+        -------
+        z : ndarray
+            Interpolated values.
+
+        lmt : ndarray
+            Flag of each point, see the class description.
+        """
+        ix, iy, t, u, lmt, off_high_x, ky = self._prepare(x, y)
+        a = self.coeffs[ix, iy]
+        tp = np.stack([np.ones_like(t), t, t*t, t*t*t], axis=-1)
+        uq = np.stack([np.ones_like(u), u, u*u, u*u*u], axis=-1)
+        z = np.einsum('...p,...pq,...q->...', tp, a, uq)
+        return np.where(off_high_x, 0.0, z), lmt
+
+    def derivatives(self, x, y):
+        """
+        Derivatives of the interpolated values with respect to x and y. They are
+        zero in the directions where a point is outside of the table.
+        """
+        ix, iy, t, u, lmt, off_high_x, ky = self._prepare(x, y)
+        a = self.coeffs[ix, iy]
+        zero = np.zeros_like(t)
+        one = np.ones_like(t)
+        tp = np.stack([one, t, t*t, t*t*t], axis=-1)
+        dtp = np.stack([zero, one, 2.0*t, 3.0*t*t], axis=-1)
+        uq = np.stack([np.ones_like(u), u, u*u, u*u*u], axis=-1)
+        duq = np.stack([np.zeros_like(u), np.ones_like(u), 2.0*u, 3.0*u*u], axis=-1)
+        dz_dx = np.einsum('...p,...pq,...q->...', dtp, a, uq)
+        dz_dy = np.einsum('...p,...pq,...q->...', tp, a, duq)
+        dz_dx = np.where(off_high_x | (lmt % 3 == 1), 0.0, dz_dx)
+        dz_dy = np.where(off_high_x | (ky > 0), 0.0, dz_dy)
+        return dz_dx, dz_dy
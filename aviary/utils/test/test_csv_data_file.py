@@ -1,5 +1,7 @@
+import shutil
 import unittest
 import warnings
+from pathlib import Path
 
 from openmdao.utils.assert_utils import assert_near_equal
 from openmdao.utils.testing_utils import use_tempdirs
@@ -80,6 +82,46 @@ class TestAviaryCSV(unittest.TestCase):
         if 'Real Var' not in get_keys(data):
             raise RuntimeError("'Real Var' is not in data read from csv")
 
+    def test_read_cached_csv(self):
+        filename = Path('cached.csv')
+        cache_filename = Path('cached.csv.npz')
+        shutil.copy(self.filename, filename)
+
+        self._compare_csv_results(*read_data_file(filename, save_comments=True,
+                                                  use_cache=True))
+        if not cache_filename.is_file():
+            raise RuntimeError('Cache file was not created')
+
+        # read from cache, but aliases are still applied
+        aliases = {'Real Var': 'Fake Var'}
+        data = read_data_file(filename, aliases=aliases, use_cache=True)
+        if 'Real Var' not in get_keys(data):
+            raise RuntimeError("'Real Var' is not in data read from cache")
+        self._compare_csv_results(*read_data_file(filename, save_comments=True,
+                                                  use_cache=True))
+
+        # cache is ignored once data file changes
+        with open(filename, 'a') as file:
+            file.write('1, 2, 3\n')
+        data = read_data_file(filename, use_cache=True)
+        assert_near_equal(data.get_val('fake_var', 'lbm'), [0.932, 1023.54, 0, -13, 3])
+
+    def test_read_damaged_cache(self):
+        filename = Path('cached.csv')
+        cache_filename = Path('cached.csv.npz')
+        shutil.copy(self.filename, filename)
+
+        read_data_file(filename, use_cache=True)
+
+        # a truncated cache is parsed again from the data file, and replaced
+        contents = cache_filename.read_bytes()
+        cache_filename.write_bytes(contents[:len(contents) // 2])
+
+        self._compare_csv_results(*read_data_file(filename, save_comments=True,
+                                                  use_cache=True))
+        if cache_filename.read_bytes() != contents:
+            raise RuntimeError('Damaged cache file was not replaced')
+
     def _compare_csv_results(self, data, comments):
         expected_data = self.data
 
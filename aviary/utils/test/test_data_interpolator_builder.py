@@ -0,0 +1,106 @@
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from aviary.utils.data_interpolator_builder import (
+    CachedMetaModelStructuredComp, _data_cache, build_data_interpolator,
+    clear_interp_cache)
+from aviary.utils.named_values import NamedValues
+
+
+class InterpCacheTest(unittest.TestCase):
+    def setUp(self):
+        clear_interp_cache()
+
+        x, y = np.meshgrid([0.0, 1.0, 2.0, 3.0], [0.0, 2.0, 4.0], indexing='ij')
+        self.x = x.ravel()
+        self.y = y.ravel()
+        self.f = np.sin(self.x) + self.y**2
+
+    def tearDown(self):
+        clear_interp_cache()
+
+    def _run(self, interp_class, num_nodes, f=None):
+        if f is None:
+            f = self.f
+
+        comp = interp_class(method='2D-lagrange2', vec_size=num_nodes)
+        comp.add_input('x', training_data=np.unique(self.x))
+        comp.add_input('y', training_data=np.unique(self.y))
+        comp.add_output('f', training_data=f.reshape(4, 3))
+
+        prob = om.Problem()
+        prob.model.add_subsystem('interp', comp, promotes=['*'])
+        prob.setup()
+        prob.set_val('x', np.linspace(0.2, 2.8, num_nodes))
+        prob.set_val('y', np.linspace(3.5, 0.5, num_nodes))
+        prob.run_model()
+
+        return comp, prob.get_val('f')
+
+    def test_shared_tables(self):
+        comp1, f1 = self._run(CachedMetaModelStructuredComp, 3)
+        comp2, _ = self._run(CachedMetaModelStructuredComp, 5)
+        comp3, f3 = self._run(CachedMetaModelStructuredComp, 3, f=2.0 * self.f)
+        comp4, f4 = self._run(CachedMetaModelStructuredComp, 1)
+        _, expected = self._run(om.MetaModelStructuredComp, 3)
+
+        # components with the same data share coefficients regardless of num_nodes,
+        # but each table keeps its own evaluation state
+        table1 = comp1.interps['f'].table
+        table2 = comp2.interps['f'].table
+        self.assertIsNot(table1, table2)
+        self.assertIsNot(table1.last_index, table2.last_index)
+        self.assertIsNot(table1.coeffs, table2.coeffs)
+        self.assertIs(table1.vec_coeff, table2.vec_coeff)
+        self.assertIsNot(table1.vec_coeff, comp3.interps['f'].table.vec_coeff)
+        # except for tables evaluated one point at a time
+        self.assertIsNone(comp4.interps['f'].table.vec_coeff)
+
+        assert_near_equal(f1, expected, 1e-14)
+        assert_near_equal(f3, 2.0 * expected, 1e-14)
+        assert_near_equal(f4, expected[0], 1e-14)
+
+    def test_build_data_interpolator(self):
+        # unsorted, semistructured data that is converted to a structured grid
+        order = np.random.default_rng(0).permutation(len(self.x))
+        data = NamedValues()
+        data.set_val('x', self.x[order], 'm')
+        data.set_val('y', self.y[order], 'm')
+        data.set_val('f', self.f[order], 'unitless')
+
+        comps = []
+        for num_nodes in (3, 5):
+            interp_data = data.deepcopy()
+            comp = build_data_interpolator(
+                num_nodes, interpolator_data=interp_data,
+                interpolator_outputs={'f': 'unitless'}, method='2D-lagrange2',
+                structured=True)
+            comps.append(comp)
+
+            # the data is formatted in place, whether it was cached or not
+            assert_near_equal(interp_data.get_val('x', 'm'), np.unique(self.x))
+            assert_near_equal(interp_data.get_val('f'), self.f.reshape(4, 3))
+
+        self.assertEqual(len(_data_cache), 1)
+
+        for comp, num_nodes in zip(comps, (3, 5)):
+            _, expected = self._run(om.MetaModelStructuredComp, num_nodes)
+
+            prob = om.Problem()
+            prob.model.add_subsystem('interp', comp, promotes=['*'])
+            prob.setup()
+            prob.set_val('x', np.linspace(0.2, 2.8, num_nodes))
+            prob.set_val('y', np.linspace(3.5, 0.5, num_nodes))
+            prob.run_model()
+
+            assert_near_equal(prob.get_val('f'), expected, 1e-14)
+
+        self.assertIs(comps[0].interps['f'].table.vec_coeff,
+                      comps[1].interps['f'].table.vec_coeff)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+
+from openmdao.utils.assert_utils import assert_near_equal
+
+from aviary.subsystems.propulsion.hamilton_standard import (
+    CP_CLi_table, CPEC, XPCLI, _biquad, _unint, cli_arr_len, comp_mach_CT_arr)
+from aviary.utils.legacy_tables import BivariateTable, UnivariateTable
+
+
+class UnivariateTableTest(unittest.TestCase):
+    def test_legacy_match(self):
+        for k in range(6):
+            xa = CP_CLi_table[k][:cli_arr_len[k]]
+            table = UnivariateTable(xa, XPCLI[k])
+            x = np.concatenate((np.linspace(-0.1, 0.8, 91), xa))
+            y, lmt = table.evaluate(x)
+
+            for i in range(x.size):
+                y_ref, lmt_ref = _unint(xa, XPCLI[k], x[i])
+                assert_near_equal(y[i], y_ref, tolerance=1e-13)
+                self.assertEqual(lmt[i], lmt_ref)
+
+    def test_derivative(self):
+        table = UnivariateTable(CPEC, XPCLI[1])
+        x = np.linspace(0.0, 0.45, 46)
+        step = 1e-30
+
+        y, _ = table.evaluate(x + step*1j)
+        assert_near_equal(table.derivative(x), y.imag / step, tolerance=1e-12)
+
+    def test_per_row(self):
+        # one row of breakpoints and values per point, as built on the fly by
+        # HamiltonStandard
+        rng = np.random.default_rng(0)
+        xa = np.cumsum(rng.uniform(0.1, 1.0, (40, 5)), axis=1)
+        ya = rng.uniform(-1.0, 1.0, (40, 5))
+        x = rng.uniform(-0.5, 5.5, 40)
+        x[:5] = xa[:5, 2]  # on a node
+        x[5:10] = xa[5:10, 0]  # at the low end
+
+        y, lmt = UnivariateTable(xa, ya).evaluate(x)
+        for i in range(x.size):
+            y_ref, lmt_ref = _unint(xa[i], ya[i], x[i])
+            assert_near_equal(y[i], y_ref, tolerance=1e-13)
+            self.assertEqual(lmt[i], lmt_ref)
+
+        # shared breakpoints with complex values per row
+        table = UnivariateTable(CPEC, XPCLI[:3] + 1e-30j)
+        x = np.array([0.01, 0.25, 0.6])
+        y, _ = table.evaluate(x)
+        for i in range(x.size):
+            y_ref, _ = UnivariateTable(CPEC, XPCLI[i]).evaluate(x[i])
+            assert_near_equal(y[i].real, y_ref[0], tolerance=1e-14)
+            assert_near_equal(y[i].imag, 1e-30, tolerance=1e-12)
+
+    def test_bad_breakpoints(self):
+        self.assertRaises(ValueError, UnivariateTable, [0., 1., 2.], [0., 1., 2.])
+        self.assertRaises(ValueError, UnivariateTable,
+                          [0., 1., 1., 2.], [0., 1., 2., 3.])
+
+
+class BivariateTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = BivariateTable.from_legacy_array(comp_mach_CT_arr, 1)
+        x = np.linspace(-0.05, 0.35, 41)
+        y = np.linspace(-0.02, 0.45, 48)
+        self.x, self.y = [arr.flatten() for arr in np.meshgrid(x, y)]
+
+    def test_legacy_match(self):
+        z, lmt = self.table.evaluate(self.x, self.y)
+
+        for i in range(self.x.size):
+            z_ref, lmt_ref = _biquad(comp_mach_CT_arr, 1, self.x[i], self.y[i])
+            assert_near_equal(z[i], z_ref, tolerance=1e-13)
+            self.assertEqual(lmt[i], lmt_ref)
+
+    def test_derivatives(self):
+        step = 1e-30
+        dz_dx, dz_dy = self.table.derivatives(self.x, self.y)
+
+        z, _ = self.table.evaluate(self.x + step*1j, self.y)
+        assert_near_equal(dz_dx, z.imag / step, tolerance=1e-12)
+        z, _ = self.table.evaluate(self.x, self.y + step*1j)
+        assert_near_equal(dz_dy, z.imag / step, tolerance=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()